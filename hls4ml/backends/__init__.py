@@ -1,4 +1,6 @@
 from hls4ml.backends.backend import Backend, get_available_backends, get_backend, register_backend  # noqa: F401
+from hls4ml.backends.build import BuildJob, BuildScheduler, BuildStatus  # noqa: F401
+from hls4ml.backends.build_cache import BuildCache  # noqa: F401
 from hls4ml.backends.fpga.fpga_backend import FPGABackend  # noqa: F401
 from hls4ml.backends.oneapi.oneapi_backend import OneAPIBackend
 from hls4ml.backends.quartus.quartus_backend import QuartusBackend
@@ -0,0 +1,341 @@
+import os
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from enum import Enum
+
+
+class BuildStatus(Enum):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    TIMEOUT = 'timeout'
+    CANCELLED = 'cancelled'
+
+
+class BuildCancelledError(Exception):
+    pass
+
+
+class BuildTimeoutError(Exception):
+    pass
+
+
+def _terminate_process_group(proc):
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=5)
+    except ProcessLookupError:
+        pass
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.wait()
+
+
+def run_build_commands(commands, cwd, check=False, log_file=None, timeout=None, cancel_event=None, poll_interval=0.1):
+    """Run the build commands of a backend in a subprocess.
+
+    The commands are run in sequence, as shell commands, from the given working directory. Unlike changing the working
+    directory of the Python process, this is safe to use from multiple threads.
+
+    Args:
+        commands (list): List of shell commands (str) to run.
+        cwd (str): Working directory of the commands, usually the output directory of the project.
+        check (bool, optional): Raise an exception if a command returns a non-zero exit code. Defaults to False.
+        log_file (str, optional): If specified, stdout and stderr of the commands are written to this file instead of
+            being printed. Defaults to None.
+        timeout (float, optional): Timeout (in seconds) for running all the commands. Defaults to None (no timeout).
+        cancel_event (threading.Event, optional): If set while running, the commands are terminated.
+            Defaults to None.
+        poll_interval (float, optional): How often (in seconds) to check for timeout or cancellation. Defaults to 0.1.
+
+    Raises:
+        BuildTimeoutError: If the commands didn't finish within the timeout.
+        BuildCancelledError: If the commands were cancelled.
+        subprocess.CalledProcessError: If check is True and a command failed.
+
+    Returns:
+        int: Exit code of the last command that was run.
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    log = open(log_file, 'a') if log_file is not None else None
+    returncode = 0
+    try:
+        for command in commands:
+            if cancel_event is not None and cancel_event.is_set():
+                raise BuildCancelledError(f'Build cancelled before running "{command}"')
+            if log is not None:
+                log.write(f'>>> {command}\n')
+                log.flush()
+
+            # Each command gets its own process group, so the whole tree of the vendor tool can be terminated
+            proc = subprocess.Popen(
+                command, shell=True, cwd=cwd, stdout=log, stderr=subprocess.STDOUT if log else None, start_new_session=True
+            )
+            while True:
+                try:
+                    returncode = proc.wait(timeout=poll_interval)
+                    break
+                except subprocess.TimeoutExpired:
+                    if cancel_event is not None and cancel_event.is_set():
+                        _terminate_process_group(proc)
+                        raise BuildCancelledError(f'Build cancelled while running "{command}"')
+                    if deadline is not None and time.monotonic() > deadline:
+                        _terminate_process_group(proc)
+                        raise BuildTimeoutError(f'Build timed out after {timeout}s while running "{command}"')
+
+            if returncode != 0 and check:
+                raise subprocess.CalledProcessError(returncode, command)
+    finally:
+        if log is not None:
+            log.close()
+
+    return returncode
+
+
+class BuildJob:
+    """A build of a single project, scheduled to run by a `BuildScheduler`.
+
+    Jobs shouldn't be created directly, use `BuildScheduler.submit()` instead.
+
+    Attributes:
+        name (str): Name of the job.
+        model (ModelGraph): The model being built.
+        output_dir (str): Output directory of the project, used as the working directory of the build.
+        commands (list): Build commands, obtained from the backend.
+        log_file (str): File containing the output of the build commands.
+        status (BuildStatus): Current status of the job.
+        returncode (int): Exit code of the build commands, or None if they didn't finish.
+        report (dict): Parsed report of the build, available after the job is done.
+        error (Exception): The exception raised by the job, if it failed.
+        elapsed (float): Wall time (in seconds) spent running the build.
+        cached (bool): True if the report was found in the build cache and the build wasn't run.
+    """
+
+    def __init__(self, model, build_kwargs, name=None, timeout=None, log_file=None, cache=None):
+        self.model = model
+        self.backend = model.config.backend
+        self.build_kwargs = build_kwargs
+        self.output_dir = os.path.abspath(model.config.get_output_dir())
+        self.name = name if name is not None else os.path.basename(self.output_dir)
+        self.timeout = timeout
+        self.log_file = log_file if log_file is not None else os.path.join(self.output_dir, 'build.log')
+        self.cache = cache
+        self.commands = self.backend.get_build_commands(model, **build_kwargs)
+
+        self.status = BuildStatus.PENDING
+        self.returncode = None
+        self.report = None
+        self.error = None
+        self.elapsed = None
+        self.cached = False
+        self._future = None
+        self._cancel_event = threading.Event()
+
+    def __repr__(self):
+        return f'BuildJob(name={self.name!r}, status={self.status.value})'
+
+    def _run(self):
+        if self._cancel_event.is_set():
+            self.status = BuildStatus.CANCELLED
+            return self
+        self.status = BuildStatus.RUNNING
+        start = time.monotonic()
+        try:
+            cache_key = self.cache.get_key(self.model, **self.build_kwargs) if self.cache is not None else None
+            if cache_key is not None:
+                self.report = self.cache.load(self.model, cache_key)
+                if self.report is not None:
+                    self.cached = True
+                    self.returncode = 0
+                    self.status = BuildStatus.DONE
+                    return self
+
+            self.returncode = run_build_commands(
+                self.commands,
+                self.output_dir,
+                check=True,
+                log_file=self.log_file,
+                timeout=self.timeout,
+                cancel_event=self._cancel_event,
+            )
+            self.report = self.backend.get_build_report(self.model)
+            if cache_key is not None and self.report:
+                self.cache.store(self.model, cache_key, self.report)
+            self.status = BuildStatus.DONE
+        except BuildCancelledError as e:
+            self.error = e
+            self.status = BuildStatus.CANCELLED
+        except BuildTimeoutError as e:
+            self.error = e
+            self.status = BuildStatus.TIMEOUT
+        except subprocess.CalledProcessError as e:
+            self.error = e
+            self.returncode = e.returncode
+            self.status = BuildStatus.FAILED
+        except Exception as e:
+            self.error = e
+            self.status = BuildStatus.FAILED
+        finally:
+            self.elapsed = time.monotonic() - start
+        return self
+
+    def cancel(self):
+        """Cancel the job. Pending jobs will not start, running jobs are terminated."""
+        self._cancel_event.set()
+        if self._future is not None and self._future.cancel():
+            self.status = BuildStatus.CANCELLED
+
+    def done(self):
+        """Returns True if the job finished (successfully or not), or was cancelled."""
+        return self.status not in (BuildStatus.PENDING, BuildStatus.RUNNING)
+
+    def result(self, timeout=None):
+        """Wait for the job to finish and return the parsed report.
+
+        Args:
+            timeout (float, optional): How long to wait (in seconds). Defaults to None (wait indefinitely).
+
+        Raises:
+            Exception: If the job failed, timed out or was cancelled.
+
+        Returns:
+            dict: Parsed report of the build.
+        """
+        if self._future is not None and not self._future.cancelled():
+            self._future.result(timeout=timeout)
+        if self.status != BuildStatus.DONE:
+            raise Exception(f'Build job "{self.name}" did not finish successfully ({self.status.value}): {self.error}')
+        return self.report
+
+    def read_log(self):
+        """Returns the output of the build commands so far."""
+        if not os.path.exists(self.log_file):
+            return ''
+        with open(self.log_file) as f:
+            return f.read()
+
+
+class BuildScheduler:
+    """Runs backend builds of several projects in parallel.
+
+    Each build runs the backend's build commands as subprocesses with the project's output directory as the working
+    directory, so the state of the Python process is not changed and multiple builds can run at the same time.
+    The output of each build is captured in a log file and the report is parsed as soon as the build finishes.
+
+    Example:
+        ```python
+        with BuildScheduler(max_workers=4, timeout=3600) as scheduler:
+            for model in models:
+                scheduler.submit(model, csim=False, synth=True)
+            for job in scheduler.as_completed():
+                print(job.name, job.status, job.report)
+        ```
+
+    Args:
+        max_workers (int, optional): Maximum number of builds running at the same time. Defaults to the number of CPUs.
+        timeout (float, optional): Default timeout (in seconds) of a single build. Defaults to None (no timeout).
+        cache (BuildCache, optional): If specified, builds of projects found in the cache are not run and their reports
+            are taken from the cache instead. Defaults to None.
+    """
+
+    def __init__(self, max_workers=None, timeout=None, cache=None):
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self.timeout = timeout
+        self.cache = cache
+        self.jobs = []
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='hls4ml-build')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(wait=True, cancel=exc_type is not None)
+
+    def submit(self, model, name=None, timeout=None, log_file=None, **build_kwargs):
+        """Schedule the build of a model.
+
+        The model must already be written (e.g., with `model.write()` or `model.compile()`).
+
+        Args:
+            model (ModelGraph): Model to build.
+            name (str, optional): Name of the job. Defaults to the name of the output directory.
+            timeout (float, optional): Timeout of the build, overrides the default timeout of the scheduler.
+            log_file (str, optional): Where to store the output of the build. Defaults to `build.log` in the output
+                directory of the project.
+            build_kwargs: Arguments passed to the backend's build, e.g. `csim=False`, `synth=True`.
+
+        Raises:
+            Exception: If another active job is building the same output directory.
+
+        Returns:
+            BuildJob: The scheduled job.
+        """
+        job = BuildJob(
+            model,
+            build_kwargs,
+            name=name,
+            timeout=timeout if timeout is not None else self.timeout,
+            log_file=log_file,
+            cache=self.cache,
+        )
+        for other in self.jobs:
+            if not other.done() and other.output_dir == job.output_dir:
+                raise Exception(f'Output directory "{job.output_dir}" is already being built by job "{other.name}"')
+
+        self.jobs.append(job)
+        job._future = self._executor.submit(job._run)
+        return job
+
+    def as_completed(self, timeout=None):
+        """Yields the jobs as they finish.
+
+        Args:
+            timeout (float, optional): Maximum time (in seconds) to wait for all the jobs. Defaults to None.
+
+        Raises:
+            TimeoutError: If not all jobs finished within the timeout.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        pending = {job._future: job for job in self.jobs}
+        while pending:
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError(f'{len(pending)} build job(s) did not finish within {timeout}s')
+            finished, _ = wait_futures(pending.keys(), timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield pending.pop(future)
+
+    def wait(self, timeout=None):
+        """Wait for all the jobs to finish.
+
+        Args:
+            timeout (float, optional): Maximum time (in seconds) to wait. Defaults to None.
+
+        Returns:
+            dict: Reports of the successfully finished jobs, keyed by job name.
+        """
+        for _ in self.as_completed(timeout=timeout):
+            pass
+        return {job.name: job.report for job in self.jobs if job.status == BuildStatus.DONE}
+
+    def cancel(self):
+        """Cancel all jobs that are pending or running."""
+        for job in self.jobs:
+            if not job.done():
+                job.cancel()
+
+    def shutdown(self, wait=True, cancel=False):
+        """Stop accepting new jobs and release the workers.
+
+        Args:
+            wait (bool, optional): Wait for the running jobs to finish. Defaults to True.
+            cancel (bool, optional): Cancel pending and running jobs. Defaults to False.
+        """
+        if cancel:
+            self.cancel()
+        self._executor.shutdown(wait=wait)
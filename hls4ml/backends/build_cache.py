@@ -0,0 +1,200 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import uuid
+
+default_cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'hls4ml', 'builds')
+
+
+class BuildCache:
+    """Cache of build results, keyed by the content of the written project and the build arguments.
+
+    The key of a build is a hash of the backend, the build arguments and all the source files of the project (firmware,
+    weights, testbench data, scripts). Files produced by the build (e.g., the vendor tool's project directory and logs)
+    are not part of the key. After a successful build, the reports and logs produced by the build are stored in the
+    cache along with the parsed report. A later build of an identical project restores them to the output directory and
+    returns the cached report, without running the vendor tool.
+
+    The cache doesn't know about the version of the vendor tools, use a different cache directory for each version.
+
+    Args:
+        cache_dir (str, optional): Directory of the cache. Defaults to the value of the ``HLS4ML_BUILD_CACHE``
+            environment variable or ``~/.cache/hls4ml/builds``.
+        max_size (int, optional): Maximum size of the cache (in bytes). The least recently used builds are removed
+            when the cache grows larger. Defaults to 1 GiB.
+    """
+
+    # Directories and files produced by the builds of the backends, not part of the key. The script that compiles the
+    # library for `predict()` is not used by the builds and contains a random stamp, so it is excluded as well.
+    build_dirs = {'build', '__pycache__'}
+    build_files = {
+        'hls4ml_config.yml',
+        'keras_model.keras',
+        'build.log',
+        'build_lib.sh',
+        'synthesis-report.txt',
+        'max_depth.json',
+    }
+    build_suffixes = ('.log', '.so', '.o', '.jou', '.rpt', '.tar.gz')
+
+    # Build outputs that are stored in the cache
+    artifact_suffixes = ('.xml', '.rpt', '.log', '.app', '.json', '.js')
+
+    def __init__(self, cache_dir=None, max_size=2**30):
+        if cache_dir is None:
+            cache_dir = os.environ.get('HLS4ML_BUILD_CACHE') or default_cache_dir
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def _is_build_output(self, model, rel_path):
+        *dirs, name = rel_path.split(os.sep)
+        for d in dirs:
+            if d == model.config.get_project_dir() or d in self.build_dirs or d.endswith('.prj') or d.startswith('.'):
+                return True
+        return name in self.build_files or name.endswith(self.build_suffixes)
+
+    def _walk(self, output_dir):
+        for root, dirs, files in os.walk(output_dir):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                if os.path.isfile(path):
+                    yield os.path.relpath(path, output_dir)
+
+    def get_key(self, model, **build_kwargs):
+        """Compute the key of a build.
+
+        Args:
+            model (ModelGraph): The written model.
+            build_kwargs: Arguments of the backend's `build()`.
+
+        Returns:
+            str: The key (hex digest).
+        """
+        backend = model.config.backend
+        build_args = inspect.signature(backend.build).bind(model, **build_kwargs)
+        build_args.apply_defaults()
+        build_args = {name: value for name, value in build_args.arguments.items() if name != 'model'}
+
+        digest = hashlib.sha256()
+        digest.update(json.dumps({'backend': backend.name, 'args': build_args}, sort_keys=True, default=str).encode())
+        output_dir = model.config.get_output_dir()
+        for rel_path in self._walk(output_dir):
+            if self._is_build_output(model, rel_path):
+                continue
+            digest.update(rel_path.encode() + b'\0')
+            with open(os.path.join(output_dir, rel_path), 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+            digest.update(b'\0')
+
+        return digest.hexdigest()
+
+    def load(self, model, key):
+        """Restore the artifacts of a cached build to the output directory of the model.
+
+        Args:
+            model (ModelGraph): The model.
+            key (str): Key of the build, from `get_key()`.
+
+        Returns:
+            dict: The cached report, or None if the build is not in the cache.
+        """
+        entry_dir = os.path.join(self.cache_dir, key)
+        report_file = os.path.join(entry_dir, 'report.json')
+        if not os.path.isfile(report_file):
+            self.misses += 1
+            return None
+
+        artifacts_dir = os.path.join(entry_dir, 'artifacts')
+        if os.path.isdir(artifacts_dir):
+            shutil.copytree(artifacts_dir, model.config.get_output_dir(), dirs_exist_ok=True)
+        with open(report_file) as f:
+            report = json.load(f)
+        os.utime(entry_dir)  # Mark as recently used
+        self.hits += 1
+        return report
+
+    def store(self, model, key, report):
+        """Store the artifacts of a build and its report in the cache.
+
+        Args:
+            model (ModelGraph): The built model.
+            key (str): Key of the build, from `get_key()`. Must be computed before the build.
+            report (dict): The parsed report of the build.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry_dir = os.path.join(self.cache_dir, key)
+        tmp_dir = os.path.join(self.cache_dir, f'.{key}-{uuid.uuid4().hex}')
+
+        output_dir = model.config.get_output_dir()
+        for rel_path in self._walk(output_dir):
+            if self._is_build_output(model, rel_path) and rel_path.endswith(self.artifact_suffixes):
+                os.makedirs(os.path.join(tmp_dir, 'artifacts', os.path.dirname(rel_path)), exist_ok=True)
+                shutil.copy2(os.path.join(output_dir, rel_path), os.path.join(tmp_dir, 'artifacts', rel_path))
+        os.makedirs(tmp_dir, exist_ok=True)
+        with open(os.path.join(tmp_dir, 'report.json'), 'w') as f:
+            json.dump(report, f, default=str)
+
+        # Concurrent builds of the same project may race to store it, the first one wins
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """Remove the least recently used builds until the cache is smaller than ``max_size``.
+
+        Args:
+            keep (str, optional): Key of a build that shouldn't be removed. Defaults to None.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        entries = []
+        for key in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, key)
+            if key.startswith('.') or not os.path.isdir(entry_dir):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry_dir, rel_path)) for rel_path in self._walk(entry_dir))
+            entries.append((os.path.getmtime(entry_dir), key, size))
+
+        total_size = sum(size for _, _, size in entries)
+        for _, key, size in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+            total_size -= size
+
+    def clear(self):
+        """Remove all builds from the cache."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def build(self, model, **kwargs):
+        """Build the model with its backend, or return the report of an identical earlier build.
+
+        Args:
+            model (ModelGraph): The written model.
+            kwargs: Arguments of the backend's `build()`.
+
+        Returns:
+            dict: The report of the build.
+        """
+        key = self.get_key(model, **kwargs)
+        report = self.load(model, key)
+        if report is not None:
+            print(f'Found build {key[:12]} in the cache ({self.cache_dir}), skipping the build.')
+            return report
+
+        report = model.config.backend.build(model, **kwargs)
+        if report:  # Only successful builds with a report can be reused
+            self.store(model, key, report)
+        return report
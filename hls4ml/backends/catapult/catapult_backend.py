@@ -1,10 +1,12 @@
 import os
+import shutil
 import sys
 from warnings import warn
 
 import numpy as np
 
 from hls4ml.backends import FPGABackend
+from hls4ml.backends.build import run_build_commands
 from hls4ml.backends.catapult.catapult_types import CatapultArrayVariableConverter
 from hls4ml.backends.fpga.fpga_types import ACTypeConverter, HLSTypeConverter
 from hls4ml.model.attributes import ChoiceAttribute, ConfigurableAttribute, TypeAttribute
@@ -163,6 +165,7 @@ class CatapultBackend(FPGABackend):
             + templates
             + writer_passes
             + fifo_depth_opt_passes
+            + ['catapult:fit_piecewise_activations']  # not yet supported
         ]
 
         if len(extras) > 0:
@@ -230,32 +233,72 @@ class CatapultBackend(FPGABackend):
         da=False,
         bup=False,
     ):
-        # print(f'ran_frame value: {ran_frame}')  # Add this line for debugging
+        commands = self.get_build_commands(
+            model,
+            reset=reset,
+            csim=csim,
+            synth=synth,
+            cosim=cosim,
+            validation=validation,
+            vhdl=vhdl,
+            verilog=verilog,
+            export=export,
+            vsynth=vsynth,
+            fifo_opt=fifo_opt,
+            bitfile=bitfile,
+            ran_frame=ran_frame,
+            sw_opt=sw_opt,
+            power=power,
+            da=da,
+            bup=bup,
+        )
+        for command in commands:
+            print(command)
+        # this execution runs the build_prj.tcl script in the hls4ml-generated "output_dir".
+        run_build_commands(commands, model.config.get_output_dir())
+
+        return self.get_build_report(model)
+
+    def get_build_commands(
+        self,
+        model,
+        reset=False,
+        csim=True,
+        synth=True,
+        cosim=False,
+        validation=False,
+        vhdl=False,
+        verilog=True,
+        export=False,
+        vsynth=False,
+        fifo_opt=False,
+        bitfile=False,
+        ran_frame=5,
+        sw_opt=False,
+        power=False,
+        da=False,
+        bup=False,
+    ):
         catapult_exe = 'catapult'
         if 'linux' in sys.platform:
-            cmd = 'command -v ' + catapult_exe + ' > /dev/null'
-            found = os.system(cmd)
-            if found != 0:
+            found = shutil.which(catapult_exe) is not None
+            if not found and os.getenv('MGC_HOME') is not None:
                 catapult_exe = os.getenv('MGC_HOME') + '/bin/catapult'
-                cmd = 'command -v ' + catapult_exe + ' > /dev/null'
-            found = os.system(cmd)
-            if found != 0:
+                found = shutil.which(catapult_exe) is not None
+            if not found and os.getenv('CATAPULT_HOME') is not None:
                 catapult_exe = os.getenv('CATAPULT_HOME') + '/bin/catapult'
-                cmd = 'command -v ' + catapult_exe + ' > /dev/null'
-            if found != 0:
+                found = shutil.which(catapult_exe) is not None
+            if not found:
                 raise Exception('Catapult HLS installation not found. Make sure "catapult" is on PATH.')
 
-        curr_dir = os.getcwd()
-        # this execution moves into the hls4ml-generated "output_dir" and runs the build_prj.tcl script.
-        os.chdir(model.config.get_output_dir())
         ccs_args = f'"reset={reset} csim={csim} synth={synth} cosim={cosim} validation={validation}'
         ccs_args += f' export={export} vsynth={vsynth} fifo_opt={fifo_opt} bitfile={bitfile} ran_frame={ran_frame}'
         ccs_args += f' sw_opt={sw_opt} power={power} da={da} vhdl={vhdl} verilog={verilog} bup={bup}"'
         ccs_invoke = catapult_exe + ' -product ultra -shell -f build_prj.tcl -eval \'set ::argv ' + ccs_args + '\''
-        print(ccs_invoke)
-        os.system(ccs_invoke)
-        os.chdir(curr_dir)
 
+        return [ccs_invoke]
+
+    def get_build_report(self, model):
         return parse_catapult_report(model.config.get_output_dir())
 
     def _validate_conv_strategy(self, layer):
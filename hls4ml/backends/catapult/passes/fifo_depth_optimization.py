@@ -1,19 +1,7 @@
 import json
 
-from pyDigitalWaveTools.vcd.parser import VcdParser
-
 from hls4ml.model.optimizer.optimizer import ConfigurableOptimizerPass, ModelOptimizerPass
-
-
-def populate_values(values, name, data, depth):
-    def get_values(x):
-        return int(x[1][1:], 2)
-
-    values.append({'name': name, 'data': [], 'max': 0, 'depth': 0})
-    values[-1]['data'] = [get_values(x) for x in data]
-    values[-1]['max'] = max(values[-1]['data'])
-    values[-1]['depth'] = int(depth[0][1][1:], 2)
-    return values
+from hls4ml.utils.vcd_utils import read_fifo_occupancy
 
 
 def set_big_fifos(vars_to_profile, profiling_fifo_depth):
@@ -26,17 +14,14 @@ def get_vcd_data(model):
     model.write()
     model.build(reset=False, csim=True, synth=True, cosim=True, validation=False, export=False, vsynth=False, fifo_opt=True)
 
-    with open(
+    vcd_path = (
         model.config.get_output_dir()
         + '/'
         + model.config.get_project_name()
         + '_prj'
         + '/solution1/sim/verilog/fifo_opt.vcd'
-    ) as vcd_file:
-        vcd = VcdParser()
-        vcd.parse(vcd_file)
-        data = vcd.scope.toJson()
-    return data
+    )
+    return read_fifo_occupancy(vcd_path)
 
 
 def generate_max_depth_file(model, maxs):
@@ -78,23 +63,16 @@ class FifoDepthOptimization(ConfigurableOptimizerPass, ModelOptimizerPass):
 
             set_big_fifos(vars_to_profile, profiling_fifo_depth)
 
-        data = get_vcd_data(model)
+        maxs = get_vcd_data(model)
 
-        if len(data['children']) == 0:
+        if len(maxs) == 0:
             print(
                 "FIFO depth optimization found no FIFOs implemented using BRAMs in the design, no optimization is possible."
             )
             print("Consider increasing profiling_fifo_depth.")
             return False
 
-        n_elem = len(data['children'][0]['children'][0]['children'])
-        for i in range(n_elem):
-            name = data['children'][0]['children'][0]['children'][i]['name']
-            data_p = data['children'][0]['children'][0]['children'][i]['children'][0]['data']
-            depth = data['children'][0]['children'][0]['children'][i]['children'][1]['data']
-            populate_values(self.values, name, data_p, depth)
-
-        maxs = [{'name': i['name'], 'max': i['max'], 'depth': i['depth']} for i in self.values]
+        self.values = maxs
 
         generate_max_depth_file(model, maxs)
 
@@ -3,6 +3,7 @@ import re
 import subprocess
 from bisect import bisect_left
 from collections.abc import Iterable
+from functools import lru_cache
 
 import numpy as np
 
@@ -137,6 +138,33 @@ class FPGABackend(Backend):
         )
         self.attribute_map[Softmax] = softmax_attrs
 
+    def _register_piecewise_activation_attributes(self):
+        """Adds the 'piecewise' implementation of the activations, for the backends that support it."""
+        act_attrs = self.attribute_map.get(Activation, [])
+        act_attrs.append(
+            ChoiceAttribute(
+                'implementation', ['lut', 'piecewise'], default='lut', description=descriptions.activation_implementation
+            )
+        )
+        act_attrs.append(ConfigurableAttribute('piecewise_degree', default=1, description=descriptions.piecewise_degree))
+        act_attrs.append(
+            ConfigurableAttribute(
+                'piecewise_max_error', value_type=float, default=2e-3, description=descriptions.piecewise_max_error
+            )
+        )
+        self.attribute_map[Activation] = act_attrs
+
+        # Softmax's own 'implementation' comes after the one of Activation, so it takes precedence
+        softmax_attrs = self.attribute_map[Softmax]
+        for i, attr in enumerate(softmax_attrs):
+            if attr.name == 'implementation':
+                softmax_attrs[i] = ChoiceAttribute(
+                    'implementation',
+                    attr.choices + ['piecewise'],
+                    default=attr.default,
+                    description=attr.description + ' ' + descriptions.softmax_implementation_piecewise,
+                )
+
     def create_layer_class(self, layer_class):
         new_attrubutes = []
         for cls, attributes in self.attribute_map.items():
@@ -193,6 +221,35 @@ class FPGABackend(Backend):
     def get_writer_flow(self):
         raise NotImplementedError
 
+    def get_build_commands(self, model, **kwargs):
+        """Returns the shell commands that build the project with the vendor tools.
+
+        The commands are run in sequence, from the output directory of the project. Backends implement this method to
+        allow builds to run as subprocesses, see `run_build_commands` and `BuildScheduler`.
+
+        Args:
+            model (ModelGraph): Model to build.
+            kwargs: Backend-specific build options, same as the arguments of `build()`.
+
+        Raises:
+            Exception: If the required vendor tools are not found.
+
+        Returns:
+            list: List of shell commands (str).
+        """
+        raise NotImplementedError
+
+    def get_build_report(self, model):
+        """Parse the report of the project built with `get_build_commands()`.
+
+        Args:
+            model (ModelGraph): The model that was built.
+
+        Returns:
+            dict: The parsed report, or None if the backend doesn't produce a report.
+        """
+        return None
+
     def get_layer_mult_size(self, layer):
         if 'Dense' in layer.class_name:
             n_in = layer.get_attr('n_in')
@@ -700,26 +757,7 @@ class FPGABackend(Backend):
 
     def _compute_conv1d_im2col(self, input_shape, kernel=3, stride=1, pad=(0, 0), dilation=1):
         W, C = input_shape
-        pad_l, pad_r = pad
-
-        out_w = (W + pad_l + pad_r - (dilation * (kernel - 1) + 1)) // stride + 1
-
-        input_img = np.arange(1, W * C + 1)
-        im_matrix = np.zeros((kernel * C * out_w,))
-
-        index = 0
-        for i_ow in range(out_w):
-            for i_kw in range(kernel):
-                for i_c in range(C):
-                    input_col = -pad_l + i_kw * dilation + i_ow * stride
-                    if input_col >= 0 and input_col < W:
-                        im_matrix[index] = input_img[input_col * C + i_c]
-                    else:
-                        im_matrix[index] = 0
-                    index += 1
-
-        im_matrix = im_matrix.reshape(out_w, -1)
-        return im_matrix
+        return _im2col_1d_matrix(W, C, kernel, stride, tuple(pad), dilation)
 
     def generate_conv1d_line_buffer_fn(self, layer_idx, n_partitions, in_W, in_C, kernel=3, stride=1, pad=0, dilation=1):
         """Generate a C++ function that mimics the im2col algorithm. This function works for 1D convolution.
@@ -727,7 +765,8 @@ class FPGABackend(Backend):
         The HLS compiler produces suboptimal designs for a im2col algorithm implementation, so a trick we use is
         to generate a resulting a result of im2col transformation explicitly, instead of relying on loops. Since
         the result depends on the parameters of the convolution layer (the input size, the kernel size, stride etc),
-        we need to do this for every convolution layer.
+        we need to do this for every convolution layer. The body of the function is cached, so layers with identical
+        parameters reuse the generated code.
 
         Args:
             layer_idx (int): Index of layer ('index' attribute).
@@ -751,7 +790,9 @@ class FPGABackend(Backend):
             pad_left = pad
             pad_right = pad
 
-        im2col_matrix = self._compute_conv1d_im2col((in_W, in_C), kernel, stride, (pad_left, pad_right), dilation)
+        fill_code = _line_buffer_fill_code(
+            '1d', n_partitions, (in_W, in_C), (kernel,), (stride,), (pad_left, pad_right), (dilation,)
+        )
 
         generated_code = (
             "template<class data_T, typename CONFIG_T>\n"
@@ -763,58 +804,12 @@ class FPGABackend(Backend):
             "        const unsigned partition\n"
             "    ) {{\n"
         ).format(index=layer_idx)
-        indent = '    '
-
-        for partition_idx, partition in enumerate(np.split(im2col_matrix, n_partitions)):
-            generated_code += indent * 2 + f'if (partition == {partition_idx:>3}) {{\n'
-            for pixel_idx, arr in enumerate(partition):
-                buffer_stmts = []
-                for j, v in enumerate(arr):
-                    if v == 0:
-                        val = '0'
-                    else:
-                        val = f'data[{int(v - 1)}]'
-                    buffer_stmts.append(f'buffer[{pixel_idx}][{j}] = {val:>10};')
-                generated_code += indent * 3 + ' '.join(buffer_stmts) + '\n'
-            generated_code += '\n' + indent * 2 + '}\n'
-
-        generated_code += indent + '}\n'
-        generated_code += '};\n'
-
-        return generated_code
+
+        return generated_code + fill_code
 
     def _compute_conv2d_im2col(self, input_shape, kernel=(3, 3), stride=(1, 1), pad=(0, 0, 0, 0), dilation=(1, 1)):
         H, W, C = input_shape
-        kernel_h, kernel_w = kernel
-        stride_h, stride_w = stride
-        pad_t, pad_b, pad_l, pad_r = pad
-        dilation_h, dilation_w = dilation
-
-        out_h = (H + pad_t + pad_b - (dilation_h * (kernel_h - 1) + 1)) // stride_h + 1
-        out_w = (W + pad_l + pad_r - (dilation_w * (kernel_w - 1) + 1)) // stride_w + 1
-
-        input_img = np.arange(1, H * W * C + 1)
-        im_matrix = np.zeros((kernel_h * kernel_w * C * out_h * out_w,))
-
-        index = 0
-        for i_oh in range(out_h):
-            for i_ow in range(out_w):
-                for i_kh in range(kernel_h):
-                    input_row = -pad_t + i_kh * dilation_h + i_oh * stride_h
-                    for i_kw in range(kernel_w):
-                        for i_c in range(C):
-                            if input_row < 0 or input_row >= H:
-                                im_matrix[index] = 0
-                            else:
-                                input_col = -pad_l + i_kw * dilation_w + i_ow * stride_w
-                                if input_col >= 0 and input_col < W:
-                                    im_matrix[index] = input_img[input_row * W * C + input_col * C + i_c]
-                                else:
-                                    im_matrix[index] = 0
-                            index += 1
-
-        im_matrix = im_matrix.reshape(out_h * out_w, -1)
-        return im_matrix
+        return _im2col_2d_matrix(H, W, C, tuple(kernel), tuple(stride), tuple(pad), tuple(dilation))
 
     def generate_conv2d_line_buffer_fn(
         self, layer_idx, n_partitions, in_H, in_W, in_C, kernel=(3, 3), stride=(1, 1), pad=(0, 0, 0, 0), dilation=(1, 1)
@@ -824,7 +819,8 @@ class FPGABackend(Backend):
         The HLS compiler produces suboptimal designs for a im2col algorithm implementation, so a trick we use is
         to generate a resulting a result of im2col transformation explicitly, instead of relying on loops. Since
         the result depends on the parameters of the convolution layer (the input size, the kernel size, stride etc),
-        we need to do this for every convolution layer.
+        we need to do this for every convolution layer. The body of the function is cached, so layers with identical
+        parameters reuse the generated code.
 
         Args:
             layer_idx (int): Index of layer ('index' attribute).
@@ -875,7 +871,9 @@ class FPGABackend(Backend):
             dilation_height = dilation
             dilation_width = dilation
 
-        im2col_matrix = self._compute_conv2d_im2col(
+        fill_code = _line_buffer_fill_code(
+            '2d',
+            n_partitions,
             (in_H, in_W, in_C),
             (kernel_height, kernel_width),
             (stride_height, stride_width),
@@ -893,27 +891,94 @@ class FPGABackend(Backend):
             "        const unsigned partition\n"
             "    ) {{\n"
         ).format(index=layer_idx)
-        indent = '    '
-
-        for partition_idx, partition in enumerate(np.split(im2col_matrix, n_partitions)):
-            generated_code += indent * 2 + f'if (partition == {partition_idx:>3}) {{\n'
-            for pixel_idx, arr in enumerate(partition):
-                buffer_stmts = []
-                for j, v in enumerate(arr):
-                    if v == 0:
-                        val = '0'
-                    else:
-                        val = f'data[{int(v - 1)}]'
-                    buffer_stmts.append(f'buffer[{pixel_idx}][{j}] = {val:>10};')
-                generated_code += indent * 3 + ' '.join(buffer_stmts) + '\n'
-            generated_code += '\n' + indent * 2 + '}\n'
-
-        generated_code += indent + '}\n'
-        generated_code += '};\n'
-
-        return generated_code
+
+        return generated_code + fill_code
 
     @model_optimizer()
     def write_hls(self, model):
         self.writer.write_hls(model)
         return True
+
+
+def _im2col_window_positions(in_size, out_size, kernel, stride, pad_before, dilation):
+    """Returns an (out_size, kernel) array of input positions covered by each output pixel, and its validity mask."""
+    positions = -pad_before + np.arange(out_size)[:, None] * stride + np.arange(kernel)[None, :] * dilation
+    valid = (positions >= 0) & (positions < in_size)
+    return positions, valid
+
+
+@lru_cache(maxsize=64)
+def _im2col_1d_matrix(W, C, kernel, stride, pad, dilation):
+    pad_l, pad_r = pad
+    out_w = (W + pad_l + pad_r - (dilation * (kernel - 1) + 1)) // stride + 1
+
+    cols, valid = _im2col_window_positions(W, out_w, kernel, stride, pad_l, dilation)
+
+    # Indices into the input are 1-based, 0 marks a padded (zero) element
+    im_matrix = cols[:, :, None] * C + np.arange(1, C + 1)[None, None, :]
+    im_matrix = np.where(valid[:, :, None], im_matrix, 0)
+
+    im_matrix = im_matrix.reshape(out_w, -1)
+    im_matrix.flags.writeable = False
+    return im_matrix
+
+
+@lru_cache(maxsize=64)
+def _im2col_2d_matrix(H, W, C, kernel, stride, pad, dilation):
+    kernel_h, kernel_w = kernel
+    stride_h, stride_w = stride
+    pad_t, pad_b, pad_l, pad_r = pad
+    dilation_h, dilation_w = dilation
+
+    out_h = (H + pad_t + pad_b - (dilation_h * (kernel_h - 1) + 1)) // stride_h + 1
+    out_w = (W + pad_l + pad_r - (dilation_w * (kernel_w - 1) + 1)) // stride_w + 1
+
+    rows, valid_rows = _im2col_window_positions(H, out_h, kernel_h, stride_h, pad_t, dilation_h)
+    cols, valid_cols = _im2col_window_positions(W, out_w, kernel_w, stride_w, pad_l, dilation_w)
+
+    # Broadcast to (out_h, out_w, kernel_h, kernel_w, C)
+    rows = rows[:, None, :, None, None]
+    cols = cols[None, :, None, :, None]
+    valid = valid_rows[:, None, :, None, None] & valid_cols[None, :, None, :, None]
+    chans = np.arange(1, C + 1)[None, None, None, None, :]
+
+    # Indices into the input are 1-based, 0 marks a padded (zero) element
+    im_matrix = np.where(valid, rows * W * C + cols * C + chans, 0)
+
+    im_matrix = im_matrix.reshape(out_h * out_w, -1)
+    im_matrix.flags.writeable = False
+    return im_matrix
+
+
+@lru_cache(maxsize=64)
+def _line_buffer_fill_code(dim, n_partitions, input_shape, kernel, stride, pad, dilation):
+    """Generates the body of the ``fill_buffer`` function, without the (layer-specific) class header."""
+    if dim == '1d':
+        im2col_matrix = _im2col_1d_matrix(*input_shape, *kernel, *stride, pad, *dilation)
+    else:
+        im2col_matrix = _im2col_2d_matrix(*input_shape, kernel, stride, pad, dilation)
+
+    indent = '    '
+    partitions = np.split(im2col_matrix, n_partitions)
+    n_pixels, n_elem = partitions[0].shape
+
+    # Right-hand side of every assignment, indexed by the 1-based input index (0 being a padded zero)
+    rhs = np.array(
+        ['{:>10};'.format('0')] + ['{:>10};'.format(f'data[{i}]') for i in range(int(im2col_matrix.max(initial=0)))]
+    )
+    # Left-hand sides are the same for every partition
+    pixel_str = np.array([f'buffer[{i}][' for i in range(n_pixels)])
+    elem_str = np.array([f'{j}] = ' for j in range(n_elem)])
+    lhs = np.char.add(pixel_str[:, None], elem_str[None, :])
+
+    code = []
+    for partition_idx, partition in enumerate(partitions):
+        code.append(indent * 2 + f'if (partition == {partition_idx:>3}) {{\n')
+        stmts = np.char.add(lhs, rhs[partition])
+        code.extend(indent * 3 + ' '.join(row) + '\n' for row in stmts.tolist())
+        code.append('\n' + indent * 2 + '}\n')
+
+    code.append(indent + '}\n')
+    code.append('};\n')
+
+    return ''.join(code)
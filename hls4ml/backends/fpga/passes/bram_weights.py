@@ -11,6 +11,9 @@ class RegisterBramWeights(OptimizerPass):
     def transform(self, model, node):
         bramport_size = model.config.get_bram_size(node)
         for w_name, w_var in node.weights.items():
+            # Generated lookup tables are constants of the design (and can be shared between layers), not IP ports
+            if getattr(w_var, 'table_key', None) is not None:
+                continue
             if ('storage' in w_var.__dict__ and w_var.storage != 'bram') and np.prod(w_var.shape) > bramport_size:
                 new_weight = BramWeightVariableConverter.convert(w_var)
                 node.set_attr(w_name, new_weight)
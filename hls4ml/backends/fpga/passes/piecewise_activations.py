@@ -0,0 +1,210 @@
+import numpy as np
+
+from hls4ml.model.layers import Activation, Softmax
+from hls4ml.model.optimizer import OptimizerPass
+from hls4ml.model.types import FixedPrecisionType, quantize_fixed
+
+# The functions and the input range over which they are fitted. Inputs outside the range are clamped to it, like the
+# indices of the lookup tables.
+piecewise_functions = {
+    'sigmoid': (-8, 8, lambda x: 1 / (1 + np.exp(-x))),
+    'tanh': (-4, 4, np.tanh),
+    'dense_tanh': (-4, 4, np.tanh),  # Quartus
+    'softplus': (-8, 8, lambda x: np.log(np.exp(x) + 1)),
+    'softsign': (-8, 8, lambda x: x / (np.abs(x) + 1)),
+}
+
+# Above this, the fit is checked on an evenly spaced subset of the representable values of the range
+_max_grid_size = 2**16
+
+
+def _round_to_grid(data, precision):
+    scale = 2.0**precision.fractional
+    return quantize_fixed(np.round(np.asarray(data, dtype=np.float64) * scale) / scale, precision)
+
+
+def _horner(dx, coefs, precision):
+    # The coefficients are in increasing order of power, the result is quantized after each step like in the HLS code
+    y = coefs[..., -1]
+    for k in range(coefs.shape[-1] - 2, -1, -1):
+        y = quantize_fixed(y * dx + coefs[..., k], precision)
+    return y
+
+
+def piecewise_value(x, breakpoints, coefs, precision):
+    """Bit-accurate emulation of ``nnet::piecewise_value``, the evaluation of a piecewise polynomial approximation.
+
+    The input is clamped to ``[breakpoints[0], breakpoints[-1]]`` and converted to the type of the approximation. The
+    polynomial of the segment is then evaluated in the local coordinate ``x - breakpoints[segment]`` with Horner's
+    method, quantizing each intermediate result to the type of the approximation.
+
+    Args:
+        x (ndarray): The input values.
+        breakpoints (ndarray): The start of each segment, followed by the end of the last one.
+        coefs (ndarray): The coefficients of each segment, in increasing order of power, of shape
+            ``(n_segments, degree + 1)``.
+        precision (FixedPrecisionType): The precision of the breakpoints, coefficients and result.
+
+    Returns:
+        ndarray: The approximated function values.
+    """
+    breakpoints = np.asarray(breakpoints, dtype=np.float64)
+    coefs = np.asarray(coefs, dtype=np.float64).reshape(len(breakpoints) - 1, -1)
+    x = quantize_fixed(np.clip(x, breakpoints[0], breakpoints[-1]), precision)
+    segment = np.searchsorted(breakpoints[1:-1], x, side='right')
+    dx = quantize_fixed(x - breakpoints[segment], precision)
+    return _horner(dx, coefs[segment], precision)
+
+
+def fit_piecewise(function, x_min, x_max, precision, degree=1, max_error=2e-3):
+    """Fit a piecewise polynomial approximation of a function with the fewest segments within the maximum error.
+
+    The segments are found greedily from ``x_min``: each one is extended as far as the least-squares fit of its
+    polynomial, with the coefficients quantized to ``precision``, stays within ``max_error`` of the function on all the
+    values of the range representable in ``precision``. Segments that can't reach the error because of the precision
+    are one value wide.
+
+    Args:
+        function (callable): Vectorized function to approximate.
+        x_min (float): Start of the range.
+        x_max (float): End of the range.
+        precision (FixedPrecisionType): The precision of the breakpoints, coefficients and result.
+        degree (int, optional): The degree of the polynomials. Defaults to 1 (piecewise-linear).
+        max_error (float, optional): The maximum absolute error of the approximation. Defaults to 2e-3.
+
+    Returns:
+        tuple: The breakpoints (start of each segment followed by the end of the last one) and the coefficients, of
+        shape ``(n_segments, degree + 1)``, of the approximation.
+    """
+    step = 2.0**-precision.fractional
+    x_min = _round_to_grid(x_min, precision)
+    x_max = _round_to_grid(x_max, precision)
+    n_steps = int(round((x_max - x_min) / step))
+    stride = max(1, int(np.ceil(n_steps / _max_grid_size)))
+    x = x_min + step * np.arange(0, n_steps + 1, stride)
+    if x[-1] != x_max:
+        x = np.append(x, x_max)
+    y = function(x)
+
+    def fit(start, length):
+        dx = x[start : start + length] - x[start]
+        deg = min(degree, length - 1)
+        coefs = np.zeros(degree + 1)
+        coefs[: deg + 1] = np.polynomial.polynomial.polyfit(dx, y[start : start + length], deg)
+        coefs = _round_to_grid(coefs, precision)
+        # Center the error of the quantized polynomial (e.g., the bias of truncation) with the constant term
+        residual = _horner(dx, coefs, precision) - y[start : start + length]
+        coefs[0] = _round_to_grid(coefs[0] - (residual.max() + residual.min()) / 2, precision)
+        error = np.max(np.abs(_horner(dx, coefs, precision) - y[start : start + length]))
+        return coefs, error <= max_error
+
+    breakpoints = []
+    all_coefs = []
+    start = 0
+    while start < len(x):
+        # Grow the segment exponentially, then bisect between the longest fitting length and the shortest failing one
+        remaining = len(x) - start
+        good_length, good_coefs = 1, fit(start, 1)[0]
+        bad_length = remaining + 1
+        while good_length < remaining:
+            length = min(2 * good_length, remaining)
+            coefs, ok = fit(start, length)
+            if not ok:
+                bad_length = length
+                break
+            good_length, good_coefs = length, coefs
+        while bad_length - good_length > 1:
+            length = (good_length + bad_length) // 2
+            coefs, ok = fit(start, length)
+            if ok:
+                good_length, good_coefs = length, coefs
+            else:
+                bad_length = length
+
+        breakpoints.append(x[start])
+        all_coefs.append(good_coefs)
+        start += good_length
+
+    breakpoints.append(x[-1])
+    return np.array(breakpoints), np.array(all_coefs)
+
+
+def _is_supported(precision):
+    return isinstance(precision, FixedPrecisionType) and precision.saturation_bits == 0
+
+
+def _max_value(precision):
+    return (2.0 ** (precision.width - 1 if precision.signed else precision.width) - 1) / 2.0**precision.fractional
+
+
+class FitPiecewiseActivations(OptimizerPass):
+    """Fits the piecewise polynomial approximations of the activations with the 'piecewise' implementation.
+
+    The breakpoints and coefficients are stored as weights of the layer, in the table type of the activation. The
+    softmax gets two approximations, of ``exp(x)`` over the differences to the maximum and of ``1/x`` over the sum of the
+    exponentials.
+    """
+
+    def match(self, node):
+        if node.get_attr('implementation') != 'piecewise':
+            return False
+        if isinstance(node, Softmax):
+            return 'exp_breakpoints' not in node.weights
+        if isinstance(node, Activation):
+            return 'breakpoints' not in node.weights
+        return False
+
+    def transform(self, model, node):
+        degree = int(node.get_attr('piecewise_degree', 1))
+        max_error = float(node.get_attr('piecewise_max_error', 2e-3))
+
+        if isinstance(node, Softmax):
+            exp_table_t = node.get_attr('exp_table_t')
+            inv_table_t = node.get_attr('inv_table_t')
+            for table_t in (exp_table_t, inv_table_t):
+                if not _is_supported(table_t.precision):
+                    raise Exception(
+                        f'Piecewise softmax in layer {node.name} requires fixed-point table types, got {table_t.precision}'
+                    )
+
+            # Below exp(x_min) the exponentials round to zero in exp_table_t
+            exp_x_min = -np.ceil((exp_table_t.precision.fractional + 1) * np.log(2))
+            exp_breakpoints, exp_coefs = fit_piecewise(np.exp, exp_x_min, 0, exp_table_t.precision, degree, max_error)
+
+            # The sum of the exponentials is between 1 (the maximum) and n_in
+            inv_x_max = min(node.get_attr('n_in'), _max_value(exp_table_t.precision), _max_value(inv_table_t.precision))
+            inv_breakpoints, inv_coefs = fit_piecewise(
+                lambda x: 1 / x, 1, inv_x_max, inv_table_t.precision, degree, max_error
+            )
+
+            self._add_approximation(node, 'exp_', exp_table_t, exp_breakpoints, exp_coefs)
+            self._add_approximation(node, 'inv_', inv_table_t, inv_breakpoints, inv_coefs)
+        else:
+            activation = node.get_attr('activation').lower()
+            if activation not in piecewise_functions:
+                raise Exception(f'Piecewise implementation is not supported for activation {activation} ({node.name})')
+            table_t = node.get_attr('table_t')
+            if not _is_supported(table_t.precision):
+                raise Exception(
+                    f'Piecewise activation in layer {node.name} requires a fixed-point table type, got {table_t.precision}'
+                )
+
+            x_min, x_max, function = piecewise_functions[activation]
+            breakpoints, coefs = fit_piecewise(function, x_min, x_max, table_t.precision, degree, max_error)
+            self._add_approximation(node, '', table_t, breakpoints, coefs)
+
+        return False
+
+    @staticmethod
+    def _add_approximation(node, prefix, table_t, breakpoints, coefs):
+        node.set_attr(prefix + 'n_segments', len(breakpoints) - 1)
+        # The arrays are named like the lookup tables, e.g., sigmoid_breakpoints4 or exp_breakpoints7 for the softmax
+        var_prefix = prefix if prefix else node.get_attr('activation').lower() + '_'
+        for name, data in ((prefix + 'breakpoints', breakpoints), (prefix + 'coefs', coefs)):
+            node.add_weights_variable(
+                name=name,
+                var_name=var_prefix + name[len(prefix) :] + '{index}',
+                type_name=table_t.name,
+                precision=table_t.precision,
+                data=data,
+            )
@@ -1,3 +1,4 @@
+import shutil
 import subprocess
 from pathlib import Path
 from warnings import warn
@@ -5,6 +6,7 @@ from warnings import warn
 import numpy as np
 
 from hls4ml.backends import FPGABackend
+from hls4ml.backends.build import run_build_commands
 from hls4ml.model.attributes import ConfigurableAttribute, TypeAttribute
 from hls4ml.model.flow import register_flow
 from hls4ml.model.layers import GRU, LSTM, Activation, Conv1D, Conv2D, Dense, Embedding, Layer, SimpleRNN, Softmax
@@ -103,7 +105,7 @@ class OneAPIBackend(FPGABackend):
             + optimization_passes
             + writer_passes
             + ['oneapi:inplace_stream_flatten', 'oneapi:reshape_stream']  # not needed
-            + ['oneapi:process_fixed_point_quantizer_layer']  # not yet supported
+            + ['oneapi:process_fixed_point_quantizer_layer', 'oneapi:fit_piecewise_activations']  # not yet supported
         ]
 
         if len(extras) > 0:
@@ -175,20 +177,20 @@ class OneAPIBackend(FPGABackend):
         Errors raise exceptions
         """
 
+        commands = self.get_build_commands(model, build_type=build_type, run=run)
+        run_build_commands(commands, model.config.get_output_dir(), check=True)
+
+    def get_build_commands(self, model, build_type='fpga_emu', run=False):
         # Check software needed is present
-        outdir = Path(Path.cwd(), model.config.get_output_dir())
-        builddir = outdir / 'build'
-        builddir.mkdir(exist_ok=True)
-        try:
-            subprocess.run('which icpx', shell=True, cwd=builddir, check=True)
-        except subprocess.CalledProcessError:
+        if shutil.which('icpx') is None:
             raise RuntimeError('Could not find icpx. Please configure oneAPI appropriately')
-        subprocess.run('cmake ..', shell=True, cwd=builddir, check=True)
-        subprocess.run(f'make {build_type}', shell=True, cwd=builddir, check=True)
+
+        commands = ['mkdir -p build', 'cd build && cmake ..', f'cd build && make {build_type}']
 
         if run and build_type in ('fpga_emu', 'fpga_sim', 'fpga'):
-            executable = builddir / f'{model.config.get_project_name()}.{build_type}'
-            subprocess.run(f'{str(executable)}', shell=True, cwd=builddir, check=True)
+            commands.append(f'cd build && ./{model.config.get_project_name()}.{build_type}')
+
+        return commands
 
     @layer_optimizer(Layer)
     def init_base_layer(self, layer):
@@ -154,10 +154,38 @@ softmax_config_template = """struct {type}_config{index} : nnet::activ_config {{
     typedef {inv_table_t.name} inv_table_t;
 }};\n"""
 
+piecewise_activ_config_template = """struct {type}_config{index} : nnet::activ_config {{
+    static const unsigned n_in = {n_in};
+    static const unsigned n_segments = {n_segments};
+    static const unsigned degree = {piecewise_degree};
+    static const unsigned io_type = nnet::{iotype};
+    static const unsigned reuse_factor = {reuse};
+    typedef {table_t.name} table_t;
+}};\n"""
+
+piecewise_softmax_config_template = """struct {type}_config{index} : nnet::activ_config {{
+    static const unsigned n_in = {n_in};
+    static const unsigned exp_n_segments = {exp_n_segments};
+    static const unsigned inv_n_segments = {inv_n_segments};
+    static const unsigned degree = {piecewise_degree};
+    static const unsigned io_type = nnet::{iotype};
+    static const unsigned reuse_factor = {reuse};
+    static const nnet::softmax_implementation implementation = nnet::softmax_implementation::{implementation};
+    typedef {exp_table_t.name} exp_table_t;
+    typedef {inv_table_t.name} inv_table_t;
+}};\n"""
+
 activ_function_template = 'nnet::{activation}<{input_t}, {output_t}, {config}>({input}, {output});'
 param_activ_function_template = (
     'nnet::{activation}<{input_t}, {param_t.name}, {output_t}, {config}>({input}, {param}, {output});'
 )
+piecewise_activ_function_template = (
+    'nnet::piecewise<{input_t}, {output_t}, {config}>({input}, {output}, {breakpoints}, {coefs});'
+)
+piecewise_softmax_function_template = (
+    'nnet::softmax_piecewise<{input_t}, {output_t}, {config}>'
+    '({input}, {output}, {exp_breakpoints}, {exp_coefs}, {inv_breakpoints}, {inv_coefs});'
+)
 
 activ_include_list = ['nnet_utils/nnet_activation.h', 'nnet_utils/nnet_activation_stream.h']
 
@@ -171,6 +199,9 @@ class ActivationConfigTemplate(LayerConfigTemplate):
         params = self._default_config_params(node)
         params['type'] = node.get_attr('activation')
 
+        if node.get_attr('implementation') == 'piecewise':
+            return piecewise_activ_config_template.format(**params)
+
         return self.template.format(**params)
 
 
@@ -203,6 +234,15 @@ class SoftmaxConfigTemplate(ActivationConfigTemplate):
         super(ActivationConfigTemplate, self).__init__(Softmax)  # Skip ActivationConfigTemplate's __init__
         self.template = softmax_config_template
 
+    def format(self, node):
+        params = self._default_config_params(node)
+        params['type'] = node.get_attr('activation')
+
+        if node.get_attr('implementation') == 'piecewise':
+            return piecewise_softmax_config_template.format(**params)
+
+        return self.template.format(**params)
+
 
 class ActivationFunctionTemplate(FunctionCallTemplate):
     def __init__(self):
@@ -214,6 +254,16 @@ class ActivationFunctionTemplate(FunctionCallTemplate):
         params['activation'] = node.get_attr('activation').lower()
         params['config'] = '{}_config{}'.format(node.get_attr('activation'), node.index)
 
+        # The approximations fitted by the fit_piecewise_activations pass
+        if 'exp_breakpoints' in node.weights:
+            for name in ('exp_breakpoints', 'exp_coefs', 'inv_breakpoints', 'inv_coefs'):
+                params[name] = node.get_weights(name).name
+            return piecewise_softmax_function_template.format(**params)
+        if 'breakpoints' in node.weights:
+            params['breakpoints'] = node.get_weights('breakpoints').name
+            params['coefs'] = node.get_weights('coefs').name
+            return piecewise_activ_function_template.format(**params)
+
         return self.template.format(**params)
 
 
@@ -1,10 +1,10 @@
-import os
-from contextlib import contextmanager
+import shutil
 from warnings import warn
 
 import numpy as np
 
 from hls4ml.backends import FPGABackend
+from hls4ml.backends.build import run_build_commands
 from hls4ml.model.attributes import ConfigurableAttribute, TypeAttribute
 from hls4ml.model.flow import register_flow
 from hls4ml.model.layers import GRU, LSTM, Activation, Conv1D, Conv2D, Dense, Embedding, Layer, SimpleRNN, Softmax
@@ -14,16 +14,6 @@ from hls4ml.report import parse_quartus_report
 from hls4ml.utils import attribute_descriptions as descriptions
 
 
-@contextmanager
-def chdir(newdir):
-    prevdir = os.getcwd()
-    os.chdir(os.path.expanduser(newdir))
-    try:
-        yield
-    finally:
-        os.chdir(prevdir)
-
-
 class QuartusBackend(FPGABackend):
     def __init__(self):
         super().__init__('Quartus')
@@ -45,6 +35,8 @@ class QuartusBackend(FPGABackend):
             attrs.append(TypeAttribute('table', default=FixedPrecisionType(18, 8), description=descriptions.table_type))
             self.attribute_map[layer] = attrs
 
+        self._register_piecewise_activation_attributes()
+
     def _register_flows(self):
         initializers = self._get_layer_initializers()
         init_flow = register_flow('init_layers', initializers, requires=['optimize'], backend=self.name)
@@ -58,6 +50,7 @@ class QuartusBackend(FPGABackend):
         streaming_flow = register_flow('streaming', streaming_passes, requires=[init_flow], backend=self.name)
 
         quartus_types = [
+            'quartus:fit_piecewise_activations',
             'quartus:transform_types',
             'quartus:register_bram_weights',
             'quartus:apply_resource_strategy',
@@ -155,32 +148,41 @@ class QuartusBackend(FPGABackend):
         Errors raise exceptions
         """
 
+        commands = self.get_build_commands(
+            model, synth=synth, fpgasynth=fpgasynth, log_level=log_level, cont_if_large_area=cont_if_large_area
+        )
+        run_build_commands(commands, model.config.get_output_dir())
+
+        return self.get_build_report(model)
+
+    def get_build_commands(self, model, synth=True, fpgasynth=False, log_level=1, cont_if_large_area=False):
         # Check software needed is present
-        found = os.system('command -v i++ > /dev/null')
-        if found != 0:
+        if shutil.which('i++') is None:
             raise Exception('Intel HLS installation not found. Make sure "i++" is on PATH.')
 
         if fpgasynth:
             if fpgasynth and not synth:
                 raise Exception('HLS Synthesis needs to be run before FPGA synthesis')
-            found = os.system('command -v quartus_sh > /dev/null')
-            if found != 0:
+            if shutil.which('quartus_sh') is None:
                 raise Exception('Quartus installation not found. Make sure "quartus_sh" is on PATH.')
 
-        with chdir(model.config.get_output_dir()):
-            if synth:
-                quartus_compile = 'QUARTUS_COMPILE=--quartus-compile' if fpgasynth else ''
-                cont_synth = 'CONT_IF_LARGE_AREA=--dont-error-if-large-area-est' if cont_if_large_area else ''
-                log_1 = 'LOGGING_1=-v ' if log_level >= 1 else ''
-                log_2 = 'LOGGING_2=-v ' if log_level >= 2 else ''
-                os.system(f'make {model.config.get_project_name()}-fpga {log_1} {log_2} {cont_synth} {quartus_compile}')
+        commands = []
+        if synth:
+            quartus_compile = 'QUARTUS_COMPILE=--quartus-compile' if fpgasynth else ''
+            cont_synth = 'CONT_IF_LARGE_AREA=--dont-error-if-large-area-est' if cont_if_large_area else ''
+            log_1 = 'LOGGING_1=-v ' if log_level >= 1 else ''
+            log_2 = 'LOGGING_2=-v ' if log_level >= 2 else ''
+            commands.append(f'make {model.config.get_project_name()}-fpga {log_1} {log_2} {cont_synth} {quartus_compile}')
+
+            # If running i++ through a container, such a singularity, this command will throw an exception, because the
+            # host OS doesn't have access to HLS simulation tools. To avoid the exception, shell into the container
+            # (e.g. singularity shell ....) and then execute the following command manually
+            # This command simply tests the IP using a simulation tool and obtains the latency and initiation interval
+            commands.append(f'./{model.config.get_project_name()}-fpga')
 
-                # If running i++ through a container, such a singularity, this command will throw an exception, because the
-                # host OS doesn't have access to HLS simulation tools. To avoid the exception, shell into the container
-                # (e.g. singularity shell ....) and then execute the following command manually
-                # This command simply tests the IP using a simulation tool and obtains the latency and initiation interval
-                os.system(f'./{model.config.get_project_name()}-fpga')
+        return commands
 
+    def get_build_report(self, model):
         return parse_quartus_report(model.config.get_output_dir())
 
     @layer_optimizer(Layer)
@@ -1,9 +1,9 @@
-import os
+import shutil
 import sys
 
 from hls4ml.backends import VivadoBackend
+from hls4ml.backends.build import run_build_commands
 from hls4ml.model.flow import get_flow, register_flow
-from hls4ml.report import parse_vivado_report
 
 
 class VitisBackend(VivadoBackend):
@@ -43,6 +43,7 @@ class VitisBackend(VivadoBackend):
         namespace=None,
         write_weights_txt=True,
         write_tar=False,
+        fast_csim=False,
         **_,
     ):
         """Create initial configuration of the Vitis backend.
@@ -57,6 +58,9 @@ class VitisBackend(VivadoBackend):
             write_weights_txt (bool, optional): If True, writes weights to .txt files which speeds up compilation.
                 Defaults to True.
             write_tar (bool, optional): If True, compresses the output directory into a .tar.gz file. Defaults to False.
+            fast_csim (bool, optional): If True, the library built by ``compile()`` uses fast, bit-exact replacements
+                of the ap_fixed types of up to 64 bits, which makes ``predict()`` faster. The HLS project is not
+                affected. Defaults to False.
 
         Returns:
             dict: initial configuration.
@@ -72,24 +76,29 @@ class VitisBackend(VivadoBackend):
             'Namespace': namespace,
             'WriteWeightsTxt': write_weights_txt,
             'WriteTar': write_tar,
+            'FastCSim': fast_csim,
         }
 
         return config
 
     def build(self, model, reset=False, csim=True, synth=True, cosim=False, validation=False, export=False, vsynth=False):
+        commands = self.get_build_commands(
+            model, reset=reset, csim=csim, synth=synth, cosim=cosim, validation=validation, export=export, vsynth=vsynth
+        )
+        run_build_commands(commands, model.config.get_output_dir())
+
+        return self.get_build_report(model)
+
+    def get_build_commands(
+        self, model, reset=False, csim=True, synth=True, cosim=False, validation=False, export=False, vsynth=False
+    ):
         if 'linux' in sys.platform:
-            found = os.system('command -v vitis_hls > /dev/null')
-            if found != 0:
+            if shutil.which('vitis_hls') is None:
                 raise Exception('Vitis HLS installation not found. Make sure "vitis_hls" is on PATH.')
 
-        curr_dir = os.getcwd()
-        os.chdir(model.config.get_output_dir())
-        os.system(
-            (
-                'vitis_hls -f build_prj.tcl "reset={reset} csim={csim} synth={synth} cosim={cosim} '
-                'validation={validation} export={export} vsynth={vsynth}"'
-            ).format(reset=reset, csim=csim, synth=synth, cosim=cosim, validation=validation, export=export, vsynth=vsynth)
-        )
-        os.chdir(curr_dir)
+        vitis_cmd = (
+            'vitis_hls -f build_prj.tcl "reset={reset} csim={csim} synth={synth} cosim={cosim} '
+            'validation={validation} export={export} vsynth={vsynth}"'
+        ).format(reset=reset, csim=csim, synth=synth, cosim=cosim, validation=validation, export=export, vsynth=vsynth)
 
-        return parse_vivado_report(model.config.get_output_dir())
+        return [vitis_cmd]
@@ -0,0 +1,128 @@
+import numpy as np
+
+from hls4ml.model.layers import Activation, Softmax
+from hls4ml.model.optimizer import OptimizerPass
+from hls4ml.model.types import FixedPrecisionType, quantize_fixed
+
+_selu_alpha = 1.6732632423543772848170429916717
+_selu_scale = 1.0507009873554804934193349852946
+
+
+def _centered_inputs(x_range):
+    # Table of x in [-x_range / 2, x_range / 2), indexed by ``x * table_size / x_range + table_size / 2``
+    return lambda table_size: x_range * (np.arange(table_size) - table_size / 2) / table_size
+
+
+def _negative_inputs(table_size):
+    # Table of x in (-8, 0], indexed by ``x * table_size / -8``
+    return -8.0 * np.arange(table_size) / table_size
+
+
+# The input values and the function of the lookup tables, following the indexing of nnet_activation(_stream).h
+activation_tables = {
+    'sigmoid': (_centered_inputs(16), lambda x: 1 / (1 + np.exp(-x))),
+    'tanh': (_centered_inputs(8), np.tanh),
+    'softplus': (_centered_inputs(16), lambda x: np.log(np.exp(x) + 1)),
+    'softsign': (_centered_inputs(16), lambda x: x / (np.abs(x) + 1)),
+    'elu': (_negative_inputs, np.expm1),
+    'selu': (_negative_inputs, lambda x: _selu_scale * _selu_alpha * np.expm1(x)),
+}
+
+
+def sliced_fixed_inputs(precision, table_size):
+    """The values of a fixed-point type whose top ``ceil(log2(table_size))`` bits are the index of the table entry.
+
+    Mirrors ``softmax_real_val_from_idx`` of the softmax implementations.
+    """
+    n_bits = int(np.ceil(np.log2(table_size)))
+    data = np.arange(table_size) * 2.0 ** (precision.width - n_bits)
+    if precision.signed:
+        data = np.where(data >= 2.0 ** (precision.width - 1), data - 2.0**precision.width, data)
+    return data / 2.0**precision.fractional
+
+
+def _is_supported(precision):
+    return isinstance(precision, FixedPrecisionType) and precision.saturation_bits == 0
+
+
+class GenerateActivationTables(OptimizerPass):
+    """Computes the lookup tables of the activation functions, which are written as constant arrays like the weights.
+
+    Layers with identical tables (same function, table size, table type and, for the softmax, input type) share the same
+    array. Layers for which no table is generated (e.g., non-fixed-point table types) keep initializing their tables in
+    the C++ code.
+    """
+
+    def match(self, node):
+        if isinstance(node, Softmax):
+            return (
+                node.get_attr('implementation', 'stable') in ['latency', 'stable']
+                and 'exp_table' not in node.weights
+                and _is_supported(node.get_input_variable().type.precision)
+                and _is_supported(node.get_attr('exp_table_t').precision)
+                and _is_supported(node.get_attr('inv_table_t').precision)
+            )
+        if isinstance(node, Activation):
+            return (
+                node.get_attr('activation').lower() in activation_tables
+                and node.get_attr('implementation', 'lut') == 'lut'
+                and 'table' not in node.weights
+                and _is_supported(node.get_attr('table_t').precision)
+            )
+        return False
+
+    def transform(self, model, node):
+        table_size = int(node.get_attr('table_size'))
+
+        if isinstance(node, Softmax):
+            input_precision = node.get_input_variable().type.precision
+            exp_table_t = node.get_attr('exp_table_t')
+            inv_table_t = node.get_attr('inv_table_t')
+
+            # exp() may overflow and 1/x divides by zero, both converted to fixed-point like in C++
+            with np.errstate(over='ignore', divide='ignore'):
+                exp_key = ('exp', table_size, str(exp_table_t.precision), str(input_precision))
+                self._add_table(
+                    model,
+                    node,
+                    'exp_table',
+                    'exp_table{index}',
+                    exp_table_t,
+                    exp_key,
+                    lambda: np.exp(sliced_fixed_inputs(input_precision, table_size)),
+                )
+
+                inv_key = ('invert', table_size, str(inv_table_t.precision), str(exp_table_t.precision))
+                self._add_table(
+                    model,
+                    node,
+                    'inv_table',
+                    'invert_table{index}',
+                    inv_table_t,
+                    inv_key,
+                    lambda: 1 / sliced_fixed_inputs(exp_table_t.precision, table_size),
+                )
+        else:
+            activation = node.get_attr('activation').lower()
+            table_t = node.get_attr('table_t')
+            inputs, function = activation_tables[activation]
+
+            key = (activation, table_size, str(table_t.precision))
+            self._add_table(
+                model, node, 'table', activation + '_table{index}', table_t, key, lambda: function(inputs(table_size))
+            )
+
+        return False
+
+    @staticmethod
+    def _add_table(model, node, name, var_name, table_t, key, compute):
+        for var in model.get_weight_variables():
+            if getattr(var, 'table_key', None) == key:
+                node.set_attr(name, var)
+                return
+
+        data = quantize_fixed(compute(), table_t.precision)
+        node.add_weights_variable(
+            name=name, var_name=var_name, type_name=table_t.name, precision=table_t.precision, data=data
+        )
+        node.get_weights(name).table_key = key
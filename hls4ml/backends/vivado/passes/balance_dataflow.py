@@ -0,0 +1,216 @@
+import math
+
+import numpy as np
+
+from hls4ml.model.layers import (
+    Conv1D,
+    Conv2D,
+    Dense,
+    DepthwiseConv1D,
+    DepthwiseConv2D,
+    Input,
+    SeparableConv1D,
+    SeparableConv2D,
+)
+from hls4ml.model.optimizer import ModelOptimizerPass
+from hls4ml.model.types import InplaceTensorVariable
+
+_conv_layers = (Conv1D, Conv2D, SeparableConv1D, SeparableConv2D)
+_tunable_strategies = ['latency', 'resource', 'resource_unrolled']
+
+
+def _stream_depth(var):
+    """Number of elements of the stream of a tensor, i.e., all but its last dimension."""
+    while isinstance(var, InplaceTensorVariable):
+        var = var.input_var
+    return int(np.prod(var.shape[:-1], dtype=int)) if len(var.shape) > 1 else 1
+
+
+class BalanceDataflow(ModelOptimizerPass):
+    '''
+    Balances the throughput of the layers of a dataflow design, if BalanceDataflow is set in the Model configuration.
+
+    The initiation interval (II) of each layer, in clock cycles per sample, is estimated from its shape, reuse factor,
+    parallelization factor (io_parallel convolutions) and implementation. The slowest layer sets the II of the model, so
+    the ReuseFactor and ParallelizationFactor of the Dense and convolutional layers are chosen to reach the target II
+    with as few multipliers as possible. The target is the DataflowInterval of the Model configuration, or by default the
+    lowest II the slowest layer can reach. The chosen values are written to the layers and to their configuration, and a
+    report of the estimated II of every layer is printed.
+    '''
+
+    def __init__(self):
+        pass
+
+    def transform(self, model):
+        if not model.config.balance_dataflow:
+            return False
+
+        io_type = model.config.get_config_value('IOType')
+        backend = model.config.backend
+
+        layers = [
+            layer
+            for layer in model.get_layers()
+            if not isinstance(layer, Input) and not isinstance(layer.get_output_variable(), InplaceTensorVariable)
+        ]
+        options = {layer.name: self._get_options(backend, io_type, layer) for layer in layers}
+
+        target_ii = model.config.dataflow_ii
+        if target_ii is None:
+            target_ii = max(min(ii for ii, _, _, _ in layer_options) for layer_options in options.values())
+
+        report = []
+        for layer in layers:
+            layer_options = options[layer.name]
+            if len(layer_options) > 1:
+                # Fewest multipliers within the target II, or the fastest option if the target can't be reached
+                in_target = [option for option in layer_options if option[0] <= target_ii]
+                if in_target:
+                    chosen = min(in_target, key=lambda option: (option[1], option[0]))
+                else:
+                    chosen = min(layer_options, key=lambda option: (option[0], option[1]))
+                    print(
+                        f'WARNING: Layer "{layer.name}" can\'t reach the target II of {target_ii} cycles, '
+                        f'the lowest estimated II is {chosen[0]} cycles.'
+                    )
+                self._set_factors(model, layer, io_type, chosen[2], chosen[3])
+            else:
+                chosen = layer_options[0]
+            report.append((layer, *chosen))
+
+        self._print_report(report, target_ii)
+
+        return False
+
+    def _get_options(self, backend, io_type, layer):
+        """Estimated II, multipliers, reuse factor and parallelization factor of each valid configuration of a layer."""
+        rf = layer.get_attr('reuse_factor', 1)
+        pf = layer.get_attr('parallelization_factor', 1)
+        strategy = layer.get_attr('strategy', 'latency').lower()
+
+        tunable = (
+            isinstance(layer, (Dense,) + _conv_layers)
+            and strategy in _tunable_strategies
+            and layer.get_attr('implementation', '') != 'winograd'
+        )
+        if not tunable:
+            return [
+                (self._estimate_ii(io_type, layer, rf, pf), self._count_multipliers(backend, io_type, layer, rf, pf), rf, pf)
+            ]
+
+        n_in, n_out = self._get_mult_size(backend, layer)
+        valid_rf = backend.get_valid_reuse_factors(n_in, n_out)
+        if strategy == 'resource_unrolled':
+            # Same restrictions as when the layers are initialized
+            valid_rf = [r for r in valid_rf[:-1] if r > 1] or [rf]
+        if self._is_pointwise_parallel_latency(io_type, layer):
+            valid_rf = [r for r in valid_rf if layer.get_attr('in_width') % r == 0] or [rf]
+
+        if io_type == 'io_parallel' and isinstance(layer, _conv_layers):
+            out_height = layer.get_attr('out_height', 1)
+            out_width = layer.get_attr('out_width')
+            valid_pf = backend.get_valid_conv_partition_splits(out_height, out_width)
+        else:
+            valid_pf = [pf]
+
+        return [
+            (
+                self._estimate_ii(io_type, layer, r, p),
+                self._count_multipliers(backend, io_type, layer, r, p),
+                r,
+                p,
+            )
+            for r in valid_rf
+            for p in valid_pf
+        ]
+
+    @staticmethod
+    def _get_mult_size(backend, layer):
+        n_in, n_out = backend.get_layer_mult_size(layer)
+        if isinstance(layer, (DepthwiseConv1D, DepthwiseConv2D)):
+            n_out = 1  # Element-wise multiplication
+        return n_in, n_out
+
+    @staticmethod
+    def _is_pointwise_parallel_latency(io_type, layer):
+        # Dedicated implementation, which splits the input width over the reuse factor (see pointwise_codegen.py)
+        return (
+            isinstance(layer, Conv1D)
+            and not isinstance(layer, DepthwiseConv1D)
+            and io_type == 'io_parallel'
+            and layer.get_attr('filt_width') == 1
+            and layer.get_attr('strategy', 'latency').lower() == 'latency'
+            and int(layer.get_attr('shift_add_max_digits', 0)) == 0
+        )
+
+    def _estimate_ii(self, io_type, layer, rf, pf):
+        if io_type == 'io_parallel':
+            if isinstance(layer, _conv_layers):
+                if layer.get_attr('implementation', '') == 'winograd':
+                    tile = layer.get_attr('impl_filt_width') - layer.get_attr('filt_width') + 1
+                    n_tiles = math.ceil(layer.get_attr('out_width') / tile)
+                    if layer.get_attr('out_height') is not None:
+                        n_tiles *= math.ceil(layer.get_attr('out_height') / tile)
+                    return n_tiles * rf
+                if self._is_pointwise_parallel_latency(io_type, layer):
+                    return rf
+                out_pixels = layer.get_attr('out_height', 1) * layer.get_attr('out_width')
+                return out_pixels // pf * rf
+            if isinstance(layer, Dense):
+                return rf
+            return 1  # Fully unrolled
+
+        # io_stream
+        if isinstance(layer, _conv_layers):
+            # One input pixel is read per iteration of the pipelined loop, which has an II of the reuse factor
+            return layer.get_attr('in_height', 1) * layer.get_attr('in_width') * rf
+        if isinstance(layer, Dense):
+            # The input is read, multiplied and written in sequence
+            return _stream_depth(layer.get_input_variable()) + rf + _stream_depth(layer.get_output_variable())
+        return _stream_depth(layer.get_input_variable())  # One element of the stream per clock cycle
+
+    def _count_multipliers(self, backend, io_type, layer, rf, pf):
+        if (
+            not isinstance(layer, (Dense,) + _conv_layers)
+            or layer.get_attr('strategy', '').lower() not in _tunable_strategies
+        ):
+            return 0
+        n_in, n_out = self._get_mult_size(backend, layer)
+        if isinstance(layer, (SeparableConv1D, SeparableConv2D)):
+            n_in = layer.get_attr('n_chan') * (1 + layer.get_attr('n_filt'))  # Depthwise and pointwise parts
+            n_out = 1
+        n_mult = math.ceil(n_in * n_out / rf)
+        if self._is_pointwise_parallel_latency(io_type, layer):
+            return n_mult * layer.get_attr('in_width')
+        if io_type == 'io_parallel' and isinstance(layer, _conv_layers):
+            return n_mult * pf
+        return n_mult
+
+    @staticmethod
+    def _set_factors(model, layer, io_type, rf, pf):
+        layer.set_attr('reuse_factor', rf)
+
+        layer_config = model.config.config['HLSConfig'].setdefault('LayerName', {}).setdefault(layer.name, {})
+        layer_config['ReuseFactor'] = rf
+
+        if io_type == 'io_parallel' and isinstance(layer, _conv_layers):
+            out_pixels = layer.get_attr('out_height', 1) * layer.get_attr('out_width')
+            layer.set_attr('parallelization_factor', pf)
+            layer.set_attr('n_partitions', out_pixels // pf)
+            layer_config['ParallelizationFactor'] = pf
+
+        model.config.parse_name_config(layer.name, layer_config)
+
+    @staticmethod
+    def _print_report(report, target_ii):
+        header = ('Layer', 'Type', 'ReuseFactor', 'ParallelizationFactor', 'Multipliers', 'Estimated II')
+        rows = [
+            (layer.name, layer.class_name, str(rf), str(pf), str(n_mult), str(ii)) for layer, ii, n_mult, rf, pf in report
+        ]
+        widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+
+        print(f'Dataflow balancing, target II: {target_ii} cycles')
+        for row in [header] + rows:
+            print('  '.join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+        bottleneck = max(report, key=lambda entry: entry[1])
+        print(f'Estimated II of the model: {bottleneck[1]} cycles (layer "{bottleneck[0].name}")')
@@ -36,6 +36,7 @@ conv1d_config_template = """struct config{index} : nnet::conv1d_config {{
     static const unsigned in_width = {in_width};
     static const unsigned n_chan = {n_chan};
     static const unsigned filt_width = {filt_width};
+    static const unsigned impl_filt_width = {impl_filt_width};
     static const unsigned kernel_size = filt_width;
     static const unsigned n_filt = {n_filt};
     static const unsigned stride_width = {stride_width};
@@ -83,6 +84,8 @@ class Conv1DConfigTemplate(LayerConfigTemplate):
         params = self._default_config_params(node)
         params['dilation'] = node.get_attr('dilation', 1)
         params['nzeros'] = node.get_weights('weight').nzeros
+        params['impl_filt_width'] = node.get_attr('impl_filt_width', node.get_attr('filt_width'))
+        is_winograd = node.get_attr('implementation') == 'winograd'
 
         params['config_t'] = f'config{node.index}_mult'
         if node.get_attr('in_width') == node.get_attr('min_width'):
@@ -95,13 +98,19 @@ class Conv1DConfigTemplate(LayerConfigTemplate):
         else:
             params['fill_fn'] = 'FillConv1DBuffer'
 
+        is_shift_add = node.get_attr('_shift_add_applied', False)
         is_pointwise_parallel_latency = (
             node.get_attr('filt_width') == 1
             and node.get_attr('strategy').lower() == 'latency'
             and node.model.config.get_config_value('IOType') == 'io_parallel'
+            and not is_shift_add
         )
-        if is_pointwise_parallel_latency:
+        if is_shift_add:
+            params['conv_fn'] = 'Conv1DShiftAdd'
+        elif is_pointwise_parallel_latency:
             params['conv_fn'] = f'pointwise_conv_{node.index}'
+        elif is_winograd:
+            params['conv_fn'] = 'Conv1DWinograd'
         else:
             if node.get_attr('strategy').lower() == 'latency':
                 params['conv_fn'] = 'Conv1DLatency'
@@ -117,14 +126,21 @@ class Conv1DConfigTemplate(LayerConfigTemplate):
             )
             mult_params['n_out'] = int(node.get_attr('in_width') * node.get_attr('n_filt') / mult_params['reuse'])
         else:
-            mult_params['n_in'] = node.get_attr('n_chan') * node.get_attr('filt_width')
+            mult_params['n_in'] = node.get_attr('n_chan') * params['impl_filt_width']
             mult_params['n_out'] = node.get_attr('n_filt')
         mult_params['nzeros'] = node.get_weights('weight').nzeros
         mult_params['product_type'] = get_backend('vivado').product_type(
             node.get_input_variable().type.precision, node.get_weights('weight').type.precision
         )
 
-        if node.get_attr('strategy').lower() == 'latency':
+        if is_winograd:
+            # The element-wise products of a tile are all computed in the Winograd kernel itself
+            mult_params['dense_function'] = 'DenseLatency'
+        elif node.get_attr('_shift_add_applied', False):
+            mult_params['dense_function'] = f'dense_shift_add_{node.index}'
+            # Only the weights that weren't converted to shifts and additions need multipliers
+            mult_params['nzeros'] = mult_params['n_in'] * mult_params['n_out'] - node.get_attr('shift_add_n_products')
+        elif node.get_attr('strategy').lower() == 'latency':
             mult_params['dense_function'] = 'DenseLatency'
         elif node.get_attr('strategy').lower() == 'resource':
             if int(mult_params['reuse_factor']) <= int(mult_params['n_in']):
@@ -133,7 +149,10 @@ class Conv1DConfigTemplate(LayerConfigTemplate):
                 mult_params['dense_function'] = 'DenseResource_rf_gt_nin_rem0'
             # The 3rd case is never used
         elif node.get_attr('strategy').lower() == 'resource_unrolled':
-            mult_params['dense_function'] = f'dense_resource_unrolled_{node.index}'
+            if isinstance(node, DepthwiseConv1D):
+                mult_params['dense_function'] = f'depthwise_resource_unrolled_{node.index}'
+            else:
+                mult_params['dense_function'] = f'dense_resource_unrolled_{node.index}'
 
         mult_config = self.mult_template.format(**mult_params)
 
@@ -172,6 +191,8 @@ conv2d_config_template = """struct config{index} : nnet::conv2d_config {{
     static const unsigned n_chan = {n_chan};
     static const unsigned filt_height = {filt_height};
     static const unsigned filt_width = {filt_width};
+    static const unsigned impl_filt_height = {impl_filt_height};
+    static const unsigned impl_filt_width = {impl_filt_width};
     static const unsigned kernel_size = filt_height * filt_width;
     static const unsigned n_filt = {n_filt};
     static const unsigned stride_height = {stride_height};
@@ -221,6 +242,9 @@ class Conv2DConfigTemplate(LayerConfigTemplate):
         params = self._default_config_params(node)
         params['dilation'] = node.get_attr('dilation', 1)
         params['nzeros'] = node.get_weights('weight').nzeros
+        params['impl_filt_height'] = node.get_attr('impl_filt_height', node.get_attr('filt_height'))
+        params['impl_filt_width'] = node.get_attr('impl_filt_width', node.get_attr('filt_width'))
+        is_winograd = node.get_attr('implementation') == 'winograd'
 
         params['config_t'] = f'config{node.index}_mult'
 
@@ -242,14 +266,21 @@ class Conv2DConfigTemplate(LayerConfigTemplate):
         conv_config = self.template.format(**params)
 
         mult_params = self._default_config_params(node)
-        mult_params['n_in'] = node.get_attr('n_chan') * node.get_attr('filt_height') * node.get_attr('filt_width')
+        mult_params['n_in'] = node.get_attr('n_chan') * params['impl_filt_height'] * params['impl_filt_width']
         mult_params['n_out'] = node.get_attr('n_filt')
         mult_params['nzeros'] = node.get_weights('weight').nzeros
         mult_params['product_type'] = get_backend('vivado').product_type(
             node.get_input_variable().type.precision, node.get_weights('weight').type.precision
         )
 
-        if node.get_attr('strategy').lower() == 'latency':
+        if is_winograd:
+            # The element-wise products of a tile are all computed in the Winograd kernel itself
+            mult_params['dense_function'] = 'DenseLatency'
+        elif node.get_attr('_shift_add_applied', False):
+            mult_params['dense_function'] = f'dense_shift_add_{node.index}'
+            # Only the weights that weren't converted to shifts and additions need multipliers
+            mult_params['nzeros'] = mult_params['n_in'] * mult_params['n_out'] - node.get_attr('shift_add_n_products')
+        elif node.get_attr('strategy').lower() == 'latency':
             mult_params['dense_function'] = 'DenseLatency'
         elif node.get_attr('strategy').lower() == 'resource':
             if int(mult_params['reuse_factor']) <= int(mult_params['n_in']):
@@ -258,7 +289,10 @@ class Conv2DConfigTemplate(LayerConfigTemplate):
                 mult_params['dense_function'] = 'DenseResource_rf_gt_nin_rem0'
             # The 3rd case is never used
         elif node.get_attr('strategy').lower() == 'resource_unrolled':
-            mult_params['dense_function'] = f'dense_resource_unrolled_{node.index}'
+            if isinstance(node, DepthwiseConv2D):
+                mult_params['dense_function'] = f'depthwise_resource_unrolled_{node.index}'
+            else:
+                mult_params['dense_function'] = f'dense_resource_unrolled_{node.index}'
 
         mult_config = self.mult_template.format(**mult_params)
 
@@ -333,6 +367,7 @@ class SeparableConv1DConfigTemplate(LayerConfigTemplate):
         params['index'] = str(node.index) + '_depthwise'
         params['weight_t'] = node.get_weights('depthwise').type
         params['bias_t'] = node.get_weights('zero_bias').type
+        params['impl_filt_width'] = params['filt_width']
         if node.model.config.get_config_value('IOType') == 'io_parallel':
             params['fill_fn'] = f'fill_buffer_{node.index}_dw'
         else:
@@ -370,7 +405,7 @@ class SeparableConv1DConfigTemplate(LayerConfigTemplate):
         else:
             params['in_width'] = node.get_output_variable().shape[1]
 
-        params['filt_width'] = 1
+        params['filt_width'] = params['impl_filt_width'] = 1
         params['stride_width'] = 1
         params['pad_left'] = params['pad_right'] = 0
         params['dilation'] = node.get_attr('dilation', 1)
@@ -466,6 +501,8 @@ class SeparableConv2DConfigTemplate(LayerConfigTemplate):
         params['nzeros'] = node.get_weights('depthwise').nzeros
         params['index'] = str(node.index) + '_depthwise'
         params['weight_t'] = node.get_weights('depthwise').type
+        params['impl_filt_height'] = params['filt_height']
+        params['impl_filt_width'] = params['filt_width']
         if node.model.config.get_config_value('IOType') == 'io_parallel':
             params['fill_fn'] = f'fill_buffer_{node.index}_dw'
         else:
@@ -510,6 +547,7 @@ class SeparableConv2DConfigTemplate(LayerConfigTemplate):
             params['in_width'] = node.get_output_variable().shape[2]
 
         params['filt_height'] = params['filt_width'] = 1
+        params['impl_filt_height'] = params['impl_filt_width'] = 1
         params['stride_height'] = params['stride_width'] = 1
         params['pad_left'] = params['pad_right'] = 0
         params['pad_top'] = params['pad_bottom'] = 0
@@ -0,0 +1,160 @@
+import numpy as np
+
+from hls4ml.model.layers import Conv1D, Conv2D, DepthwiseConv1D, DepthwiseConv2D
+from hls4ml.model.optimizer import OptimizerPass
+from hls4ml.model.types import FixedPrecisionType, IntegerPrecisionType, NamedType, RoundingMode, quantize_fixed
+
+# Transformation matrices of Winograd's minimal filtering algorithm F(m, 3), Y = A'[(Gg) * (B'd)], from
+# Lavin & Gray, 2015 - Fast Algorithms for Convolutional Neural Networks. Only G is applied here, B' and A' are
+# implemented by the input and output transforms of nnet_conv_winograd.h.
+winograd_matrices = {
+    2: (
+        np.array([[1, 0, 0], [0.5, 0.5, 0.5], [0.5, -0.5, 0.5], [0, 0, 1]]),
+        np.array([[1, 0, -1, 0], [0, 1, 1, 0], [0, -1, 1, 0], [0, 1, 0, -1]]),
+    ),
+    4: (
+        np.array(
+            [
+                [1 / 4, 0, 0],
+                [-1 / 6, -1 / 6, -1 / 6],
+                [-1 / 6, 1 / 6, -1 / 6],
+                [1 / 24, 1 / 12, 1 / 6],
+                [1 / 24, -1 / 12, 1 / 6],
+                [0, 0, 1],
+            ]
+        ),
+        np.array(
+            [
+                [4, 0, -5, 0, 1, 0],
+                [0, -4, -4, 1, 1, 0],
+                [0, 4, -4, -1, 1, 0],
+                [0, -2, -1, 2, 1, 0],
+                [0, 2, -1, -2, 1, 0],
+                [0, 4, 0, -5, 0, 1],
+            ]
+        ),
+    ),
+}
+
+# Fractional bits added to the transformed weights, per dimension. G only halves the weights for F(2, 3), so one bit
+# keeps them exact. The sixths of F(4, 3) can't be represented exactly, the extra bits keep the rounding error well below
+# the quantization error of the layer.
+_weight_fractional_bits = {2: 1, 4: 6}
+
+
+def _as_fixed(precision):
+    if isinstance(precision, FixedPrecisionType):
+        return precision
+    if isinstance(precision, IntegerPrecisionType):
+        return FixedPrecisionType(width=precision.width, integer=precision.width, signed=precision.signed)
+    return None
+
+
+class ApplyWinogradKernelTransformation(OptimizerPass):
+    '''
+    Transforms the weights of Conv1D/Conv2D layers with the "Winograd" ConvImplementation to the Winograd domain
+    (GgG'), with the layout (F, C, W) or (F, C, H, W) of nnet_conv1d_winograd.h/nnet_conv2d_winograd.h.
+
+    The precision of the transformed weights is widened to hold them, and the accumulator gets the extra fractional
+    bits of the weights and the integer bits of the input transform. With the wrap-around arithmetic of the accumulator,
+    F(2, 3) then gives the same results as the other implementations, while F(4, 3) approximates the transformed
+    weights. Layers that can't use Winograd's algorithm fall back to the "LineBuffer" implementation.
+    '''
+
+    def match(self, node):
+        return (
+            isinstance(node, (Conv1D, Conv2D))
+            and node.get_attr('implementation') == 'winograd'
+            and not node.get_attr('_winograd_transformation_applied', False)
+        )
+
+    def transform(self, model, node):
+        reason = self._unsupported_reason(node)
+        if reason is not None:
+            print(
+                f'WARNING: "Winograd" implementation in "{node.name}" ({node.class_name}) is not possible: {reason}. '
+                'Switching to "LineBuffer" implementation.'
+            )
+            node.set_attr('implementation', 'linebuffer')
+            return False
+
+        output_tile = int(node.get_attr('winograd_output_tile', 2))
+        G, BT = winograd_matrices[output_tile]
+        n_dims = 1 if isinstance(node, Conv1D) else 2
+
+        # Transform the weights as they would be quantized by the other implementations
+        weights = node.weights['weight']
+        weight_precision = _as_fixed(weights.type.precision)
+        data = quantize_fixed(weights.data, weight_precision)
+        if n_dims == 1:
+            data = np.einsum('ik,kcf->fci', G, data)  # (W, C, F) => (F, C, W)
+        else:
+            data = np.einsum('ik,klcf,jl->fcij', G, data, G)  # (H, W, C, F) => (F, C, H, W)
+
+        fractional = weight_precision.fractional + n_dims * _weight_fractional_bits[output_tile]
+        integer = max(weight_precision.integer, int(np.ceil(np.abs(data).max())).bit_length() + 1)
+        new_weight_precision = FixedPrecisionType(
+            width=integer + fractional, integer=integer, signed=True, rounding_mode=RoundingMode.RND
+        )
+        data = quantize_fixed(data, new_weight_precision)
+
+        weights.data = data
+        weights.shape = list(data.shape)
+        weights.data_length = data.size
+        weights.nonzeros = np.count_nonzero(data)
+        weights.nzeros = weights.data_length - weights.nonzeros
+        weights.min = np.min(data)
+        weights.max = np.max(data)
+        weights.update_precision(
+            FixedPrecisionType(width=integer + fractional, integer=integer, signed=True)  # The data is on the grid already
+        )
+
+        # The input transform grows the inputs by at most the largest row sum of B', per dimension
+        accum_t = node.get_attr('accum_t')
+        accum_precision = _as_fixed(accum_t.precision)
+        input_growth = int(np.ceil(np.log2(np.abs(BT).sum(axis=1).max())))
+        accum_integer = accum_precision.integer + n_dims * input_growth
+        accum_fractional = accum_precision.fractional + n_dims * _weight_fractional_bits[output_tile]
+        new_accum_precision = FixedPrecisionType(
+            width=accum_integer + accum_fractional,
+            integer=accum_integer,
+            signed=accum_precision.signed,
+            rounding_mode=accum_precision.rounding_mode,
+            saturation_mode=accum_precision.saturation_mode,
+            saturation_bits=accum_precision.saturation_bits,
+        )
+        node.set_attr('accum_t', NamedType(accum_t.name, new_accum_precision))
+
+        # Modified kernel size
+        tile = G.shape[0]
+        node.set_attr('impl_filt_width', tile)
+        if n_dims == 2:
+            node.set_attr('impl_filt_height', tile)
+
+        node.set_attr('_winograd_transformation_applied', True)
+
+        return False
+
+    @staticmethod
+    def _unsupported_reason(node):
+        if node.model.config.get_config_value('IOType') != 'io_parallel':
+            return 'only io_parallel is supported'
+        if isinstance(node, (DepthwiseConv1D, DepthwiseConv2D)):
+            return 'depthwise convolutions are not supported'
+        if node.get_attr('data_format', 'channels_last') != 'channels_last':
+            return 'only channels_last is supported'
+        if isinstance(node, Conv1D):
+            if node.get_attr('filt_width') != 3 or node.get_attr('stride_width') != 1 or node.get_attr('dilation', 1) != 1:
+                return 'the kernel must be 3 wide with stride 1'
+        elif (
+            node.get_attr('filt_height') != 3
+            or node.get_attr('filt_width') != 3
+            or node.get_attr('stride_height') != 1
+            or node.get_attr('stride_width') != 1
+        ):
+            return 'the kernel must be 3x3 with stride 1'
+        if _as_fixed(node.weights['weight'].type.precision) is None:
+            return 'the weights must be fixed-point'
+        if _as_fixed(node.get_attr('accum_t').precision) is None:
+            return 'the accumulator must be fixed-point'
+        return None
@@ -43,7 +43,11 @@ class DenseConfigTemplate(LayerConfigTemplate):
             node.get_input_variable().type.precision, node.get_weights('weight').type.precision
         )
 
-        if node.get_attr('strategy').lower() == 'latency':
+        if node.get_attr('_shift_add_applied', False):
+            params['dense_function'] = f'dense_shift_add_{node.index}'
+            # Only the weights that weren't converted to shifts and additions need multipliers
+            params['nzeros'] = int(params['n_in']) * int(params['n_out']) - node.get_attr('shift_add_n_products')
+        elif node.get_attr('strategy').lower() == 'latency':
             params['dense_function'] = 'DenseLatency'
         elif node.get_attr('strategy').lower() == 'resource':
             if int(params['reuse_factor']) <= int(params['n_in']):
@@ -159,10 +163,46 @@ softmax_config_template = """struct {type}_config{index} : nnet::activ_config {{
     typedef {inv_table_t.name} inv_table_t;
 }};\n"""
 
+piecewise_activ_config_template = """struct {type}_config{index} : nnet::activ_config {{
+    static const unsigned n_in = {n_in};
+    static const unsigned n_segments = {n_segments};
+    static const unsigned degree = {piecewise_degree};
+    static const unsigned io_type = nnet::{iotype};
+    static const unsigned reuse_factor = {reuse};
+    typedef {table_t.name} table_t;
+}};\n"""
+
+piecewise_softmax_config_template = """struct {type}_config{index} : nnet::activ_config {{
+    static const unsigned n_in = {n_in};
+    static const unsigned exp_n_segments = {exp_n_segments};
+    static const unsigned inv_n_segments = {inv_n_segments};
+    static const unsigned degree = {piecewise_degree};
+    static const unsigned io_type = nnet::{iotype};
+    static const unsigned reuse_factor = {reuse};
+    static const unsigned axis = {axis};
+    static const nnet::softmax_implementation implementation = nnet::softmax_implementation::{implementation};
+    typedef {exp_table_t.name} exp_table_t;
+    typedef {inv_table_t.name} inv_table_t;
+}};\n"""
+
 activ_function_template = 'nnet::{activation}<{input_t}, {output_t}, {config}>({input}, {output});'
 param_activ_function_template = (
     'nnet::{activation}<{input_t}, {param_t.name}, {output_t}, {config}>({input}, {param}, {output});'
 )
+activ_table_function_template = 'nnet::{activation}<{input_t}, {output_t}, {config}>({input}, {output}, {table});'
+param_activ_table_function_template = (
+    'nnet::{activation}<{input_t}, {param_t.name}, {output_t}, {config}>({input}, {param}, {output}, {table});'
+)
+softmax_table_function_template = (
+    'nnet::{activation}<{input_t}, {output_t}, {config}>({input}, {output}, {exp_table}, {inv_table});'
+)
+piecewise_activ_function_template = (
+    'nnet::piecewise<{input_t}, {output_t}, {config}>({input}, {output}, {breakpoints}, {coefs});'
+)
+piecewise_softmax_function_template = (
+    'nnet::softmax_piecewise<{input_t}, {output_t}, {config}>'
+    '({input}, {output}, {exp_breakpoints}, {exp_coefs}, {inv_breakpoints}, {inv_coefs});'
+)
 
 activ_include_list = ['nnet_utils/nnet_activation.h', 'nnet_utils/nnet_activation_stream.h']
 
@@ -176,6 +216,9 @@ class ActivationConfigTemplate(LayerConfigTemplate):
         params = self._default_config_params(node)
         params['type'] = node.get_attr('activation')
 
+        if node.get_attr('implementation') == 'piecewise':
+            return piecewise_activ_config_template.format(**params)
+
         return self.template.format(**params)
 
 
@@ -208,6 +251,15 @@ class SoftmaxConfigTemplate(ActivationConfigTemplate):
         super(ActivationConfigTemplate, self).__init__(Softmax)  # Skip ActivationConfigTemplate's __init__
         self.template = softmax_config_template
 
+    def format(self, node):
+        params = self._default_config_params(node)
+        params['type'] = node.get_attr('activation')
+
+        if node.get_attr('implementation') == 'piecewise':
+            return piecewise_softmax_config_template.format(**params)
+
+        return self.template.format(**params)
+
 
 class ActivationFunctionTemplate(FunctionCallTemplate):
     def __init__(self):
@@ -219,6 +271,25 @@ class ActivationFunctionTemplate(FunctionCallTemplate):
         params['activation'] = node.get_attr('activation').lower()
         params['config'] = '{}_config{}'.format(node.get_attr('activation'), node.index)
 
+        # The approximations fitted by the fit_piecewise_activations pass
+        if 'exp_breakpoints' in node.weights:
+            for name in ('exp_breakpoints', 'exp_coefs', 'inv_breakpoints', 'inv_coefs'):
+                params[name] = node.get_weights(name).name
+            return piecewise_softmax_function_template.format(**params)
+        if 'breakpoints' in node.weights:
+            params['breakpoints'] = node.get_weights('breakpoints').name
+            params['coefs'] = node.get_weights('coefs').name
+            return piecewise_activ_function_template.format(**params)
+
+        # The lookup tables generated by the generate_activation_tables pass
+        if 'exp_table' in node.weights:
+            params['exp_table'] = node.get_weights('exp_table').name
+            params['inv_table'] = node.get_weights('inv_table').name
+            return softmax_table_function_template.format(**params)
+        if 'table' in node.weights:
+            params['table'] = node.get_weights('table').name
+            return activ_table_function_template.format(**params)
+
         return self.template.format(**params)
 
 
@@ -233,6 +304,10 @@ class ParametrizedActivationFunctionTemplate(FunctionCallTemplate):
         params['param'] = node.get_attr('activ_param', 1.0)
         params['config'] = '{}_config{}'.format(node.get_attr('activation'), node.index)
 
+        if 'table' in node.weights:
+            params['table'] = node.get_weights('table').name
+            return param_activ_table_function_template.format(**params)
+
         return self.template.format(**params)
 
 
@@ -0,0 +1,172 @@
+import math
+
+import numpy as np
+
+from hls4ml.backends.vivado.passes.fifo_depth_optimization import generate_max_depth_file
+from hls4ml.model.optimizer.optimizer import ConfigurableOptimizerPass, ModelOptimizerPass
+from hls4ml.report.resource_estimate import get_estimate_features
+
+
+def _get_layer_streams(model, layer, stream_profile):
+    in_streams = [var.name for var in (layer.get_input_variable(name) for name in layer.inputs) if var is not None]
+    out_streams = [model.output_vars[name].name for name in layer.outputs if name in model.output_vars]
+    # Layers that pass their input stream through (e.g., a reshape of a stream) don't read or write it
+    return (
+        [s for s in in_streams if s in stream_profile and s not in out_streams],
+        [s for s in out_streams if s in stream_profile and s not in in_streams],
+    )
+
+
+def _get_sample_starts(model, stream_profile, n_samples):
+    """Counter values of the first write to the inputs of the model in each sample"""
+    starts = None
+    for var in model.get_input_variables():
+        writes = stream_profile.get(var.name, ([],))[0]
+        if len(writes) < n_samples or len(writes) % n_samples != 0:
+            continue
+        var_starts = writes[:: len(writes) // n_samples]
+        starts = var_starts if starts is None else np.minimum(starts, var_starts)
+    if starts is None:
+        return np.zeros(1, dtype=np.int64)
+    return starts
+
+
+def get_fifo_occupancy(model, stream_profile, n_samples):
+    '''
+    Estimate the maximum occupancy of the FIFOs between the layers from the stream operations recorded in C simulation
+
+    The C simulation runs the layers one after the other, so the occupancy of the streams during the simulation is
+    always the full tensor. Instead, the recorded order of the reads and writes of each layer is replayed as if the
+    layers ran concurrently (dataflow): each layer performs its operations in the recorded order, spread evenly over its
+    estimated interval, and waits for the data of its reads to be written. Each sample is replayed from the start, with
+    all layers idle, and the FIFOs are assumed to never be full.
+
+    Args:
+        model (ModelGraph): The model
+        stream_profile (dict): Stream operations, from `ModelGraph.profile_streams()`
+        n_samples (int): Number of samples used for the profiling
+
+    Returns:
+        dict: Maximum occupancy of each stream written and read by the layers, by name
+    '''
+    intervals = {name: layer['interval'] for name, layer in get_estimate_features(model)['Layers'].items()}
+    sample_starts = _get_sample_starts(model, stream_profile, n_samples)
+
+    # Replayed time of the operations, as (sample, cycle) pairs
+    write_times = {}
+    read_times = {}
+    for layer in model.get_layers():
+        in_streams, out_streams = _get_layer_streams(model, layer, stream_profile)
+        streams = in_streams + out_streams
+        if len(streams) == 0:
+            continue
+
+        # Operations of the layer, in the order of the simulation: (counter, stream index, is write, index in stream)
+        clocks, stream_index, is_write, op_index = [], [], [], []
+        for i, stream in enumerate(streams):
+            write = i >= len(in_streams)
+            ops = stream_profile[stream][0 if write else 1]
+            clocks.append(ops)
+            stream_index.append(np.full(len(ops), i))
+            is_write.append(np.full(len(ops), write))
+            op_index.append(np.arange(len(ops)))
+        clocks = np.concatenate(clocks)
+        order = np.argsort(clocks, kind='stable')
+        if len(order) == 0:
+            continue
+        samples = np.maximum(np.searchsorted(sample_starts, clocks[order], side='right') - 1, 0)
+        stream_index = np.concatenate(stream_index)[order]
+        is_write = np.concatenate(is_write)[order]
+        op_index = np.concatenate(op_index)[order]
+
+        # Layers without an estimate (e.g., the inputs of the model) perform one operation per cycle
+        ops_per_sample = len(order) / max(n_samples, 1)
+        step = max(intervals.get(layer.name, ops_per_sample), 1) / ops_per_sample
+
+        times = {stream: [] for stream in streams}
+        t = 0.0
+        current_sample = 0
+        for sample, i, write, k in zip(samples.tolist(), stream_index.tolist(), is_write.tolist(), op_index.tolist()):
+            if sample != current_sample:
+                current_sample = sample
+                t = 0.0
+            stream = streams[i]
+            if not write:
+                written = write_times.get(stream)
+                if written is not None and k < len(written) and written[k][0] == sample:
+                    t = max(t, written[k][1] + 1)  # The data is available in the cycle after the write
+            times[stream].append((sample, t))
+            t += step
+
+        for stream in in_streams:
+            read_times[stream] = times[stream]
+        for stream in out_streams:
+            write_times[stream] = times[stream]
+
+    occupancy = {}
+    span = max((t for times in write_times.values() for _, t in times), default=0) + 2
+    for stream, writes in write_times.items():
+        reads = read_times.get(stream)
+        if reads is None or len(writes) == 0:
+            continue  # Not read by a layer, e.g., an output of the model
+        # Occupancy after each write, reads in the same cycle are counted after the write
+        writes = np.array([sample * span + t for sample, t in writes])
+        reads = np.array([sample * span + t for sample, t in reads])
+        n_reads = np.searchsorted(reads, writes, side='left')
+        occupancy[stream] = int(np.max(np.arange(1, len(writes) + 1) - n_reads))
+
+    return occupancy
+
+
+class CsimFifoDepthOptimization(ConfigurableOptimizerPass, ModelOptimizerPass):
+    '''
+    Sets the depths of the FIFOs between the layers from a C simulation of the model on representative data
+
+    This is a fast alternative to the FIFO depth optimization with RTL cosimulation ('vivado:fifo_depth_optimization'),
+    that doesn't need the vendor tools. The model is compiled, the stream operations are recorded while running the
+    data through it (see `ModelGraph.profile_streams()`) and the occupancy of the FIFOs is estimated as if the layers
+    ran concurrently (see `get_fifo_occupancy()`). The depth of each FIFO is set to the estimated maximum occupancy
+    with a margin, but not more than its original depth. The estimate depends on the estimated intervals of the layers,
+    so the depths should be confirmed with cosimulation.
+
+    Configuration (with `configure()`):
+        data (np.ndarray or list): Representative input data of the model, as for `predict()`. Required
+        margin (float, optional): Fraction of the occupancy added to the depths. Defaults to 0.1
+    '''
+
+    def __init__(self):
+        self.values = []
+
+    def transform(self, model):
+        data = getattr(self, 'data', None)
+        margin = getattr(self, 'margin', 0.1)
+
+        if not (model.config.get_config_value('IOType') == 'io_stream'):
+            raise RuntimeError('To use this optimization you have to set `IOType` field to `io_stream` in the HLS config')
+        if data is None:
+            raise Exception(
+                'The data used to profile the FIFOs is not set, use '
+                '`get_optimizer(\'vivado:csim_fifo_depth_optimization\').configure(data=...)`'
+            )
+
+        model.compile()
+        stream_profile = model.profile_streams(data)
+        occupancy = get_fifo_occupancy(model, stream_profile, model._compute_n_samples(data))
+
+        # The inputs and outputs of the model are the interfaces of the design, not FIFOs
+        ports = [var.name for var in model.get_input_variables() + model.get_output_variables()]
+        maxs = []
+        for v in model.output_vars.values():
+            if v.name in occupancy and v.name not in ports and isinstance(v.pragma, tuple) and v.pragma[0] == 'stream':
+                maxs.append({'name': v.name, 'max': occupancy[v.name], 'depth': int(v.pragma[1])})
+        self.values = maxs
+
+        generate_max_depth_file(model, maxs)
+
+        depths = {x['name']: min(math.ceil(x['max'] * (1 + margin)) + 1, x['depth']) for x in maxs}
+        for v in model.output_vars.values():
+            if v.name in depths:
+                v.pragma = (v.pragma[0], depths[v.name])
+
+        print('[hls4ml] - FIFO optimization completed')
+        return False
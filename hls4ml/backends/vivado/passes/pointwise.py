@@ -79,7 +79,11 @@ class OptimizePointwiseConv(OptimizerPass):
             'PointwiseConv' + dim, node.name, new_attrs, node.inputs.copy(), outputs=node.outputs.copy()
         )
         # Set strategy to ensure lowercase string is passed to the template
-        if model.config.is_resource_strategy(pw_node):
+        if node.get_attr('strategy') == 'resource_unrolled' and node.get_attr('reuse_factor') > 1:
+            # Keep the reuse factor validated for the unrolled code generation
+            pw_node.set_attr('strategy', 'resource_unrolled')
+            pw_node.set_attr('reuse_factor', node.get_attr('reuse_factor'))
+        elif model.config.is_resource_strategy(pw_node):
             pw_node.set_attr('strategy', 'resource')
         else:
             pw_node.set_attr('strategy', 'latency')
@@ -11,8 +11,9 @@ class ApplyResourceStrategy(OptimizerPass):
         node_matches = isinstance(node, (Dense, Conv1D, SeparableConv1D, Conv2D, SeparableConv2D, LSTM, GRU))
         is_resource_strategy = node.get_attr('strategy', '').lower() in ['resource', 'resource_unrolled']
         already_transformed = node.get_attr('_weights_transposed', False) is True
+        is_winograd = node.get_attr('implementation', '') == 'winograd'  # Has its own layout of the weights
 
-        return node_matches and is_resource_strategy and not already_transformed
+        return node_matches and is_resource_strategy and not already_transformed and not is_winograd
 
     def transform(self, model, node):
         if isinstance(node, Dense):
@@ -0,0 +1,296 @@
+from collections import Counter
+
+import numpy as np
+
+from hls4ml.model.layers import Conv1D, Conv2D, Dense, DepthwiseConv1D, DepthwiseConv2D
+from hls4ml.model.optimizer import OptimizerPass
+from hls4ml.model.types import FixedPrecisionType, IntegerPrecisionType, NamedType, Source, quantize_fixed
+
+
+def _as_fixed(precision):
+    if isinstance(precision, FixedPrecisionType):
+        return precision
+    if isinstance(precision, IntegerPrecisionType):
+        return FixedPrecisionType(width=precision.width, integer=precision.width, signed=precision.signed)
+    return None
+
+
+def csd_digits(value):
+    """Canonical signed digit representation of an integer.
+
+    Args:
+        value (int): The integer to represent.
+
+    Returns:
+        list: The nonzero digits as (position, sign) tuples, from the least significant one. No two digits are adjacent,
+        so their number is the minimum over all signed digit representations.
+    """
+    digits = []
+    position = 0
+    while value != 0:
+        if value & 1:
+            sign = 2 - (value & 3)
+            digits.append((position, sign))
+            value -= sign
+        value >>= 1
+        position += 1
+    return digits
+
+
+def _match_pattern(terms, pattern):
+    """Greedily pairs the digits of a constant that match a (distance, relative sign) pattern, without overlaps."""
+    distance, relative_sign = pattern
+    digits = {pos: sign for pos, sign, sub in terms if sub is None}
+    pairs = []
+    for pos in sorted(digits):
+        other = pos + distance
+        if pos in digits and other in digits and digits[pos] * digits[other] == relative_sign:
+            pairs.append((pos, other))
+            del digits[pos], digits[other]
+    return pairs
+
+
+def _count_patterns(constants):
+    counts = Counter()
+    for terms in constants:
+        positions = sorted((pos, sign) for pos, sign, sub in terms if sub is None)
+        patterns = {
+            (pos_hi - pos_lo, sign_lo * sign_hi)
+            for i, (pos_lo, sign_lo) in enumerate(positions)
+            for pos_hi, sign_hi in positions[i + 1 :]
+        }
+        for pattern in patterns:
+            counts[pattern] += len(_match_pattern(terms, pattern))
+    return counts
+
+
+def share_subexpressions(constants):
+    """Extracts the two-digit subexpressions common to the constants multiplying the same input.
+
+    The most frequent pattern of two digits (their distance and relative sign) is repeatedly replaced by a new
+    subexpression ``x + sign * (x << distance)``, as long as it occurs at least twice. The subexpressions are only
+    built from the digits themselves, so each of them costs one adder.
+
+    Args:
+        constants (list): The digits of each constant, as lists of (position, sign) tuples.
+
+    Returns:
+        tuple: The subexpressions as (distance, sign) tuples, and the terms of each constant as (position, sign,
+        subexpression) tuples, where the subexpression is None for the input itself.
+    """
+    terms = [[(pos, sign, None) for pos, sign in digits] for digits in constants]
+    subexpressions = []
+    while True:
+        counts = _count_patterns(terms)
+        if not counts:
+            break
+        # Most frequent, then shortest, pattern first, for a deterministic result
+        pattern = min(counts, key=lambda p: (-counts[p], p[0], -p[1]))
+        if counts[pattern] < 2:
+            break
+        sub = len(subexpressions)
+        subexpressions.append(pattern)
+        for i, const_terms in enumerate(terms):
+            pairs = _match_pattern(const_terms, pattern)
+            if not pairs:
+                continue
+            paired = {pos for pair in pairs for pos in pair}
+            signs = {pos: sign for pos, sign, s in const_terms if s is None}
+            new_terms = [t for t in const_terms if t[2] is not None or t[0] not in paired]
+            new_terms.extend((pos_lo, signs[pos_lo], sub) for pos_lo, _ in pairs)
+            terms[i] = sorted(new_terms, key=lambda t: t[0])
+    return subexpressions, terms
+
+
+class GenerateShiftAddMultiplication(OptimizerPass):
+    '''
+    Generates the matrix-vector multiplication of Dense/Conv1D/Conv2D layers with the Latency strategy and a nonzero
+    ShiftAddMaxDigits as shift-and-add trees. The multiplications by weights with at most ShiftAddMaxDigits nonzero
+    digits in canonical signed digit form are expanded into shifts of the input, the two-digit subexpressions common to
+    the weights multiplying the same input are shared, and the other weights keep using the product of the layer.
+
+    The terms are computed exactly in a new shift_add_t type and cast to the accumulator, so the results are identical
+    to those of the DenseLatency implementation.
+    '''
+
+    def match(self, node):
+        return (
+            isinstance(node, (Dense, Conv1D, Conv2D))
+            and not isinstance(node, (DepthwiseConv1D, DepthwiseConv2D))
+            and node.get_attr('strategy', 'latency').lower() == 'latency'
+            and int(node.get_attr('shift_add_max_digits', 0)) > 0
+            and node.get_attr('implementation', '') != 'winograd'
+            and node.get_attr('_shift_add_applied') is None
+        )
+
+    def transform(self, model, node):
+        weights = node.weights['weight']
+        input_precision = _as_fixed(node.get_input_variable().type.precision)
+        weight_precision = _as_fixed(weights.type.precision)
+        product_type = model.config.backend.product_type(node.get_input_variable().type.precision, weights.type.precision)
+        if input_precision is None or weight_precision is None or product_type != 'mult':
+            node.set_attr('_shift_add_applied', False)
+            return False
+
+        n_in, n_out = model.config.backend.get_layer_mult_size(node)
+        max_digits = int(node.get_attr('shift_add_max_digits'))
+
+        # The weights as written to the project and converted by the weight type, in units of its LSB
+        data = quantize_fixed(np.array([float(w) for w in weights]), weight_precision)
+        scaled = np.rint(data * 2.0**weight_precision.fractional).astype(np.int64).reshape(n_in, n_out)
+
+        # Weights in CSD form (n_in lists of (output, digits)), and the remaining (input, output) multiplications
+        csd_weights = [[] for _ in range(n_in)]
+        generic = []
+        for i in range(n_in):
+            for o in range(n_out):
+                if scaled[i, o] == 0:
+                    continue
+                digits = csd_digits(int(scaled[i, o]))
+                if len(digits) <= max_digits:
+                    csd_weights[i].append((o, [(pos - weight_precision.fractional, sign) for pos, sign in digits]))
+                else:
+                    generic.append((i, o))
+
+        if not any(csd_weights):
+            node.set_attr('_shift_add_applied', False)
+            return False
+
+        shared = [share_subexpressions([digits for _, digits in row]) for row in csd_weights]
+
+        shift_add_t = self._get_shift_add_type(node, input_precision, csd_weights, shared)
+        node.set_attr('shift_add_t', shift_add_t)
+
+        code_str = self._generate_shift_add_function(n_in, n_out, shift_add_t.name, csd_weights, shared, generic, node.index)
+        node.set_attr('shift_add_codegen', Source(code_str))
+        node.set_attr('shift_add_n_products', len(generic))
+        node.set_attr('_shift_add_applied', True)
+
+        return False
+
+    @staticmethod
+    def _get_shift_add_type(node, input_precision, csd_weights, shared):
+        positions = [pos for row in csd_weights for _, digits in row for pos, _ in digits]
+        distances = [distance for subexpressions, _ in shared for distance, _ in subexpressions]
+
+        # Wide enough to hold the shifted inputs, the subexpressions and the products exactly
+        input_integer = input_precision.integer + (0 if input_precision.signed else 1)
+        integer = input_integer + max(positions + distances + [0]) + 2
+        fractional = input_precision.fractional + max(0, -min(positions))
+        precision = FixedPrecisionType(width=integer + fractional, integer=integer, signed=True)
+
+        return NamedType(node.name + '_shift_add_t', precision)
+
+    @staticmethod
+    def _shifted(var, pos):
+        if pos > 0:
+            return f'({var} << {pos})'
+        elif pos < 0:
+            return f'({var} >> {-pos})'
+        return var
+
+    def _sum(self, terms):
+        expr = ''
+        for var, pos, sign in terms:
+            shifted = self._shifted(var, pos)
+            if not expr:
+                expr = shifted if sign > 0 else f'-{shifted}'
+            else:
+                expr += f' + {shifted}' if sign > 0 else f' - {shifted}'
+        return expr
+
+    def _generate_shift_add_function(self, n_in, n_out, type_name, csd_weights, shared, generic, function_suffix):
+        """
+        Generate a C++ function that computes the matrix-vector multiplication of the Latency strategy with shifts and
+        additions of the inputs instead of products, for the weights that were converted to CSD form.
+
+        Args:
+            n_in (int): Number of inputs
+            n_out (int): Number of outputs
+            type_name (str): Name of the type of the shifted inputs and subexpressions
+            csd_weights (list): Output index and CSD digits of the converted weights, per input
+            shared (list): Subexpressions and terms of each converted weight, per input
+            generic (list): (input, output) indices of the weights using the product of the layer
+            function_suffix (str): Suffix of the generated class name
+        Returns:
+            generated_code: Generated C++ function (string)
+        """
+
+        indent = '    '
+
+        generated_code = [
+            'template<class data_T, class res_T, typename CONFIG_T>\n',
+            f'class dense_shift_add_{function_suffix} : public DenseShiftAddKernel<data_T, res_T, CONFIG_T> {{\n',
+            f'{indent}public:\n',
+            f'{indent}static void dense(\n',
+            f'{indent}data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_out],\n',
+            f'{indent}typename CONFIG_T::weight_t weights[CONFIG_T::n_in * CONFIG_T::n_out],\n',
+            f'{indent}typename CONFIG_T::bias_t biases[CONFIG_T::n_out]\n',
+            f'{indent}) {{\n',
+            f'{indent*2}#pragma HLS function_instantiate variable=weights,biases\n',
+            f'{indent*2}#pragma HLS PIPELINE II=CONFIG_T::reuse_factor\n',
+            '\n',
+            f'{indent*2}#pragma HLS ARRAY_PARTITION variable=biases complete\n',
+            '\n',
+            f'{indent*2}typename CONFIG_T::accum_t acc[CONFIG_T::n_out];\n',
+            f'{indent*2}#pragma HLS ARRAY_PARTITION variable=acc complete\n',
+            '\n',
+            f'{indent*2}InitAccum:\n',
+            f'{indent*2}for (int i = 0; i < CONFIG_T::n_out; i++) {{\n',
+            f'{indent*3}#pragma HLS UNROLL\n',
+            f'{indent*3}acc[i] = (typename CONFIG_T::accum_t) biases[i];\n',
+            f'{indent*2}}}\n',
+            '\n',
+        ]
+
+        # Products by the weights that weren't converted, limited as in DenseLatency. The multiplier_limit of the config
+        # only counts these products (see the n_zeros of the config templates). Convolutions in io_parallel inline this
+        # kernel for all the pixels and apply the same limit to the whole layer, as conv_1d_latency_cl does.
+        if generic:
+            generated_code.append(
+                f'{indent*2}#pragma HLS ALLOCATION operation instances=mul limit=CONFIG_T::multiplier_limit\n'
+            )
+            generated_code.append('\n')
+
+        # One block per input, accumulated in the same order as in DenseLatency
+        generic_outputs = [[] for _ in range(n_in)]
+        for i, o in generic:
+            generic_outputs[i].append(o)
+
+        generated_code.append(f'{indent*2}MULT: {{\n')
+        for i, (row, (subexpressions, terms)) in enumerate(zip(csd_weights, shared)):
+            if not row and not generic_outputs[i]:
+                continue
+            generated_code.append(f'{indent*3}IN{i}: {{\n')
+            generated_code.extend(
+                f'{indent*4}acc[{o}] += static_cast<typename CONFIG_T::accum_t>'
+                '(CONFIG_T::template product<data_T, typename CONFIG_T::weight_t>::'
+                f'product(data[{i}], weights[{i * n_out + o}]));\n'
+                for o in generic_outputs[i]
+            )
+            if row:
+                generated_code.append(f'{indent*4}const {type_name} x = data[{i}];\n')
+                generated_code.extend(
+                    f'{indent*4}const {type_name} s{n} = {self._sum([("x", 0, 1), ("x", distance, sign)])};\n'
+                    for n, (distance, sign) in enumerate(subexpressions)
+                )
+            for (o, _), const_terms in zip(row, terms):
+                expr = self._sum([('x' if sub is None else f's{sub}', pos, sign) for pos, sign, sub in const_terms])
+                generated_code.append(f'{indent*4}acc[{o}] += static_cast<typename CONFIG_T::accum_t>({expr});\n')
+            generated_code.append(f'{indent*3}}}\n')
+        generated_code.append(f'{indent*2}}}\n')
+        generated_code.append('\n')
+
+        generated_code.extend(
+            [
+                f'{indent*2}Result:\n',
+                f'{indent*2}for (int i = 0; i < CONFIG_T::n_out; i++) {{\n',
+                f'{indent*3}#pragma HLS UNROLL\n',
+                f'{indent*3}res[i] = cast<data_T, res_T, CONFIG_T>(acc[i]);\n',
+                f'{indent*2}}}\n',
+                f'{indent}}}\n',
+                '};\n',
+            ]
+        )
+
+        return ''.join(generated_code)
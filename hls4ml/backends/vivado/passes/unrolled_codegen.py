@@ -1,18 +1,26 @@
+import hashlib
 import math
+from collections import OrderedDict
 
 import numpy as np
 
-from hls4ml.model.layers import GRU, LSTM, Conv1D, Conv2D, Dense
+from hls4ml.model.layers import GRU, LSTM, Conv1D, Conv2D, Dense, DepthwiseConv1D, DepthwiseConv2D
 from hls4ml.model.optimizer import OptimizerPass
 from hls4ml.model.types import Source
 
+# Generated multiplication code of recently processed layers, keyed by the hash of the weights and the layer parameters.
+# The generated code doesn't depend on the backend, backend-specific pragmas are added afterwards.
+_UNROLLED_CACHE_SIZE = 128
+_unrolled_mult_code_cache = OrderedDict()
+
 
 class GenerateUnrolledDenseResource(OptimizerPass):
     '''Generates C++ code for unrolled Dense resource'''
 
     def match(self, node):
-        # Only apply to layers use that use Dense Matrix Multiplication
-        # TODO - Extend (& test) for Separable Conv / Depthwise Conv / Recurrent layers
+        # Only apply to layers use that use Dense Matrix Multiplication, or its element-wise variant in depthwise
+        # convolutions. Pointwise convolutions derive from Conv1D/Conv2D, and separable convolutions are split into
+        # depthwise and pointwise convolutions before this pass.
         layers_with_dense = (Dense, Conv1D, Conv2D, LSTM, GRU)
 
         # Unrolled Dense mimics the hardware implementation of Resource strategy -> apply after Resource optimizer
@@ -44,6 +52,16 @@ class GenerateUnrolledDenseResource(OptimizerPass):
             code_str = self._add_backend_specific_pragmas_to_generated_code(code_str, model.config.backend)
             node.set_attr('resource_unrolled_dense_codegen_2', Source(code_str))
 
+        elif isinstance(node, (DepthwiseConv1D, DepthwiseConv2D)):
+            n_chan = node.get_attr('n_chan')
+            n_in = n_chan * node.get_attr('filt_height', 1) * node.get_attr('filt_width')
+            reuse_factor = node.get_attr('reuse_factor')
+            weights = node.weights['weight']
+
+            code_str = self._generate_unrolled_depthwise_function(n_in, n_chan, reuse_factor, weights, node.index)
+            code_str = self._add_backend_specific_pragmas_to_generated_code(code_str, model.config.backend)
+            node.set_attr('resource_unrolled_dense_codegen', Source(code_str))
+
         else:
             n_in, n_out = node.model.config.backend.get_layer_mult_size(node)
             reuse_factor = node.get_attr('reuse_factor')
@@ -97,19 +115,108 @@ class GenerateUnrolledDenseResource(OptimizerPass):
             '\n'
         ).format(suffix=function_suffix)
 
-        # Unrolled multiplication, according to the three cases
-        if reuse_factor <= n_in:
-            mult_code = self._generate_unrolled_mult_code_rf_leq_nin(n_in, n_out, reuse_factor, weights)
-        elif reuse_factor > n_in and reuse_factor % n_in == 0:
-            mult_code = self._generate_unrolled_mult_code_rf_gt_nin_rem0(n_in, n_out, reuse_factor, weights)
+        # Unrolled multiplication, reused from previous invocations if the weights and the layer parameters are unchanged
+        cache_key = self._get_cache_key(n_in, n_out, reuse_factor, weights)
+        mult_code = _unrolled_mult_code_cache.get(cache_key)
+        if mult_code is None:
+            # Unrolled multiplication, according to the three cases
+            if reuse_factor <= n_in:
+                mult_code = self._generate_unrolled_mult_code_rf_leq_nin(n_in, n_out, reuse_factor, weights)
+            elif reuse_factor > n_in and reuse_factor % n_in == 0:
+                mult_code = self._generate_unrolled_mult_code_rf_gt_nin_rem0(n_in, n_out, reuse_factor, weights)
+            else:
+                # This case shouldn't happen if my understanding of RF is correct
+                # The function fpga_backend._validate_reuse_factor() has assertion rf % n_in == 0 or rf < n_in
+                raise Exception('Not implemented...')
+            self._cache_mult_code(cache_key, mult_code)
         else:
-            # This case shouldn't happen if my understanding of RF is correct
-            # The function fpga_backend._validate_reuse_factor() has assertion rf % n_in == 0 or rf < n_in
-            raise Exception('Not implemented...')
+            _unrolled_mult_code_cache.move_to_end(cache_key)
 
         # Write output
         generated_code += mult_code + '\n'
-        generated_code += (
+        generated_code += self._generate_unrolled_result_code()
+
+        return generated_code
+
+    def _generate_unrolled_depthwise_function(self, n_in, n_chan, reuse_factor, weights, function_suffix):
+        """
+        Generate a C++ function that mimics the Resource implementation of the element-wise multiplication of depthwise
+        convolutions.
+
+        The weights are laid out as (kernel, channel) and each of them is multiplied with the input at the same index, so
+        the multiplications are split over the reuse factor the same way as in Dense Resource, with the accumulator
+        selected by the channel. Multiplications by zero weights are skipped.
+
+        Args:
+            n_in (int): Number of weights, i.e., kernel size times the number of channels
+            n_chan (int): Number of channels (and outputs)
+            reuse_factor (int): Reuse factor, a divisor of n_in
+            weights (WeightVariable): Weights of the layer
+            function_suffix (str): Suffix of the generated class name
+        Returns:
+            generated_code: Generated C++ function (string)
+        """
+
+        # Variable instantiation and function pragmas
+        generated_code = (
+            'template<class data_T, class res_T, typename CONFIG_T>\n'
+            'class depthwise_resource_unrolled_{suffix} : public DenseKernel<data_T, res_T, CONFIG_T> {{{{\n'
+            '    public:\n'
+            '    static void dense(\n'
+            '    data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_out],\n'
+            '    typename CONFIG_T::weight_t weights[CONFIG_T::n_in],\n'
+            '    typename CONFIG_T::bias_t biases[CONFIG_T::n_out]\n'
+            '    ) {{{{\n'
+            '        #pragma HLS pipeline II=CONFIG_T::reuse_factor\n'
+            '\n'
+            '        constexpr int block_factor = DIV_ROUNDUP(CONFIG_T::n_in, CONFIG_T::reuse_factor);\n'
+            '        #pragma HLS ARRAY_RESHAPE variable=weights block factor=block_factor\n'
+            '        {{weights_resource_pragma}}\n'
+            '        #pragma HLS ARRAY_PARTITION variable=biases complete\n'
+            '\n'
+            '        typename CONFIG_T::accum_t acc[CONFIG_T::n_out];\n'
+            '        #pragma HLS ARRAY_PARTITION variable=acc complete\n'
+            '\n'
+            '        InitAccum:\n'
+            '        for (int i = 0; i < CONFIG_T::n_out; i++) {{{{\n'
+            '            #pragma HLS UNROLL\n'
+            '            acc[i] = (typename CONFIG_T::accum_t) biases[i];\n'
+            '        }}}}\n'
+            '\n'
+        ).format(suffix=function_suffix)
+
+        cache_key = self._get_cache_key(n_in, n_chan, reuse_factor, weights) + ('depthwise',)
+        mult_code = _unrolled_mult_code_cache.get(cache_key)
+        if mult_code is None:
+            block_factor = int(math.ceil(n_in / reuse_factor))
+
+            # Indices are laid out as (reuse_factor, block_factor), i.e., one row per reuse step (M{ir} block)
+            ir = np.arange(reuse_factor)[:, None]
+            step = np.arange(block_factor)[None, :]
+
+            w_index = ir + step * reuse_factor
+            out_index = w_index % n_chan
+
+            # Element-wise, i.e., a Dense layer with one output per weight from the point of view of the multipliers
+            mult_code = self._emit_unrolled_mult_code(n_in, 1, reuse_factor, weights, w_index, w_index, out_index)
+            self._cache_mult_code(cache_key, mult_code)
+        else:
+            _unrolled_mult_code_cache.move_to_end(cache_key)
+
+        generated_code += mult_code + '\n'
+        generated_code += self._generate_unrolled_result_code()
+
+        return generated_code
+
+    @staticmethod
+    def _cache_mult_code(cache_key, mult_code):
+        _unrolled_mult_code_cache[cache_key] = mult_code
+        if len(_unrolled_mult_code_cache) > _UNROLLED_CACHE_SIZE:
+            _unrolled_mult_code_cache.popitem(last=False)
+
+    @staticmethod
+    def _generate_unrolled_result_code():
+        return (
             '        Result:\n'
             '        for (int i = 0; i < CONFIG_T::n_out; i++) {{\n'
             '            #pragma HLS UNROLL\n'
@@ -119,7 +226,11 @@ class GenerateUnrolledDenseResource(OptimizerPass):
             '}};\n'
         )
 
-        return generated_code
+    @staticmethod
+    def _get_cache_key(n_in, n_out, reuse_factor, weights):
+        data = np.ascontiguousarray(weights.data)
+        digest = hashlib.sha256(data.tobytes()).hexdigest()
+        return (digest, data.dtype.str, data.shape, n_in, n_out, reuse_factor)
 
     def _generate_unrolled_mult_code_rf_leq_nin(self, n_in, n_out, reuse_factor, weights):
         # Function constants
@@ -128,52 +239,34 @@ class GenerateUnrolledDenseResource(OptimizerPass):
         mult_limit = int(math.ceil(n_in * n_out / mult_factor))
         mult_scale = mult_limit // n_out
 
-        # Zero DSPs are the DSP blocks that always have zero input
-        # In this case, it is the number of rows in the transposed and reshaped weight matrix
-        # The new shape is (parallel_mult, reuse_factor)
-        zeros = np.sum(~weights.data.reshape(block_factor, reuse_factor).any(1))
-
-        # Used to pad the code to make it human-readable
-        indent = '    '
+        # Indices are laid out as (reuse_factor, block_factor), i.e., one row per reuse step (M{ir} block)
+        ir = np.arange(reuse_factor)[:, None]
+        step = np.arange(block_factor)[None, :]
 
-        # Generate unrolled multiplications
-        mult_code = f'{indent*2}#pragma HLS ALLOCATION operation instances=mul limit={mult_limit - zeros}\n'
-        mult_code += f'{indent*2}MULT: {{{{\n'
+        # Input index wraps around to the start of the reuse step once it goes past n_in
+        n_steps_before_wrap = -(-(n_in - ir) // reuse_factor)
+        w_index = ir + step * reuse_factor
+        in_index = ir + (step % n_steps_before_wrap) * reuse_factor
+        out_index = np.broadcast_to(step // mult_scale, w_index.shape)
 
-        for ir in range(reuse_factor):
-            acc_step = 0
-            out_index = 0
-            w_index = ir
-            in_index = ir
-
-            mult_code += f'{indent*3}M{ir}: {{{{\n'
-            for _ in range(block_factor):
-                if weights.data.flatten()[w_index] != 0:
-                    mult_code += (
-                        f'{indent*4}acc[{out_index}] += '
-                        'static_cast<typename CONFIG_T::accum_t>'
-                        '(CONFIG_T::template product<data_T, typename CONFIG_T::weight_t>::'
-                        f'product(data[{in_index}], weights[{w_index}]));\n'
-                    )
-
-                w_index += reuse_factor
-                in_index += reuse_factor
-                if in_index >= n_in:
-                    in_index = ir
-                if acc_step + 1 >= mult_scale:
-                    acc_step = 0
-                    out_index += 1
-                else:
-                    acc_step += 1
-
-            mult_code += f'{indent*3}}}}}\n'
-
-        mult_code += f'{indent*2}}}}}\n'
-
-        return mult_code
+        return self._emit_unrolled_mult_code(n_in, n_out, reuse_factor, weights, w_index, in_index, out_index)
 
     def _generate_unrolled_mult_code_rf_gt_nin_rem0(self, n_in, n_out, reuse_factor, weights):
         # Function constants
+        block_factor = int(math.ceil(n_in * n_out / reuse_factor))
+        outscale = reuse_factor // n_in
+
+        # Indices are laid out as (reuse_factor, block_factor), i.e., one row per reuse step (M{ir} block)
+        ir = np.arange(reuse_factor)[:, None]
+        step = np.arange(block_factor)[None, :]
+
+        w_index = ir + step * reuse_factor
+        in_index = np.broadcast_to(ir % n_in, w_index.shape)
+        out_index = ir // n_in + step * outscale
+
+        return self._emit_unrolled_mult_code(n_in, n_out, reuse_factor, weights, w_index, in_index, out_index)
+
+    def _emit_unrolled_mult_code(self, n_in, n_out, reuse_factor, weights, w_index, in_index, out_index):
         mult_factor = min(n_in, reuse_factor)
         block_factor = int(math.ceil(n_in * n_out / reuse_factor))
         mult_limit = int(math.ceil(n_in * n_out / mult_factor))
@@ -183,52 +276,36 @@ class GenerateUnrolledDenseResource(OptimizerPass):
         # The new shape is (parallel_mult, reuse_factor)
         zeros = np.sum(~weights.data.reshape(block_factor, reuse_factor).any(1))
 
+        # Multiplications are only generated for non-zero weights
+        flat_weights = weights.data.flatten()
+        in_range = w_index < n_in * n_out
+        nonzero = np.zeros(w_index.shape, dtype=bool)
+        nonzero[in_range] = flat_weights[w_index[in_range]] != 0
+
         # Used to pad the code to make it human-readable
         indent = '    '
 
-        # Generate out indices
-        outidx = [0] * reuse_factor
-        outstep = 0
-        outscale = reuse_factor // n_in
-        for ir in range(reuse_factor):
-            outidx[ir] = outstep
-            if (ir + 1) % n_in == 0:
-                outstep += 1
-
-        # Define variables
-        in_index = 0
-
         # Generate unrolled multiplications
-        mult_code = f'{indent*2}#pragma HLS ALLOCATION operation instances=mul limit={mult_limit - zeros}\n'
-        mult_code += f'{indent*2}MULT: {{{{\n'
+        mult_code = [
+            f'{indent*2}#pragma HLS ALLOCATION operation instances=mul limit={mult_limit - zeros}\n',
+            f'{indent*2}MULT: {{{{\n',
+        ]
 
         for ir in range(reuse_factor):
-            w_index = ir
-            out_index = outidx[ir]
-
-            mult_code += f'{indent*3}M{ir}: {{{{\n'
-            for _ in range(block_factor):
-                if weights.data.flatten()[w_index] != 0:
-                    mult_code += (
-                        f'{indent*4}acc[{int(out_index)}] += '
-                        'static_cast<typename CONFIG_T::accum_t>'
-                        '(CONFIG_T::template product<data_T, typename CONFIG_T::weight_t>::'
-                        f'product(data[{in_index}], weights[{w_index}]));\n'
-                    )
-
-                w_index += reuse_factor
-                if w_index > n_in * n_out:
-                    break
-                out_index += outscale
-            mult_code += f'{indent*3}}}}}\n'
-
-            in_index += 1
-            if in_index >= n_in:
-                in_index = 0
-
-        mult_code += f'{indent*2}}}}}\n'
-
-        return mult_code
+            mult_code.append(f'{indent*3}M{ir}: {{{{\n')
+            row = nonzero[ir]
+            mult_code.extend(
+                f'{indent*4}acc[{o}] += '
+                'static_cast<typename CONFIG_T::accum_t>'
+                '(CONFIG_T::template product<data_T, typename CONFIG_T::weight_t>::'
+                f'product(data[{i}], weights[{w}]));\n'
+                for o, i, w in zip(out_index[ir][row].tolist(), in_index[ir][row].tolist(), w_index[ir][row].tolist())
+            )
+            mult_code.append(f'{indent*3}}}}}\n')
+
+        mult_code.append(f'{indent*2}}}}}\n')
+
+        return ''.join(mult_code)
 
     def _add_backend_specific_pragmas_to_generated_code(self, code, backend):
         if backend.name == 'Vivado':
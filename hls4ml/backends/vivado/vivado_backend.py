@@ -1,10 +1,11 @@
-import os
+import shutil
 import sys
 from warnings import warn
 
 import numpy as np
 
 from hls4ml.backends import FPGABackend
+from hls4ml.backends.build import run_build_commands
 from hls4ml.backends.fpga.fpga_types import APTypeConverter, HLSTypeConverter
 from hls4ml.backends.vivado.vivado_types import VivadoArrayVariableConverter
 from hls4ml.model.attributes import ChoiceAttribute, ConfigurableAttribute, TypeAttribute
@@ -69,20 +70,46 @@ class VivadoBackend(FPGABackend):
             attrs.append(ConfigurableAttribute('parallelization_factor', default=1, description=descriptions.conv_pf))
             self.attribute_map[layer] = attrs
 
-        # Add ConvImplementation to Convolution+Pooling layers
+        # Add the threshold of the shift-and-add multiplications to the layers using the latency matrix multiplication
+        shift_add_layers = [Dense, Conv1D, Conv2D]
+        for layer in shift_add_layers:
+            attrs = self.attribute_map.get(layer, [])
+            attrs.append(
+                ConfigurableAttribute('shift_add_max_digits', default=0, description=descriptions.shift_add_max_digits)
+            )
+            self.attribute_map[layer] = attrs
+
+        # Add ConvImplementation to Convolution+Pooling layers, Conv1D/2D can also use Winograd's minimal filtering algorithm
         cnn_layers = [Conv1D, Conv2D, SeparableConv1D, SeparableConv2D, DepthwiseConv2D, Pooling1D, Pooling2D]
         for layer in cnn_layers:
             attrs = self.attribute_map.get(layer, [])
-            attrs.append(
-                ChoiceAttribute(
-                    'conv_implementation',
-                    choices=['LineBuffer', 'Encoded'],
-                    default='LineBuffer',
-                    description=descriptions.conv_implementation,
+            if layer in [Conv1D, Conv2D]:
+                attrs.append(
+                    ChoiceAttribute(
+                        'conv_implementation',
+                        choices=['LineBuffer', 'Encoded', 'Winograd'],
+                        default='LineBuffer',
+                        description=descriptions.conv_implementation_winograd,
+                    )
+                )
+                attrs.append(
+                    ChoiceAttribute(
+                        'winograd_output_tile', choices=[2, 4], default=2, description=descriptions.winograd_output_tile
+                    )
+                )
+            else:
+                attrs.append(
+                    ChoiceAttribute(
+                        'conv_implementation',
+                        choices=['LineBuffer', 'Encoded'],
+                        default='LineBuffer',
+                        description=descriptions.conv_implementation,
+                    )
                 )
-            )
             self.attribute_map[layer] = attrs
 
+        self._register_piecewise_activation_attributes()
+
     def _register_flows(self):
         initializers = self._get_layer_initializers()
         init_flow = register_flow('init_layers', initializers, requires=['optimize'], backend=self.name)
@@ -118,6 +145,11 @@ class VivadoBackend(FPGABackend):
         optimization_flow = register_flow('optimize', optimization_passes, requires=[init_flow], backend=self.name)
 
         vivado_types = [
+            'vivado:balance_dataflow',
+            'vivado:fit_piecewise_activations',
+            'vivado:generate_activation_tables',
+            'vivado:apply_winograd_kernel_transformation',
+            'vivado:generate_shift_add_multiplication',
             'vivado:transform_types',
             'vivado:register_bram_weights',
             'vivado:generate_conv_streaming_instructions',
@@ -141,6 +173,10 @@ class VivadoBackend(FPGABackend):
 
         register_flow('fifo_depth_optimization', fifo_depth_opt_passes, requires=['vivado:ip'], backend=self.name)
 
+        csim_fifo_depth_opt_passes = ['vivado:csim_fifo_depth_optimization'] + writer_passes
+
+        register_flow('csim_fifo_depth_optimization', csim_fifo_depth_opt_passes, requires=['vivado:ip'], backend=self.name)
+
         all_passes = get_backend_passes(self.name)
 
         extras = [
@@ -156,6 +192,7 @@ class VivadoBackend(FPGABackend):
             + templates
             + writer_passes
             + fifo_depth_opt_passes
+            + csim_fifo_depth_opt_passes
         ]
 
         if len(extras) > 0:
@@ -189,6 +226,7 @@ class VivadoBackend(FPGABackend):
         namespace=None,
         write_weights_txt=True,
         write_tar=False,
+        fast_csim=False,
         **_,
     ):
         """Create initial configuration of the Vivado backend.
@@ -203,6 +241,9 @@ class VivadoBackend(FPGABackend):
             write_weights_txt (bool, optional): If True, writes weights to .txt files which speeds up compilation.
                 Defaults to True.
             write_tar (bool, optional): If True, compresses the output directory into a .tar.gz file. Defaults to False.
+            fast_csim (bool, optional): If True, the library built by ``compile()`` uses fast, bit-exact replacements
+                of the ap_fixed types of up to 64 bits, which makes ``predict()`` faster. The HLS project is not
+                affected. Defaults to False.
 
         Returns:
             dict: initial configuration.
@@ -218,6 +259,7 @@ class VivadoBackend(FPGABackend):
             'Namespace': namespace,
             'WriteWeightsTxt': write_weights_txt,
             'WriteTar': write_tar,
+            'FastCSim': fast_csim,
         }
 
         return config
@@ -233,14 +275,38 @@ class VivadoBackend(FPGABackend):
         export=False,
         vsynth=False,
         fifo_opt=False,
+    ):
+        commands = self.get_build_commands(
+            model,
+            reset=reset,
+            csim=csim,
+            synth=synth,
+            cosim=cosim,
+            validation=validation,
+            export=export,
+            vsynth=vsynth,
+            fifo_opt=fifo_opt,
+        )
+        run_build_commands(commands, model.config.get_output_dir())
+
+        return self.get_build_report(model)
+
+    def get_build_commands(
+        self,
+        model,
+        reset=False,
+        csim=True,
+        synth=True,
+        cosim=False,
+        validation=False,
+        export=False,
+        vsynth=False,
+        fifo_opt=False,
     ):
         if 'linux' in sys.platform:
-            found = os.system('command -v vivado_hls > /dev/null')
-            if found != 0:
+            if shutil.which('vivado_hls') is None:
                 raise Exception('Vivado HLS installation not found. Make sure "vivado_hls" is on PATH.')
 
-        curr_dir = os.getcwd()
-        os.chdir(model.config.get_output_dir())
         vivado_cmd = (
             f'vivado_hls -f build_prj.tcl "reset={reset} '
             f'csim={csim} '
@@ -251,9 +317,10 @@ class VivadoBackend(FPGABackend):
             f'vsynth={vsynth} '
             f'fifo_opt={fifo_opt}"'
         )
-        os.system(vivado_cmd)
-        os.chdir(curr_dir)
 
+        return [vivado_cmd]
+
+    def get_build_report(self, model):
         return parse_vivado_report(model.config.get_output_dir())
 
     @layer_optimizer(Layer)
@@ -400,6 +467,8 @@ class VivadoBackend(FPGABackend):
             layer.set_attr('strategy', 'resource')
             n_in, n_out = self.get_layer_mult_size(layer)
             self.set_closest_reuse_factor(layer, n_in, n_out)
+        elif layer.model.config.get_strategy(layer).lower() == 'resource_unrolled':
+            self._init_depconv_resource_unrolled(layer)
         else:
             layer.set_attr('strategy', 'latency')
 
@@ -523,6 +592,8 @@ class VivadoBackend(FPGABackend):
             layer.set_attr('strategy', 'resource')
             n_in, n_out = self.get_layer_mult_size(layer)
             self.set_closest_reuse_factor(layer, n_in, n_out)
+        elif layer.model.config.get_strategy(layer).lower() == 'resource_unrolled':
+            self._init_depconv_resource_unrolled(layer)
         else:
             layer.set_attr('strategy', 'latency')
 
@@ -543,6 +614,27 @@ class VivadoBackend(FPGABackend):
 
         layer.set_attr('implementation', layer.model.config.get_conv_implementation(layer).lower())
 
+    def _init_depconv_resource_unrolled(self, layer):
+        if layer.model.config.get_config_value('IOType') == 'io_parallel':
+            print(
+                f'Unrolled resource strategy cannot be combined with io_parallel in layer "{layer.name}". '
+                'Using "latency" strategy instead.'
+            )
+            layer.set_attr('strategy', 'latency')
+            return
+
+        # Depthwise multiplication is element-wise, each weight is used with a single input
+        n_in = layer.get_attr('n_chan') * layer.get_attr('filt_height', 1) * layer.get_attr('filt_width')
+        self.set_closest_reuse_factor(layer, n_in, 1)
+        if layer.get_attr('reuse_factor') == 1:
+            print(
+                f'Unrolled resource strategy cannot be combined with reuse factor 1 in layer "{layer.name}". '
+                'Using "latency" strategy instead.'
+            )
+            layer.set_attr('strategy', 'latency')
+        else:
+            layer.set_attr('strategy', 'resource_unrolled')
+
     @layer_optimizer(Pooling1D)
     def init_pooling1d(self, layer):
         layer.set_attr('implementation', layer.model.config.get_conv_implementation(layer).lower())
@@ -1,7 +1,6 @@
 from hls4ml.backends.vivado.passes.fifo_depth_optimization import (
     generate_max_depth_file,
     get_vcd_data,
-    populate_values,
     set_big_fifos,
     set_fifo_depth,
 )
@@ -33,25 +32,12 @@ class FifoDepthOptimization(ConfigurableOptimizerPass, ModelOptimizerPass):
         if profiling_fifo_depth:
             set_big_fifos(model.output_vars, profiling_fifo_depth)
 
-        data = get_vcd_data(model)
+        maxs = get_vcd_data(model)
 
-        for i in range(1, len(data['children'][0]['children'][0]['children'])):
-            # wrapper fifos
-            populate_values(
-                self.values,
-                data['children'][0]['children'][0]['children'][i]['name'],
-                data['children'][0]['children'][0]['children'][i]['children'][0]['data'],
-                data['children'][0]['children'][0]['children'][i]['children'][1]['data'],
-            )
-
-        n_elem = len(data['children'][0]['children'][0]['children'][0]['children'])
-        for i in range(n_elem):
-            name = data['children'][0]['children'][0]['children'][0]['children'][i]['name']
-            data_p = data['children'][0]['children'][0]['children'][0]['children'][i]['children'][0]['data']
-            depth = data['children'][0]['children'][0]['children'][0]['children'][i]['children'][1]['data']
-            populate_values(self.values, name, data_p, depth)
-
-        maxs = [{'name': i['name'], 'max': i['max'], 'depth': i['depth']} for i in self.values]
+        # The FIFOs of the wrapper (in_local and out_local) are listed before the FIFOs of the layers
+        wrapper_maxs = [x for x in maxs if 'in_local' in x['name'] or 'out_local' in x['name']]
+        maxs = wrapper_maxs + [x for x in maxs if x not in wrapper_maxs]
+        self.values = maxs
 
         generate_max_depth_file(model, maxs)
 
@@ -1,8 +1,8 @@
 import os
 
 from hls4ml.backends import VivadoBackend
+from hls4ml.backends.build import run_build_commands
 from hls4ml.model.flow import register_flow
-from hls4ml.report import parse_vivado_report
 
 
 class VivadoAcceleratorBackend(VivadoBackend):
@@ -23,9 +23,38 @@ class VivadoAcceleratorBackend(VivadoBackend):
         vsynth=False,
         fifo_opt=False,
         bitfile=False,
+    ):
+        commands = self.get_build_commands(
+            model,
+            reset=reset,
+            csim=csim,
+            synth=synth,
+            cosim=cosim,
+            validation=validation,
+            export=export,
+            vsynth=vsynth,
+            fifo_opt=fifo_opt,
+            bitfile=bitfile,
+        )
+        run_build_commands(commands, model.config.get_output_dir())
+
+        return self.get_build_report(model)
+
+    def get_build_commands(
+        self,
+        model,
+        reset=False,
+        csim=True,
+        synth=True,
+        cosim=False,
+        validation=False,
+        export=False,
+        vsynth=False,
+        fifo_opt=False,
+        bitfile=False,
     ):
         # run the VivadoBackend build
-        super().build(
+        commands = super().get_build_commands(
             model,
             reset=reset,
             csim=csim,
@@ -45,17 +74,11 @@ class VivadoAcceleratorBackend(VivadoBackend):
         # now make a bitfile
         if bitfile:
             if vivado_accelerator_config.get_board().startswith('alveo'):
-                self.make_xclbin(model, vivado_accelerator_config.get_platform())
+                commands.extend(self._get_xclbin_commands(model, vivado_accelerator_config.get_platform()))
             else:
-                curr_dir = os.getcwd()
-                os.chdir(model.config.get_output_dir())
-                try:
-                    os.system('vivado -mode batch -source design.tcl')
-                except Exception:
-                    print("Something went wrong, check the Vivado logs")
-                os.chdir(curr_dir)
+                commands.append('vivado -mode batch -source design.tcl')
 
-        return parse_vivado_report(model.config.get_output_dir())
+        return commands
 
     def make_xclbin(self, model, platform='xilinx_u250_xdma_201830_2'):
         """Create the xclbin for the given model and target platform.
@@ -66,21 +89,17 @@ class VivadoAcceleratorBackend(VivadoBackend):
                 The host machine only requires the deployment target platform. Refer to the Getting Started section of
                 the Alveo guide. Defaults to 'xilinx_u250_xdma_201830_2'.
         """
-        curr_dir = os.getcwd()
+        commands = self._get_xclbin_commands(model, platform)
+        if run_build_commands(commands, model.config.get_output_dir()) != 0:
+            print("Something went wrong, check the Vitis/Vivado logs")
+
+    def _get_xclbin_commands(self, model, platform):
         abs_path_dir = os.path.abspath(model.config.get_output_dir())
-        os.chdir(abs_path_dir)
-        os.makedirs('xo_files', exist_ok=True)
-        try:
-            os.system('vivado -mode batch -source design.tcl')
-        except Exception:
-            print("Something went wrong, check the Vivado logs")
         project_name = model.config.get_project_name()
         ip_repo_path = abs_path_dir + '/' + project_name + '_prj' + '/solution1/impl/ip'
-        os.makedirs('xclbin_files', exist_ok=True)
-        os.chdir(abs_path_dir + '/xclbin_files')
         # TODO Add other platforms
         vitis_cmd = (
-            "v++ -t hw --platform "
+            "cd xclbin_files && v++ -t hw --platform "
             + platform
             + " --link ../xo_files/"
             + project_name
@@ -89,11 +108,12 @@ class VivadoAcceleratorBackend(VivadoBackend):
             + "_kernel.xclbin' --user_ip_repo_paths "
             + ip_repo_path
         )
-        try:
-            os.system(vitis_cmd)
-        except Exception:
-            print("Something went wrong, check the Vitis/Vivado logs")
-        os.chdir(curr_dir)
+        return [
+            'mkdir -p xo_files',
+            'vivado -mode batch -source design.tcl',
+            'mkdir -p xclbin_files',
+            vitis_cmd,
+        ]
 
     def create_initial_config(
         self,
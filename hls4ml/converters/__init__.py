@@ -159,6 +159,9 @@ def _check_hls_config(config, hls_config):
     if 'SkipOptimizers' in hls_config:
         config['HLSConfig']['SkipOptimizers'] = hls_config['SkipOptimizers']
 
+    if 'Timing' in hls_config:
+        config['HLSConfig']['Timing'] = hls_config['Timing']
+
     return
 
 
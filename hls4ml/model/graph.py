@@ -1,16 +1,88 @@
+import asyncio
+import contextlib
+import copy
 import ctypes
+import multiprocessing
 import os
 import platform
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
 
 import numpy as np
 import numpy.ctypeslib as npc
 
-from hls4ml.backends import get_backend
+from hls4ml.backends import BuildCache, get_backend
 from hls4ml.model.flow import get_flow
-from hls4ml.model.layers import layer_map
+from hls4ml.model.layers import Layer, layer_map
 from hls4ml.model.optimizer import get_available_passes, optimize_model
 from hls4ml.utils.string_utils import convert_to_snake_case
+from hls4ml.utils.timing import Timer, timed
+
+# Top-level configuration keys that are only used when writing the project
+_WRITER_CONFIG_KEYS = {'OutputDir', 'ProjectName', 'ProjectDir', 'WriterConfig'}
+
+# Configuration keys that are only used by the backend flows, applied after the backend-independent 'optimize' flow
+_BACKEND_CONFIG_KEYS = {'Part', 'ClockPeriod', 'ClockUncertainty'}
+_BACKEND_LAYER_CONFIG_KEYS = {'ReuseFactor', 'Strategy', 'TargetCycles', 'ConvImplementation', 'ParallelizationFactor'}
+
+# The model and the configuration overrides of the variants written by `ModelGraph.write_variants`
+_variant_jobs = None
+
+
+def _copy_graph_object(obj, memo):
+    """Copy the containers and hls4ml objects (layers, variables, types...) reachable from obj.
+
+    Other objects, e.g., quantizers of the frameworks, are shared with the copy. NumPy arrays are shared as read-only
+    views, so the weights of a model and its copies can't be modified in place, only replaced.
+    """
+    copied = memo.get(id(obj))
+    if copied is not None:
+        return copied
+
+    if isinstance(obj, np.ndarray):
+        copied = obj.view()
+        copied.flags.writeable = False
+    elif type(obj) in (dict, OrderedDict):
+        copied = memo[id(obj)] = type(obj)()
+        for key, value in obj.items():
+            copied[key] = _copy_graph_object(value, memo)
+    elif type(obj) is list:
+        copied = memo[id(obj)] = []
+        copied.extend(_copy_graph_object(item, memo) for item in obj)
+    elif type(obj) is set:
+        copied = {_copy_graph_object(item, memo) for item in obj}
+    elif type(obj) is tuple:
+        copied = tuple(_copy_graph_object(item, memo) for item in obj)
+    elif (
+        (isinstance(obj, Layer) or type(obj).__module__.startswith('hls4ml.'))
+        and hasattr(obj, '__dict__')
+        and not isinstance(obj, (type, Enum))
+    ):
+        copied = memo[id(obj)] = object.__new__(type(obj))
+        for key, value in obj.__dict__.items():
+            copied.__dict__[key] = _copy_graph_object(value, memo)
+    else:
+        return obj
+
+    memo[id(obj)] = copied
+    return copied
+
+
+def _merge_config(config, overrides):
+    # Recursively merge the overrides into the config, a value of None removes the key
+    for key, value in overrides.items():
+        if value is None:
+            config.pop(key, None)
+        elif isinstance(value, dict) and isinstance(config.get(key), dict):
+            _merge_config(config[key], value)
+        else:
+            config[key] = _copy_graph_object(value, {})
+
+
+def _write_variant(index):
+    model, config_overrides = _variant_jobs
+    model.variant(config_overrides[index]).write()
 
 
 class HLSConfig:
@@ -53,6 +125,12 @@ class HLSConfig:
         self.pipeline_style = 'auto'
         self.pipeline_ii = None
 
+        self.balance_dataflow = False
+        self.dataflow_ii = None
+
+        self._resolved_layers = {}
+        self._parsed_precisions = {}
+
         if 'WriterConfig' in self.config:
             self.writer_config = self.config['WriterConfig']
         else:
@@ -60,6 +138,7 @@ class HLSConfig:
                 'Namespace': None,
                 'WriteWeightsTxt': True,
                 'WriteTar': False,
+                'FastCSim': False,
             }
 
         self._parse_hls_config()
@@ -80,43 +159,84 @@ class HLSConfig:
         return self.get_config_value('OutputDir')
 
     def get_layer_config_value(self, layer, key, default=None):
-        hls_config = self.config['HLSConfig']
+        return self._resolve_layer_config(layer)['source'].get(key, default)
 
-        name_config = hls_config.get('LayerName', {}).get(layer.name, None)
-        if name_config is not None:
-            return name_config.get(key, default)
+    def get_layer_config(self, layer):
+        return dict(self._resolve_layer_config(layer)['config'])
 
-        type_config = hls_config.get('LayerType', {}).get(layer.class_name, None)
-        if type_config is not None:
-            return type_config.get(key, default)
+    def set_name_config(self, name, config):
+        """sets hls_config["LayerName"][name] = config"""
+        hls_config = self.config['HLSConfig']
+        layer_config = hls_config.setdefault('LayerName', {})
+        layer_config[name] = config
+        self.invalidate()
 
-        model_config = hls_config.get('Model', None)
-        if model_config is not None:
-            return model_config.get(key, default)
+    def invalidate(self):
+        """Discard the resolved per-layer configuration.
 
-        return default
+        The configuration of each layer is resolved from the ``LayerName``, ``LayerType`` and ``Model`` sections on first
+        use and cached. The cache is discarded by ``set_name_config`` and ``parse_name_config``; code that modifies the
+        configuration (or the parsed values, e.g., ``layer_name_precision``) directly needs to call this method.
+        """
+        self._resolved_layers.clear()
+
+    def _resolve_layer_config(self, layer):
+        key = (layer.name, layer.__class__)
+        resolved = self._resolved_layers.get(key)
+        if resolved is None:
+            resolved = self._resolved_layers[key] = self._compile_layer_config(
+                layer.name, layer.class_name, layer.__class__.__name__
+            )
+        return resolved
 
-    def get_layer_config(self, layer):
+    def _compile_layer_config(self, name, class_name, type_name):
         hls_config = self.config['HLSConfig']
-        layer_config = {}
+        name_config = hls_config.get('LayerName', {}).get(name, None)
+        type_config = hls_config.get('LayerType', {}).get(class_name, None)
+        model_config = hls_config.get('Model', None)
 
-        type_config = hls_config.get('LayerType', {}).get(layer.class_name, None)
+        layer_config = {}
         if type_config is not None:
             layer_config.update(type_config)
-
-        name_config = hls_config.get('LayerName', {}).get(layer.name, None)
         if name_config is not None:
             layer_config.update(name_config)
 
-        return layer_config
-
-    def set_name_config(self, name, config):
-        """sets hls_config["LayerName"][name] = config"""
-        hls_config = self.config['HLSConfig']
-        layer_config = hls_config.setdefault('LayerName', {})
-        layer_config[name] = config
+        # Values not set for the layer name, layer type or model, in that order of priority
+        def first(*values):
+            return next((value for value in values if value is not None), None)
+
+        name, class_name, type_name = name.lower(), class_name.lower(), type_name.lower()
+        return {
+            # The most specific section configuring the layer, used as a whole by get_layer_config_value
+            'source': first(name_config, type_config, model_config, {}),
+            'config': layer_config,
+            'reuse_factor': first(self.layer_name_rf.get(name), self.layer_type_rf.get(class_name), self.model_rf),
+            'target_cycles': first(
+                self.layer_name_targ_cycles.get(name), self.layer_name_targ_cycles.get(type_name), self.model_targ_cycles
+            ),
+            'strategy': first(
+                self.layer_name_strategy.get(name), self.layer_type_strategy.get(class_name), self.model_strategy
+            ),
+            'conv_implementation': first(
+                self.layer_name_conv_implementation.get(name),
+                self.layer_type_conv_implementation.get(type_name),
+                self.model_conv_implementation,
+            ),
+            'compression': first(
+                self.layer_name_compression.get(name), self.layer_type_compression.get(class_name), self.model_compression
+            ),
+            'precision': {},
+        }
 
     def get_precision(self, layer, var='default'):
+        resolved = self._resolve_layer_config(layer)['precision']
+        if var not in resolved:
+            resolved[var] = self._find_precision(layer, var)
+        precision, type_name = resolved[var]
+
+        return (self._convert_precision(precision), type_name)
+
+    def _find_precision(self, layer, var):
         precision = self.layer_name_precision.get(layer.name.lower() + '_' + var)
         type_name = layer.name.lower() + '_' + var + '_t'
         if precision is None:
@@ -141,20 +261,23 @@ class HLSConfig:
         if precision is None:
             raise Exception(f'No precision for {layer.name}->{var} found and no default specified.')
 
-        precision = self.backend.convert_precision_string(precision)
-
         return (precision, type_name)
 
+    def _convert_precision(self, precision):
+        # Precision strings are parsed once; each call returns a copy, as passes may modify the precision of a type
+        if not isinstance(precision, str):
+            return self.backend.convert_precision_string(precision)
+        parsed = self._parsed_precisions.get(precision)
+        if parsed is None:
+            parsed = self._parsed_precisions[precision] = self.backend.convert_precision_string(precision)
+        return copy.copy(parsed)
+
     def get_bram_size(self, layer):
         bf = self.model_bf
         return bf
 
     def get_reuse_factor(self, layer):
-        rf = self.layer_name_rf.get(layer.name.lower())
-        if rf is None:
-            rf = self.layer_type_rf.get(layer.class_name.lower())
-        if rf is None:
-            rf = self.model_rf
+        rf = self._resolve_layer_config(layer)['reuse_factor']
 
         if rf is None:
             raise Exception(f'No reuse factor for {layer.name} found and no default specified.')
@@ -162,46 +285,23 @@ class HLSConfig:
         return rf
 
     def get_target_cycles(self, layer):
-        targ_cycles = self.layer_name_targ_cycles.get(layer.name.lower())
-        if targ_cycles is None:
-            targ_cycles = self.layer_name_targ_cycles.get(layer.__class__.__name__.lower())
-        if targ_cycles is None:
-            targ_cycles = self.model_targ_cycles
-
-        return targ_cycles
+        return self._resolve_layer_config(layer)['target_cycles']
 
     def get_strategy(self, layer):
-        strategy = self.layer_name_strategy.get(layer.name.lower())
-        if strategy is None:
-            strategy = self.layer_type_strategy.get(layer.class_name.lower())
-        if strategy is None:
-            strategy = self.model_strategy
-
-        return strategy
+        return self._resolve_layer_config(layer)['strategy']
 
     def get_conv_implementation(self, layer):
-        conv_implementation = self.layer_name_conv_implementation.get(layer.name.lower())
-        if conv_implementation is None:
-            conv_implementation = self.layer_type_conv_implementation.get(layer.__class__.__name__.lower())
-        if conv_implementation is None:
-            conv_implementation = self.model_conv_implementation
-
-        return conv_implementation
+        return self._resolve_layer_config(layer)['conv_implementation']
 
     def is_resource_strategy(self, layer):
         return self.get_strategy(layer).lower() == 'resource'
 
     def get_compression(self, layer):
-        compression = self.layer_name_compression.get(layer.name.lower())
-        if compression is None:
-            compression = self.layer_type_compression.get(layer.class_name.lower())
-        if compression is None:
-            compression = self.model_compression
-
-        return compression
+        return self._resolve_layer_config(layer)['compression']
 
     def parse_name_config(self, layer_name, layer_cfg):
         """This is used by _parse_hls_config below, but also in optimizers when a new layer config is created"""
+        self.invalidate()
         precision_cfg = layer_cfg.get('Precision')
         if isinstance(precision_cfg, dict):
             for var, precision in precision_cfg.items():
@@ -239,6 +339,8 @@ class HLSConfig:
         if self.flows is None:
             self.flows = [self.backend.get_default_flow()]
 
+        self.timing = hls_config.get('Timing', False)
+
         # TODO this is now effectively broken
         self.optimizers = hls_config.get('Optimizers')
         if 'SkipOptimizers' in hls_config:
@@ -271,6 +373,8 @@ class HLSConfig:
             self.model_compression = bool(model_cfg.get('Compression', 0))
             self.pipeline_style = model_cfg.get('PipelineStyle', 'auto')
             self.pipeline_ii = model_cfg.get('PipelineInterval', None)
+            self.balance_dataflow = bool(model_cfg.get('BalanceDataflow', False))
+            self.dataflow_ii = model_cfg.get('DataflowInterval', None)
 
         layer_type_cfg = hls_config.get('LayerType')
         if layer_type_cfg is not None:
@@ -321,6 +425,12 @@ class ModelGraph:
     def __init__(self, config, layer_list, inputs=None, outputs=None):
         self.config = HLSConfig(config)
 
+        # keep the layers the model was created from, and the graph after the 'optimize' flow, to create variants
+        self._layer_list = _copy_graph_object(layer_list, {})
+        self._input_layers = inputs
+        self._output_layers = outputs
+        self._variant_base = None
+
         # keep track of the applied flows
         self._applied_flows = []
 
@@ -342,6 +452,8 @@ class ModelGraph:
         self.output_vars = {}
 
         self._top_function_lib = None
+        self._predict_executor = None
+        self.timer = Timer() if self.config.timing else None
 
         self._make_graph(layer_list)
 
@@ -408,23 +520,29 @@ class ModelGraph:
                 return
 
         self._applied_flows.append(applied_flows)
-        self._apply_sub_flow(flow, applied_flows)
+        with self._timing():
+            self._apply_sub_flow(flow, applied_flows)
 
     def _apply_sub_flow(self, flow_name, applied_flows):
         if flow_name in applied_flows:
             return
         flow = get_flow(flow_name)
 
-        for sub_flow in flow.requires:
-            if sub_flow not in applied_flows.keys():
-                self._apply_sub_flow(sub_flow, applied_flows)
+        with timed('flow', flow_name):
+            for sub_flow in flow.requires:
+                if sub_flow not in applied_flows.keys():
+                    self._apply_sub_flow(sub_flow, applied_flows)
 
-        if len(flow.optimizers) > 0:
-            applied_passes = optimize_model(self, flow.optimizers)
-        else:
-            applied_passes = set()
+            if len(flow.optimizers) > 0:
+                applied_passes = optimize_model(self, flow.optimizers)
+            else:
+                applied_passes = set()
         applied_flows[flow.name] = applied_passes
 
+    def _timing(self):
+        # The timer of the model, if enabled with 'Timing' in the configuration
+        return self.timer if self.timer is not None else contextlib.nullcontext()
+
     def make_node(self, kind, name, attributes, inputs, outputs=None):
         """Make a new node not connected to the model graph.
 
@@ -671,12 +789,161 @@ class ModelGraph:
 
     def get_weight_variables(self):
         variables = []
+        seen = set()
         for layer in self.get_layers():
-            weights = layer.get_weights()
-            variables.extend(weights)
+            for weight in layer.get_weights():
+                # Weights can be shared between layers, e.g., identical activation tables
+                if id(weight) not in seen:
+                    seen.add(id(weight))
+                    variables.append(weight)
 
         return variables
 
+    def variant(self, config_overrides):
+        """Create a variant of the model with a modified configuration, without converting the model again.
+
+        The configuration overrides are merged into the configuration of the model, e.g.,
+        ``{'OutputDir': 'prj_rf4', 'HLSConfig': {'LayerName': {'fc1': {'ReuseFactor': 4}}}}``. A value of ``None``
+        removes the key from the configuration. Only the steps affected by the overridden keys are repeated:
+
+        - If only the output directory, the project name or the writer configuration change, the model is copied.
+        - If only the reuse factor, strategy, target cycles, parallelization factor or conv implementation of layers
+          (or the part and clock) change, the graph after the backend-independent ``optimize`` flow is copied and
+          only the backend flows are applied. This graph is created on first use and shared by the variants.
+        - Otherwise (e.g., precision changes), the model is created from the layers it was converted from, skipping the
+          conversion from the original framework.
+
+        The weights are shared (as read-only arrays) with the model and the other variants.
+
+        Args:
+            config_overrides (dict): The configuration keys to change.
+
+        Returns:
+            ModelGraph: The new model.
+        """
+        config = _copy_graph_object(self.config.config, {})
+        _merge_config(config, config_overrides)
+
+        stage = self._get_variant_stage(config_overrides)
+        if stage == 'write':
+            model = self._copy(config)
+            model._variant_base = self._variant_base
+            # Chosen by the backend flows
+            model.config.pipeline_style = self.config.pipeline_style
+            model.config.pipeline_ii = self.config.pipeline_ii
+        elif stage == 'backend':
+            model = self._get_variant_base()._copy(config)
+            model._variant_base = self._variant_base
+            for layer in model.get_layers():
+                for key, value in model.config.get_layer_config(layer).items():
+                    if key in _BACKEND_LAYER_CONFIG_KEYS:
+                        layer.set_attr(convert_to_snake_case(key), value)
+            for flow in model.config.flows:
+                model.apply_flow(flow)
+        else:
+            layer_list = _copy_graph_object(self._layer_list, {})
+            model = ModelGraph(config, layer_list, self._input_layers, self._output_layers)
+
+        return model
+
+    def write_variants(self, config_overrides, processes=None):
+        """Create and write variants of the model (see `variant`) in parallel processes, e.g., for a design-space sweep.
+
+        The processes are forked from the current one, so they share the model. If forking is not supported by the
+        platform, the variants are written sequentially.
+
+        Args:
+            config_overrides (list(dict)): The configuration overrides of each variant. Variants without an
+                ``OutputDir`` are written to ``<OutputDir>_<index>``, where ``OutputDir`` is the one of this model.
+            processes (int, optional): The number of processes. Defaults to None (the number of CPUs).
+
+        Returns:
+            list(str): The output directories of the variants.
+        """
+        global _variant_jobs
+
+        config_overrides = [
+            overrides if 'OutputDir' in overrides else dict(overrides, OutputDir=f'{self.config.get_output_dir()}_{i}')
+            for i, overrides in enumerate(config_overrides)
+        ]
+        # Create the shared graph before starting the processes, so it is created only once
+        for overrides in config_overrides:
+            self._get_variant_stage(overrides)
+
+        if processes == 1 or 'fork' not in multiprocessing.get_all_start_methods():
+            for overrides in config_overrides:
+                self.variant(overrides).write()
+        else:
+            _variant_jobs = (self, config_overrides)
+            try:
+                with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context('fork')) as executor:
+                    list(executor.map(_write_variant, range(len(config_overrides))))
+            finally:
+                _variant_jobs = None
+
+        return [overrides['OutputDir'] for overrides in config_overrides]
+
+    def _get_variant_stage(self, config_overrides):
+        # The first step of the conversion affected by the overrides, 'write', 'backend' or 'convert'
+        stage = 'write'
+        for key, value in config_overrides.items():
+            if key in _WRITER_CONFIG_KEYS:
+                continue
+            if key in _BACKEND_CONFIG_KEYS:
+                stage = 'backend'
+                continue
+            if key != 'HLSConfig' or not isinstance(value, dict):
+                return 'convert'
+            for section, section_config in value.items():
+                if section == 'Model':
+                    layer_configs = [section_config]
+                elif section in ['LayerType', 'LayerName'] and isinstance(section_config, dict):
+                    layer_configs = list(section_config.values())
+                else:
+                    return 'convert'
+                if not all(isinstance(c, dict) and set(c.keys()) <= _BACKEND_LAYER_CONFIG_KEYS for c in layer_configs):
+                    return 'convert'
+                stage = 'backend'
+
+        if stage == 'backend':
+            if not any('optimize' in applied_flows for applied_flows in self._applied_flows):
+                return 'convert'
+            # Layers created or replaced by the backend-independent flows inherit the configuration of the original
+            # layers, so these layers need to be converted again
+            base = self._get_variant_base()
+            hls_config = config_overrides.get('HLSConfig', {})
+            layer_names = {layer.name for layer in base.get_layers()}
+            layer_types = {layer.class_name for layer in base.get_layers()}
+            if not set(hls_config.get('LayerName', {})) <= layer_names:
+                return 'convert'
+            if not set(hls_config.get('LayerType', {})) <= layer_types:
+                return 'convert'
+
+        return stage
+
+    def _get_variant_base(self):
+        if self._variant_base is None:
+            config = _copy_graph_object(self.config.config, {})
+            config['HLSConfig']['Flows'] = ['optimize']
+            layer_list = _copy_graph_object(self._layer_list, {})
+            self._variant_base = ModelGraph(config, layer_list, self._input_layers, self._output_layers)
+        return self._variant_base
+
+    def _copy(self, config):
+        # Copy of the graph with a new configuration, the compiled library and the timer are not copied
+        model = object.__new__(type(self))
+        model.config = HLSConfig(config)
+        model._layer_list = self._layer_list
+        model._variant_base = None
+        model._top_function_lib = None
+        model._predict_executor = None
+        model.timer = Timer() if model.config.timing else None
+        memo = {id(self): model, id(self.config): model.config}
+        for key, value in self.__dict__.items():
+            if key not in model.__dict__:
+                model.__dict__[key] = _copy_graph_object(value, memo)
+        return model
+
     def write(self):
         """Write the generated project to disk.
 
@@ -695,7 +962,13 @@ class ModelGraph:
         self._compile()
 
     def _compile(self):
-        lib_name = self.config.backend.compile(self)
+        if self._predict_executor is not None:
+            # Wait for the asynchronous predictions using the current library before it is rebuilt and replaced, a new
+            # executor is created by the next predict_async
+            self._predict_executor.shutdown(wait=True)
+            self._predict_executor = None
+        with self._timing(), timed('compile', self.config.get_project_name()):
+            lib_name = self.config.backend.compile(self)
         if self._top_function_lib is not None:
             if platform.system() == "Linux":
                 libdl_libs = ['libdl.so', 'libdl.so.2']
@@ -800,6 +1073,80 @@ class ModelGraph:
         else:
             return output
 
+    def predict_async(self, x):
+        """Run `predict()` in the background.
+
+        The predictions run on a single worker thread owned by the model, in the order they were submitted. The compiled
+        library is called without holding the GIL, so the calling thread can e.g., load the next batch meanwhile.
+
+        Args:
+            x (np.ndarray or list): Input data, as for `predict()`.
+
+        Returns:
+            concurrent.futures.Future: The future result of `predict()`.
+        """
+        if self._top_function_lib is None:
+            raise Exception('Model not compiled')
+        if self._predict_executor is None:
+            self._predict_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f'hls4ml-{self.config.get_project_name()}'
+            )
+        return self._predict_executor.submit(self.predict, x)
+
+    async def apredict(self, x):
+        """Awaitable version of `predict()`, for use with asyncio. See `predict_async()`.
+
+        Args:
+            x (np.ndarray or list): Input data, as for `predict()`.
+
+        Returns:
+            np.ndarray or list: The predictions, as returned by `predict()`.
+        """
+        return await asyncio.wrap_future(self.predict_async(x))
+
+    def predict_pipeline(self, batches, callback=None, max_in_flight=2):
+        """Run `predict()` on a stream of batches, overlapping the predictions with producing and consuming the batches.
+
+        The batches are produced and the results are consumed in the calling thread, while up to ``max_in_flight``
+        batches are queued or running in the background (see `predict_async()`).
+
+        Args:
+            batches (iterable): Input batches, as for `predict()`. May be a generator that reads the data.
+            callback (callable, optional): Called with each batch and its predictions, in order. Defaults to None, in
+                which case the predictions are returned.
+            max_in_flight (int, optional): Maximum number of batches submitted but not yet consumed. Defaults to 2.
+
+        Returns:
+            list or None: The predictions of each batch if no callback is given, otherwise None.
+        """
+        if max_in_flight < 1:
+            raise Exception('At least one batch must be in flight')
+
+        results = [] if callback is None else None
+        in_flight = deque()
+
+        def consume():
+            x, future = in_flight.popleft()
+            y = future.result()
+            if callback is None:
+                results.append(y)
+            else:
+                callback(x, y)
+
+        try:
+            for x in batches:
+                if len(in_flight) >= max_in_flight:
+                    consume()
+                in_flight.append((x, self.predict_async(x)))
+            while len(in_flight) > 0:
+                consume()
+        finally:
+            # Don't run the remaining batches if the producer or the consumer fails
+            for _, future in in_flight:
+                future.cancel()
+
+        return results
+
     def trace(self, x):
         print(f'Recompiling {self.config.get_project_name()} with tracing')
         self.config.trace_output = True
@@ -884,13 +1231,101 @@ class ModelGraph:
         else:
             return output, trace_output
 
-    def build(self, **kwargs):
+    def profile_streams(self, x):
+        """Record the order of the reads and writes of all streams while running the compiled model on the data.
+
+        Only the C simulation model of the streams of the Vivado-based backends supports profiling. The reads and
+        writes of all streams share one counter, so the returned values give the order of the operations across streams
+        and samples. See `hls4ml.backends.vivado.passes.csim_fifo_depth_optimization` for how this is used to size the
+        FIFOs between layers.
+
+        Args:
+            x (np.ndarray or list): Input data, as for `predict()`.
+
+        Returns:
+            dict: For each stream (by name, e.g., the name of the variable), a tuple of arrays with the counter values
+            of its writes and of its reads.
+        """
+        top_function, ctype = self._get_top_function(x)
+        if not hasattr(self._top_function_lib, 'allocate_stream_profile'):
+            raise Exception(f'Stream profiling is not supported by the {self.config.backend.name} backend')
+        n_samples = self._compute_n_samples(x)
+        n_inputs = len(self.get_input_variables())
+
+        class StreamProfileData(ctypes.Structure):
+            _fields_ = [
+                ('name', ctypes.c_char_p),
+                ('n_writes', ctypes.c_size_t),
+                ('writes', ctypes.POINTER(ctypes.c_ulong)),
+                ('n_reads', ctypes.c_size_t),
+                ('reads', ctypes.POINTER(ctypes.c_ulong)),
+            ]
+
+        alloc_func = self._top_function_lib.allocate_stream_profile
+        alloc_func.argtypes = None
+        alloc_func.restype = None
+
+        size_func = self._top_function_lib.get_stream_profile_size
+        size_func.argtypes = None
+        size_func.restype = ctypes.c_size_t
+
+        collect_func = self._top_function_lib.collect_stream_profile
+        collect_func.argtypes = [ctypes.POINTER(StreamProfileData)]
+        collect_func.restype = None
+
+        free_func = self._top_function_lib.free_stream_profile
+        free_func.argtypes = None
+        free_func.restype = None
+
+        if n_samples == 1 and n_inputs == 1:
+            x = [x]
+
+        stream_profile = {}
+        try:
+            alloc_func()
+
+            for i in range(n_samples):
+                predictions = [np.zeros(yj.size(), dtype=ctype) for yj in self.get_output_variables()]
+                if n_inputs == 1:
+                    inp = [np.asarray(x[i])]
+                else:
+                    inp = [np.asarray(xj[i]) for xj in x]
+                top_function(*inp, *predictions)
+
+            profile_data = (StreamProfileData * size_func())()
+            collect_func(profile_data)
+            for profile in profile_data:
+                writes = np.ctypeslib.as_array(profile.writes, shape=(profile.n_writes,)) if profile.n_writes else []
+                reads = np.ctypeslib.as_array(profile.reads, shape=(profile.n_reads,)) if profile.n_reads else []
+                stream_profile[str(profile.name, 'utf-8')] = (
+                    np.array(writes, dtype=np.int64),
+                    np.array(reads, dtype=np.int64),
+                )
+        finally:
+            free_func()
+
+        return stream_profile
+
+    def build(self, cache=None, **kwargs):
         """Builds the generated project using HLS compiler.
 
         Please see the `build()` function of backends for a list of possible arguments.
+
+        Args:
+            cache (bool or BuildCache, optional): Reuse the report of an earlier build of an identical project, see
+                `hls4ml.backends.BuildCache`. If True, the default cache is used. Defaults to None, in which case the
+                cache is used only if the ``HLS4ML_BUILD_CACHE`` environment variable is set.
         """
         if not os.path.exists(self.config.get_output_dir()):
             # Assume the project wasn't written before
             self.write()
 
-        return self.config.backend.build(self, **kwargs)
+        if cache is None:
+            cache = bool(os.environ.get('HLS4ML_BUILD_CACHE'))
+        if cache is True:
+            cache = BuildCache()
+        with self._timing(), timed('build', self.config.get_project_name()):
+            if cache:
+                return cache.build(self, **kwargs)
+
+            return self.config.backend.build(self, **kwargs)
@@ -3,6 +3,7 @@ import inspect
 import os
 
 from hls4ml.utils.string_utils import convert_to_snake_case
+from hls4ml.utils.timing import timed
 
 
 class OptimizerPass:
@@ -308,20 +309,25 @@ def optimize_model(model, passes):
     optimization_done = False
     while not optimization_done:
         for opt_name, opt in optimizers.items():
-            if isinstance(opt, ModelOptimizerPass) and opt_name not in applied_passes:
-                res = opt.transform(model)
-                if res:
-                    applied_passes.add(opt_name)
-                continue
-            for node in model.graph.values():
-                if opt.match(node):
-                    res = opt.transform(model, node)
-                    applied_passes.add(opt_name)
+            model_changed = False
+            with timed('pass', opt_name) as counters:
+                if isinstance(opt, ModelOptimizerPass) and opt_name not in applied_passes:
+                    res = opt.transform(model)
                     if res:
-                        break
-            else:
-                continue
-            break
+                        applied_passes.add(opt_name)
+                        counters['transforms'] += 1
+                    continue
+                for node in model.graph.values():
+                    if opt.match(node):
+                        counters['matches'] += 1
+                        res = opt.transform(model, node)
+                        applied_passes.add(opt_name)
+                        if res:
+                            counters['transforms'] += 1
+                            model_changed = True
+                            break
+            if model_changed:
+                break
         else:
             optimization_done = True
 
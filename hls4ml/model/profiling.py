@@ -1,4 +1,3 @@
-import json
 import os
 import shutil
 import uuid
@@ -29,23 +28,14 @@ except ImportError:
 
 
 def get_unoptimized_hlsmodel(model):
-    from hls4ml.converters import convert_from_config
-
-    new_config = model.config.config.copy()
-    new_config['HLSConfig'] = json.loads(json.dumps(new_config['HLSConfig']))
-
     new_output_dir = uuid.uuid4().hex
 
     while os.path.exists(new_output_dir):
         new_output_dir = uuid.uuid4().hex
 
-    if 'SkipOptimizers' in new_config['HLSConfig']:
-        del new_config['HLSConfig']['SkipOptimizers']
-
-    new_config['HLSConfig']['Optimizers'] = []
-    new_config['OutputDir'] = new_output_dir
+    config_overrides = {'OutputDir': new_output_dir, 'HLSConfig': {'Optimizers': [], 'SkipOptimizers': None}}
 
-    return convert_from_config(new_config), new_output_dir
+    return model.variant(config_overrides), new_output_dir
 
 
 def array_to_summary(x, fmt='boxplot'):
@@ -278,6 +278,55 @@ def find_minimum_width(data, signed=True):
     return iwidth
 
 
+def quantize_fixed(data, precision):
+    """Quantize the data to a fixed-point precision, like the conversion of a double to ap_fixed.
+
+    Args:
+        data (ndarray): The data to quantize.
+        precision (FixedPrecisionType): The fixed-point precision, with any rounding and saturation mode.
+
+    Returns:
+        ndarray: The quantized data.
+    """
+    scale = 2.0**precision.fractional
+    data = np.asarray(data, dtype=np.float64) * scale
+
+    rounding = precision.rounding_mode
+    if rounding == RoundingMode.TRN:
+        data = np.floor(data)
+    elif rounding == RoundingMode.TRN_ZERO:
+        data = np.trunc(data)
+    elif rounding == RoundingMode.RND:
+        data = np.floor(data + 0.5)
+    elif rounding == RoundingMode.RND_ZERO:
+        data = np.sign(data) * np.ceil(np.abs(data) - 0.5)
+    elif rounding == RoundingMode.RND_INF:
+        data = np.sign(data) * np.floor(np.abs(data) + 0.5)
+    elif rounding == RoundingMode.RND_MIN_INF:
+        data = np.ceil(data - 0.5)
+    elif rounding == RoundingMode.RND_CONV:
+        data = np.round(data)
+
+    if precision.signed:
+        int_min, int_max = -(2.0 ** (precision.width - 1)), 2.0 ** (precision.width - 1) - 1
+    else:
+        int_min, int_max = 0.0, 2.0**precision.width - 1
+
+    saturation = precision.saturation_mode
+    if saturation == SaturationMode.SAT:
+        data = np.clip(data, int_min, int_max)
+    elif saturation == SaturationMode.SAT_SYM:
+        data = np.clip(data, -int_max if precision.signed else 0.0, int_max)
+    elif saturation == SaturationMode.SAT_ZERO:
+        data = np.where((data < int_min) | (data > int_max), 0.0, data)
+    else:
+        # Infinity has no bits left after wrapping around
+        finite = np.isfinite(data)
+        data = np.where(finite, np.mod(np.where(finite, data, 0.0) - int_min, 2.0**precision.width) + int_min, 0.0)
+
+    return data / scale
+
+
 # endregion
 
 # region Data type definitions
@@ -1,3 +1,4 @@
+from .dse import optimize_reuse_factors  # noqa: F401
 from .dsp_aware_pruning import optimize_keras_model_for_hls4ml  # noqa: F401
 from .dsp_aware_pruning.attributes import get_attributes_from_keras_model_and_hls4ml_config  # noqa: F401
 from .dsp_aware_pruning.keras import optimize_model  # noqa: F401
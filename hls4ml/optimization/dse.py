@@ -0,0 +1,229 @@
+import numpy as np
+
+from hls4ml.converters.keras_to_hls import MAXMULT
+from hls4ml.optimization.dsp_aware_pruning.attributes import LayerAttributes, OptimizationAttributes, hls4mlAttributes
+from hls4ml.optimization.dsp_aware_pruning.knapsack import solve_knapsack
+from hls4ml.optimization.dsp_aware_pruning.objectives.vivado_objectives import VivadoDSPEstimator
+from hls4ml.report.resource_estimate import get_estimate_features, get_layer_cycles, get_weight_bram
+
+_searchable_layers = ('Dense', 'Conv1D', 'Conv2D', 'PointwiseConv1D', 'PointwiseConv2D')
+
+
+def _get_layer_options(layer, io_type, strategies, interval_target):
+    '''
+    Returns the valid reuse factor and strategy combinations of a layer, with their estimated resources and latency
+    '''
+    backend = layer.model.config.backend
+    n_in, n_out = backend.get_layer_mult_size(layer)
+    weight_precision = layer.get_weights('weight').type.precision
+    output_precision = layer.get_output_variable().type.precision
+
+    options = []
+    for rf in backend.get_valid_reuse_factors(n_in, n_out):
+        interval, latency = get_layer_cycles(layer, io_type, rf)
+        if interval_target is not None and interval > interval_target:
+            continue
+        for strategy in strategies:
+            # Vivado can't partition the weights of large layers with the latency strategy
+            if strategy.lower() == 'latency' and n_in * n_out > MAXMULT:
+                continue
+            hls4ml_attributes = hls4mlAttributes(
+                n_in, n_out, io_type, strategy, weight_precision, output_precision, rf, parallelization_factor=1
+            )
+            attributes = LayerAttributes(
+                layer.name,
+                layer.__class__,
+                [],
+                (n_in, n_out),
+                tuple(layer.get_input_variable().shape),
+                tuple(layer.get_output_variable().shape),
+                False,
+                OptimizationAttributes(),
+                {'hls4ml_attributes': hls4ml_attributes},
+            )
+            bram = get_weight_bram(n_in * n_out, rf, weight_precision.width) if strategy.lower() == 'resource' else 0
+            options.append(
+                {
+                    'ReuseFactor': rf,
+                    'Strategy': strategy,
+                    'DSP': int(VivadoDSPEstimator.layer_resources(attributes)[0]),
+                    'BRAM_18K': int(bram),
+                    'Latency': latency,
+                    'Interval': interval,
+                }
+            )
+
+    return options
+
+
+def _get_option_chain(options, budget, resources):
+    '''
+    Selects the options that are faster than all cheaper options, ordered from the cheapest (and slowest) to the most
+    expensive (and fastest). The cost of an option is the sum of its resources, relative to the budget.
+    '''
+    options = sorted(options, key=lambda o: (_cost(o, budget, resources), o['Latency']))
+    chain = []
+    for option in options:
+        if len(chain) == 0 or option['Latency'] < chain[-1]['Latency']:
+            chain.append(option)
+    return chain
+
+
+def _cost(option, budget, resources):
+    return sum(option[r] / budget[i] for i, r in enumerate(resources))
+
+
+def _usage(layer_options, levels, resources):
+    return np.array([sum(options[level][r] for options, level in zip(layer_options, levels)) for r in resources])
+
+
+def _model_latency(io_type, layer_cycles, layer_options, levels):
+    cycles = dict(layer_cycles)
+    for name, options, level in zip(layer_options.keys(), layer_options.values(), levels):
+        cycles[name] = (options[level]['Interval'], options[level]['Latency'] - options[level]['Interval'])
+    intervals = [interval for interval, _ in cycles.values()]
+    depths = [depth for _, depth in cycles.values()]
+    if io_type == 'io_stream':
+        return max(intervals, default=0) + sum(depths)
+    return sum(intervals) + sum(depths)
+
+
+def _step_cost(options, level, budget, resources):
+    '''
+    Resources (relative to the budget) and latency of moving from options[level - 1] to options[level]
+    '''
+    resource_cost = sum(max(options[level][r] - options[level - 1][r], 0) / budget[i] for i, r in enumerate(resources))
+    latency_gain = options[level - 1]['Latency'] - options[level]['Latency']
+    return resource_cost, latency_gain
+
+
+def optimize_reuse_factors(
+    hls_model,
+    dsp_budget,
+    bram_budget=None,
+    latency_target=None,
+    interval_target=None,
+    strategies=('Latency', 'Resource'),
+    knapsack_solver=None,
+    update_config=True,
+):
+    '''
+    Search for the reuse factor and strategy of each layer that minimize the latency within a resource budget
+
+    The layers with multiplications (Dense, Conv1D, Conv2D) are assigned one of their valid reuse factors and one
+    of the strategies. The DSPs of each option are estimated with VivadoDSPEstimator, the BRAMs and the latency with the
+    estimator in hls4ml.report. The assignment is solved as a Knapsack problem: each item is a step from an option of
+    a layer to the next faster option, its value is the decrease in latency and its weights are the additional
+    resources. The solution is then adjusted so each layer uses a single option within the budget.
+
+    Args:
+        hls_model (ModelGraph): Converted model
+        dsp_budget (int): Number of DSPs available to the layers
+        bram_budget (int, optional): Number of BRAM_18K available to the layers. Defaults to None (not constrained)
+        latency_target (int, optional): Target latency of the model, in clock cycles. If the target is met, resources
+            are reduced as long as the latency stays within the target. Defaults to None (minimize the latency)
+        interval_target (int, optional): Maximum interval of each layer, in clock cycles. Defaults to None
+        strategies (tuple, optional): Strategies to consider. Defaults to ('Latency', 'Resource')
+        knapsack_solver (string, optional): Algorithm used to solve the Knapsack problem, see solve_knapsack.
+            Defaults to None ('dynamic' if only the DSPs are constrained, 'greedy' otherwise)
+        update_config (bool, optional): Write the selected reuse factors and strategies to the 'LayerName' section of
+            the model's HLSConfig. Note, the model needs to be converted again with the updated config for the
+            changes to take effect. Defaults to True
+
+    Returns:
+        dict: Selected option for each layer, with keys 'ReuseFactor', 'Strategy', 'DSP', 'BRAM_18K', 'Latency' and
+        'Interval'
+    '''
+    io_type = hls_model.config.get_config_value('IOType')
+    resources = ['DSP'] if bram_budget is None else ['DSP', 'BRAM_18K']
+    budget = np.array([dsp_budget] if bram_budget is None else [dsp_budget, bram_budget])
+    if knapsack_solver is None:
+        knapsack_solver = 'dynamic' if len(resources) == 1 else 'greedy'
+
+    layer_options = {}
+    for layer in hls_model.get_layers():
+        if layer.class_name not in _searchable_layers or 'weight' not in layer.weights:
+            continue
+        try:
+            options = _get_option_chain(_get_layer_options(layer, io_type, strategies, interval_target), budget, resources)
+        except Exception as e:
+            print(f'WARNING: Not searching the reuse factor of layer "{layer.name}": {e}')
+            continue
+        if len(options) == 0:
+            raise Exception(f'No reuse factor of layer "{layer.name}" meets the interval target of {interval_target}')
+        layer_options[layer.name] = options
+
+    layer_cycles = {
+        name: (layer['interval'], layer['depth'])
+        for name, layer in get_estimate_features(hls_model)['Layers'].items()
+        if name not in layer_options
+    }
+    options_list = list(layer_options.values())
+
+    levels = [0] * len(options_list)
+    if np.any(_usage(options_list, levels, resources) > budget):
+        raise Exception(f'The model does not fit within the budget ({dict(zip(resources, budget))}) with any reuse factor')
+
+    # Knapsack items are the steps to a faster option, the capacity is what remains after the slowest options
+    items = [(i, level) for i, options in enumerate(options_list) for level in range(1, len(options))]
+    if len(items) > 0:
+        values = np.array([options_list[i][level - 1]['Latency'] - options_list[i][level]['Latency'] for i, level in items])
+        weights = np.array(
+            [[max(options_list[i][level][r] - options_list[i][level - 1][r], 0) for i, level in items] for r in resources]
+        )
+        capacity = budget - _usage(options_list, levels, resources)
+        _, selected = solve_knapsack(values.astype(float), weights, capacity, implementation=knapsack_solver)
+
+        # A layer can only use the steps up to its selected option
+        for item in selected:
+            levels[items[item][0]] += 1
+
+    # Fix the solution if it is over the budget, then use the remaining budget for the steps with the best gain
+    while np.any(_usage(options_list, levels, resources) > budget):
+        candidates = [i for i, level in enumerate(levels) if level > 0]
+        costs = [_step_cost(options_list[i], levels[i], budget, resources) for i in candidates]
+        worst = max(range(len(candidates)), key=lambda k: costs[k][0] / max(costs[k][1], 1e-9))
+        levels[candidates[worst]] -= 1
+
+    while True:
+        candidates = []
+        for i, options in enumerate(options_list):
+            if levels[i] + 1 < len(options):
+                levels[i] += 1
+                if np.all(_usage(options_list, levels, resources) <= budget):
+                    cost, gain = _step_cost(options, levels[i], budget, resources)
+                    candidates.append((gain / max(cost, 1e-9), i))
+                levels[i] -= 1
+        if len(candidates) == 0:
+            break
+        levels[max(candidates)[1]] += 1
+
+    latency = _model_latency(io_type, layer_cycles, layer_options, levels)
+    if latency_target is not None and latency > latency_target:
+        print(f'WARNING: Estimated latency ({latency}) does not meet the target latency ({latency_target})')
+    elif latency_target is not None:
+        # Trade the latency within the target for resources
+        while True:
+            candidates = []
+            for i, options in enumerate(options_list):
+                if levels[i] > 0:
+                    cost, gain = _step_cost(options, levels[i], budget, resources)
+                    levels[i] -= 1
+                    if _model_latency(io_type, layer_cycles, layer_options, levels) <= latency_target:
+                        candidates.append((cost / max(gain, 1e-9), i))
+                    levels[i] += 1
+            if len(candidates) == 0:
+                break
+            levels[max(candidates)[1]] -= 1
+
+    selected_options = {name: options[level] for (name, options), level in zip(layer_options.items(), levels)}
+
+    if update_config:
+        hls_config = hls_model.config.config['HLSConfig']
+        for name, option in selected_options.items():
+            layer_config = hls_config.setdefault('LayerName', {}).setdefault(name, {})
+            layer_config['ReuseFactor'] = option['ReuseFactor']
+            layer_config['Strategy'] = option['Strategy']
+            hls_model.config.parse_name_config(name, layer_config)
+
+    return selected_options
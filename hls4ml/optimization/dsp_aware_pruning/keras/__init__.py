@@ -183,12 +183,15 @@ def optimize_model(
     target_sparsity = scheduler.get_sparsity()
 
     while sparsity_conditions:
-        # TODO - This might cause OOM issues on large models / data sets, since it is not done in batches
         gradients = (
-            utils.get_model_gradients(optimizable_model, loss_fn, X_train, y_train) if ranking_metric == 'gradients' else {}
+            utils.get_model_gradients(optimizable_model, loss_fn, X_train, y_train, batch_size=batch_size)
+            if ranking_metric == 'oracle'
+            else {}
         )
         hessians = (
-            utils.get_model_hessians(optimizable_model, loss_fn, X_train, y_train) if ranking_metric == 'saliency' else {}
+            utils.get_model_hessians(optimizable_model, loss_fn, X_train, y_train, batch_size=batch_size)
+            if ranking_metric == 'saliency'
+            else {}
         )
 
         # Mask weights
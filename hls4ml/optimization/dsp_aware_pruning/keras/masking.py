@@ -417,13 +417,17 @@ def __get_masks_global(keras_model, model_attributes, sparsity, objective, metri
     Function calculating a layer-wise binary mask for all optimizable layers
     Global masking, with layers of different sparsity; masks are calculated by solving a Knapsack problem
     Most of the logic remains similar to local masking; comments describing implementation are given in the function above
+
+    The optimizable groups (single weight, structure, pattern, block) of all the layers are stored in a single
+    structured array (see __weight_groups_table), instead of one Python object per group
+    This keeps the memory and time linear in the number of weights, for models with millions of weights
     '''
-    groups = []
+    layer_groups = []
     total_resources = []
 
-    # Iterate through all layers and create a list of all the optimizable groups (single weight, structure, pattern, block)
-    # Each entry contains the value associated with the group,
-    # Alongside the layer it belongs to and its location in the layer
+    # Iterate through all layers and find all the optimizable groups (single weight, structure, pattern, block)
+    # For each group, the value associated with it, its location in the layer (flat index) and whether it is
+    # pruned or weight shared (with the offset it would be quantized to) are kept
     # The values is normalised w.r.t to the to largest element in the group, to avoid bias towards large layers
     # We also keep track of total model resources, with respect to the objective
     # A detailed comment in the local masking function is given for
@@ -437,8 +441,11 @@ def __get_masks_global(keras_model, model_attributes, sparsity, objective, metri
             or model_attributes[layer.name].optimization_attributes.pruning
         )
         if isinstance(layer, SUPPORTED_LAYERS) and layer_optimizable:
-            value = layer.get_weights()[0]
+            weights = layer.get_weights()[0]
+            value = weights
             structure_type = model_attributes[layer.name].optimization_attributes.structure_type
+            pruning = model_attributes[layer.name].optimization_attributes.pruning
+            weight_sharing = model_attributes[layer.name].optimization_attributes.weight_sharing
             layer_savings = objective.layer_savings(model_attributes[layer.name])
             total_resources.append(objective.layer_resources(model_attributes[layer.name]))
 
@@ -453,72 +460,42 @@ def __get_masks_global(keras_model, model_attributes, sparsity, objective, metri
             else:
                 norm = 2
 
+            # Values of the groups, their offsets (the mean of the group, if weight shared) and whether they're weight shared
+            groups = None
+
             if structure_type == SUPPORTED_STRUCTURES.UNSTRUCTURED:
-                if model_attributes[layer.name].optimization_attributes.weight_sharing:
+                if weight_sharing:
                     logging.warn('Weight sharing not suitable for unstructured pruning. Ignoring....')
 
-                if model_attributes[layer.name].optimization_attributes.pruning:
-                    value = np.abs(value)
+                if pruning:
+                    # One group per weight, in the order of the flattened weight tensor
+                    value = np.abs(value).ravel()
                     value = value / np.max(value)
-                    indices = np.indices(value.shape).reshape(value.ndim, -1).T
-                    for i in indices:
-                        group = __WeightGroups__(
-                            value[tuple(i)], layer_savings, tuple(i), structure_type, layer.name, 'pruning'
-                        )
-                        groups.append(group)
+                    groups = (value, np.zeros_like(value), np.zeros(value.shape, dtype=bool))
 
             if structure_type == SUPPORTED_STRUCTURES.STRUCTURED:
+                # Neurons (columns) of Dense layers and filters of Conv2D layers
                 if isinstance(layer, (Dense, QDense)):
-                    if model_attributes[layer.name].optimization_attributes.pruning:
-                        vals_norm = np.linalg.norm(value, axis=0, ord=norm)
-                        vals_norm = vals_norm / np.max(vals_norm)
-                    else:
-                        vals_norm = np.full((value.shape[1]), sys.float_info.max, dtype=value.dtype)
-
-                    if model_attributes[layer.name].optimization_attributes.weight_sharing:
-                        vals_var = np.var(value, axis=0)
-                    else:
-                        vals_var = np.full((value.shape[1]), sys.float_info.max, dtype=value.dtype)
-
-                    for i in range(vals_norm.shape[0]):
-                        if vals_norm[i] <= vals_var[i]:
-                            groups.append(
-                                __WeightGroups__(
-                                    vals_norm[i], layer_savings, i, structure_type, layer.name, optimization_type='pruning'
-                                )
-                            )
-                        else:
-                            groups.append(
-                                __WeightGroups__(
-                                    vals_var[i], layer_savings, i, structure_type, layer.name, optimization_type='sharing'
-                                )
-                            )
-
+                    n_structures = value.shape[1]
+                    structure_norms = value
+                    means = np.mean(weights, axis=0)
                 elif isinstance(layer, (Conv2D, QConv2D)):
-                    if model_attributes[layer.name].optimization_attributes.pruning:
-                        vals_norm = np.linalg.norm(np.linalg.norm(value, axis=(0, 1), ord='fro'), axis=0, ord=norm)
-                        vals_norm = vals_norm / np.max(vals_norm)
-                    else:
-                        vals_norm = np.full((value.shape[3]), sys.float_info.max, dtype=value.dtype)
+                    n_structures = value.shape[3]
+                    structure_norms = np.linalg.norm(value, axis=(0, 1), ord='fro')
+                    means = np.mean(weights, axis=(0, 1, 2))
 
-                    if model_attributes[layer.name].optimization_attributes.weight_sharing:
-                        vals_var = np.var(np.linalg.norm(value, axis=(0, 1), ord='fro'), axis=0)
-                    else:
-                        vals_var = np.full((value.shape[3]), sys.float_info.max, dtype=value.dtype)
+                if pruning:
+                    vals_norm = np.linalg.norm(structure_norms, axis=0, ord=norm)
+                    vals_norm = vals_norm / np.max(vals_norm)
+                else:
+                    vals_norm = np.full((n_structures,), sys.float_info.max, dtype=value.dtype)
 
-                    for i in range(vals_norm.shape[0]):
-                        if vals_norm[i] <= vals_var[i]:
-                            groups.append(
-                                __WeightGroups__(
-                                    vals_norm[i], layer_savings, i, structure_type, layer.name, optimization_type='pruning'
-                                )
-                            )
-                        else:
-                            groups.append(
-                                __WeightGroups__(
-                                    vals_var[i], layer_savings, i, structure_type, layer.name, optimization_type='sharing'
-                                )
-                            )
+                if weight_sharing:
+                    vals_var = np.var(structure_norms, axis=0)
+                else:
+                    vals_var = np.full((n_structures,), sys.float_info.max, dtype=value.dtype)
+
+                groups = __choose_pruning_or_sharing(vals_norm, vals_var, means)
 
             if structure_type == SUPPORTED_STRUCTURES.PATTERN:
                 pattern_offset = model_attributes[layer.name].optimization_attributes.pattern_offset
@@ -532,58 +509,36 @@ def __get_masks_global(keras_model, model_attributes, sparsity, objective, metri
                 # Transpose, as done in hls4ml Resource strategy
                 if isinstance(layer, (Dense, QDense)):
                     value = value.T
-                    transposed_shape = value.shape
+                    transposed_weights = weights.T
                 elif isinstance(layer, (Conv2D, QConv2D)):
                     value = np.transpose(value, axes=[3, 0, 1, 2])
-                    transposed_shape = value.shape
+                    transposed_weights = np.transpose(weights, axes=[3, 0, 1, 2])
 
                 # Reshape weight matrix into [number_of_patterns, pattern_offset]
                 # Note, swapping the axis will mess up the weight order
                 # In the case of hls4ml, number_of_patterns is equivalent to reuse factor
                 # And, pattern_offset, is the number of multiplications done in parallel
-                number_of_patterns = np.prod(transposed_shape) // pattern_offset
-                target_shape = (pattern_offset, number_of_patterns)
-                reshaped = np.reshape(value, target_shape)
-
-                # Group consecutive patterns (rows) into blocks and reshape
+                # Consecutive patterns (rows) are grouped into blocks, i.e., consecutive elements of the flattened tensor
+                number_of_patterns = np.prod(value.shape) // pattern_offset
                 total_blocks = pattern_offset // consecutive_patterns
-                blocks = np.reshape(
-                    tf.image.extract_patches(
-                        np.expand_dims(np.expand_dims(reshaped, 2), 0),
-                        [1, consecutive_patterns, number_of_patterns, 1],
-                        [1, consecutive_patterns, number_of_patterns, 1],
-                        [1, 1, 1, 1],
-                        'SAME',
-                    ).numpy(),
-                    (total_blocks, -1),
+                blocks = __extract_blocks(
+                    np.reshape(value, (pattern_offset, number_of_patterns)), (consecutive_patterns, number_of_patterns)
                 )
+                means = np.mean(np.reshape(transposed_weights, (total_blocks, -1)), axis=1)
 
                 # If pruning enabled, find cost associated with pruning each neuron
-                if model_attributes[layer.name].optimization_attributes.pruning:
+                if pruning:
                     vals_norm = np.linalg.norm(blocks, axis=1, ord=norm)
                 else:
                     vals_norm = np.full((blocks.shape[0],), sys.float_info.max, dtype=value.dtype)
 
                 # If weight sharing enabled, find cost asociated with quantizing nerons to their mean
-                if model_attributes[layer.name].optimization_attributes.weight_sharing:
+                if weight_sharing:
                     vals_var = np.var(blocks, axis=1)
                 else:
                     vals_var = np.full((blocks.shape[0],), sys.float_info.max, dtype=value.dtype)
 
-                # Choose min(pruning, weight sharing)
-                for i in range(vals_norm.shape[0]):
-                    if vals_norm[i] <= vals_var[i]:
-                        groups.append(
-                            __WeightGroups__(
-                                vals_norm[i], layer_savings, i, structure_type, layer.name, optimization_type='pruning'
-                            )
-                        )
-                    else:
-                        groups.append(
-                            __WeightGroups__(
-                                vals_var[i], layer_savings, i, structure_type, layer.name, optimization_type='sharing'
-                            )
-                        )
+                groups = __choose_pruning_or_sharing(vals_norm, vals_var, means)
 
             if structure_type == SUPPORTED_STRUCTURES.BLOCK:
                 if len(value.shape) != 2:
@@ -593,42 +548,28 @@ def __get_masks_global(keras_model, model_attributes, sparsity, objective, metri
                 if (value.shape[0] % block_shape[0]) != 0 or (value.shape[1] % block_shape[1] != 0):
                     raise Exception('Block sizes need to be fators of weight matrix dimensions')
 
-                total_blocks = (value.shape[0] * value.shape[1]) // (block_shape[0] * block_shape[1])
-                blocks = np.reshape(
-                    tf.image.extract_patches(
-                        np.expand_dims(np.expand_dims(value, 2), 0),
-                        [1, block_shape[0], block_shape[1], 1],
-                        [1, block_shape[0], block_shape[1], 1],
-                        [1, 1, 1, 1],
-                        'SAME',
-                    ).numpy(),
-                    (total_blocks, block_shape[0] * block_shape[1]),
-                )
+                # Blocks, in row-major order of their position in the weight matrix
+                blocks = __extract_blocks(value, block_shape)
+                means = np.mean(__extract_blocks(weights, block_shape), axis=1)
 
-                if model_attributes[layer.name].optimization_attributes.pruning:
+                if pruning:
                     vals_norm = np.linalg.norm(blocks, axis=1, ord=norm)
                     vals_norm = vals_norm / np.max(vals_norm)
                 else:
                     vals_norm = np.full((blocks.shape[0]), sys.float_info.max, dtype=value.dtype)
 
-                if model_attributes[layer.name].optimization_attributes.weight_sharing:
+                if weight_sharing:
                     vals_var = np.var(blocks, axis=1)
                 else:
                     vals_var = np.full((blocks.shape[0]), sys.float_info.max, dtype=value.dtype)
 
-                for i in range(vals_norm.shape[0]):
-                    if vals_norm[i] <= vals_var[i]:
-                        groups.append(
-                            __WeightGroups__(
-                                vals_norm[i], layer_savings, i, structure_type, layer.name, optimization_type='pruning'
-                            )
-                        )
-                    else:
-                        groups.append(
-                            __WeightGroups__(
-                                vals_var[i], layer_savings, i, structure_type, layer.name, optimization_type='sharing'
-                            )
-                        )
+                groups = __choose_pruning_or_sharing(vals_norm, vals_var, means)
+
+            if groups is not None:
+                layer_groups.append((layer.name, structure_type, layer_savings) + groups)
+
+    groups = __weight_groups_table(layer_groups)
+    layer_ids = {layer_name: i for i, (layer_name, *_) in enumerate(layer_groups)}
 
     # The goal is to maximize network accuracy (values) subject to resorces (objective) staying under some threshold
     # This is a Knapsack problem; several implementations are provided in the helper functions
@@ -636,106 +577,64 @@ def __get_masks_global(keras_model, model_attributes, sparsity, objective, metri
     total_resources = np.sum(np.array(total_resources), axis=0)
     target_resources = ((1 - sparsity) * np.array(total_resources)).astype(int)
     _, selected = solve_knapsack(
-        np.array([s.value for s in groups]),
-        np.array([s.resources for s in groups]).T,
+        groups['value'],
+        groups['resources'].T,
         target_resources,
         implementation=knapsack_solver,
     )
-    # Update masks and offsets
+    kept = np.zeros(len(groups), dtype=bool)
+    kept[np.asarray(selected, dtype=np.int64)] = True
+
+    # Update masks and offsets, by scattering the selected groups of each layer (and the offsets of the weight-shared
+    # groups that were not selected) to the positions of the weights in the groups
     masks = {}
     offsets = {}
 
     for layer in keras_model.layers:
         if isinstance(layer, SUPPORTED_LAYERS) and model_attributes[layer.name].optimizable:
             structure_type = model_attributes[layer.name].optimization_attributes.structure_type
-            selected_layer = [i for i in selected if groups[i].layer_name == layer.name]
-            not_selected_layer = [
-                i for i in range(len(groups)) if groups[i].layer_name == layer.name and i not in selected_layer
-            ]
+            weight_shape = model_attributes[layer.name].weight_shape
+            dtype = layer.get_weights()[0].dtype
+
+            in_layer = groups['layer'] == layer_ids.get(layer.name, -1)
+            selected_positions = groups['position'][in_layer & kept]
+            shared = in_layer & ~kept & groups['sharing']
+            shared_positions = groups['position'][shared]
+            shared_offsets = groups['offset'][shared]
 
             if structure_type == SUPPORTED_STRUCTURES.UNSTRUCTURED:
-                mask = np.zeros(model_attributes[layer.name].weight_shape, layer.get_weights()[0].dtype)
-                for i in selected_layer:
-                    mask[groups[i].layer_position] = 1
-                masks[layer.name] = mask
-                offsets[layer.name] = np.zeros(model_attributes[layer.name].weight_shape, layer.get_weights()[0].dtype)
+                mask = np.zeros(np.prod(weight_shape), dtype)
+                mask[selected_positions] = 1
+                masks[layer.name] = np.reshape(mask, weight_shape)
+                offsets[layer.name] = np.zeros(weight_shape, dtype)
 
             if structure_type == SUPPORTED_STRUCTURES.STRUCTURED:
-                mask = np.zeros(model_attributes[layer.name].weight_shape, layer.get_weights()[0].dtype)
-                offset = np.zeros(model_attributes[layer.name].weight_shape, layer.get_weights()[0].dtype)
-                if isinstance(layer, (Dense, QDense)):
-                    for i in selected_layer:
-                        mask[:, groups[i].layer_position] = 1
-                    for i in not_selected_layer:
-                        if groups[i].optimization_type == 'sharing':
-                            offset[:, groups[i].layer_position] = np.mean(layer.get_weights()[0][:, i])
-                if isinstance(layer, (Conv2D, QConv2D)):
-                    for i in selected_layer:
-                        mask[:, :, :, groups[i].layer_position] = 1
-                    for i in not_selected_layer:
-                        if groups[i].optimization_type == 'sharing':
-                            offset[
-                                :,
-                                :,
-                                :,
-                                groups[i].layer_position,
-                            ] = np.mean(layer.get_weights()[0][:, :, :, i])
-                masks[layer.name] = mask
-                offsets[layer.name] = offset
+                # The structures are the last axis of the weight tensor
+                mask = np.zeros(weight_shape[-1], dtype)
+                mask[selected_positions] = 1
+                offset = np.zeros(weight_shape[-1], dtype)
+                offset[shared_positions] = shared_offsets
+                masks[layer.name] = np.broadcast_to(mask, weight_shape).copy()
+                offsets[layer.name] = np.broadcast_to(offset, weight_shape).copy()
 
             if structure_type == SUPPORTED_STRUCTURES.PATTERN:
                 pattern_offset = model_attributes[layer.name].optimization_attributes.pattern_offset
                 consecutive_patterns = model_attributes[layer.name].optimization_attributes.consecutive_patterns
-                number_of_patterns = np.prod(model_attributes[layer.name].weight_shape) // pattern_offset
-
-                # Transpose shape, as done in hls4ml Resource strategy
-                # We need the weights to recalculate the block means
-                weight_shape = model_attributes[layer.name].weight_shape
-                if isinstance(layer, (Dense, QDense)):
-                    value = layer.get_weights()[0].T
-                    transposed_shape = (weight_shape[1], weight_shape[0])
-                elif isinstance(layer, (Conv2D, QConv2D)):
-                    value = np.transpose(layer.get_weights()[0], (3, 0, 1, 2))
-                    transposed_shape = (weight_shape[3], weight_shape[0], weight_shape[1], weight_shape[2])
-
-                # Decode masks
-                mask = np.zeros((np.prod(transposed_shape),), layer.get_weights()[0].dtype)
-                for i in selected_layer:
-                    pos = groups[i].layer_position * number_of_patterns * consecutive_patterns
-                    for j in range(pos, pos + number_of_patterns * consecutive_patterns, number_of_patterns):
-                        mask[range(j, j + number_of_patterns)] = 1
-
-                        # Decode offsets
-                offset = np.zeros((np.prod(transposed_shape),), layer.get_weights()[0].dtype)
-
-                # Re-calculate the blocks, they are needed to calculate block means
-                target_shape = (pattern_offset, number_of_patterns)
-                reshaped = np.reshape(value, target_shape)
-
                 total_blocks = pattern_offset // consecutive_patterns
-                blocks = np.reshape(
-                    tf.image.extract_patches(
-                        np.expand_dims(np.expand_dims(reshaped, 2), 0),
-                        [1, consecutive_patterns, number_of_patterns, 1],
-                        [1, consecutive_patterns, number_of_patterns, 1],
-                        [1, 1, 1, 1],
-                        'SAME',
-                    ).numpy(),
-                    (total_blocks, -1),
-                )
 
-                for i in not_selected_layer:
-                    if groups[i].optimization_type == 'sharing':
-                        mean = np.mean(blocks[groups[i].layer_position, :])
-                        pos = groups[i].layer_position * number_of_patterns * consecutive_patterns
-                        for j in range(pos, pos + number_of_patterns * consecutive_patterns, number_of_patterns):
-                            offset[range(j, j + number_of_patterns)] = mean
+                # Each block is a contiguous range of the flattened, transposed weight tensor
+                mask = np.zeros((total_blocks, np.prod(weight_shape) // total_blocks), dtype)
+                mask[selected_positions] = 1
+                offset = np.zeros((total_blocks, np.prod(weight_shape) // total_blocks), dtype)
+                offset[shared_positions] = shared_offsets[:, np.newaxis]
 
-                            # Reshape into original shape and store result
+                # Reshape into original shape and store result
                 if isinstance(layer, (Dense, QDense)):
+                    transposed_shape = (weight_shape[1], weight_shape[0])
                     mask = np.reshape(mask, transposed_shape).T
                     offset = np.reshape(offset, transposed_shape).T
                 elif isinstance(layer, (Conv2D, QConv2D)):
+                    transposed_shape = (weight_shape[3], weight_shape[0], weight_shape[1], weight_shape[2])
                     mask = np.transpose(np.reshape(mask, transposed_shape), (1, 2, 3, 0))
                     offset = np.transpose(np.reshape(offset, transposed_shape), (1, 2, 3, 0))
                 masks[layer.name] = mask
@@ -743,43 +642,96 @@ def __get_masks_global(keras_model, model_attributes, sparsity, objective, metri
 
             if structure_type == SUPPORTED_STRUCTURES.BLOCK:
                 block_shape = model_attributes[layer.name].optimization_attributes.block_shape
-                total_blocks = np.prod(model_attributes[layer.name].weight_shape) // np.prod(block_shape)
-                blocks_in_row = model_attributes[layer.name].weight_shape[1] // block_shape[1]
-                blocks = np.reshape(
-                    tf.image.extract_patches(
-                        np.expand_dims(np.expand_dims(layer.get_weights()[0], 2), 0),
-                        [1, block_shape[0], block_shape[1], 1],
-                        [1, block_shape[0], block_shape[1], 1],
-                        [1, 1, 1, 1],
-                        'SAME',
-                    ).numpy(),
-                    (total_blocks, block_shape[0] * block_shape[1]),
-                )
+                blocks_shape = (weight_shape[0] // block_shape[0], weight_shape[1] // block_shape[1])
+
+                # Scatter to one entry per block, then expand each entry to the size of the blocks
+                mask = np.zeros(np.prod(blocks_shape), dtype)
+                mask[selected_positions] = 1
+                offset = np.zeros(np.prod(blocks_shape), dtype)
+                offset[shared_positions] = shared_offsets
+                mask = np.reshape(mask, blocks_shape)
+                offset = np.reshape(offset, blocks_shape)
+                masks[layer.name] = np.repeat(np.repeat(mask, block_shape[0], axis=0), block_shape[1], axis=1)
+                offsets[layer.name] = np.repeat(np.repeat(offset, block_shape[0], axis=0), block_shape[1], axis=1)
 
-                mask = np.zeros(model_attributes[layer.name].weight_shape, layer.get_weights()[0].dtype)
-                for i in selected_layer:
-                    row = block_shape[0] * (groups[i].layer_position // blocks_in_row)
-                    col = block_shape[1] * (groups[i].layer_position % blocks_in_row)
-                    cols = np.linspace(col, col + block_shape[1], block_shape[1], endpoint=False, dtype=np.int32)
-                    rows = np.linspace(row, row + block_shape[0], block_shape[0], endpoint=False, dtype=np.int32)
-                    zeros = np.array(np.meshgrid(rows, cols)).T.reshape(-1, 2)
-                    mask[zeros[:, 0], zeros[:, 1]] = 1
+    return masks, offsets
 
-                offset = np.zeros(model_attributes[layer.name].weight_shape, layer.get_weights()[0].dtype)
-                for i in not_selected_layer:
-                    if groups[i].optimization_type == 'sharing':
-                        mean = np.mean(blocks[groups[i].layer_position, :])
-                        row = block_shape[0] * (groups[i].layer_position // blocks_in_row)
-                        col = block_shape[1] * (groups[i].layer_position % blocks_in_row)
-                        cols = np.linspace(col, col + block_shape[1], block_shape[1], endpoint=False, dtype=np.int32)
-                        rows = np.linspace(row, row + block_shape[0], block_shape[0], endpoint=False, dtype=np.int32)
-                        pos = np.array(np.meshgrid(rows, cols)).T.reshape(-1, 2)
-                        offset[pos[:, 0], pos[:, 1]] = mean
 
-                masks[layer.name] = mask
-                offsets[layer.name] = offset
+def __choose_pruning_or_sharing(vals_norm, vals_var, means):
+    '''
+    Chooses min(pruning, weight sharing) for each group of a layer
 
-    return masks, offsets
+    Returns:
+        tuple containing
+
+        - values (np.array): The values of the groups
+        - offsets (np.array): The values the groups are quantized to if weight shared, i.e., their means
+        - sharing (np.array): Whether each group is weight shared (True) or pruned (False)
+    '''
+    sharing = vals_norm > vals_var
+    return np.where(sharing, vals_var, vals_norm), means, sharing
+
+
+def __extract_blocks(value, block_shape):
+    '''
+    Splits a matrix into blocks of the given shape, returning a matrix with one (flattened) block per row
+    Blocks are in row-major order of their position, equivalent to tf.image.extract_patches with strides of the block shape
+    '''
+    rows, cols = value.shape
+    blocks = np.reshape(value, (rows // block_shape[0], block_shape[0], cols // block_shape[1], block_shape[1]))
+    return np.reshape(np.swapaxes(blocks, 1, 2), (-1, block_shape[0] * block_shape[1]))
+
+
+def __weight_groups_table(layer_groups):
+    '''
+    Stores the optimizable groups of all the layers in a single structured array, with one entry per group:
+        - value: The value associated with the group (e.g. its norm); used as the value in the Knapsack problem
+        - resources: The resources saved by removing the group; used as the weight in the Knapsack problem
+        - layer: The index of the layer the group belongs to, in the order of layer_groups
+        - position: The location of the group in the layer (e.g. the flat index of a weight, or the index of a neuron)
+        - structure: The index of the structure type of the group in SUPPORTED_STRUCTURES
+        - sharing: Whether the group is weight shared (True) or pruned (False), if not selected
+        - offset: The value the group is quantized to, if weight shared
+
+    Args:
+        - layer_groups (list): For each layer, a tuple of its name, structure type, savings (per group),
+            and the values, offsets and sharing flags of its groups
+
+    Returns:
+        - groups (np.array): A structured array with the groups of all the layers
+    '''
+    structures = list(SUPPORTED_STRUCTURES)
+    if len(layer_groups) > 0:
+        n_resources = len(layer_groups[0][2])
+        resources_dtype = np.result_type(*[np.asarray(savings) for _, _, savings, *_ in layer_groups])
+        value_dtype = np.result_type(*[values for *_, values, _, _ in layer_groups])
+    else:
+        n_resources, resources_dtype, value_dtype = 1, np.int64, np.float32
+
+    dtype = [
+        ('value', value_dtype),
+        ('resources', resources_dtype, (n_resources,)),
+        ('layer', np.int32),
+        ('position', np.int64),
+        ('structure', np.int8),
+        ('sharing', np.bool_),
+        ('offset', np.float64),
+    ]
+    groups = np.zeros(sum(len(values) for *_, values, _, _ in layer_groups), dtype=dtype)
+
+    start = 0
+    for layer_id, (_, structure_type, savings, values, offsets, sharing) in enumerate(layer_groups):
+        end = start + len(values)
+        groups['value'][start:end] = values
+        groups['resources'][start:end] = savings
+        groups['layer'][start:end] = layer_id
+        groups['position'][start:end] = np.arange(len(values))
+        groups['structure'][start:end] = structures.index(structure_type)
+        groups['sharing'][start:end] = sharing
+        groups['offset'][start:end] = offsets
+        start = end
+
+    return groups
 
 
 class __WeightGroups__:
@@ -2,60 +2,145 @@ import numpy as np
 import tensorflow as tf
 
 
-@tf.function
-def get_model_gradients(model, loss_fn, X, y):
+def get_model_gradients(model, loss_fn, X, y=None, batch_size=256):
     '''
     Calculate model gradients with respect to weights
 
+    The gradients are accumulated over mini-batches, so memory utilization is bounded by the batch size.
+    The gradients of all the layers are computed in a single backward pass per batch.
+
     Args:
         model (keras.model): Input model
         loss_fn (keras.losses.Loss): Model loss function
-        X (np.array): Input data
+        X (np.array or tf.data.Dataset): Input data; alternatively, a batched tf.data.Dataset
+            or an iterable of (inputs, outputs) batches, in which case y should be None
         y (np.array): Output data
+        batch_size (int): Number of samples processed at once, if X and y are NumPy arrays
 
     Returns:
-        grads (dict): Per-layer gradients of loss with respect to weights
+        grads (dict): Per-layer gradients of loss (averaged over all samples) with respect to weights
     '''
-    grads = {}
-    # While persistent GradientTape slows down execution,
-    # Is faster than performing forward pass and non-persistent for every layer
-    with tf.GradientTape(persistent=True) as tape:
-        output = model(X, training=True)
-        loss_value = loss_fn(y, output)
+    layers = [layer for layer in model.layers if hasattr(layer, 'kernel')]
+    kernels = [layer.kernel for layer in layers]
 
-        for layer in model.layers:
-            if len(layer.trainable_weights) > 0:
-                grads[layer.name] = tape.gradient(loss_value, layer.kernel)
+    def gradient_step(X, y, seed):
+        with tf.GradientTape() as tape:
+            tape.watch(kernels)
+            output = model(X, training=True)
+            loss_value = tf.reduce_mean(loss_fn(y, output))
+        return tape.gradient(loss_value, kernels, unconnected_gradients=tf.UnconnectedGradients.ZERO)
 
-    return grads
+    grads = __accumulate_over_batches(model, 'gradients', loss_fn, gradient_step, X, y, batch_size, kernels)
+    return {layer.name: grad for layer, grad in zip(layers, grads)}
 
 
-@tf.function
-def get_model_hessians(model, loss_fn, X, y):
+def get_model_hessians(model, loss_fn, X, y=None, batch_size=256, num_samples=1, seed=None):
     '''
     Calculate the second derivatives of the loss with repsect to model weights.
 
     Note, only diagonal elements of the Hessian are computed.
+    The diagonal is estimated with Hutchinson's method, diag(H) = E[v * Hv], where v is a random Rademacher vector.
+    The Hessian-vector products are accumulated over mini-batches, so memory utilization is bounded by the batch size.
 
     Args:
         model (keras.model): Input model
         loss_fn (keras.losses.Loss): Model loss function
-        X (np.array): Input data
+        X (np.array or tf.data.Dataset): Input data; alternatively, a batched tf.data.Dataset
+            or an iterable of (inputs, outputs) batches, in which case y should be None
         y (np.array): Output data
+        batch_size (int): Number of samples processed at once, if X and y are NumPy arrays
+        num_samples (int): Number of random vectors sampled per batch; more samples reduce the variance of the estimate
+        seed (int): Random seed of the sampled vectors
 
     Returns:
-        grads (dict): Per-layer second derivatives of loss with respect to weights
+        grads (dict): Per-layer second derivatives of loss (averaged over all samples) with respect to weights
+    '''
+    layers = [layer for layer in model.layers if hasattr(layer, 'kernel')]
+    kernels = [layer.kernel for layer in layers]
+
+    def hessian_step(X, y, seed):
+        with tf.GradientTape() as outer_tape:
+            outer_tape.watch(kernels)
+            with tf.GradientTape() as inner_tape:
+                inner_tape.watch(kernels)
+                output = model(X, training=False)
+                loss_value = tf.reduce_mean(loss_fn(y, output))
+            grads = inner_tape.gradient(loss_value, kernels, unconnected_gradients=tf.UnconnectedGradients.ZERO)
+
+            # Rademacher vectors, i.e. entries are -1 or +1 with equal probability
+            vs = [
+                tf.cast(2 * tf.random.stateless_uniform(k.shape, seed + [i, 0], maxval=2, dtype=tf.int32) - 1, k.dtype)
+                for i, k in enumerate(kernels)
+            ]
+            grads_dot_v = tf.add_n([tf.reduce_sum(grad * v) for grad, v in zip(grads, vs)])
+
+        hvps = outer_tape.gradient(grads_dot_v, kernels, unconnected_gradients=tf.UnconnectedGradients.ZERO)
+        return [v * hvp for v, hvp in zip(vs, hvps)]
+
+    def sampled_hessian_step(X, y, seed):
+        estimates = hessian_step(X, y, seed)
+        for i in range(1, num_samples):
+            sample_seed = seed + tf.constant([i * len(kernels), 0], dtype=tf.int64)
+            estimates = [e + h for e, h in zip(estimates, hessian_step(X, y, sample_seed))]
+        return [e / num_samples for e in estimates]
+
+    hessians = __accumulate_over_batches(
+        model, f'hessians_{num_samples}', loss_fn, sampled_hessian_step, X, y, batch_size, kernels, seed
+    )
+    return {layer.name: hessian for layer, hessian in zip(layers, hessians)}
+
+
+def __iterate_batches(X, y, batch_size):
+    '''
+    Helper function yielding (inputs, outputs) batches from NumPy arrays, a tf.data.Dataset or an iterable of batches
     '''
-    grads = {}
-    with tf.GradientTape(persistent=True) as tape:
-        output = model(X, training=False)
-        loss_value = loss_fn(y, output)
+    if y is None:
+        yield from X
+    else:
+        for i in range(0, X.shape[0], batch_size):
+            yield X[i : i + batch_size], y[i : i + batch_size]
 
-        for layer in model.layers:
-            if hasattr(layer, 'kernel'):
-                grads[layer.name] = tape.gradient(tape.gradient(loss_value, layer.kernel), layer.kernel)
 
-    return grads
+def __batch_signature(X, y):
+    '''
+    Helper function returning an input signature with a variable batch dimension, to avoid retracing on the last batch
+    The last element of the signature is the per-batch seed used by stateless random ops
+    '''
+    return [
+        tf.TensorSpec(shape=(None,) + tuple(tensor.shape[1:]), dtype=tf.as_dtype(tensor.dtype))
+        for tensor in (tf.convert_to_tensor(X), tf.convert_to_tensor(y))
+    ] + [tf.TensorSpec(shape=(2,), dtype=tf.int64)]
+
+
+def __accumulate_over_batches(model, name, loss_fn, step, X, y, batch_size, kernels, seed=None):
+    '''
+    Helper function that averages the output of step (a list of tensors, one for every kernel) over all the batches
+    '''
+    if seed is None:
+        seed = np.random.randint(np.iinfo(np.int32).max)
+
+    accum = [np.zeros(kernel.shape, dtype=kernel.dtype.as_numpy_dtype) for kernel in kernels]
+    n_samples = 0
+
+    # Traced functions are stored on the model, so they are reused between pruning iterations and released with it
+    # The attribute is set through object.__setattr__, to keep it out of Keras attribute tracking (and saved models)
+    traced_steps = getattr(model, '_hls4ml_traced_steps', None)
+    if traced_steps is None:
+        traced_steps = {}
+        object.__setattr__(model, '_hls4ml_traced_steps', traced_steps)
+    for i, (X_batch, y_batch) in enumerate(__iterate_batches(X, y, batch_size)):
+        signature = __batch_signature(X_batch, y_batch)
+        key = (name, loss_fn, tuple(str(spec) for spec in signature))
+        if key not in traced_steps:
+            traced_steps[key] = tf.function(step, input_signature=signature)
+
+        n_batch = int(tf.shape(X_batch)[0])
+        values = traced_steps[key](X_batch, y_batch, tf.constant([seed, i], dtype=tf.int64))
+        for acc, value in zip(accum, values):
+            acc += n_batch * value.numpy()
+        n_samples += n_batch
+
+    return [acc / max(n_samples, 1) for acc in accum]
 
 
 def get_model_sparsity(model):
@@ -90,7 +90,7 @@ def solve_knapsack(values, weights, capacity, implementation='CBC_MIP', **kwargs
         return np.sum(values), list(range(0, values.shape[0]))
 
     # Special case, all the item weights per knapsack are equal, so we can greedily select the ones with the highest value
-    if np.all([weights[i, :] == weights[i, 0] for i in range(weights.shape[0])]):
+    if np.all(weights == weights[:, :1]):
         return __solve_knapsack_equal_weights(values, weights, capacity)
 
     # General cases
@@ -117,34 +117,39 @@ def __solve_1d_knapsack_dp(values, weights, capacity):
     Furthermore, it has a high computational complexity and it is not suitable for highly-dimensional arrays
     NOTE: The weights and corresponding weight constraint need to be integers;
     If not, the they should be scaled and rounded beforehand
+
+    The look-up table is built row by row, with each row computed in a single vectorized operation
+    Only the last row of values is kept in memory; to find the selected items,
+    a bit-packed table of decisions (whether item i was taken at capacity w) is stored, requiring O(NW / 8) bytes
     '''
     assert len(weights.shape) == 1
 
-    # Build look-up table in bottom-up approach
     N = values.shape[0]
-    K = [[0 for w in range(capacity + 1)] for i in range(N + 1)]
-    for i in range(1, N + 1):
-        for w in range(1, capacity + 1):
-            if weights[i - 1] <= w:
-                K[i][w] = max(values[i - 1] + K[i - 1][w - weights[i - 1]], K[i - 1][w])
-            else:
-                K[i][w] = K[i - 1][w]
+    capacity = int(capacity)
+    weights = weights.astype(np.int64)
+
+    # Build look-up table in bottom-up approach
+    K = np.zeros(capacity + 1, dtype=np.result_type(values.dtype, np.float64))
+    decisions = np.zeros((N, (capacity + 1 + 7) // 8), dtype=np.uint8)
+    for i in range(N):
+        w_i = weights[i]
+        if w_i > capacity:
+            continue
+        candidate = K[: capacity + 1 - w_i] + values[i]
+        take = np.zeros(capacity + 1, dtype=bool)
+        take[w_i:] = candidate > K[w_i:]
+        K[take] = candidate[take[w_i:]]
+        decisions[i] = np.packbits(take)
 
     # Reverse Knapsack to find selected groups
-    i = N
     w = capacity
-    res = K[N][capacity]
     selected = []
-    while i >= 0 and res > 0:
-        if res == K[i - 1][w]:
-            pass
-        else:
-            selected.append(i - 1)
-            res = res - values[i - 1]
-            w = w - weights[i - 1]
-        i = i - 1
+    for i in reversed(range(N)):
+        if (decisions[i, w // 8] >> (7 - w % 8)) & 1:
+            selected.append(i)
+            w = w - weights[i]
 
-    return K[N][capacity], selected
+    return K[capacity], selected
 
 
 def __solve_knapsack_greedy(values, weights, capacity):
@@ -156,27 +161,24 @@ def __solve_knapsack_greedy(values, weights, capacity):
 
     # For each item, calculate the value per weight ratio (this can be thought of as item efficiency)
     # The weights are scaled for every dimension, to avoid inherent bias towards large weights in a single dimension
-    weights_rescaled = weights / np.max(weights, axis=1)[:, np.newaxis]
-    ratios = values / weights_rescaled.sum(axis=0)
-    indices = np.argsort(ratios)
-
-    # Greedily select item with the highest ratio (efficiency)
-    optimal = 0
-    selected = []
-    accum = np.zeros_like(capacity)
-    for i in reversed(indices):
-        if np.all((accum + weights[:, i]) <= capacity):
-            selected.append(i)
-            optimal += values[i]
-            accum += weights[:, i]
-        else:
-            break
+    # Items without weight in any dimension are always selected first
+    max_weights = np.max(weights, axis=1)
+    weights_rescaled = weights / np.where(max_weights > 0, max_weights, 1)[:, np.newaxis]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = np.where(weights_rescaled.sum(axis=0) > 0, values / weights_rescaled.sum(axis=0), np.inf)
+    indices = np.argsort(ratios)[::-1]
+
+    # Greedily select items with the highest ratio (efficiency), until the first item that doesn't fit
+    n_selected = __first_overflow(weights[:, indices], capacity)
+    selected = indices[:n_selected].tolist()
+    optimal = np.sum(values[selected])
 
     # The greedy algorithm can be sub-optimal;
     # However, selecting the above elements or the next element that could not fit into the knapsack
     # Will lead to solution that is at most (1/2) of the optimal solution;
     # Therefore, take whichever is higher and satisfies the constraints
-    if values[i] > optimal and np.all(weights[:, i]) <= capacity:
+    i = indices[min(n_selected, indices.shape[0] - 1)]
+    if values[i] > optimal and np.all(weights[:, i] <= capacity):
         return values[i], [i]
     else:
         return optimal, selected
@@ -242,21 +244,19 @@ def __solve_knapsack_equal_weights(values, weights, capacity):
     It occurs often in pruning - e.g. in pattern pruning, each DSP block saves one DSP; however, as a counter-example
     In structured pruning, each structure can save a different amount of FLOPs (Conv2D filter vs Dense neuron)
     '''
-    assert np.all([weights[i, :] == weights[i, 0] for i in range(weights.shape[0])])
+    assert np.all(weights == weights[:, :1])
 
-    # Find items with the highest value
-    indices = np.argsort(values)
+    # Greedily select items with the highest value
+    indices = np.argsort(values)[::-1]
+    n_selected = __first_overflow(weights[:, indices], capacity)
+    selected = indices[:n_selected].tolist()
+
+    return np.sum(values[selected]), selected
 
-    # Greedily select item with the highest ratio
-    optimal = 0
-    selected = []
-    accum = np.zeros_like(capacity)
-    for i in reversed(indices):
-        if np.all((accum + weights[:, i]) <= capacity):
-            selected.append(i)
-            optimal += values[i]
-            accum += weights[:, i]
-        else:
-            break
 
-    return optimal, selected
+def __first_overflow(weights, capacity):
+    '''
+    Helper function that returns the number of leading items that fit in the knapsack, when taken in the given order
+    '''
+    fits = np.all(np.cumsum(weights, axis=1) <= capacity[:, np.newaxis], axis=0)
+    return fits.shape[0] if np.all(fits) else int(np.argmin(fits))
@@ -3,6 +3,10 @@ from hls4ml.report.catapult_report import qofr  # noqa: F401
 from hls4ml.report.catapult_report import read_catapult_report  # noqa: F401
 from hls4ml.report.quartus_report import parse_quartus_report  # noqa: F401
 from hls4ml.report.quartus_report import read_quartus_report  # noqa: F401
+from hls4ml.report.report_db import ReportDatabase  # noqa: F401
+from hls4ml.report.resource_estimate import calibrate_estimate  # noqa: F401
+from hls4ml.report.resource_estimate import estimate  # noqa: F401
+from hls4ml.report.resource_estimate import write_estimate_features  # noqa: F401
 from hls4ml.report.vivado_report import parse_vivado_report  # noqa: F401
 from hls4ml.report.vivado_report import print_vivado_report  # noqa: F401
 from hls4ml.report.vivado_report import read_vivado_report  # noqa: F401
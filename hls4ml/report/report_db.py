@@ -0,0 +1,306 @@
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+
+config_filename = 'hls4ml_config.yml'
+
+_schema = '''
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY,
+    output_dir TEXT UNIQUE NOT NULL,
+    project_name TEXT,
+    backend TEXT,
+    part TEXT,
+    clock_period REAL,
+    io_type TEXT,
+    precision TEXT,
+    reuse_factor INTEGER,
+    strategy TEXT,
+    config TEXT,
+    ingested REAL
+);
+CREATE TABLE IF NOT EXISTS layer_settings (
+    build_id INTEGER NOT NULL REFERENCES builds(id) ON DELETE CASCADE,
+    layer TEXT NOT NULL,
+    setting TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (build_id, layer, setting)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    build_id INTEGER NOT NULL REFERENCES builds(id) ON DELETE CASCADE,
+    report TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (build_id, report, metric)
+);
+CREATE INDEX IF NOT EXISTS metrics_by_name ON metrics (report, metric, value);
+'''
+
+
+class _ConfigLoader(yaml.SafeLoader):
+    """Loads the configuration written by hls4ml without loading the original model."""
+
+
+_ConfigLoader.add_constructor('!keras_model', lambda loader, node: loader.construct_scalar(node))
+
+
+def _flatten(d, prefix=''):
+    flat = {}
+    for key, value in d.items():
+        name = f'{prefix}{key}'
+        if isinstance(value, dict):
+            flat.update(_flatten(value, prefix=name + '.'))
+        else:
+            flat[name] = value
+    return flat
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _read_build(output_dir):
+    """Read the configuration and the reports of a build. Runs in the worker processes of ``ReportDatabase.ingest()``.
+
+    Args:
+        output_dir (str): Output directory of the project.
+
+    Returns:
+        tuple: The configuration (dict) and the parsed report (dict, or None if the backend has no report parser).
+    """
+    from hls4ml.report import parse_catapult_report, parse_quartus_report, parse_vivado_report
+
+    with open(os.path.join(output_dir, config_filename)) as f:
+        config = yaml.load(f, Loader=_ConfigLoader)
+
+    backend = str(config.get('Backend', 'Vivado')).lower()
+    # The parsers print their progress and missing files, which is only noise across many builds
+    with contextlib.redirect_stdout(io.StringIO()):
+        if backend in ('vivado', 'vitis', 'vivadoaccelerator'):
+            report = parse_vivado_report(output_dir)
+        elif backend == 'quartus':
+            report = parse_quartus_report(output_dir, write_to_file=False)
+            report = {'QuartusReport': report} if report is not None else None
+        elif backend == 'catapult':
+            report = parse_catapult_report(output_dir)
+        else:
+            report = None
+
+    return config, report
+
+
+class ReportDatabase:
+    """Store of the configurations and synthesis results of many builds, backed by SQLite.
+
+    Each ingested project is a row of the ``builds`` table, with the main settings of the configuration as columns
+    (``output_dir``, ``project_name``, ``backend``, ``part``, ``clock_period``, ``io_type``, ``precision``,
+    ``reuse_factor``, ``strategy``) and the whole configuration as JSON (``config``). The settings of the layers from the
+    'LayerName' section of the configuration are stored in the ``layer_settings`` table (``build_id``, ``layer``,
+    ``setting``, ``value``), with nested settings flattened (e.g., ``Precision.result``). The numeric values of the
+    reports are stored in the ``metrics`` table (``build_id``, ``report``, ``metric``, ``value``), e.g., report
+    'CSynthesisReport' and metric 'DSP'. The tables can be queried directly with ``query()``.
+
+    Example::
+
+        db = ReportDatabase('sweep.db')
+        db.ingest('sweep/')  # Reads all projects found in the subdirectories of 'sweep/'
+        for build in db.pareto_front(latency='WorstLatency', resources=('DSP', 'LUT')):
+            print(build['output_dir'], build['WorstLatency'], build['DSP'], build['LUT'])
+
+    Args:
+        path (str, optional): Path to the database file. Defaults to ':memory:' (not persisted).
+    """
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript(_schema)
+
+    def close(self):
+        """Close the connection to the database."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def find_projects(path):
+        """Find the project directories (containing ``hls4ml_config.yml``) in a directory and its subdirectories.
+
+        Args:
+            path (str): The directory to search.
+
+        Returns:
+            list: Paths of the project directories, sorted.
+        """
+        projects = []
+        for root, dirs, files in os.walk(path):
+            if config_filename in files:
+                projects.append(root)
+                dirs.clear()  # The project itself doesn't contain other projects
+            else:
+                dirs[:] = [d for d in dirs if not d.startswith('.')]
+        return sorted(projects)
+
+    def ingest(self, paths, max_workers=None, update=True):
+        """Read the configurations and reports of projects into the database.
+
+        The reports are parsed in parallel worker processes. Projects without a report are stored with their
+        configuration only.
+
+        Args:
+            paths (str or list): Project directories, or directories to search for projects (see ``find_projects()``).
+            max_workers (int, optional): Number of worker processes. If 1, the reports are parsed in this process.
+                Defaults to None (the number of CPUs).
+            update (bool, optional): Read again the projects that are already in the database. Defaults to True.
+
+        Returns:
+            int: Number of projects read.
+        """
+        if isinstance(paths, (str, os.PathLike)):
+            paths = [paths]
+
+        output_dirs = []
+        for path in paths:
+            output_dirs.extend(self.find_projects(path))
+        output_dirs = [os.path.abspath(output_dir) for output_dir in output_dirs]
+        if not update:
+            existing = {row['output_dir'] for row in self.connection.execute('SELECT output_dir FROM builds')}
+            output_dirs = [output_dir for output_dir in output_dirs if output_dir not in existing]
+
+        if max_workers == 1 or len(output_dirs) <= 1:
+            results = map(_read_build, output_dirs)
+            self._store_all(output_dirs, results)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = executor.map(_read_build, output_dirs, chunksize=max(1, len(output_dirs) // 64))
+                self._store_all(output_dirs, results)
+
+        return len(output_dirs)
+
+    def _store_all(self, output_dirs, results):
+        with self.connection:
+            for output_dir, (config, report) in zip(output_dirs, results):
+                self._store(output_dir, config, report)
+
+    def _store(self, output_dir, config, report):
+        hls_config = config.get('HLSConfig', {})
+        model_config = hls_config.get('Model', {})
+        precision = model_config.get('Precision')
+        if isinstance(precision, dict):
+            precision = precision.get('default')
+
+        self.connection.execute('DELETE FROM builds WHERE output_dir = ?', (output_dir,))
+        cursor = self.connection.execute(
+            'INSERT INTO builds (output_dir, project_name, backend, part, clock_period, io_type, precision, reuse_factor, '
+            'strategy, config, ingested) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                output_dir,
+                config.get('ProjectName'),
+                config.get('Backend'),
+                config.get('Part'),
+                _to_float(config.get('ClockPeriod')),
+                config.get('IOType'),
+                None if precision is None else str(precision),
+                model_config.get('ReuseFactor'),
+                model_config.get('Strategy'),
+                json.dumps(config, default=str),
+                time.time(),
+            ),
+        )
+        build_id = cursor.lastrowid
+
+        layer_settings = [
+            (build_id, layer, setting, str(value))
+            for layer, layer_config in hls_config.get('LayerName', {}).items()
+            for setting, value in _flatten(layer_config).items()
+        ]
+        self.connection.executemany('INSERT INTO layer_settings VALUES (?, ?, ?, ?)', layer_settings)
+
+        metrics = []
+        for report_name, section in (report or {}).items():
+            if not isinstance(section, dict):
+                continue  # Simulation results
+            for metric, value in _flatten(section).items():
+                value = _to_float(value)
+                if value is not None:
+                    metrics.append((build_id, report_name, metric, value))
+        self.connection.executemany('INSERT INTO metrics VALUES (?, ?, ?, ?)', metrics)
+
+    def query(self, sql, params=()):
+        """Run an SQL query on the database.
+
+        Args:
+            sql (str): The query.
+            params (tuple or dict, optional): Parameters of the query. Defaults to ().
+
+        Returns:
+            list: The rows of the result, as dicts.
+        """
+        return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def get_metrics(self, metrics, report='CSynthesisReport', where=None, params=()):
+        """Get metrics of the builds as columns, next to the columns of the ``builds`` table.
+
+        Args:
+            metrics (list): Names of the metrics, e.g., ['BestLatency', 'DSP'].
+            report (str, optional): Report the metrics are taken from. Defaults to 'CSynthesisReport'.
+            where (str, optional): SQL condition on the ``builds`` table (aliased ``b``), e.g., "b.io_type = ?".
+                Defaults to None.
+            params (tuple, optional): Parameters of the condition. Defaults to ().
+
+        Returns:
+            list: One dict per build that has all the metrics.
+        """
+        columns = ', '.join(f'm{i}.value AS "{metric}"' for i, metric in enumerate(metrics))
+        joins = ' '.join(
+            f'JOIN metrics m{i} ON m{i}.build_id = b.id AND m{i}.report = ? AND m{i}.metric = ?' for i in range(len(metrics))
+        )
+        join_params = [value for metric in metrics for value in (report, metric)]
+        sql = 'SELECT b.id, b.output_dir, b.project_name, b.backend, b.part, b.clock_period, b.io_type, b.precision, '
+        sql += f'b.reuse_factor, b.strategy, {columns} FROM builds b {joins}'
+        if where is not None:
+            sql += f' WHERE {where}'
+        return self.query(sql, tuple(join_params) + tuple(params))
+
+    def pareto_front(
+        self, latency='WorstLatency', resources=('DSP', 'LUT'), report='CSynthesisReport', where=None, params=()
+    ):
+        """Find the builds for which no other build is as fast and uses at most as many of each resource.
+
+        Args:
+            latency (str, optional): The latency metric. Defaults to 'WorstLatency'.
+            resources (tuple, optional): The resource metrics. Defaults to ('DSP', 'LUT').
+            report (str, optional): Report the metrics are taken from. Defaults to 'CSynthesisReport'.
+            where (str, optional): SQL condition on the builds to consider, see ``get_metrics()``. Defaults to None.
+            params (tuple, optional): Parameters of the condition. Defaults to ().
+
+        Returns:
+            list: The builds on the Pareto front (dicts with the build columns and the metrics), from the fastest to the
+            slowest.
+        """
+        resources = list(resources)
+        builds = self.get_metrics([latency] + resources, report=report, where=where, params=params)
+        builds.sort(key=lambda b: (b[latency], *(b[r] for r in resources), b['id']))
+
+        front = []
+        for build in builds:
+            # Builds are sorted by latency, so only the faster builds already on the front can dominate this one
+            if not any(all(other[r] <= build[r] for r in resources) for other in front):
+                front.append(build)
+
+        return front
@@ -0,0 +1,449 @@
+import glob
+import json
+import math
+import os
+import warnings
+
+import numpy as np
+
+from hls4ml.report.vivado_report import parse_vivado_report
+
+estimate_filename = 'hls4ml_estimate.json'
+
+_resource_keys = ['BRAM_18K', 'DSP', 'FF', 'LUT', 'URAM']
+
+# Bits in a single BRAM_18K block
+_bram_bits = 18 * 1024
+
+# Arrays (weights, FIFOs) smaller than this are implemented in LUTs/registers instead of BRAM
+_bram_threshold_bits = 1024
+
+# Layers with multiplications, as supported by get_layer_mult_size of the backend (includes the depthwise variants)
+_mult_layer_classes = ('Dense', 'Conv1D', 'Conv2D', 'LSTM', 'GRU')
+
+# Activations implemented with lookup tables
+_table_activations = {'sigmoid', 'tanh', 'elu', 'selu', 'softplus', 'softsign', 'softmax'}
+
+default_coefficients = {
+    'DSP': {'dsp_mults': 1.0},
+    'BRAM_18K': {'bram_blocks': 1.0},
+    'LUT': {
+        'lut_mult_bits': 0.6,
+        'adder_bits': 1.0,
+        'lutram_bits': 1 / 64,
+        'rom_bits': 1 / 64,
+        'elem_bits': 1.0,
+        'layers': 50.0,
+    },
+    'FF': {
+        'adder_bits': 1.2,
+        'elem_bits': 1.0,
+        'layers': 40.0,
+    },
+    'URAM': {},
+    'Latency': {'cycles': 1.0},
+    'Interval': {'cycles': 1.0},
+}
+
+
+def _width(var_type):
+    return var_type.precision.width
+
+
+def _get_stream_depth(var):
+    pragma = getattr(var, 'pragma', None)
+    if isinstance(pragma, tuple) and pragma[0] == 'stream':
+        return pragma[1]
+    return 0
+
+
+def _get_pixels(layer, prefix):
+    pixels = 1
+    for dim in ('height', 'width'):
+        size = layer.get_attr(f'{prefix}_{dim}')
+        if size is not None:
+            pixels *= size
+    return pixels
+
+
+def _get_mult_size(layer):
+    """Multiplications per output pixel (or sample) and the size of the adder tree of a single output"""
+    if 'Depthwise' in layer.class_name:
+        filt_size = layer.get_attr('filt_width', 1) * layer.get_attr('filt_height', 1)
+        return filt_size, layer.get_attr('n_chan') * layer.get_attr('depth_multiplier', 1)
+
+    n_in, n_out, *recr = layer.model.config.backend.get_layer_mult_size(layer)
+    if len(recr) > 0:
+        n_in_recr, n_out_recr = recr
+        return n_in + n_in_recr, max(n_out, n_out_recr)
+    return n_in, n_out
+
+
+def _get_mult_schedule(layer, io_type, n_ops, rf):
+    """Number of multipliers and the interval of a layer"""
+    if 'Conv' in layer.class_name and io_type == 'io_parallel':
+        n_partitions = max(layer.get_attr('n_partitions', 1), 1)
+        return math.ceil(n_ops * _get_pixels(layer, 'out') / n_partitions / rf), n_partitions * rf
+    elif 'Conv' in layer.class_name:
+        return math.ceil(n_ops / rf), _get_pixels(layer, 'in') * rf
+    else:
+        return math.ceil(n_ops / rf), rf * layer.get_attr('n_timesteps', 1)
+
+
+def _get_mult_depth(n_in):
+    """Pipeline depth of the multiplications and the adder tree"""
+    return math.ceil(math.log2(max(n_in, 2))) + 3
+
+
+def get_layer_cycles(layer, io_type, reuse_factor=None):
+    """Estimate the interval and latency of a layer with multiplications (Dense, Conv1D/2D, etc.).
+
+    Args:
+        layer (Layer): The layer.
+        io_type (str): IO type of the model, ``io_parallel`` or ``io_stream``.
+        reuse_factor (int, optional): Reuse factor to use for the estimate. Defaults to None (the reuse factor of the
+            layer).
+
+    Returns:
+        tuple: Interval and latency of the layer (in clock cycles).
+    """
+    n_in, n_out = _get_mult_size(layer)
+    rf = max(reuse_factor if reuse_factor is not None else layer.get_attr('reuse_factor', 1), 1)
+    _, interval = _get_mult_schedule(layer, io_type, n_in * n_out, rf)
+    return interval, interval + _get_mult_depth(n_in)
+
+
+def get_weight_bram(n_weights, reuse_factor, weight_bits):
+    """Estimate the number of BRAM_18K blocks storing the weights of a layer with the resource strategy.
+
+    The weights are split into one bank of depth ``reuse_factor`` per multiplier. Banks that are too small are
+    implemented in LUTs (LUTRAM) instead.
+
+    Args:
+        n_weights (int): Number of weights.
+        reuse_factor (int): Reuse factor of the layer.
+        weight_bits (int): Width of the weights.
+
+    Returns:
+        int: Number of BRAM_18K blocks.
+    """
+    bank_bits = reuse_factor * weight_bits
+    if bank_bits < _bram_threshold_bits:
+        return 0
+    return math.ceil(n_weights / reuse_factor) * math.ceil(bank_bits / _bram_bits)
+
+
+def _get_mult_layer_features(layer, io_type, bram_factor):
+    n_in, n_out = _get_mult_size(layer)
+    n_ops = n_in * n_out
+    rf = max(layer.get_attr('reuse_factor', 1), 1)
+    strategy = layer.get_attr('strategy', 'latency').lower()
+
+    weight = layer.weights.get('weight')
+    w_bits = _width(weight.type) if weight is not None else 16
+    x_bits = _width(layer.get_input_variable().type)
+    accum_t = layer.get_attr('accum_t')
+    accum_bits = _width(accum_t) if accum_t is not None else w_bits + x_bits
+
+    # Multiplications with zero weights are removed by the HLS compiler if weights are constants (i.e., not in BRAM)
+    nonzero_frac = 1.0
+    if weight is not None and strategy != 'resource' and weight.data.size > 0:
+        nonzero_frac = np.count_nonzero(weight.data) / weight.data.size
+
+    n_mults, interval = _get_mult_schedule(layer, io_type, n_ops, rf)
+    n_mults = math.ceil(n_mults * nonzero_frac)
+
+    # Vivado uses LUTs for narrow multiplications, wide ones are split over several (27x18) DSPs
+    a_bits, b_bits = max(w_bits, x_bits), min(w_bits, x_bits)
+    if b_bits <= 4 or a_bits + b_bits <= 10:
+        dsp_per_mult = 0
+    else:
+        dsp_per_mult = math.ceil(a_bits / 27) * math.ceil(b_bits / 18)
+
+    features = {
+        'dsp_mults': n_mults * dsp_per_mult,
+        'lut_mult_bits': n_mults * a_bits * b_bits if dsp_per_mult == 0 else 0,
+        'adder_bits': n_mults * accum_bits,
+    }
+
+    # Weights are stored in BRAMs with the resource strategy (one bank of depth 'rf' per multiplier), unless they are
+    # large enough to be passed in through a port, as set by 'BramFactor'
+    n_weights = weight.data_length if weight is not None else 0
+    if strategy == 'resource' and n_weights <= bram_factor:
+        features['bram_blocks'] = get_weight_bram(n_weights, rf, w_bits)
+        if features['bram_blocks'] == 0:
+            features['lutram_bits'] = n_weights * w_bits
+
+    return features, interval, _get_mult_depth(n_in)
+
+
+def _get_table_features(layer, io_type):
+    activation = (layer.get_attr('activation') or layer.class_name).lower()
+    if activation not in _table_activations:
+        return {}
+
+    table_size = layer.get_attr('table_size', 1024)
+    if activation == 'softmax':
+        table_bits = sum(
+            table_size * _width(layer.get_attr(table_t))
+            for table_t in ('exp_table_t', 'inv_table_t')
+            if layer.get_attr(table_t) is not None
+        )
+    else:
+        table_t = layer.get_attr('table_t')
+        table_bits = table_size * (_width(table_t) if table_t is not None else 18)
+
+    # Parallel lookups require copies of the table
+    out_var = layer.get_output_variable()
+    lookups = out_var.shape[-1] if io_type == 'io_stream' else out_var.size()
+    if table_bits >= _bram_threshold_bits and lookups == 1:
+        return {'bram_blocks': math.ceil(table_bits / _bram_bits)}
+    return {'rom_bits': table_bits * lookups}
+
+
+def _get_fifo_features(layer):
+    features = {}
+    for var in layer.variables.values():
+        depth = _get_stream_depth(var)
+        if depth == 0:
+            continue
+        width = var.shape[-1] * _width(var.type)
+        if depth * width >= _bram_threshold_bits and depth > 32:
+            features['bram_blocks'] = features.get('bram_blocks', 0) + math.ceil(depth * width / _bram_bits)
+        else:
+            features['lutram_bits'] = features.get('lutram_bits', 0) + depth * width
+    return features
+
+
+def _get_layer_features(layer, io_type, bram_factor):
+    features = {'layers': 1}
+
+    out_var = layer.get_output_variable()
+    if io_type == 'io_stream':
+        parallel_elements = out_var.shape[-1]
+        interval = int(np.prod(out_var.shape[:-1]))
+    else:
+        parallel_elements = out_var.size()
+        interval = 1
+    features['elem_bits'] = parallel_elements * _width(out_var.type)
+    depth = 2
+
+    if 'weight' in layer.weights and layer.class_name not in ('BatchNormalization', 'ApplyAlpha'):
+        if any(name in layer.class_name for name in _mult_layer_classes):
+            mult_features, interval, depth = _get_mult_layer_features(layer, io_type, bram_factor)
+            features.update(mult_features)
+        else:
+            warnings.warn(
+                f'Multiplications of layer {layer.name} ({layer.class_name}) are not supported by the estimator, '
+                'the layer is estimated without them.',
+                stacklevel=1,
+            )
+
+    for key, value in _get_table_features(layer, io_type).items():
+        features[key] = features.get(key, 0) + value
+    if layer.class_name == 'Softmax':
+        depth = math.ceil(math.log2(max(out_var.shape[-1], 2))) + 6
+
+    for key, value in _get_fifo_features(layer).items():
+        features[key] = features.get(key, 0) + value
+
+    return features, interval, depth
+
+
+def get_estimate_features(hls_model):
+    """Compute the features of the model used by the estimator.
+
+    The features are derived from the converted model (multiplications per layer, reuse factor, strategy, precision,
+    IO type and ``BramFactor``) and don't depend on the vendor tools.
+
+    Args:
+        hls_model (ModelGraph): The hls4ml model.
+
+    Returns:
+        dict: Dictionary with per-layer features and the latency and interval (in clock cycles) of each layer.
+    """
+    io_type = hls_model.config.get_config_value('IOType')
+    bram_factor = hls_model.config.get_bram_size(None)
+
+    layers = {}
+    for layer in hls_model.get_layers():
+        if layer.class_name == 'Input':
+            continue
+        features, interval, depth = _get_layer_features(layer, io_type, bram_factor)
+        features = {key: int(value) for key, value in features.items()}
+        layers[layer.name] = {'features': features, 'interval': int(interval), 'depth': int(depth)}
+
+    intervals = [layer['interval'] for layer in layers.values()]
+    depths = [layer['depth'] for layer in layers.values()]
+    if io_type == 'io_stream':
+        # Layers run concurrently (dataflow), the slowest layer determines the throughput
+        latency = max(intervals, default=0) + sum(depths)
+    else:
+        latency = sum(intervals) + sum(depths)
+
+    return {
+        'IOType': io_type,
+        'ClockPeriod': hls_model.config.get_config_value('ClockPeriod'),
+        'Latency': latency,
+        'Interval': max(intervals, default=0),
+        'Layers': layers,
+    }
+
+
+def _evaluate(coefficients, features):
+    return sum(coef * features.get(name, 0) for name, coef in coefficients.items())
+
+
+def estimate(hls_model, coefficients=None):
+    """Estimate the resource usage and latency of the model without running the vendor tools.
+
+    The estimate is based on an analytic model of the layers, derived from the converted model. It runs in milliseconds,
+    so it can be used in design space exploration loops before committing to synthesis. The coefficients of the model
+    can be calibrated to previous synthesis results with `calibrate_estimate()`.
+
+    Args:
+        hls_model (ModelGraph): The hls4ml model.
+        coefficients (dict, optional): Coefficients of the estimator, as returned by `calibrate_estimate()`.
+            Defaults to None (use the default coefficients).
+
+    Returns:
+        dict: Estimate in the same format as the ``CSynthesisReport`` of `parse_vivado_report()`, with per-layer
+        estimates in ``LayerReport``.
+    """
+    if coefficients is None:
+        coefficients = default_coefficients
+    model_features = get_estimate_features(hls_model)
+
+    def make_report(features, latency, interval):
+        report = {
+            'BestLatency': round(_evaluate(coefficients['Latency'], {'cycles': latency})),
+            'IntervalMin': round(_evaluate(coefficients['Interval'], {'cycles': interval})),
+        }
+        report['WorstLatency'] = report['BestLatency']
+        report['IntervalMax'] = report['IntervalMin']
+        for resource in _resource_keys:
+            report[resource] = round(_evaluate(coefficients[resource], features))
+        return report
+
+    layer_report = {}
+    totals = {}
+    for name, layer in model_features['Layers'].items():
+        features = layer['features']
+        layer_report[name] = make_report(features, layer['interval'] + layer['depth'], layer['interval'])
+        for key, value in features.items():
+            totals[key] = totals.get(key, 0) + value
+
+    clock_period = model_features['ClockPeriod']
+    c_synth_report = {
+        'TargetClockPeriod': clock_period,
+        'EstimatedClockPeriod': clock_period,
+        **make_report(totals, model_features['Latency'], model_features['Interval']),
+    }
+
+    return {'CSynthesisReport': c_synth_report, 'LayerReport': layer_report}
+
+
+def write_estimate_features(hls_model):
+    """Save the estimator features of the model to its output directory.
+
+    Projects with saved features and a synthesis report can be used to calibrate the estimator with
+    `calibrate_estimate()`.
+
+    Args:
+        hls_model (ModelGraph): The hls4ml model.
+    """
+    output_dir = hls_model.config.get_output_dir()
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, estimate_filename), 'w') as f:
+        json.dump(get_estimate_features(hls_model), f, indent=1)
+
+
+def _find_calibration_samples(path):
+    samples = []
+    for features_file in sorted(glob.glob(os.path.join(path, '**', estimate_filename), recursive=True)):
+        with open(features_file) as f:
+            features = json.load(f)
+        report = parse_vivado_report(os.path.dirname(features_file))
+        if report is not None and 'CSynthesisReport' in report:
+            samples.append((features, report))
+    return samples
+
+
+def _fit_scales(A, y, regularization):
+    """Solve min |A s - y|^2 + reg * |D (s - 1)|^2 for s >= 0, where D scales each column of A to the same norm"""
+    scales = np.zeros(A.shape[1])
+    active = np.ones(A.shape[1], dtype=bool)
+    while np.any(active):
+        A_active = A[:, active]
+        D = np.diag(np.sqrt(regularization * (np.sum(A_active**2, axis=0) + 1e-9)))
+        solution, *_ = np.linalg.lstsq(
+            np.vstack([A_active, D]), np.concatenate([y, D @ np.ones(A_active.shape[1])]), rcond=None
+        )
+        if np.all(solution >= 0):
+            scales[active] = solution
+            break
+        # Coefficients can't be negative, drop the most negative one and fit the rest again
+        active[np.flatnonzero(active)[np.argmin(solution)]] = False
+
+    return scales
+
+
+def calibrate_estimate(samples, regularization=0.1):
+    """Fit the coefficients of the estimator to synthesis results.
+
+    Each coefficient of the default estimator is scaled to best match the synthesis results (least squares), with the
+    regularization keeping the scale close to 1 when there are few samples.
+
+    Args:
+        samples (str or list): Either a directory to search for previously built projects that have the features saved
+            with `write_estimate_features()`, or a list of ``(hls_model, report)`` pairs, where ``report`` is the
+            output of `parse_vivado_report()`.
+        regularization (float, optional): Strength of the regularization. Defaults to 0.1.
+
+    Raises:
+        Exception: If no samples were found.
+
+    Returns:
+        dict: Calibrated coefficients, to be passed to `estimate()`.
+    """
+    if isinstance(samples, str):
+        samples = _find_calibration_samples(samples)
+    else:
+        samples = [
+            (features if isinstance(features, dict) else get_estimate_features(features), report)
+            for features, report in samples
+        ]
+    if len(samples) == 0:
+        raise Exception('No samples to calibrate the estimator.')
+
+    totals = []
+    for features, _ in samples:
+        model_totals = {'Latency': {'cycles': features['Latency']}, 'Interval': {'cycles': features['Interval']}}
+        layer_totals = {}
+        for layer in features['Layers'].values():
+            for key, value in layer['features'].items():
+                layer_totals[key] = layer_totals.get(key, 0) + value
+        for resource in _resource_keys:
+            model_totals[resource] = layer_totals
+        totals.append(model_totals)
+
+    report_keys = {'Latency': 'BestLatency', 'Interval': 'IntervalMin'}
+    coefficients = {}
+    for target, default in default_coefficients.items():
+        names = list(default.keys())
+        report_key = report_keys.get(target, target)
+        rows = [
+            (model_totals[target], report['CSynthesisReport'].get(report_key))
+            for model_totals, (_, report) in zip(totals, samples)
+        ]
+        rows = [(row, float(value)) for row, value in rows if value not in (None, 'N/A')]
+        if len(names) == 0 or len(rows) == 0:
+            coefficients[target] = dict(default)
+            continue
+
+        A = np.array([[default[name] * row.get(name, 0) for name in names] for row, _ in rows], dtype=float)
+        y = np.array([value for _, value in rows], dtype=float)
+        scales = _fit_scales(A, y, regularization)
+        coefficients[target] = {name: float(default[name] * scale) for name, scale in zip(names, scales)}
+
+    return coefficients
@@ -120,6 +120,47 @@ def _get_abs_and_percentage_values(unparsed_cell):
     return int(unparsed_cell.split('(')[0]), float(unparsed_cell.split('(')[1].replace('%', '').replace(')', ''))
 
 
+def _parse_csynth_xml(syn_file):
+    """Read the summary of a C synthesis report.
+
+    The report is parsed incrementally and the elements are discarded once read, so the per-module sections of large
+    reports are never held in memory as a whole.
+
+    Args:
+        syn_file (str): Path to the ``*_csynth.xml`` report.
+
+    Returns:
+        dict: Latency, interval, clock period and resources of the top function.
+    """
+    summary_tags = {
+        ('UserAssignments', 'TargetClockPeriod'): 'TargetClockPeriod',
+        ('PerformanceEstimates', 'SummaryOfTimingAnalysis', 'EstimatedClockPeriod'): 'EstimatedClockPeriod',
+        ('PerformanceEstimates', 'SummaryOfOverallLatency', 'Best-caseLatency'): 'BestLatency',
+        ('PerformanceEstimates', 'SummaryOfOverallLatency', 'Worst-caseLatency'): 'WorstLatency',
+        ('PerformanceEstimates', 'SummaryOfOverallLatency', 'Interval-min'): 'IntervalMin',
+        ('PerformanceEstimates', 'SummaryOfOverallLatency', 'Interval-max'): 'IntervalMax',
+    }
+
+    c_synth_report = {}
+    path = []
+    for event, elem in ET.iterparse(syn_file, events=('start', 'end')):
+        if event == 'start':
+            path.append(elem.tag)
+            continue
+        key = tuple(path[1:])
+        if key in summary_tags:
+            c_synth_report[summary_tags[key]] = elem.text
+        elif len(key) == 3 and key[:2] in (('AreaEstimates', 'Resources'), ('AreaEstimates', 'AvailableResources')):
+            # DSPs are called 'DSP48E' in Vivado and just 'DSP' in Vitis. Overriding here to have consistent keys
+            tag = 'DSP' if elem.tag == 'DSP48E' else elem.tag
+            prefix = 'Available' if key[1] == 'AvailableResources' else ''
+            c_synth_report[prefix + tag] = elem.text
+        path.pop()
+        elem.clear()
+
+    return c_synth_report
+
+
 def parse_vivado_report(hls_dir):
     if not os.path.exists(hls_dir):
         print(f'Path {hls_dir} does not exist. Exiting.')
@@ -165,27 +206,7 @@ def parse_vivado_report(hls_dir):
     syn_file = sln_dir + '/' + solutions[0] + f'/syn/report/{top_func_name}_csynth.xml'
     c_synth_report = {}
     if os.path.isfile(syn_file):
-        root = ET.parse(syn_file).getroot()
-
-        # Performance
-        perf_node = root.find('./PerformanceEstimates')
-        c_synth_report['TargetClockPeriod'] = root.find('./UserAssignments/TargetClockPeriod').text
-        c_synth_report['EstimatedClockPeriod'] = perf_node.find('./SummaryOfTimingAnalysis/EstimatedClockPeriod').text
-        c_synth_report['BestLatency'] = perf_node.find('./SummaryOfOverallLatency/Best-caseLatency').text
-        c_synth_report['WorstLatency'] = perf_node.find('./SummaryOfOverallLatency/Worst-caseLatency').text
-        c_synth_report['IntervalMin'] = perf_node.find('./SummaryOfOverallLatency/Interval-min').text
-        c_synth_report['IntervalMax'] = perf_node.find('./SummaryOfOverallLatency/Interval-max').text
-        # Area
-        area_node = root.find('./AreaEstimates')
-        for child in area_node.find('./Resources'):
-            # DSPs are called 'DSP48E' in Vivado and just 'DSP' in Vitis. Overriding here to have consistent keys
-            if child.tag == 'DSP48E':
-                child.tag = 'DSP'
-            c_synth_report[child.tag] = child.text
-        for child in area_node.find('./AvailableResources'):
-            if child.tag == 'DSP48E':
-                child.tag = 'DSP'
-            c_synth_report['Available' + child.tag] = child.text
+        c_synth_report = _parse_csynth_xml(syn_file)
         report['CSynthesisReport'] = c_synth_report
     else:
         print('CSynthesis report not found.')
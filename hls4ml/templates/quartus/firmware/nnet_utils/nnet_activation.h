@@ -67,6 +67,50 @@ template <class data_T, class res_T, typename CONFIG_T> void relu1(data_T data[C
     relu_max<data_T, res_T, 1, CONFIG_T>(data, res);
 }
 
+// *************************************************
+//       Piecewise polynomial approximation
+// *************************************************
+template <class data_T, class table_T, unsigned N_SEGMENTS, unsigned DEGREE>
+inline table_T piecewise_value(data_T x, const table_T breakpoints[N_SEGMENTS + 1],
+                               const table_T coefs[N_SEGMENTS * (DEGREE + 1)]) {
+    // Clamp the input to the fitted range
+    hls_register table_T x_clamped;
+    if (x < breakpoints[0])
+        x_clamped = breakpoints[0];
+    else if (x > breakpoints[N_SEGMENTS])
+        x_clamped = breakpoints[N_SEGMENTS];
+    else
+        x_clamped = x;
+
+    // Find the segment with one comparator per breakpoint
+    hls_register unsigned segment = 0;
+    #pragma unroll
+    for (unsigned i = 1; i < N_SEGMENTS; i++) {
+        if (x_clamped >= breakpoints[i])
+            segment = i;
+    }
+
+    // Evaluate the polynomial of the segment with Horner's method, in the local coordinate of the segment
+    hls_register table_T dx = x_clamped - breakpoints[segment];
+    hls_register table_T y = coefs[segment * (DEGREE + 1) + DEGREE];
+    #pragma unroll
+    for (int k = DEGREE - 1; k >= 0; k--) {
+        y = y * dx + coefs[segment * (DEGREE + 1) + k];
+    }
+    return y;
+}
+
+template <class data_T, class res_T, typename CONFIG_T>
+void piecewise(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in],
+               const typename CONFIG_T::table_t breakpoints[CONFIG_T::n_segments + 1],
+               const typename CONFIG_T::table_t coefs[CONFIG_T::n_segments * (CONFIG_T::degree + 1)]) {
+    #pragma unroll
+    for (int ii = 0; ii < CONFIG_T::n_in; ii++) {
+        res[ii] = piecewise_value<data_T, typename CONFIG_T::table_t, CONFIG_T::n_segments, CONFIG_T::degree>(
+            data[ii], breakpoints, coefs);
+    }
+}
+
 // *************************************************
 //       Sigmoid Activation
 // *************************************************
@@ -99,7 +143,7 @@ void sigmoid(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
 //       Softmax Activation
 // *************************************************
 
-enum class softmax_implementation { latency = 0, legacy = 1, stable = 2, argmax = 3 };
+enum class softmax_implementation { latency = 0, legacy = 1, stable = 2, argmax = 3, piecewise = 4 };
 
 template <class data_T, typename CONFIG_T> inline unsigned softmax_stable_idx_from_real_val(const data_T x) {
     // Number of address bits for table
@@ -160,6 +204,48 @@ void softmax_stable(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
     }
 }
 
+template <class data_T, class res_T, typename CONFIG_T>
+void softmax_piecewise(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in],
+                       const typename CONFIG_T::exp_table_t exp_breakpoints[CONFIG_T::exp_n_segments + 1],
+                       const typename CONFIG_T::exp_table_t exp_coefs[CONFIG_T::exp_n_segments * (CONFIG_T::degree + 1)],
+                       const typename CONFIG_T::inv_table_t inv_breakpoints[CONFIG_T::inv_n_segments + 1],
+                       const typename CONFIG_T::inv_table_t inv_coefs[CONFIG_T::inv_n_segments * (CONFIG_T::degree + 1)]) {
+    typedef ac_fixed<data_T::width, data_T::i_width, true, AC_RND, AC_SAT> diff_T;
+
+    // Find maximum
+    Op_max<data_T> op_max;
+    hls_register data_T x_max = reduce<data_T, CONFIG_T::n_in, Op_max<data_T>>(data, op_max);
+
+    // For the diffs, use the same type as the input but force rounding and saturation
+    hls_register diff_T d_xi_xmax[CONFIG_T::n_in];
+    #pragma unroll
+    for (unsigned i = 0; i < CONFIG_T::n_in; i++) {
+        d_xi_xmax[i] = data[i] - x_max;
+    }
+
+    // Calculate all the e^x's with the piecewise approximation
+    hls_register typename CONFIG_T::exp_table_t exp_res[CONFIG_T::n_in];
+    #pragma unroll
+    for (unsigned i = 0; i < CONFIG_T::n_in; i++) {
+        exp_res[i] = piecewise_value<diff_T, typename CONFIG_T::exp_table_t, CONFIG_T::exp_n_segments, CONFIG_T::degree>(
+            d_xi_xmax[i], exp_breakpoints, exp_coefs);
+    }
+
+    // Explicitly sum previously calculated exponentials with an adder tree
+    Op_add<typename CONFIG_T::exp_table_t> op_add;
+    hls_register typename CONFIG_T::exp_table_t exp_sum =
+        reduce<typename CONFIG_T::exp_table_t, CONFIG_T::n_in, Op_add<typename CONFIG_T::exp_table_t>>(exp_res, op_add);
+
+    // Multiply previously calculated exponetials with the reciprocal of the sum
+    hls_register typename CONFIG_T::inv_table_t inv_exp_sum =
+        piecewise_value<typename CONFIG_T::exp_table_t, typename CONFIG_T::inv_table_t, CONFIG_T::inv_n_segments,
+                        CONFIG_T::degree>(exp_sum, inv_breakpoints, inv_coefs);
+    #pragma unroll
+    for (unsigned i = 0; i < CONFIG_T::n_in; i++) {
+        res[i] = exp_res[i] * inv_exp_sum;
+    }
+}
+
 // TODO - Improve accuracy
 template <class data_T, class res_T, typename CONFIG_T>
 void softmax_latency(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
@@ -265,6 +265,70 @@ SoftsignActLoop:
 //       Softmax Activation
 // *************************************************
 
+template <class data_T, class res_T, typename CONFIG_T>
+void softmax_piecewise(stream<data_T> &data, stream<res_T> &res,
+                       const typename CONFIG_T::exp_table_t exp_breakpoints[CONFIG_T::exp_n_segments + 1],
+                       const typename CONFIG_T::exp_table_t exp_coefs[CONFIG_T::exp_n_segments * (CONFIG_T::degree + 1)],
+                       const typename CONFIG_T::inv_table_t inv_breakpoints[CONFIG_T::inv_n_segments + 1],
+                       const typename CONFIG_T::inv_table_t inv_coefs[CONFIG_T::inv_n_segments * (CONFIG_T::degree + 1)]) {
+    constexpr unsigned multiplier_limit = DIV_ROUNDUP(data_T::size, CONFIG_T::reuse_factor);
+    constexpr unsigned pipeline = data_T::size / multiplier_limit;
+
+    typedef ac_fixed<data_T::value_type::width, data_T::value_type::i_width, true, AC_RND, AC_SAT> diff_T;
+
+    hls_register typename data_T::value_type data_array[data_T::size];
+
+SoftmaxArrayLoop:
+    #pragma ii pipeline
+    for (unsigned i = 0; i < CONFIG_T::n_in / data_T::size; i++) {
+        data_T in_pack = data.read();
+
+    SoftmaxArrayPackLoop:
+        #pragma unroll
+        for (unsigned j = 0; j < data_T::size; j++) {
+            data_array[j] = in_pack[j];
+        }
+
+        // Find the max and compute all delta(x_i, x_max)
+        Op_max<typename data_T::value_type> op_max;
+        hls_register typename data_T::value_type x_max =
+            reduce<typename data_T::value_type, data_T::size, Op_max<typename data_T::value_type>>(data_array, op_max);
+
+        // For the diffs, use the same type as the input but force rounding and saturation
+        hls_register diff_T d_xi_xmax[data_T::size];
+        #pragma unroll
+        for (unsigned j = 0; j < data_T::size; j++) {
+            d_xi_xmax[j] = data_array[j] - x_max;
+        }
+
+        // Calculate all the e^x's with the piecewise approximation
+        hls_register typename CONFIG_T::exp_table_t exp_res[data_T::size];
+        #pragma unroll
+        for (unsigned j = 0; j < data_T::size; j++) {
+            exp_res[j] = piecewise_value<diff_T, typename CONFIG_T::exp_table_t, CONFIG_T::exp_n_segments, CONFIG_T::degree>(
+                d_xi_xmax[j], exp_breakpoints, exp_coefs);
+        }
+
+        // Explicitly sum the results with an adder tree.
+        Op_add<typename CONFIG_T::exp_table_t> op_add;
+        hls_register typename CONFIG_T::exp_table_t exp_sum =
+            reduce<typename CONFIG_T::exp_table_t, data_T::size, Op_add<typename CONFIG_T::exp_table_t>>(exp_res, op_add);
+
+        hls_register typename CONFIG_T::inv_table_t inv_exp_sum =
+            piecewise_value<typename CONFIG_T::exp_table_t, typename CONFIG_T::inv_table_t, CONFIG_T::inv_n_segments,
+                            CONFIG_T::degree>(exp_sum, inv_breakpoints, inv_coefs);
+        res_T out_pack;
+
+    SoftmaxInvPackLoop:
+        #pragma unroll
+        for (unsigned j = 0; j < res_T::size; j++) {
+            out_pack[j] = exp_res[j] * inv_exp_sum;
+        }
+
+        res.write(out_pack);
+    }
+}
+
 template <class data_T, class res_T, typename CONFIG_T> void softmax_stable(stream<data_T> &data, stream<res_T> &res) {
 #include "activation_tables/exp_table.tb"
 #include "activation_tables/invert_table.tb"
@@ -521,6 +585,30 @@ TanHActLoop:
     }
 }
 
+// *************************************************
+//       Piecewise polynomial approximation
+// *************************************************
+template <class data_T, class res_T, typename CONFIG_T>
+void piecewise(stream<data_T> &data, stream<res_T> &res,
+               const typename CONFIG_T::table_t breakpoints[CONFIG_T::n_segments + 1],
+               const typename CONFIG_T::table_t coefs[CONFIG_T::n_segments * (CONFIG_T::degree + 1)]) {
+PiecewiseActLoop:
+    #pragma ii 1
+    for (int i = 0; i < CONFIG_T::n_in / res_T::size; i++) {
+        data_T in_data = data.read();
+        res_T out_data;
+
+    PiecewisePackLoop:
+        #pragma unroll
+        for (int j = 0; j < res_T::size; j++) {
+            out_data[j] = piecewise_value<typename data_T::value_type, typename CONFIG_T::table_t, CONFIG_T::n_segments,
+                                          CONFIG_T::degree>(in_data[j], breakpoints, coefs);
+        }
+
+        res.write(out_data);
+    }
+}
+
 // *************************************************
 //       Sigmoid Activation
 // *************************************************
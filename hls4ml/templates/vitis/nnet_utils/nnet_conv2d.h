@@ -4,6 +4,8 @@
 #include "nnet_common.h"
 #include "nnet_conv2d_latency.h"
 #include "nnet_conv2d_resource.h"
+#include "nnet_conv2d_winograd.h"
+#include "nnet_conv_shift_add.h"
 #include <cstdlib>
 
 namespace nnet {
@@ -38,6 +40,36 @@ struct conv2d_config {
     static const unsigned n_zeros = 0; // not used yet
 };
 
+// Winograd's algorithm only applies to some kernels, so it is only instantiated for the layers that use it
+template <class data_T, class res_T, typename CONFIG_T, bool winograd> struct Conv2DParallel {
+    static void conv(data_T data[CONFIG_T::in_height * CONFIG_T::in_width * CONFIG_T::n_chan],
+                     res_T res[CONFIG_T::out_height * CONFIG_T::out_width * CONFIG_T::n_filt],
+                     typename CONFIG_T::weight_t
+                         weights[CONFIG_T::filt_height * CONFIG_T::filt_width * CONFIG_T::n_chan * CONFIG_T::n_filt],
+                     typename CONFIG_T::bias_t biases[CONFIG_T::n_filt]) {
+        //#pragma HLS INLINE
+        if (CONFIG_T::strategy == nnet::latency &&
+            is_shift_add_kernel<data_T, res_T, typename CONFIG_T::mult_config>::value) {
+            conv_2d_shift_add_cl<data_T, res_T, CONFIG_T>(data, res, weights, biases);
+        } else if (CONFIG_T::strategy == nnet::latency) {
+            conv_2d_latency_cl<data_T, res_T, CONFIG_T>(data, res, weights, biases);
+        } else {
+            conv_2d_resource_cl<data_T, res_T, CONFIG_T>(data, res, weights, biases);
+        }
+    }
+};
+
+template <class data_T, class res_T, typename CONFIG_T> struct Conv2DParallel<data_T, res_T, CONFIG_T, true> {
+    static void conv(data_T data[CONFIG_T::in_height * CONFIG_T::in_width * CONFIG_T::n_chan],
+                     res_T res[CONFIG_T::out_height * CONFIG_T::out_width * CONFIG_T::n_filt],
+                     typename CONFIG_T::weight_t weights[CONFIG_T::impl_filt_height * CONFIG_T::impl_filt_width *
+                                                         CONFIG_T::n_chan * CONFIG_T::n_filt],
+                     typename CONFIG_T::bias_t biases[CONFIG_T::n_filt]) {
+        //#pragma HLS INLINE
+        conv_2d_winograd_cl<data_T, res_T, CONFIG_T>(data, res, weights, biases);
+    }
+};
+
 template <class data_T, class res_T, typename CONFIG_T>
 void conv_2d_cl(
     data_T data[CONFIG_T::in_height * CONFIG_T::in_width * CONFIG_T::n_chan],
@@ -47,11 +79,8 @@ void conv_2d_cl(
     // Inlining helps reduce latency, but may also cause timing issues in some cases, use carefully.
     //#pragma HLS INLINE recursive
 
-    if (CONFIG_T::strategy == nnet::latency) {
-        conv_2d_latency_cl<data_T, res_T, CONFIG_T>(data, res, weights, biases);
-    } else {
-        conv_2d_resource_cl<data_T, res_T, CONFIG_T>(data, res, weights, biases);
-    }
+    Conv2DParallel<data_T, res_T, CONFIG_T, CONFIG_T::implementation == conv_implementation::winograd>::conv(
+        data, res, weights, biases);
 }
 
 template <class data_T, class res_T, typename CONFIG_T>
@@ -65,7 +94,9 @@ void pointwise_conv_2d_cl(data_T data[CONFIG_T::in_height * CONFIG_T::in_width *
     //#pragma HLS INLINE recursive
 
     // Nothing special to be done for io_parallel implementation
-    if (CONFIG_T::strategy == nnet::latency) {
+    if (CONFIG_T::strategy == nnet::latency && is_shift_add_kernel<data_T, res_T, typename CONFIG_T::mult_config>::value) {
+        conv_2d_shift_add_cl<data_T, res_T, CONFIG_T>(data, res, weights, biases);
+    } else if (CONFIG_T::strategy == nnet::latency) {
         conv_2d_latency_cl<data_T, res_T, CONFIG_T>(data, res, weights, biases);
     } else {
         conv_2d_resource_cl<data_T, res_T, CONFIG_T>(data, res, weights, biases);
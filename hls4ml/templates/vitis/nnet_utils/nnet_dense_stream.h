@@ -14,7 +14,7 @@ void dense_latency_wrapper(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_ou
                            typename CONFIG_T::weight_t weights[CONFIG_T::n_in * CONFIG_T::n_out],
                            typename CONFIG_T::bias_t biases[CONFIG_T::n_out]) {
     #pragma HLS PIPELINE II=CONFIG_T::reuse_factor
-    dense_latency<data_T, res_T, CONFIG_T>(data, res, weights, biases);
+    CONFIG_T::template kernel<data_T, res_T, CONFIG_T>::dense(data, res, weights, biases);
 }
 
 template <class data_T, class res_T, typename CONFIG_T>
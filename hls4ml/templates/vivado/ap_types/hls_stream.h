@@ -81,6 +81,8 @@
 #include <typeinfo>
 #include <string>
 #include <sstream>
+#include <map>
+#include <vector>
 
 #ifdef HLS_STREAM_THREAD_SAFE
 #include <mutex>
@@ -94,12 +96,35 @@
 
 namespace hls {
 
+// Profiling of the stream operations (hls4ml extension, C simulation only). When enabled, the value of a global
+// counter is recorded at each read and write, per stream name, so the order of the operations on all streams is known.
+struct stream_profile {
+    std::vector<unsigned long> writes;
+    std::vector<unsigned long> reads;
+};
+
+struct stream_profiler {
+    bool enabled;
+    unsigned long clock;
+    unsigned long generation; // Incremented when the profiles are cleared
+    std::map<std::string, stream_profile> profiles;
+
+    stream_profiler() : enabled(false), clock(0), generation(0) {}
+};
+
+inline stream_profiler &get_stream_profiler() {
+    static stream_profiler profiler;
+    return profiler;
+}
+
 template<typename __STREAM_T__>
 class stream
 {
   protected:
     std::string _name;
     std::deque<__STREAM_T__> _data; // container for the elements
+    stream_profile* _profile;
+    unsigned long _profile_generation;
 #ifdef HLS_STREAM_THREAD_SAFE
     std::mutex _mutex;
     std::condition_variable _condition_var;
@@ -108,7 +133,7 @@ class stream
   public:
     /// Constructors
     // Keep consistent with the synthesis model's constructors
-    stream() {
+    stream() : _profile(0), _profile_generation(0) {
         static unsigned _counter = 1;
         std::stringstream ss;
 #ifndef _MSC_VER
@@ -128,7 +153,7 @@ class stream
         _name += "." + ss.str();
     }
 
-    stream(const std::string name) {
+    stream(const std::string name) : _profile(0), _profile_generation(0) {
     // default constructor,
     // capacity set to predefined maximum
         _name = name;
@@ -137,7 +162,7 @@ class stream
   /// Make copy constructor and assignment operator private
   private:
     stream(const stream< __STREAM_T__ >& chn):
-        _name(chn._name), _data(chn._data) {
+        _name(chn._name), _data(chn._data), _profile(0), _profile_generation(0) {
     }
 
     stream& operator = (const stream< __STREAM_T__ >& chn) {
@@ -146,6 +171,20 @@ class stream
         return *this;
     }
 
+    void record(bool is_write) {
+        stream_profiler& profiler = get_stream_profiler();
+        if (!profiler.enabled)
+            return;
+        if (_profile == 0 || _profile_generation != profiler.generation) {
+            _profile = &profiler.profiles[_name];
+            _profile_generation = profiler.generation;
+        }
+        if (is_write)
+            _profile->writes.push_back(profiler.clock++);
+        else
+            _profile->reads.push_back(profiler.clock++);
+    }
+
   public:
     /// Overload >> and << operators to implement read() and write()
     void operator >> (__STREAM_T__& rdata) {
@@ -196,6 +235,7 @@ class stream
         __STREAM_T__ elem;
         elem = _data.front();
         _data.pop_front();
+        record(false);
         return elem;
     }
 #else
@@ -211,6 +251,7 @@ class stream
         } else {
             elem = _data.front();
             _data.pop_front();
+            record(false);
         }
         return elem;
     }
@@ -222,6 +263,7 @@ class stream
         std::unique_lock<std::mutex> ul(_mutex);
 #endif
         _data.push_back(tail);
+        record(true);
 #ifdef HLS_STREAM_THREAD_SAFE
         _condition_var.notify_one();
 #endif
@@ -238,6 +280,7 @@ class stream
         } else {
             __STREAM_T__ elem(_data.front());
             _data.pop_front();
+            record(false);
             head = elem;
         }
         return !is_empty;
@@ -4,6 +4,9 @@
 #include "ap_fixed.h"
 #include "ap_int.h"
 #include "nnet_utils/nnet_types.h"
+#ifdef HLS4ML_FAST_CSIM
+#include "nnet_utils/nnet_fast_fixed.h"
+#endif
 #include <cstddef>
 #include <cstdio>
 
@@ -48,6 +48,45 @@ void collect_trace_output(struct trace_data *c_trace_outputs) {
     }
 }
 
+struct stream_profile_data {
+    const char *name;
+    size_t n_writes;
+    const unsigned long *writes;
+    size_t n_reads;
+    const unsigned long *reads;
+};
+
+void allocate_stream_profile() {
+    hls::stream_profiler &profiler = hls::get_stream_profiler();
+    profiler.profiles.clear();
+    profiler.clock = 0;
+    profiler.generation++;
+    profiler.enabled = true;
+}
+
+size_t get_stream_profile_size() { return hls::get_stream_profiler().profiles.size(); }
+
+void collect_stream_profile(struct stream_profile_data *c_stream_profile) {
+    hls::stream_profiler &profiler = hls::get_stream_profiler();
+    int ii = 0;
+    for (std::map<std::string, hls::stream_profile>::iterator i = profiler.profiles.begin(); i != profiler.profiles.end();
+         i++) {
+        c_stream_profile[ii].name = i->first.c_str();
+        c_stream_profile[ii].n_writes = i->second.writes.size();
+        c_stream_profile[ii].writes = i->second.writes.data();
+        c_stream_profile[ii].n_reads = i->second.reads.size();
+        c_stream_profile[ii].reads = i->second.reads.data();
+        ii++;
+    }
+}
+
+void free_stream_profile() {
+    hls::stream_profiler &profiler = hls::get_stream_profiler();
+    profiler.enabled = false;
+    profiler.profiles.clear();
+    profiler.generation++;
+}
+
 // Wrapper of top level function for Python bridge
 void myproject_float(
     // hls-fpga-machine-learning insert header #float
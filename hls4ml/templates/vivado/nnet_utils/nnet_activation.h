@@ -73,6 +73,55 @@ template <class data_T, class res_T, typename CONFIG_T> void relu1(data_T data[C
     relu_max<data_T, res_T, 1, CONFIG_T>(data, res);
 }
 
+// *************************************************
+//       Piecewise polynomial approximation
+// *************************************************
+template <class data_T, class table_T, unsigned N_SEGMENTS, unsigned DEGREE>
+table_T piecewise_value(data_T x, const table_T breakpoints[N_SEGMENTS + 1],
+                        const table_T coefs[N_SEGMENTS * (DEGREE + 1)]) {
+    #pragma HLS INLINE
+
+    // Clamp the input to the fitted range
+    table_T x_clamped;
+    if (x < breakpoints[0])
+        x_clamped = breakpoints[0];
+    else if (x > breakpoints[N_SEGMENTS])
+        x_clamped = breakpoints[N_SEGMENTS];
+    else
+        x_clamped = x;
+
+    // Find the segment with one comparator per breakpoint
+    unsigned segment = 0;
+    for (unsigned i = 1; i < N_SEGMENTS; i++) {
+        #pragma HLS UNROLL
+        if (x_clamped >= breakpoints[i])
+            segment = i;
+    }
+
+    // Evaluate the polynomial of the segment with Horner's method, in the local coordinate of the segment
+    table_T dx = x_clamped - breakpoints[segment];
+    table_T y = coefs[segment * (DEGREE + 1) + DEGREE];
+    for (int k = DEGREE - 1; k >= 0; k--) {
+        #pragma HLS UNROLL
+        y = y * dx + coefs[segment * (DEGREE + 1) + k];
+    }
+    return y;
+}
+
+template <class data_T, class res_T, typename CONFIG_T>
+void piecewise(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in],
+               const typename CONFIG_T::table_t breakpoints[CONFIG_T::n_segments + 1],
+               const typename CONFIG_T::table_t coefs[CONFIG_T::n_segments * (CONFIG_T::degree + 1)]) {
+    #pragma HLS PIPELINE
+    #pragma HLS ARRAY_PARTITION variable=breakpoints complete
+    #pragma HLS ARRAY_PARTITION variable=coefs complete
+
+    for (int ii = 0; ii < CONFIG_T::n_in; ii++) {
+        res[ii] = piecewise_value<data_T, typename CONFIG_T::table_t, CONFIG_T::n_segments, CONFIG_T::degree>(
+            data[ii], breakpoints, coefs);
+    }
+}
+
 // *************************************************
 //       Sigmoid Activation
 // *************************************************
@@ -92,20 +141,8 @@ template <typename CONFIG_T, int N_TABLE> void init_sigmoid_table(typename CONFI
 }
 
 template <class data_T, class res_T, typename CONFIG_T>
-void sigmoid(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
-    // Initialize the lookup table
-#ifdef __HLS_SYN__
-    bool initialized = false;
-    typename CONFIG_T::table_t sigmoid_table[CONFIG_T::table_size];
-#else
-    static bool initialized = false;
-    static typename CONFIG_T::table_t sigmoid_table[CONFIG_T::table_size];
-#endif
-    if (!initialized) {
-        init_sigmoid_table<CONFIG_T, CONFIG_T::table_size>(sigmoid_table);
-        initialized = true;
-    }
-
+void sigmoid(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in],
+             const typename CONFIG_T::table_t sigmoid_table[CONFIG_T::table_size]) {
     #pragma HLS PIPELINE
 
     // Index into the lookup table based on data
@@ -122,11 +159,31 @@ void sigmoid(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
     }
 }
 
+template <class data_T, class res_T, typename CONFIG_T>
+void sigmoid(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
+    #pragma HLS INLINE
+
+    // Initialize the lookup table
+#ifdef __HLS_SYN__
+    bool initialized = false;
+    typename CONFIG_T::table_t sigmoid_table[CONFIG_T::table_size];
+#else
+    static bool initialized = false;
+    static typename CONFIG_T::table_t sigmoid_table[CONFIG_T::table_size];
+#endif
+    if (!initialized) {
+        init_sigmoid_table<CONFIG_T, CONFIG_T::table_size>(sigmoid_table);
+        initialized = true;
+    }
+
+    sigmoid<data_T, res_T, CONFIG_T>(data, res, sigmoid_table);
+}
+
 // *************************************************
 //       Softmax Activation
 // *************************************************
 
-enum class softmax_implementation { latency = 0, legacy = 1, stable = 2, argmax = 3 };
+enum class softmax_implementation { latency = 0, legacy = 1, stable = 2, argmax = 3, piecewise = 4 };
 
 inline float exp_fcn_float(float input) { return std::exp(input); }
 
@@ -167,8 +224,39 @@ void init_invert_table(typename CONFIG_T::inv_table_t table_out[CONFIG_T::table_
 }
 
 template <class data_T, class res_T, typename CONFIG_T>
-void softmax_latency(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
+void softmax_latency(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in],
+                     const typename CONFIG_T::exp_table_t exp_table[CONFIG_T::table_size],
+                     const typename CONFIG_T::inv_table_t invert_table[CONFIG_T::table_size]) {
     #pragma HLS pipeline
+
+    // Calculate all the e^x's
+    typename CONFIG_T::exp_table_t exp_res[CONFIG_T::n_in];
+    #pragma HLS array_partition variable=exp_res complete
+    typename CONFIG_T::exp_table_t exp_sum(0);
+    for (unsigned i = 0; i < CONFIG_T::n_in; i++) {
+        #pragma HLS unroll
+        unsigned x = softmax_idx_from_real_val<data_T, CONFIG_T>(data[i]);
+        exp_res[i] = exp_table[x];
+    }
+
+    // Explicitly sum the results with an adder tree.
+    // Rounding & Saturation mode, which improve accuracy, prevent Vivado from expression balancing
+    Op_add<typename CONFIG_T::exp_table_t> op_add;
+    exp_sum =
+        reduce<typename CONFIG_T::exp_table_t, CONFIG_T::n_in, Op_add<typename CONFIG_T::exp_table_t>>(exp_res, op_add);
+
+    typename CONFIG_T::inv_table_t inv_exp_sum =
+        invert_table[softmax_idx_from_real_val<typename CONFIG_T::exp_table_t, CONFIG_T>(exp_sum)];
+    for (unsigned i = 0; i < CONFIG_T::n_in; i++) {
+        #pragma HLS unroll
+        res[i] = exp_res[i] * inv_exp_sum;
+    }
+}
+
+template <class data_T, class res_T, typename CONFIG_T>
+void softmax_latency(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
+    #pragma HLS INLINE
+
     // Initialize the lookup tables
 #ifdef __HLS_SYN__
     bool initialized = false;
@@ -188,13 +276,33 @@ void softmax_latency(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
         initialized = true;
     }
 
+    softmax_latency<data_T, res_T, CONFIG_T>(data, res, exp_table, invert_table);
+}
+
+template <class data_T, class res_T, typename CONFIG_T>
+void softmax_stable(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in],
+                    const typename CONFIG_T::exp_table_t exp_table[CONFIG_T::table_size],
+                    const typename CONFIG_T::inv_table_t invert_table[CONFIG_T::table_size]) {
+    #pragma HLS pipeline
+
+    // Find the max and compute all delta(x_i, x_max)
+    Op_max<data_T> op_max;
+    data_T x_max = reduce<data_T, CONFIG_T::n_in, Op_max<data_T>>(data, op_max);
+
+    // For the diffs, use the same type as the input but force rounding and saturation
+    ap_fixed<data_T::width, data_T::iwidth, AP_RND, AP_SAT> d_xi_xmax[CONFIG_T::n_in];
+    for (unsigned i = 0; i < CONFIG_T::n_in; i++) {
+        #pragma HLS unroll
+        d_xi_xmax[i] = data[i] - x_max;
+    }
+
     // Calculate all the e^x's
     typename CONFIG_T::exp_table_t exp_res[CONFIG_T::n_in];
     #pragma HLS array_partition variable=exp_res complete
     typename CONFIG_T::exp_table_t exp_sum(0);
     for (unsigned i = 0; i < CONFIG_T::n_in; i++) {
         #pragma HLS unroll
-        unsigned x = softmax_idx_from_real_val<data_T, CONFIG_T>(data[i]);
+        unsigned x = softmax_idx_from_real_val<data_T, CONFIG_T>(d_xi_xmax[i]);
         exp_res[i] = exp_table[x];
     }
 
@@ -214,7 +322,8 @@ void softmax_latency(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
 
 template <class data_T, class res_T, typename CONFIG_T>
 void softmax_stable(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
-    #pragma HLS pipeline
+    #pragma HLS INLINE
+
     // Initialize the lookup tables
 #ifdef __HLS_SYN__
     bool initialized = false;
@@ -234,25 +343,42 @@ void softmax_stable(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
         initialized = true;
     }
 
+    softmax_stable<data_T, res_T, CONFIG_T>(data, res, exp_table, invert_table);
+}
+
+template <class data_T, class res_T, typename CONFIG_T>
+void softmax_piecewise(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in],
+                       const typename CONFIG_T::exp_table_t exp_breakpoints[CONFIG_T::exp_n_segments + 1],
+                       const typename CONFIG_T::exp_table_t exp_coefs[CONFIG_T::exp_n_segments * (CONFIG_T::degree + 1)],
+                       const typename CONFIG_T::inv_table_t inv_breakpoints[CONFIG_T::inv_n_segments + 1],
+                       const typename CONFIG_T::inv_table_t inv_coefs[CONFIG_T::inv_n_segments * (CONFIG_T::degree + 1)]) {
+    #pragma HLS pipeline
+    #pragma HLS ARRAY_PARTITION variable=exp_breakpoints complete
+    #pragma HLS ARRAY_PARTITION variable=exp_coefs complete
+    #pragma HLS ARRAY_PARTITION variable=inv_breakpoints complete
+    #pragma HLS ARRAY_PARTITION variable=inv_coefs complete
+
+    typedef ap_fixed<data_T::width, data_T::iwidth, AP_RND, AP_SAT> diff_T;
+
     // Find the max and compute all delta(x_i, x_max)
     Op_max<data_T> op_max;
     data_T x_max = reduce<data_T, CONFIG_T::n_in, Op_max<data_T>>(data, op_max);
 
     // For the diffs, use the same type as the input but force rounding and saturation
-    ap_fixed<data_T::width, data_T::iwidth, AP_RND, AP_SAT> d_xi_xmax[CONFIG_T::n_in];
+    diff_T d_xi_xmax[CONFIG_T::n_in];
     for (unsigned i = 0; i < CONFIG_T::n_in; i++) {
         #pragma HLS unroll
         d_xi_xmax[i] = data[i] - x_max;
     }
 
-    // Calculate all the e^x's
+    // Calculate all the e^x's with the piecewise approximation
     typename CONFIG_T::exp_table_t exp_res[CONFIG_T::n_in];
     #pragma HLS array_partition variable=exp_res complete
     typename CONFIG_T::exp_table_t exp_sum(0);
     for (unsigned i = 0; i < CONFIG_T::n_in; i++) {
         #pragma HLS unroll
-        unsigned x = softmax_idx_from_real_val<data_T, CONFIG_T>(d_xi_xmax[i]);
-        exp_res[i] = exp_table[x];
+        exp_res[i] = piecewise_value<diff_T, typename CONFIG_T::exp_table_t, CONFIG_T::exp_n_segments, CONFIG_T::degree>(
+            d_xi_xmax[i], exp_breakpoints, exp_coefs);
     }
 
     // Explicitly sum the results with an adder tree.
@@ -262,7 +388,8 @@ void softmax_stable(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
         reduce<typename CONFIG_T::exp_table_t, CONFIG_T::n_in, Op_add<typename CONFIG_T::exp_table_t>>(exp_res, op_add);
 
     typename CONFIG_T::inv_table_t inv_exp_sum =
-        invert_table[softmax_idx_from_real_val<typename CONFIG_T::exp_table_t, CONFIG_T>(exp_sum)];
+        piecewise_value<typename CONFIG_T::exp_table_t, typename CONFIG_T::inv_table_t, CONFIG_T::inv_n_segments,
+                        CONFIG_T::degree>(exp_sum, inv_breakpoints, inv_coefs);
     for (unsigned i = 0; i < CONFIG_T::n_in; i++) {
         #pragma HLS unroll
         res[i] = exp_res[i] * inv_exp_sum;
@@ -394,6 +521,25 @@ void softmax(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
     }
 }
 
+template <class data_T, class res_T, typename CONFIG_T>
+void softmax(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in],
+             const typename CONFIG_T::exp_table_t exp_table[CONFIG_T::table_size],
+             const typename CONFIG_T::inv_table_t invert_table[CONFIG_T::table_size]) {
+    #pragma HLS inline
+    // Only the latency and stable implementations use the exp_table_t and inv_table_t tables
+    switch (CONFIG_T::implementation) {
+    case softmax_implementation::latency:
+        softmax_latency<data_T, res_T, CONFIG_T>(data, res, exp_table, invert_table);
+        break;
+    case softmax_implementation::stable:
+        softmax_stable<data_T, res_T, CONFIG_T>(data, res, exp_table, invert_table);
+        break;
+    default:
+        softmax<data_T, res_T, CONFIG_T>(data, res);
+        break;
+    }
+}
+
 // *************************************************
 //       TanH Activation
 // *************************************************
@@ -410,20 +556,9 @@ template <typename CONFIG_T, int N_TABLE> void init_tanh_table(typename CONFIG_T
     }
 }
 
-template <class data_T, class res_T, typename CONFIG_T> void tanh(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
-    // Initialize the lookup table
-#ifdef __HLS_SYN__
-    bool initialized = false;
-    typename CONFIG_T::table_t tanh_table[CONFIG_T::table_size];
-#else
-    static bool initialized = false;
-    static typename CONFIG_T::table_t tanh_table[CONFIG_T::table_size];
-#endif
-    if (!initialized) {
-        init_tanh_table<CONFIG_T, CONFIG_T::table_size>(tanh_table);
-        initialized = true;
-    }
-
+template <class data_T, class res_T, typename CONFIG_T>
+void tanh(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in],
+          const typename CONFIG_T::table_t tanh_table[CONFIG_T::table_size]) {
     #pragma HLS PIPELINE
 
     // Index into the lookup table based on data
@@ -441,6 +576,25 @@ template <class data_T, class res_T, typename CONFIG_T> void tanh(data_T data[CO
     }
 }
 
+template <class data_T, class res_T, typename CONFIG_T> void tanh(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
+    #pragma HLS INLINE
+
+    // Initialize the lookup table
+#ifdef __HLS_SYN__
+    bool initialized = false;
+    typename CONFIG_T::table_t tanh_table[CONFIG_T::table_size];
+#else
+    static bool initialized = false;
+    static typename CONFIG_T::table_t tanh_table[CONFIG_T::table_size];
+#endif
+    if (!initialized) {
+        init_tanh_table<CONFIG_T, CONFIG_T::table_size>(tanh_table);
+        initialized = true;
+    }
+
+    tanh<data_T, res_T, CONFIG_T>(data, res, tanh_table);
+}
+
 // *************************************************
 //       UnaryLUT Activation
 // *************************************************
@@ -549,20 +703,8 @@ template <typename CONFIG_T, int N_TABLE> void init_softplus_table(typename CONF
 }
 
 template <class data_T, class res_T, typename CONFIG_T>
-void softplus(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
-    // Initialize the lookup table
-#ifdef __HLS_SYN__
-    bool initialized = false;
-    typename CONFIG_T::table_t softplus_table[CONFIG_T::table_size];
-#else
-    static bool initialized = false;
-    static typename CONFIG_T::table_t softplus_table[CONFIG_T::table_size];
-#endif
-    if (!initialized) {
-        init_softplus_table<CONFIG_T, CONFIG_T::table_size>(softplus_table);
-        initialized = true;
-    }
-
+void softplus(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in],
+              const typename CONFIG_T::table_t softplus_table[CONFIG_T::table_size]) {
     #pragma HLS PIPELINE
 
     // Index into the lookup table based on data
@@ -579,6 +721,26 @@ void softplus(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
     }
 }
 
+template <class data_T, class res_T, typename CONFIG_T>
+void softplus(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
+    #pragma HLS INLINE
+
+    // Initialize the lookup table
+#ifdef __HLS_SYN__
+    bool initialized = false;
+    typename CONFIG_T::table_t softplus_table[CONFIG_T::table_size];
+#else
+    static bool initialized = false;
+    static typename CONFIG_T::table_t softplus_table[CONFIG_T::table_size];
+#endif
+    if (!initialized) {
+        init_softplus_table<CONFIG_T, CONFIG_T::table_size>(softplus_table);
+        initialized = true;
+    }
+
+    softplus<data_T, res_T, CONFIG_T>(data, res, softplus_table);
+}
+
 // *************************************************
 //       Softsign Activation
 // *************************************************
@@ -598,20 +760,8 @@ template <typename CONFIG_T, int N_TABLE> void init_softsign_table(typename CONF
 }
 
 template <class data_T, class res_T, typename CONFIG_T>
-void softsign(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
-    // Initialize the lookup table
-#ifdef __HLS_SYN__
-    bool initialized = false;
-    typename CONFIG_T::table_t softsign_table[CONFIG_T::table_size];
-#else
-    static bool initialized = false;
-    static typename CONFIG_T::table_t softsign_table[CONFIG_T::table_size];
-#endif
-    if (!initialized) {
-        init_softsign_table<CONFIG_T, CONFIG_T::table_size>(softsign_table);
-        initialized = true;
-    }
-
+void softsign(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in],
+              const typename CONFIG_T::table_t softsign_table[CONFIG_T::table_size]) {
     #pragma HLS PIPELINE
 
     // Index into the lookup table based on data
@@ -628,6 +778,26 @@ void softsign(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
     }
 }
 
+template <class data_T, class res_T, typename CONFIG_T>
+void softsign(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
+    #pragma HLS INLINE
+
+    // Initialize the lookup table
+#ifdef __HLS_SYN__
+    bool initialized = false;
+    typename CONFIG_T::table_t softsign_table[CONFIG_T::table_size];
+#else
+    static bool initialized = false;
+    static typename CONFIG_T::table_t softsign_table[CONFIG_T::table_size];
+#endif
+    if (!initialized) {
+        init_softsign_table<CONFIG_T, CONFIG_T::table_size>(softsign_table);
+        initialized = true;
+    }
+
+    softsign<data_T, res_T, CONFIG_T>(data, res, softsign_table);
+}
+
 // *************************************************
 //       ELU Activation
 // *************************************************
@@ -647,20 +817,8 @@ template <typename CONFIG_T, int N_TABLE> void init_elu_table(typename CONFIG_T:
 }
 
 template <class data_T, class param_T, class res_T, typename CONFIG_T>
-void elu(data_T data[CONFIG_T::n_in], const param_T alpha, res_T res[CONFIG_T::n_in]) {
-    // Initialize the lookup table
-#ifdef __HLS_SYN__
-    bool initialized = false;
-    typename CONFIG_T::table_t elu_table[CONFIG_T::table_size];
-#else
-    static bool initialized = false;
-    static typename CONFIG_T::table_t elu_table[CONFIG_T::table_size];
-#endif
-    if (!initialized) {
-        init_elu_table<CONFIG_T, CONFIG_T::table_size>(elu_table);
-        initialized = true;
-    }
-
+void elu(data_T data[CONFIG_T::n_in], const param_T alpha, res_T res[CONFIG_T::n_in],
+         const typename CONFIG_T::table_t elu_table[CONFIG_T::table_size]) {
     #pragma HLS PIPELINE
 
     data_T datareg;
@@ -679,10 +837,36 @@ void elu(data_T data[CONFIG_T::n_in], const param_T alpha, res_T res[CONFIG_T::n
     }
 }
 
+template <class data_T, class param_T, class res_T, typename CONFIG_T>
+void elu(data_T data[CONFIG_T::n_in], const param_T alpha, res_T res[CONFIG_T::n_in]) {
+    #pragma HLS INLINE
+
+    // Initialize the lookup table
+#ifdef __HLS_SYN__
+    bool initialized = false;
+    typename CONFIG_T::table_t elu_table[CONFIG_T::table_size];
+#else
+    static bool initialized = false;
+    static typename CONFIG_T::table_t elu_table[CONFIG_T::table_size];
+#endif
+    if (!initialized) {
+        init_elu_table<CONFIG_T, CONFIG_T::table_size>(elu_table);
+        initialized = true;
+    }
+
+    elu<data_T, param_T, res_T, CONFIG_T>(data, alpha, res, elu_table);
+}
+
 template <class data_T, class res_T, typename CONFIG_T> void elu(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
     elu<data_T, ap_uint<1>, res_T, CONFIG_T>(data, 1.0, res);
 }
 
+template <class data_T, class res_T, typename CONFIG_T>
+void elu(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in],
+         const typename CONFIG_T::table_t elu_table[CONFIG_T::table_size]) {
+    elu<data_T, ap_uint<1>, res_T, CONFIG_T>(data, 1.0, res, elu_table);
+}
+
 // *************************************************
 //       SELU Activation
 // *************************************************
@@ -703,20 +887,9 @@ template <typename CONFIG_T, int N_TABLE> void init_selu_table(typename CONFIG_T
     }
 }
 
-template <class data_T, class res_T, typename CONFIG_T> void selu(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
-    // Initialize the lookup table
-#ifdef __HLS_SYN__
-    bool initialized = false;
-    typename CONFIG_T::table_t selu_table[CONFIG_T::table_size];
-#else
-    static bool initialized = false;
-    static typename CONFIG_T::table_t selu_table[CONFIG_T::table_size];
-#endif
-    if (!initialized) {
-        init_selu_table<CONFIG_T, CONFIG_T::table_size>(selu_table);
-        initialized = true;
-    }
-
+template <class data_T, class res_T, typename CONFIG_T>
+void selu(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in],
+          const typename CONFIG_T::table_t selu_table[CONFIG_T::table_size]) {
     #pragma HLS PIPELINE
 
     data_T datareg;
@@ -735,6 +908,25 @@ template <class data_T, class res_T, typename CONFIG_T> void selu(data_T data[CO
     }
 }
 
+template <class data_T, class res_T, typename CONFIG_T> void selu(data_T data[CONFIG_T::n_in], res_T res[CONFIG_T::n_in]) {
+    #pragma HLS INLINE
+
+    // Initialize the lookup table
+#ifdef __HLS_SYN__
+    bool initialized = false;
+    typename CONFIG_T::table_t selu_table[CONFIG_T::table_size];
+#else
+    static bool initialized = false;
+    static typename CONFIG_T::table_t selu_table[CONFIG_T::table_size];
+#endif
+    if (!initialized) {
+        init_selu_table<CONFIG_T, CONFIG_T::table_size>(selu_table);
+        initialized = true;
+    }
+
+    selu<data_T, res_T, CONFIG_T>(data, res, selu_table);
+}
+
 // *************************************************
 //       PReLU Activation
 // *************************************************
@@ -59,23 +59,42 @@ ReLUActLoop:
 }
 
 // *************************************************
-//       Sigmoid Activation
+//       Piecewise polynomial approximation
 // *************************************************
 
-template <class data_T, class res_T, typename CONFIG_T> void sigmoid(hls::stream<data_T> &data, hls::stream<res_T> &res) {
-    // Initialize the lookup table
-#ifdef __HLS_SYN__
-    bool initialized = false;
-    typename CONFIG_T::table_t sigmoid_table[CONFIG_T::table_size];
-#else
-    static bool initialized = false;
-    static typename CONFIG_T::table_t sigmoid_table[CONFIG_T::table_size];
-#endif
-    if (!initialized) {
-        init_sigmoid_table<CONFIG_T, CONFIG_T::table_size>(sigmoid_table);
-        initialized = true;
+template <class data_T, class res_T, typename CONFIG_T>
+void piecewise(hls::stream<data_T> &data, hls::stream<res_T> &res,
+               const typename CONFIG_T::table_t breakpoints[CONFIG_T::n_segments + 1],
+               const typename CONFIG_T::table_t coefs[CONFIG_T::n_segments * (CONFIG_T::degree + 1)]) {
+    #pragma HLS ARRAY_PARTITION variable=breakpoints complete
+    #pragma HLS ARRAY_PARTITION variable=coefs complete
+
+PiecewiseActLoop:
+    for (int i = 0; i < CONFIG_T::n_in / res_T::size; i++) {
+        #pragma HLS PIPELINE
+
+        data_T in_data = data.read();
+        res_T out_data;
+        PRAGMA_DATA_PACK(out_data)
+
+    PiecewisePackLoop:
+        for (int j = 0; j < res_T::size; j++) {
+            #pragma HLS UNROLL
+            out_data[j] = piecewise_value<typename data_T::value_type, typename CONFIG_T::table_t, CONFIG_T::n_segments,
+                                          CONFIG_T::degree>(in_data[j], breakpoints, coefs);
+        }
+
+        res.write(out_data);
     }
+}
+
+// *************************************************
+//       Sigmoid Activation
+// *************************************************
 
+template <class data_T, class res_T, typename CONFIG_T>
+void sigmoid(hls::stream<data_T> &data, hls::stream<res_T> &res,
+             const typename CONFIG_T::table_t sigmoid_table[CONFIG_T::table_size]) {
 SigmoidActLoop:
     for (int i = 0; i < CONFIG_T::n_in / res_T::size; i++) {
         #pragma HLS PIPELINE
@@ -100,12 +119,78 @@ SigmoidActLoop:
     }
 }
 
+template <class data_T, class res_T, typename CONFIG_T> void sigmoid(hls::stream<data_T> &data, hls::stream<res_T> &res) {
+    #pragma HLS INLINE
+
+    // Initialize the lookup table
+#ifdef __HLS_SYN__
+    bool initialized = false;
+    typename CONFIG_T::table_t sigmoid_table[CONFIG_T::table_size];
+#else
+    static bool initialized = false;
+    static typename CONFIG_T::table_t sigmoid_table[CONFIG_T::table_size];
+#endif
+    if (!initialized) {
+        init_sigmoid_table<CONFIG_T, CONFIG_T::table_size>(sigmoid_table);
+        initialized = true;
+    }
+
+    sigmoid<data_T, res_T, CONFIG_T>(data, res, sigmoid_table);
+}
+
 // *************************************************
 //       Softmax Activation
 // *************************************************
 
+template <class data_T, class res_T, typename CONFIG_T>
+void softmax_latency(hls::stream<data_T> &data, hls::stream<res_T> &res,
+                     const typename CONFIG_T::exp_table_t exp_table[CONFIG_T::table_size],
+                     const typename CONFIG_T::inv_table_t invert_table[CONFIG_T::table_size]) {
+    constexpr unsigned multiplier_limit = DIV_ROUNDUP(data_T::size, CONFIG_T::reuse_factor);
+    constexpr unsigned ii = data_T::size / multiplier_limit;
+
+    // Calculate all the e^x's
+    typename CONFIG_T::exp_table_t exp_res[data_T::size];
+    #pragma HLS array_partition variable=exp_res complete
+    typename CONFIG_T::exp_table_t exp_sum(0);
+SoftmaxExpLoop:
+    for (unsigned i = 0; i < CONFIG_T::n_in / data_T::size; i++) {
+        #pragma HLS PIPELINE II=ii
+
+        data_T in_pack = data.read();
+    SoftmaxExpPackLoop:
+        for (unsigned j = 0; j < data_T::size; j++) {
+            #pragma HLS UNROLL
+            unsigned x = softmax_idx_from_real_val<typename data_T::value_type, CONFIG_T>(in_pack[j]);
+            exp_res[j] = exp_table[x];
+        }
+
+        // Explicitly sum the results with an adder tree.
+        // Rounding & Saturation mode, which improve accuracy, prevent Vivado from expression balancing
+        Op_add<typename CONFIG_T::exp_table_t> op_add;
+        exp_sum =
+            reduce<typename CONFIG_T::exp_table_t, data_T::size, Op_add<typename CONFIG_T::exp_table_t>>(exp_res, op_add);
+
+        typename CONFIG_T::inv_table_t inv_exp_sum =
+            invert_table[softmax_idx_from_real_val<typename CONFIG_T::exp_table_t, CONFIG_T>(exp_sum)];
+
+        res_T out_pack;
+        PRAGMA_DATA_PACK(out_pack)
+
+    SoftmaxInvPackLoop:
+        for (unsigned j = 0; j < res_T::size; j++) {
+            #pragma HLS UNROLL
+            #pragma HLS ALLOCATION operation instances=mul limit=multiplier_limit
+            out_pack[j] = exp_res[j] * inv_exp_sum;
+        }
+        res.write(out_pack);
+    }
+}
+
 template <class data_T, class res_T, typename CONFIG_T>
 void softmax_latency(hls::stream<data_T> &data, hls::stream<res_T> &res) {
+    #pragma HLS INLINE
+
     // Initialize the lookup tables
 #ifdef __HLS_SYN__
     bool initialized = false;
@@ -125,22 +210,48 @@ void softmax_latency(hls::stream<data_T> &data, hls::stream<res_T> &res) {
         initialized = true;
     }
 
+    softmax_latency<data_T, res_T, CONFIG_T>(data, res, exp_table, invert_table);
+}
+
+template <class data_T, class res_T, typename CONFIG_T>
+void softmax_stable(hls::stream<data_T> &data, hls::stream<res_T> &res,
+                    const typename CONFIG_T::exp_table_t exp_table[CONFIG_T::table_size],
+                    const typename CONFIG_T::inv_table_t invert_table[CONFIG_T::table_size]) {
     constexpr unsigned multiplier_limit = DIV_ROUNDUP(data_T::size, CONFIG_T::reuse_factor);
     constexpr unsigned ii = data_T::size / multiplier_limit;
 
-    // Calculate all the e^x's
-    typename CONFIG_T::exp_table_t exp_res[data_T::size];
-    #pragma HLS array_partition variable=exp_res complete
-    typename CONFIG_T::exp_table_t exp_sum(0);
-SoftmaxExpLoop:
+    typename data_T::value_type data_array[data_T::size];
+#pragma HLS ARRAY_PARTITION variable=data_array complete
+SoftmaxArrayLoop:
     for (unsigned i = 0; i < CONFIG_T::n_in / data_T::size; i++) {
         #pragma HLS PIPELINE II=ii
 
         data_T in_pack = data.read();
-    SoftmaxExpPackLoop:
+    SoftmaxArrayPackLoop:
         for (unsigned j = 0; j < data_T::size; j++) {
             #pragma HLS UNROLL
-            unsigned x = softmax_idx_from_real_val<typename data_T::value_type, CONFIG_T>(in_pack[j]);
+            data_array[j] = in_pack[j];
+        }
+
+        // Find the max and compute all delta(x_i, x_max)
+        Op_max<typename data_T::value_type> op_max;
+        typename data_T::value_type x_max =
+            reduce<typename data_T::value_type, data_T::size, Op_max<typename data_T::value_type>>(data_array, op_max);
+
+        // For the diffs, use the same type as the input but force rounding and saturation
+        ap_fixed<data_T::value_type::width, data_T::value_type::iwidth, AP_RND, AP_SAT> d_xi_xmax[data_T::size];
+        for (unsigned j = 0; j < data_T::size; j++) {
+            #pragma HLS UNROLL
+            d_xi_xmax[j] = data_array[j] - x_max;
+        }
+
+        // Calculate all the e^x's
+        typename CONFIG_T::exp_table_t exp_res[data_T::size];
+        #pragma HLS ARRAY_PARTITION variable=exp_res complete
+        typename CONFIG_T::exp_table_t exp_sum(0);
+        for (unsigned j = 0; j < data_T::size; j++) {
+            #pragma HLS UNROLL
+            unsigned x = softmax_idx_from_real_val<typename data_T::value_type, CONFIG_T>(d_xi_xmax[j]);
             exp_res[j] = exp_table[x];
         }
 
@@ -168,6 +279,8 @@ SoftmaxExpLoop:
 
 template <class data_T, class res_T, typename CONFIG_T>
 void softmax_stable(hls::stream<data_T> &data, hls::stream<res_T> &res) {
+    #pragma HLS INLINE
+
     // Initialize the lookup tables
 #ifdef __HLS_SYN__
     bool initialized = false;
@@ -187,9 +300,25 @@ void softmax_stable(hls::stream<data_T> &data, hls::stream<res_T> &res) {
         initialized = true;
     }
 
+    softmax_stable<data_T, res_T, CONFIG_T>(data, res, exp_table, invert_table);
+}
+
+template <class data_T, class res_T, typename CONFIG_T>
+void softmax_piecewise(hls::stream<data_T> &data, hls::stream<res_T> &res,
+                       const typename CONFIG_T::exp_table_t exp_breakpoints[CONFIG_T::exp_n_segments + 1],
+                       const typename CONFIG_T::exp_table_t exp_coefs[CONFIG_T::exp_n_segments * (CONFIG_T::degree + 1)],
+                       const typename CONFIG_T::inv_table_t inv_breakpoints[CONFIG_T::inv_n_segments + 1],
+                       const typename CONFIG_T::inv_table_t inv_coefs[CONFIG_T::inv_n_segments * (CONFIG_T::degree + 1)]) {
+    #pragma HLS ARRAY_PARTITION variable=exp_breakpoints complete
+    #pragma HLS ARRAY_PARTITION variable=exp_coefs complete
+    #pragma HLS ARRAY_PARTITION variable=inv_breakpoints complete
+    #pragma HLS ARRAY_PARTITION variable=inv_coefs complete
+
     constexpr unsigned multiplier_limit = DIV_ROUNDUP(data_T::size, CONFIG_T::reuse_factor);
     constexpr unsigned ii = data_T::size / multiplier_limit;
 
+    typedef ap_fixed<data_T::value_type::width, data_T::value_type::iwidth, AP_RND, AP_SAT> diff_T;
+
     typename data_T::value_type data_array[data_T::size];
 #pragma HLS ARRAY_PARTITION variable=data_array complete
 SoftmaxArrayLoop:
@@ -209,20 +338,20 @@ SoftmaxArrayLoop:
             reduce<typename data_T::value_type, data_T::size, Op_max<typename data_T::value_type>>(data_array, op_max);
 
         // For the diffs, use the same type as the input but force rounding and saturation
-        ap_fixed<data_T::value_type::width, data_T::value_type::iwidth, AP_RND, AP_SAT> d_xi_xmax[data_T::size];
+        diff_T d_xi_xmax[data_T::size];
         for (unsigned j = 0; j < data_T::size; j++) {
             #pragma HLS UNROLL
             d_xi_xmax[j] = data_array[j] - x_max;
         }
 
-        // Calculate all the e^x's
+        // Calculate all the e^x's with the piecewise approximation
         typename CONFIG_T::exp_table_t exp_res[data_T::size];
         #pragma HLS ARRAY_PARTITION variable=exp_res complete
         typename CONFIG_T::exp_table_t exp_sum(0);
         for (unsigned j = 0; j < data_T::size; j++) {
             #pragma HLS UNROLL
-            unsigned x = softmax_idx_from_real_val<typename data_T::value_type, CONFIG_T>(d_xi_xmax[j]);
-            exp_res[j] = exp_table[x];
+            exp_res[j] = piecewise_value<diff_T, typename CONFIG_T::exp_table_t, CONFIG_T::exp_n_segments, CONFIG_T::degree>(
+                d_xi_xmax[j], exp_breakpoints, exp_coefs);
         }
 
         // Explicitly sum the results with an adder tree.
@@ -232,7 +361,8 @@ SoftmaxArrayLoop:
             reduce<typename CONFIG_T::exp_table_t, data_T::size, Op_add<typename CONFIG_T::exp_table_t>>(exp_res, op_add);
 
         typename CONFIG_T::inv_table_t inv_exp_sum =
-            invert_table[softmax_idx_from_real_val<typename CONFIG_T::exp_table_t, CONFIG_T>(exp_sum)];
+            piecewise_value<typename CONFIG_T::exp_table_t, typename CONFIG_T::inv_table_t, CONFIG_T::inv_n_segments,
+                            CONFIG_T::degree>(exp_sum, inv_breakpoints, inv_coefs);
 
         res_T out_pack;
         PRAGMA_DATA_PACK(out_pack)
@@ -370,24 +500,33 @@ template <class data_T, class res_T, typename CONFIG_T> void softmax(hls::stream
     }
 }
 
+template <class data_T, class res_T, typename CONFIG_T>
+void softmax(hls::stream<data_T> &data, hls::stream<res_T> &res,
+             const typename CONFIG_T::exp_table_t exp_table[CONFIG_T::table_size],
+             const typename CONFIG_T::inv_table_t invert_table[CONFIG_T::table_size]) {
+    assert(CONFIG_T::axis == -1);
+
+    // Only the latency and stable implementations use the exp_table_t and inv_table_t tables
+    switch (CONFIG_T::implementation) {
+    case softmax_implementation::latency:
+        softmax_latency<data_T, res_T, CONFIG_T>(data, res, exp_table, invert_table);
+        break;
+    case softmax_implementation::stable:
+        softmax_stable<data_T, res_T, CONFIG_T>(data, res, exp_table, invert_table);
+        break;
+    default:
+        softmax<data_T, res_T, CONFIG_T>(data, res);
+        break;
+    }
+}
+
 // *************************************************
 //       TanH Activation
 // *************************************************
 
-template <class data_T, class res_T, typename CONFIG_T> void tanh(hls::stream<data_T> &data, hls::stream<res_T> &res) {
-    // Initialize the lookup table
-#ifdef __HLS_SYN__
-    bool initialized = false;
-    typename CONFIG_T::table_t tanh_table[CONFIG_T::table_size];
-#else
-    static bool initialized = false;
-    static typename CONFIG_T::table_t tanh_table[CONFIG_T::table_size];
-#endif
-    if (!initialized) {
-        init_tanh_table<CONFIG_T, CONFIG_T::table_size>(tanh_table);
-        initialized = true;
-    }
-
+template <class data_T, class res_T, typename CONFIG_T>
+void tanh(hls::stream<data_T> &data, hls::stream<res_T> &res,
+          const typename CONFIG_T::table_t tanh_table[CONFIG_T::table_size]) {
 TanHActLoop:
     for (int i = 0; i < CONFIG_T::n_in / res_T::size; i++) {
         #pragma HLS PIPELINE
@@ -412,6 +551,25 @@ TanHActLoop:
     }
 }
 
+template <class data_T, class res_T, typename CONFIG_T> void tanh(hls::stream<data_T> &data, hls::stream<res_T> &res) {
+    #pragma HLS INLINE
+
+    // Initialize the lookup table
+#ifdef __HLS_SYN__
+    bool initialized = false;
+    typename CONFIG_T::table_t tanh_table[CONFIG_T::table_size];
+#else
+    static bool initialized = false;
+    static typename CONFIG_T::table_t tanh_table[CONFIG_T::table_size];
+#endif
+    if (!initialized) {
+        init_tanh_table<CONFIG_T, CONFIG_T::table_size>(tanh_table);
+        initialized = true;
+    }
+
+    tanh<data_T, res_T, CONFIG_T>(data, res, tanh_table);
+}
+
 // *************************************************
 //       UnaryLUT Activation
 // *************************************************
@@ -552,20 +710,9 @@ ThresholdedReLUActLoop:
 //       Softplus Activation
 // *************************************************
 
-template <class data_T, class res_T, typename CONFIG_T> void softplus(hls::stream<data_T> &data, hls::stream<res_T> &res) {
-    // Initialize the lookup table
-#ifdef __HLS_SYN__
-    bool initialized = false;
-    typename CONFIG_T::table_t softplus_table[CONFIG_T::table_size];
-#else
-    static bool initialized = false;
-    static typename CONFIG_T::table_t softplus_table[CONFIG_T::table_size];
-#endif
-    if (!initialized) {
-        init_softplus_table<CONFIG_T, CONFIG_T::table_size>(softplus_table);
-        initialized = true;
-    }
-
+template <class data_T, class res_T, typename CONFIG_T>
+void softplus(hls::stream<data_T> &data, hls::stream<res_T> &res,
+              const typename CONFIG_T::table_t softplus_table[CONFIG_T::table_size]) {
 SoftplusActLoop:
     for (int i = 0; i < CONFIG_T::n_in / res_T::size; i++) {
         #pragma HLS PIPELINE
@@ -589,24 +736,32 @@ SoftplusActLoop:
     }
 }
 
-// *************************************************
-//       Softsign Activation
-// *************************************************
+template <class data_T, class res_T, typename CONFIG_T> void softplus(hls::stream<data_T> &data, hls::stream<res_T> &res) {
+    #pragma HLS INLINE
 
-template <class data_T, class res_T, typename CONFIG_T> void softsign(hls::stream<data_T> &data, hls::stream<res_T> &res) {
     // Initialize the lookup table
 #ifdef __HLS_SYN__
     bool initialized = false;
-    typename CONFIG_T::table_t softsign_table[CONFIG_T::table_size];
+    typename CONFIG_T::table_t softplus_table[CONFIG_T::table_size];
 #else
     static bool initialized = false;
-    static typename CONFIG_T::table_t softsign_table[CONFIG_T::table_size];
+    static typename CONFIG_T::table_t softplus_table[CONFIG_T::table_size];
 #endif
     if (!initialized) {
-        init_softsign_table<CONFIG_T, CONFIG_T::table_size>(softsign_table);
+        init_softplus_table<CONFIG_T, CONFIG_T::table_size>(softplus_table);
         initialized = true;
     }
 
+    softplus<data_T, res_T, CONFIG_T>(data, res, softplus_table);
+}
+
+// *************************************************
+//       Softsign Activation
+// *************************************************
+
+template <class data_T, class res_T, typename CONFIG_T>
+void softsign(hls::stream<data_T> &data, hls::stream<res_T> &res,
+              const typename CONFIG_T::table_t softsign_table[CONFIG_T::table_size]) {
 SoftsignActLoop:
     for (int i = 0; i < CONFIG_T::n_in / res_T::size; i++) {
         #pragma HLS PIPELINE
@@ -630,24 +785,31 @@ SoftsignActLoop:
     }
 }
 
-// *************************************************
-//       ELU Activation
-// *************************************************
-template <class data_T, class param_T, class res_T, typename CONFIG_T>
-void elu(hls::stream<data_T> &data, param_T alpha, hls::stream<res_T> &res) {
+template <class data_T, class res_T, typename CONFIG_T> void softsign(hls::stream<data_T> &data, hls::stream<res_T> &res) {
+    #pragma HLS INLINE
+
     // Initialize the lookup table
 #ifdef __HLS_SYN__
     bool initialized = false;
-    typename CONFIG_T::table_t elu_table[CONFIG_T::table_size];
+    typename CONFIG_T::table_t softsign_table[CONFIG_T::table_size];
 #else
     static bool initialized = false;
-    static typename CONFIG_T::table_t elu_table[CONFIG_T::table_size];
+    static typename CONFIG_T::table_t softsign_table[CONFIG_T::table_size];
 #endif
     if (!initialized) {
-        init_elu_table<CONFIG_T, CONFIG_T::table_size>(elu_table);
+        init_softsign_table<CONFIG_T, CONFIG_T::table_size>(softsign_table);
         initialized = true;
     }
 
+    softsign<data_T, res_T, CONFIG_T>(data, res, softsign_table);
+}
+
+// *************************************************
+//       ELU Activation
+// *************************************************
+template <class data_T, class param_T, class res_T, typename CONFIG_T>
+void elu(hls::stream<data_T> &data, param_T alpha, hls::stream<res_T> &res,
+         const typename CONFIG_T::table_t elu_table[CONFIG_T::table_size]) {
 EluActLoop:
     for (int i = 0; i < CONFIG_T::n_in / res_T::size; i++) {
         #pragma HLS PIPELINE
@@ -674,28 +836,43 @@ EluActLoop:
     }
 }
 
-template <class data_T, class res_T, typename CONFIG_T> void elu(hls::stream<data_T> &data, hls::stream<res_T> &res) {
-    elu<data_T, ap_uint<1>, res_T, CONFIG_T>(data, 1.0, res);
-}
-
-// *************************************************
-//       SELU Activation
-// *************************************************
+template <class data_T, class param_T, class res_T, typename CONFIG_T>
+void elu(hls::stream<data_T> &data, param_T alpha, hls::stream<res_T> &res) {
+    #pragma HLS INLINE
 
-template <class data_T, class res_T, typename CONFIG_T> void selu(hls::stream<data_T> &data, hls::stream<res_T> &res) {
     // Initialize the lookup table
 #ifdef __HLS_SYN__
     bool initialized = false;
-    typename CONFIG_T::table_t selu_table[CONFIG_T::table_size];
+    typename CONFIG_T::table_t elu_table[CONFIG_T::table_size];
 #else
     static bool initialized = false;
-    static typename CONFIG_T::table_t selu_table[CONFIG_T::table_size];
+    static typename CONFIG_T::table_t elu_table[CONFIG_T::table_size];
 #endif
     if (!initialized) {
-        init_selu_table<CONFIG_T, CONFIG_T::table_size>(selu_table);
+        init_elu_table<CONFIG_T, CONFIG_T::table_size>(elu_table);
         initialized = true;
     }
 
+    elu<data_T, param_T, res_T, CONFIG_T>(data, alpha, res, elu_table);
+}
+
+template <class data_T, class res_T, typename CONFIG_T> void elu(hls::stream<data_T> &data, hls::stream<res_T> &res) {
+    elu<data_T, ap_uint<1>, res_T, CONFIG_T>(data, 1.0, res);
+}
+
+template <class data_T, class res_T, typename CONFIG_T>
+void elu(hls::stream<data_T> &data, hls::stream<res_T> &res,
+         const typename CONFIG_T::table_t elu_table[CONFIG_T::table_size]) {
+    elu<data_T, ap_uint<1>, res_T, CONFIG_T>(data, 1.0, res, elu_table);
+}
+
+// *************************************************
+//       SELU Activation
+// *************************************************
+
+template <class data_T, class res_T, typename CONFIG_T>
+void selu(hls::stream<data_T> &data, hls::stream<res_T> &res,
+          const typename CONFIG_T::table_t selu_table[CONFIG_T::table_size]) {
 SeluActLoop:
     for (int i = 0; i < CONFIG_T::n_in / res_T::size; i++) {
         #pragma HLS PIPELINE
@@ -722,6 +899,25 @@ SeluActLoop:
     }
 }
 
+template <class data_T, class res_T, typename CONFIG_T> void selu(hls::stream<data_T> &data, hls::stream<res_T> &res) {
+    #pragma HLS INLINE
+
+    // Initialize the lookup table
+#ifdef __HLS_SYN__
+    bool initialized = false;
+    typename CONFIG_T::table_t selu_table[CONFIG_T::table_size];
+#else
+    static bool initialized = false;
+    static typename CONFIG_T::table_t selu_table[CONFIG_T::table_size];
+#endif
+    if (!initialized) {
+        init_selu_table<CONFIG_T, CONFIG_T::table_size>(selu_table);
+        initialized = true;
+    }
+
+    selu<data_T, res_T, CONFIG_T>(data, res, selu_table);
+}
+
 // *************************************************
 //       PReLU Activation
 // *************************************************
@@ -25,6 +25,7 @@ namespace nnet {
 // Common type definitions
 enum io_type { io_parallel = 0, io_stream };
 enum strategy { latency, resource, resource_unrolled };
+enum class conv_implementation { linebuffer = 0, encoded = 1, winograd = 2 };
 
 /* ---
  * Balanced tree reduce implementation.
@@ -4,6 +4,8 @@
 #include "nnet_common.h"
 #include "nnet_conv1d_latency.h"
 #include "nnet_conv1d_resource.h"
+#include "nnet_conv1d_winograd.h"
+#include "nnet_conv_shift_add.h"
 #include "nnet_function_stubs.h"
 #include <cstdlib>
 
@@ -73,6 +75,26 @@ template <class data_T, class res_T, typename CONFIG_T> class Conv1DResource : p
     }
 };
 
+template <class data_T, class res_T, typename CONFIG_T> class Conv1DWinograd : public Conv1DKernel<data_T, res_T, CONFIG_T> {
+  public:
+    static void conv(data_T data[CONFIG_T::in_width * CONFIG_T::n_chan], res_T res[CONFIG_T::out_width * CONFIG_T::n_filt],
+                     typename CONFIG_T::weight_t weights[CONFIG_T::impl_filt_width * CONFIG_T::n_chan * CONFIG_T::n_filt],
+                     typename CONFIG_T::bias_t biases[CONFIG_T::n_filt]) {
+        #pragma HLS INLINE region
+        conv_1d_winograd_cl<data_T, res_T, CONFIG_T>(data, res, weights, biases);
+    }
+};
+
+template <class data_T, class res_T, typename CONFIG_T> class Conv1DShiftAdd : public Conv1DKernel<data_T, res_T, CONFIG_T> {
+  public:
+    static void conv(data_T data[CONFIG_T::in_width * CONFIG_T::n_chan], res_T res[CONFIG_T::out_width * CONFIG_T::n_filt],
+                     typename CONFIG_T::weight_t weights[CONFIG_T::filt_width * CONFIG_T::n_chan * CONFIG_T::n_filt],
+                     typename CONFIG_T::bias_t biases[CONFIG_T::n_filt]) {
+        #pragma HLS INLINE region
+        conv_1d_shift_add_cl<data_T, res_T, CONFIG_T>(data, res, weights, biases);
+    }
+};
+
 } // namespace nnet
 
 #endif
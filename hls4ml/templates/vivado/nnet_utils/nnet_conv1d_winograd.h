@@ -0,0 +1,94 @@
+#ifndef NNET_CONV1D_WINOGRAD_H_
+#define NNET_CONV1D_WINOGRAD_H_
+
+#include "nnet_common.h"
+#include "nnet_conv_winograd.h"
+#include "nnet_mult.h"
+
+namespace nnet {
+
+// Weights in the Winograd domain, ordered (n_filt, n_chan, impl_filt_width), with impl_filt_width the size of the tile
+template <class data_T, class res_T, typename CONFIG_T>
+void conv_1d_winograd_cl(
+    data_T data[CONFIG_T::in_width * CONFIG_T::n_chan], res_T res[CONFIG_T::out_width * CONFIG_T::n_filt],
+    typename CONFIG_T::weight_t weights[CONFIG_T::impl_filt_width * CONFIG_T::n_chan * CONFIG_T::n_filt],
+    typename CONFIG_T::bias_t biases[CONFIG_T::n_filt]) {
+    assert(CONFIG_T::filt_width == 3 && CONFIG_T::stride_width == 1);
+
+    typedef winograd_transform<CONFIG_T::impl_filt_width> transform;
+    constexpr unsigned tile = CONFIG_T::impl_filt_width;
+    constexpr unsigned n_out = transform::n_out;
+    constexpr unsigned n_tiles = DIV_ROUNDUP(CONFIG_T::out_width, n_out);
+
+    typename CONFIG_T::accum_t acc[CONFIG_T::n_filt][tile];
+    #pragma HLS ARRAY_PARTITION variable=acc complete dim=0
+
+    #pragma HLS ARRAY_PARTITION variable=weights complete
+    #pragma HLS ARRAY_PARTITION variable=biases complete
+
+    // Limit multipliers to control parallelization
+    #pragma HLS ALLOCATION operation instances=mul limit=CONFIG_T::mult_config::multiplier_limit
+
+TileLoop:
+    for (unsigned i_tile = 0; i_tile < n_tiles; i_tile++) {
+        #pragma HLS PIPELINE II=CONFIG_T::reuse_factor rewind
+
+    ResetAccum:
+        for (unsigned i_filt = 0; i_filt < CONFIG_T::n_filt; i_filt++) {
+            #pragma HLS UNROLL
+            for (unsigned i = 0; i < tile; i++) {
+                #pragma HLS UNROLL
+                acc[i_filt][i] = 0;
+            }
+        }
+
+    ChannelLoop:
+        for (unsigned i_chan = 0; i_chan < CONFIG_T::n_chan; i_chan++) {
+            #pragma HLS UNROLL
+
+            // Transform the input tile, zero outside of the input
+            typename CONFIG_T::accum_t data_tile[tile];
+            typename CONFIG_T::accum_t data_wino[tile];
+            for (unsigned i = 0; i < tile; i++) {
+                #pragma HLS UNROLL
+                int i_in = i_tile * n_out + i - CONFIG_T::pad_left;
+                if (i_in >= 0 && i_in < CONFIG_T::in_width) {
+                    data_tile[i] = data[i_in * CONFIG_T::n_chan + i_chan];
+                } else {
+                    data_tile[i] = 0;
+                }
+            }
+            transform::input(data_tile, data_wino);
+
+        // Element-wise product with the transformed kernels, summed over the channels
+        Product:
+            for (unsigned i_filt = 0; i_filt < CONFIG_T::n_filt; i_filt++) {
+                #pragma HLS UNROLL
+                for (unsigned i = 0; i < tile; i++) {
+                    #pragma HLS UNROLL
+                    acc[i_filt][i] += static_cast<typename CONFIG_T::accum_t>(
+                        data_wino[i] * weights[(i_filt * CONFIG_T::n_chan + i_chan) * tile + i]);
+                }
+            }
+        }
+
+    // Transform back to the outputs of the tile and cast to "res_t" type
+    Result:
+        for (unsigned i_filt = 0; i_filt < CONFIG_T::n_filt; i_filt++) {
+            #pragma HLS UNROLL
+            typename CONFIG_T::accum_t out_tile[n_out];
+            transform::output(acc[i_filt], out_tile);
+            for (unsigned i = 0; i < n_out; i++) {
+                #pragma HLS UNROLL
+                unsigned i_out = i_tile * n_out + i;
+                if (i_out < CONFIG_T::out_width) {
+                    res[i_out * CONFIG_T::n_filt + i_filt] = cast<data_T, res_T, typename CONFIG_T::mult_config>(
+                        out_tile[i] + (typename CONFIG_T::accum_t)biases[i_filt]);
+                }
+            }
+        }
+    }
+}
+
+} // namespace nnet
+#endif
@@ -0,0 +1,138 @@
+#ifndef NNET_CONV2D_WINOGRAD_H_
+#define NNET_CONV2D_WINOGRAD_H_
+
+#include "nnet_common.h"
+#include "nnet_conv_winograd.h"
+#include "nnet_mult.h"
+
+namespace nnet {
+
+// Weights in the Winograd domain, ordered (n_filt, n_chan, impl_filt_height, impl_filt_width), with impl_filt_height and
+// impl_filt_width the size of the tile
+template <class data_T, class res_T, typename CONFIG_T>
+void conv_2d_winograd_cl(
+    data_T data[CONFIG_T::in_height * CONFIG_T::in_width * CONFIG_T::n_chan],
+    res_T res[CONFIG_T::out_height * CONFIG_T::out_width * CONFIG_T::n_filt],
+    typename CONFIG_T::weight_t
+        weights[CONFIG_T::impl_filt_height * CONFIG_T::impl_filt_width * CONFIG_T::n_chan * CONFIG_T::n_filt],
+    typename CONFIG_T::bias_t biases[CONFIG_T::n_filt]) {
+    assert(CONFIG_T::filt_height == 3 && CONFIG_T::filt_width == 3);
+    assert(CONFIG_T::stride_height == 1 && CONFIG_T::stride_width == 1);
+    assert(CONFIG_T::impl_filt_height == CONFIG_T::impl_filt_width);
+
+    typedef winograd_transform<CONFIG_T::impl_filt_width> transform;
+    constexpr unsigned tile = CONFIG_T::impl_filt_width;
+    constexpr unsigned n_out = transform::n_out;
+    constexpr unsigned n_tiles_height = DIV_ROUNDUP(CONFIG_T::out_height, n_out);
+    constexpr unsigned n_tiles_width = DIV_ROUNDUP(CONFIG_T::out_width, n_out);
+
+    typename CONFIG_T::accum_t acc[CONFIG_T::n_filt][tile][tile];
+    #pragma HLS ARRAY_PARTITION variable=acc complete dim=0
+
+    #pragma HLS ARRAY_PARTITION variable=weights complete
+    #pragma HLS ARRAY_PARTITION variable=biases complete
+
+    // Limit multipliers to control parallelization
+    #pragma HLS ALLOCATION operation instances=mul limit=CONFIG_T::mult_config::multiplier_limit
+
+TileLoop:
+    for (unsigned i_tile = 0; i_tile < n_tiles_height * n_tiles_width; i_tile++) {
+        #pragma HLS PIPELINE II=CONFIG_T::reuse_factor rewind
+
+        const unsigned out_row = (i_tile / n_tiles_width) * n_out;
+        const unsigned out_col = (i_tile % n_tiles_width) * n_out;
+
+    ResetAccum:
+        for (unsigned i_filt = 0; i_filt < CONFIG_T::n_filt; i_filt++) {
+            #pragma HLS UNROLL
+            for (unsigned i = 0; i < tile; i++) {
+                #pragma HLS UNROLL
+                for (unsigned j = 0; j < tile; j++) {
+                    #pragma HLS UNROLL
+                    acc[i_filt][i][j] = 0;
+                }
+            }
+        }
+
+    ChannelLoop:
+        for (unsigned i_chan = 0; i_chan < CONFIG_T::n_chan; i_chan++) {
+            #pragma HLS UNROLL
+
+            // Transform the input tile (B'dB), zero outside of the input
+            typename CONFIG_T::accum_t data_tile[tile][tile];
+            typename CONFIG_T::accum_t data_wino[tile][tile];
+            for (unsigned j = 0; j < tile; j++) {
+                #pragma HLS UNROLL
+                typename CONFIG_T::accum_t column[tile];
+                typename CONFIG_T::accum_t column_wino[tile];
+                for (unsigned i = 0; i < tile; i++) {
+                    #pragma HLS UNROLL
+                    int i_row = out_row + i - CONFIG_T::pad_top;
+                    int i_col = out_col + j - CONFIG_T::pad_left;
+                    if (i_row >= 0 && i_row < CONFIG_T::in_height && i_col >= 0 && i_col < CONFIG_T::in_width) {
+                        column[i] = data[(i_row * CONFIG_T::in_width + i_col) * CONFIG_T::n_chan + i_chan];
+                    } else {
+                        column[i] = 0;
+                    }
+                }
+                transform::input(column, column_wino);
+                for (unsigned i = 0; i < tile; i++) {
+                    #pragma HLS UNROLL
+                    data_tile[i][j] = column_wino[i];
+                }
+            }
+            for (unsigned i = 0; i < tile; i++) {
+                #pragma HLS UNROLL
+                transform::input(data_tile[i], data_wino[i]);
+            }
+
+        // Element-wise product with the transformed kernels, summed over the channels
+        Product:
+            for (unsigned i_filt = 0; i_filt < CONFIG_T::n_filt; i_filt++) {
+                #pragma HLS UNROLL
+                for (unsigned i = 0; i < tile; i++) {
+                    #pragma HLS UNROLL
+                    for (unsigned j = 0; j < tile; j++) {
+                        #pragma HLS UNROLL
+                        acc[i_filt][i][j] += static_cast<typename CONFIG_T::accum_t>(
+                            data_wino[i][j] * weights[((i_filt * CONFIG_T::n_chan + i_chan) * tile + i) * tile + j]);
+                    }
+                }
+            }
+        }
+
+    // Transform back to the outputs of the tile (A'MA) and cast to "res_t" type
+    Result:
+        for (unsigned i_filt = 0; i_filt < CONFIG_T::n_filt; i_filt++) {
+            #pragma HLS UNROLL
+            typename CONFIG_T::accum_t rows_out[tile][n_out];
+            for (unsigned i = 0; i < tile; i++) {
+                #pragma HLS UNROLL
+                transform::output(acc[i_filt][i], rows_out[i]);
+            }
+            for (unsigned j = 0; j < n_out; j++) {
+                #pragma HLS UNROLL
+                typename CONFIG_T::accum_t column[tile];
+                typename CONFIG_T::accum_t column_out[n_out];
+                for (unsigned i = 0; i < tile; i++) {
+                    #pragma HLS UNROLL
+                    column[i] = rows_out[i][j];
+                }
+                transform::output(column, column_out);
+                for (unsigned i = 0; i < n_out; i++) {
+                    #pragma HLS UNROLL
+                    unsigned i_row = out_row + i;
+                    unsigned i_col = out_col + j;
+                    if (i_row < CONFIG_T::out_height && i_col < CONFIG_T::out_width) {
+                        res[(i_row * CONFIG_T::out_width + i_col) * CONFIG_T::n_filt + i_filt] =
+                            cast<data_T, res_T, typename CONFIG_T::mult_config>(
+                                column_out[i] + (typename CONFIG_T::accum_t)biases[i_filt]);
+                    }
+                }
+            }
+        }
+    }
+}
+
+} // namespace nnet
+#endif
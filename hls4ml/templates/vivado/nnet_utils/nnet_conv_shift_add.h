@@ -0,0 +1,82 @@
+#ifndef NNET_CONV_SHIFT_ADD_H_
+#define NNET_CONV_SHIFT_ADD_H_
+
+#include "nnet_common.h"
+#include "nnet_function_stubs.h"
+#include "nnet_mult.h"
+#include <type_traits>
+
+namespace nnet {
+
+// True if the matrix-vector multiplication of the layer is a generated shift-and-add kernel
+template <class data_T, class res_T, typename CONFIG_T> struct is_shift_add_kernel {
+    static const bool value = std::is_base_of<DenseShiftAddKernel<data_T, res_T, CONFIG_T>,
+                                              typename CONFIG_T::template kernel<data_T, res_T, CONFIG_T>>::value;
+};
+
+// Latency implementation of io_parallel convolutions, with the multiplications of each pixel done by the (generated)
+// kernel of the multiplication config instead of the product of each input and weight
+
+template <class data_T, class res_T, typename CONFIG_T, unsigned in_size, unsigned out_size, unsigned mult_n_in>
+void conv_shift_add_cl(data_T data[in_size], res_T res[out_size],
+                       typename CONFIG_T::weight_t weights[mult_n_in * CONFIG_T::n_filt],
+                       typename CONFIG_T::bias_t biases[CONFIG_T::n_filt]) {
+    #pragma HLS INLINE recursive
+
+    data_T data_buf[CONFIG_T::n_pixels][mult_n_in];
+    #pragma HLS ARRAY_PARTITION variable=data_buf complete dim=0
+
+    res_T res_buf[CONFIG_T::n_pixels][CONFIG_T::n_filt];
+    #pragma HLS ARRAY_PARTITION variable=res_buf complete dim=0
+
+    #pragma HLS ARRAY_PARTITION variable=weights complete
+    #pragma HLS ARRAY_PARTITION variable=biases complete
+
+    // Limit multipliers to control parallelization, as in conv_1d_latency_cl. The kernels of all pixels are inlined, so
+    // the limit covers the remaining products of the whole layer, not those of a single pixel.
+    #pragma HLS ALLOCATION operation instances=mul limit=CONFIG_T::mult_config::multiplier_limit
+
+PartitionLoop:
+    for (int i_part = 0; i_part < CONFIG_T::n_partitions; i_part++) {
+        #pragma HLS PIPELINE II=CONFIG_T::reuse_factor rewind
+
+        CONFIG_T::template fill_buffer<data_T, CONFIG_T>::fill_buffer(data, data_buf, i_part);
+
+    PixelLoop:
+        for (unsigned i_pxl = 0; i_pxl < CONFIG_T::n_pixels; i_pxl++) {
+            #pragma HLS UNROLL
+            CONFIG_T::mult_config::template kernel<data_T, res_T, typename CONFIG_T::mult_config>::dense(
+                data_buf[i_pxl], res_buf[i_pxl], weights, biases);
+
+        Result:
+            for (int i_res = 0; i_res < CONFIG_T::n_filt; i_res++) {
+                #pragma HLS UNROLL
+                *(res++) = res_buf[i_pxl][i_res];
+            }
+        }
+    }
+}
+
+template <class data_T, class res_T, typename CONFIG_T>
+void conv_1d_shift_add_cl(data_T data[CONFIG_T::in_width * CONFIG_T::n_chan],
+                          res_T res[CONFIG_T::out_width * CONFIG_T::n_filt],
+                          typename CONFIG_T::weight_t weights[CONFIG_T::filt_width * CONFIG_T::n_chan * CONFIG_T::n_filt],
+                          typename CONFIG_T::bias_t biases[CONFIG_T::n_filt]) {
+    conv_shift_add_cl<data_T, res_T, CONFIG_T, CONFIG_T::in_width * CONFIG_T::n_chan, CONFIG_T::out_width * CONFIG_T::n_filt,
+                      CONFIG_T::filt_width * CONFIG_T::n_chan>(data, res, weights, biases);
+}
+
+template <class data_T, class res_T, typename CONFIG_T>
+void conv_2d_shift_add_cl(
+    data_T data[CONFIG_T::in_height * CONFIG_T::in_width * CONFIG_T::n_chan],
+    res_T res[CONFIG_T::out_height * CONFIG_T::out_width * CONFIG_T::n_filt],
+    typename CONFIG_T::weight_t weights[CONFIG_T::filt_height * CONFIG_T::filt_width * CONFIG_T::n_chan * CONFIG_T::n_filt],
+    typename CONFIG_T::bias_t biases[CONFIG_T::n_filt]) {
+    conv_shift_add_cl<data_T, res_T, CONFIG_T, CONFIG_T::in_height * CONFIG_T::in_width * CONFIG_T::n_chan,
+                      CONFIG_T::out_height * CONFIG_T::out_width * CONFIG_T::n_filt,
+                      CONFIG_T::filt_height * CONFIG_T::filt_width * CONFIG_T::n_chan>(data, res, weights, biases);
+}
+
+} // namespace nnet
+
+#endif
@@ -0,0 +1,62 @@
+#ifndef NNET_CONV_WINOGRAD_H_
+#define NNET_CONV_WINOGRAD_H_
+
+#include "nnet_common.h"
+
+namespace nnet {
+
+// *************************************************
+//       Winograd's minimal filtering algorithm
+// *************************************************
+// F(m, 3) computes m outputs of a 3-tap filter from an input tile of m + 2 values, as Y = A'[(Gg) * (B'd)]
+// (Lavin & Gray, 2015, Fast Algorithms for Convolutional Neural Networks). The filter transform (Gg) is precomputed in
+// Python, these are the input (B'd) and output (A'M) transforms, specialized on the size of the input tile. The constant
+// factors are shifts and additions, so only the element-wise product uses multipliers.
+
+template <unsigned TILE> struct winograd_transform {};
+
+// F(2, 3)
+template <> struct winograd_transform<4> {
+    static const unsigned n_out = 2;
+
+    template <class T> static void input(const T d[4], T res[4]) {
+        #pragma HLS INLINE
+        res[0] = d[0] - d[2];
+        res[1] = d[1] + d[2];
+        res[2] = d[2] - d[1];
+        res[3] = d[1] - d[3];
+    }
+
+    template <class T> static void output(const T m[4], T res[2]) {
+        #pragma HLS INLINE
+        res[0] = m[0] + m[1] + m[2];
+        res[1] = m[1] - m[2] - m[3];
+    }
+};
+
+// F(4, 3)
+template <> struct winograd_transform<6> {
+    static const unsigned n_out = 4;
+
+    template <class T> static void input(const T d[6], T res[6]) {
+        #pragma HLS INLINE
+        res[0] = (d[0] << 2) - (d[2] << 2) - d[2] + d[4];
+        res[1] = d[3] + d[4] - (d[1] << 2) - (d[2] << 2);
+        res[2] = (d[1] << 2) - (d[2] << 2) - d[3] + d[4];
+        res[3] = (d[3] << 1) - (d[1] << 1) - d[2] + d[4];
+        res[4] = (d[1] << 1) - (d[3] << 1) - d[2] + d[4];
+        res[5] = (d[1] << 2) - (d[3] << 2) - d[3] + d[5];
+    }
+
+    template <class T> static void output(const T m[6], T res[4]) {
+        #pragma HLS INLINE
+        res[0] = m[0] + m[1] + m[2] + m[3] + m[4];
+        res[1] = m[1] - m[2] + (m[3] << 1) - (m[4] << 1);
+        res[2] = m[1] + m[2] + (m[3] << 2) + (m[4] << 2);
+        res[3] = m[1] - m[2] + (m[3] << 3) - (m[4] << 3) + m[5];
+    }
+};
+
+} // namespace nnet
+
+#endif
@@ -0,0 +1,813 @@
+#ifndef NNET_FAST_FIXED_H_
+#define NNET_FAST_FIXED_H_
+
+// Fast, bit-exact replacement of ap_fixed/ap_ufixed for C simulation.
+//
+// The value is stored as a native integer (int64_t, or __int128 for the intermediate results wider than 64 bits) and
+// all operations follow the semantics of the ap_fixed emulation library: the results of the arithmetic operators have
+// the same (full precision) types as their ap_fixed counterparts, and the quantization and overflow modes are applied
+// on assignment. Only used when compiling with HLS4ML_FAST_CSIM, never for synthesis.
+
+#include "ap_fixed.h"
+#include <cmath>
+#include <iostream>
+#include <stdint.h>
+#include <type_traits>
+
+namespace nnet {
+
+__extension__ typedef __int128 fast_int128_t;
+__extension__ typedef unsigned __int128 fast_uint128_t;
+
+template <int W, bool S> struct fast_fixed_storage {
+    static_assert(W + !S <= 128, "fast_fixed intermediate results are limited to 128 bits");
+    typedef typename std::conditional<(W + !S <= 64), int64_t, fast_int128_t>::type type;
+};
+
+template <typename T> struct fast_fixed_unsigned { typedef uint64_t type; };
+template <> struct fast_fixed_unsigned<fast_int128_t> { typedef fast_uint128_t type; };
+
+// Signed integer type wide enough for both (signed or unsigned) integer types
+template <typename T1, typename T2> struct fast_fixed_wider {
+    typedef typename std::conditional<(sizeof(T1) > 8 || sizeof(T2) > 8), fast_int128_t, int64_t>::type type;
+};
+
+template <int W, int I, bool S, ap_q_mode Q = AP_TRN, ap_o_mode O = AP_WRAP, int N = 0> struct fast_fixed_base;
+
+// Comparison of integers of widths WA and WB, following ap_private, which mimics the C rules for operands of different
+// signedness: if one of them has 32 bits or more and the unsigned operand is at least as wide as the signed one, they are
+// compared as unsigned numbers, i.e. a negative operand is greater than any unsigned one. Equality is tested on the
+// lowest max(WA, WB, 32) bits.
+template <int WA, bool SA, int WB, bool SB> struct fast_fixed_cmp {
+    typedef typename fast_fixed_storage<AP_MAX(WA, WB) + 1, true>::type type;
+    typedef typename fast_fixed_unsigned<type>::type utype;
+
+    enum {
+        AS_UNSIGNED = SA != SB && (WA >= 32 || WB >= 32) && (SA ? WB >= WA : WA >= WB),
+        EQ_BITS = AP_MAX(AP_MAX(WA, WB), 32),
+        EQ_SHIFT = 8 * sizeof(type) > EQ_BITS ? 8 * sizeof(type) - EQ_BITS : 0
+    };
+
+    static bool lt(type a, type b) {
+        const bool na = SA && a < 0, nb = SB && b < 0;
+        if (AS_UNSIGNED && na != nb)
+            return nb;
+        return a < b;
+    }
+    static bool gt(type a, type b) {
+        const bool na = SA && a < 0, nb = SB && b < 0;
+        if (AS_UNSIGNED && na != nb)
+            return na;
+        return a > b;
+    }
+    static bool le(type a, type b) { return !gt(a, b); }
+    static bool ge(type a, type b) { return !lt(a, b); }
+    static bool eq(type a, type b) {
+        if (SA != SB)
+            return ((utype)a << EQ_SHIFT) == ((utype)b << EQ_SHIFT);
+        return a == b;
+    }
+    static bool ne(type a, type b) { return !eq(a, b); }
+};
+
+// Reads the bits of ap_int_base<W, S> as an integer
+template <int W, bool S, bool Wide = (W > 64)> struct fast_fixed_ap_bits {
+    typedef typename fast_fixed_storage<W, S>::type type;
+    static type get(const ap_int_base<W, S> &bits) { return S ? (type)bits.to_int64() : (type)bits.to_uint64(); }
+    static ap_int_base<W, S> set(type v) {
+        ap_int_base<W, S> bits;
+        if (S)
+            bits = (ap_slong)v;
+        else
+            bits = (ap_ulong)v;
+        return bits;
+    }
+};
+
+template <int W, bool S> struct fast_fixed_ap_bits<W, S, true> {
+    typedef typename fast_fixed_storage<W, S>::type type;
+    static type get(const ap_int_base<W, S> &bits) {
+        ap_int_base<W, S> hi = bits >> 64;
+        return (type)(((fast_uint128_t)(fast_int128_t)hi.to_int64() << 64) | (fast_uint128_t)bits.to_uint64());
+    }
+    static ap_int_base<W, S> set(type v) {
+        ap_int_base<W, S> bits = ap_int_base<W - 64, S>((ap_slong)(v >> 64));
+        bits <<= 64;
+        bits |= ap_int_base<W, false>((ap_ulong)v);
+        return bits;
+    }
+};
+
+template <int W, int I, bool S, ap_q_mode Q, ap_o_mode O, int N> struct fast_fixed_base {
+    static_assert(W > 0, "fast_fixed width must be positive");
+
+    typedef typename fast_fixed_storage<W, S>::type storage_t;
+    typedef typename fast_fixed_unsigned<storage_t>::type ustorage_t;
+
+    static const int width = W;
+    static const int iwidth = I;
+    static const ap_q_mode qmode = Q;
+    static const ap_o_mode omode = O;
+
+    enum { F = W - I, BITS = 8 * sizeof(storage_t) };
+
+    /// Result types of the binary operators, same as for ap_fixed_base
+    template <int W2, int I2, bool S2> struct RType {
+        enum {
+            F2 = W2 - I2,
+            mult_w = W + W2,
+            mult_i = I + I2,
+            mult_s = S || S2,
+            plus_w = AP_MAX(I + (S2 && !S), I2 + (S && !S2)) + 1 + AP_MAX(F, F2),
+            plus_i = AP_MAX(I + (S2 && !S), I2 + (S && !S2)) + 1,
+            plus_s = S || S2,
+            minus_w = AP_MAX(I + (S2 && !S), I2 + (S && !S2)) + 1 + AP_MAX(F, F2),
+            minus_i = AP_MAX(I + (S2 && !S), I2 + (S && !S2)) + 1,
+            minus_s = true,
+            div_w = S2 + W + AP_MAX(F2, 0),
+            div_i = S2 + I + F2,
+            div_s = S || S2,
+            logic_w = AP_MAX(I + (S2 && !S), I2 + (S && !S2)) + AP_MAX(F, F2),
+            logic_i = AP_MAX(I + (S2 && !S), I2 + (S && !S2)),
+            logic_s = S || S2
+        };
+
+        typedef fast_fixed_base<W, I, S> lhs;
+        typedef fast_fixed_base<mult_w, mult_i, mult_s> mult;
+        typedef fast_fixed_base<plus_w, plus_i, plus_s> plus;
+        typedef fast_fixed_base<minus_w, minus_i, minus_s> minus;
+        typedef fast_fixed_base<logic_w, logic_i, logic_s> logic;
+        typedef fast_fixed_base<div_w, div_i, div_s> div;
+    };
+
+    storage_t V;
+
+    // Helpers
+    // -------------------------------------------------------------------------
+
+    /// Keeps the lowest W bits of v, sign-extended if the type is signed
+    template <typename T> static storage_t wrap(T v) {
+        typedef typename fast_fixed_wider<T, storage_t>::type work_t;
+        typedef typename fast_fixed_unsigned<work_t>::type uwork_t;
+        enum { WB = 8 * sizeof(work_t), SH = WB - W > 0 ? WB - W : 0 };
+        uwork_t u = (uwork_t)(work_t)v << SH;
+        if (S)
+            return (storage_t)((work_t)u >> SH);
+        else
+            return (storage_t)(u >> SH);
+    }
+
+    /// Converts the raw value v of a number with f2 fractional bits, applying the quantization and overflow modes
+    template <typename T> static storage_t from_raw(T v, int f2) {
+        typedef typename fast_fixed_wider<T, storage_t>::type work_t;
+        typedef typename fast_fixed_unsigned<work_t>::type uwork_t;
+        enum { WB = 8 * sizeof(work_t) };
+
+        const bool neg = v < 0;
+        work_t q;
+        bool out_of_range = false;
+
+        if (f2 > F) {
+            // Quantization
+            const int sh = f2 - F;
+            bool qb, r;
+            if (sh < WB) {
+                q = (work_t)v >> sh;
+                qb = ((work_t)v >> (sh - 1)) & 1;
+                r = sh > 1 && ((uwork_t)(work_t)v << (WB - sh + 1)) != 0;
+            } else {
+                q = neg ? -1 : 0;
+                qb = neg;
+                r = sh == WB ? ((uwork_t)(work_t)v << 1) != 0 : v != 0;
+            }
+            bool inc;
+            switch (Q) {
+            case AP_RND:
+                inc = qb;
+                break;
+            case AP_RND_ZERO:
+                inc = qb && (neg || r);
+                break;
+            case AP_RND_MIN_INF:
+                inc = qb && r;
+                break;
+            case AP_RND_INF:
+                inc = qb && (!neg || r);
+                break;
+            case AP_RND_CONV:
+                inc = qb && ((q & 1) || r);
+                break;
+            case AP_TRN_ZERO:
+                inc = neg && (qb || r);
+                break;
+            default:
+                inc = false;
+            }
+            q += inc;
+        } else if (f2 < F) {
+            const int sh = F - f2;
+            if (sh < WB) {
+                q = (work_t)((uwork_t)(work_t)v << sh);
+                out_of_range = (q >> sh) != (work_t)v;
+            } else {
+                q = 0;
+                out_of_range = v != 0;
+            }
+        } else {
+            q = v;
+        }
+
+        // Overflow
+        if (O == AP_WRAP && N == 0)
+            return wrap(q);
+
+        const work_t max_val = (work_t)(((uwork_t)1 << (W - 1) << !S) - 1);
+        const work_t min_val = S ? -max_val - 1 : 0;
+        bool overflow, underflow;
+        if (out_of_range) {
+            overflow = !neg;
+            underflow = neg;
+        } else {
+            overflow = q > max_val;
+            underflow = q < min_val || (O == AP_SAT_SYM && S && q == min_val);
+        }
+        if (!overflow && !underflow)
+            return (storage_t)q;
+
+        switch (O) {
+        case AP_SAT_ZERO:
+            return 0;
+        case AP_SAT:
+        case AP_SAT_SYM:
+            if (overflow)
+                return (storage_t)max_val;
+            return (storage_t)((O == AP_SAT_SYM && S) ? -max_val : min_val);
+        default: {
+            // AP_WRAP with N saturation bits
+            enum { NS = N > 0 ? N : 1 };
+            uwork_t bits = (uwork_t)(work_t)wrap(q);
+            if (S) {
+                const uwork_t sign = (uwork_t)1 << (W - 1);
+                bits = underflow ? (bits | sign) : (bits & ~sign);
+                if (NS > 1) {
+                    const uwork_t mask = (((uwork_t)1 << (NS - 1)) - 1) << (W - NS);
+                    bits = underflow ? (bits & ~mask) : (bits | mask);
+                }
+            } else {
+                bits |= (((uwork_t)1 << (NS - 1) << 1) - 1) << (W - NS);
+            }
+            return wrap((work_t)bits);
+        }
+        }
+    }
+
+    template <int W2, int I2, bool S2, ap_q_mode Q2, ap_o_mode O2, int N2>
+    static fast_fixed_base from(const fast_fixed_base<W2, I2, S2, Q2, O2, N2> &op) {
+        fast_fixed_base r;
+        if (std::is_same<fast_fixed_base, fast_fixed_base<W2, I2, S2, Q2, O2, N2>>::value)
+            // Copy of the same type, never quantized nor saturated
+            r.V = (storage_t)op.V;
+        else if (W2 - I2 == F && (O == AP_WRAP && N == 0) && (S == S2 ? W >= W2 : S && W > W2))
+            r.V = (storage_t)op.V;
+        else
+            r.V = from_raw(op.V, W2 - I2);
+        return r;
+    }
+
+    static fast_fixed_base from_double(double d) {
+        fast_fixed_base r;
+        union {
+            double d;
+            uint64_t u;
+        } bits;
+        bits.d = d;
+        if ((bits.u & 0x7fffffffffffffffULL) == 0) {
+            r.V = 0;
+            return r;
+        }
+        const int biased_exp = (int)((bits.u >> 52) & 0x7ff);
+        // Subnormal numbers have no implicit leading one
+        const int exp = biased_exp ? biased_exp - 1023 : -1022;
+        int64_t man = (int64_t)((bits.u & 0xfffffffffffffULL) | (biased_exp ? 0x10000000000000ULL : 0));
+        if (bits.u >> 63)
+            man = -man;
+        r.V = from_raw(man, 52 - exp);
+        return r;
+    }
+
+    template <int W2, int I2, bool S2, ap_q_mode Q2 = AP_TRN, ap_o_mode O2 = AP_WRAP, int N2 = 0>
+    static fast_fixed_base from_ap(const ap_int_base<W2, S2> &bits) {
+        fast_fixed_base<W2, I2, S2, Q2, O2, N2> tmp;
+        tmp.V = fast_fixed_ap_bits<W2, S2>::get(bits);
+        return from(tmp);
+    }
+
+    ap_fixed_base<W, I, S> to_ap() const {
+        ap_fixed_base<W, I, S> r;
+        r.V = fast_fixed_ap_bits<W, S>::set(V).V;
+        return r;
+    }
+
+    // Constructors
+    // -------------------------------------------------------------------------
+
+    fast_fixed_base() : V(0) {}
+
+    template <int W2, int I2, bool S2, ap_q_mode Q2, ap_o_mode O2, int N2>
+    fast_fixed_base(const fast_fixed_base<W2, I2, S2, Q2, O2, N2> &op) : V(from(op).V) {}
+
+    template <int W2, int I2, bool S2, ap_q_mode Q2, ap_o_mode O2, int N2>
+    fast_fixed_base(const ap_fixed_base<W2, I2, S2, Q2, O2, N2> &op) {
+        ap_int_base<W2, S2> bits;
+        bits.V = op.V;
+        V = from_ap<W2, I2, S2, Q2, O2, N2>(bits).V;
+    }
+
+    template <int W2, bool S2> fast_fixed_base(const ap_int_base<W2, S2> &op) : V(from_ap<W2, W2, S2>(op).V) {}
+
+    template <int W2, bool S2> fast_fixed_base(const ap_range_ref<W2, S2> &op) {
+        *this = ap_int_base<W2, false>(op);
+    }
+
+    template <int W2, bool S2> fast_fixed_base(const ap_bit_ref<W2, S2> &op) { *this = (bool)op; }
+
+#define FAST_FIXED_CTOR_FROM_INT(C_TYPE, W2, S2)                                                                         \
+    fast_fixed_base(const C_TYPE x) {                                                                                  \
+        fast_fixed_base<W2, W2, S2> tmp;                                                                               \
+        tmp.V = x;                                                                                                     \
+        V = from(tmp).V;                                                                                               \
+    }
+
+    FAST_FIXED_CTOR_FROM_INT(bool, 1, false)
+    FAST_FIXED_CTOR_FROM_INT(char, 8, CHAR_IS_SIGNED)
+    FAST_FIXED_CTOR_FROM_INT(signed char, 8, true)
+    FAST_FIXED_CTOR_FROM_INT(unsigned char, 8, false)
+    FAST_FIXED_CTOR_FROM_INT(short, _AP_SIZE_short, true)
+    FAST_FIXED_CTOR_FROM_INT(unsigned short, _AP_SIZE_short, false)
+    FAST_FIXED_CTOR_FROM_INT(int, _AP_SIZE_int, true)
+    FAST_FIXED_CTOR_FROM_INT(unsigned int, _AP_SIZE_int, false)
+    FAST_FIXED_CTOR_FROM_INT(long, _AP_SIZE_long, true)
+    FAST_FIXED_CTOR_FROM_INT(unsigned long, _AP_SIZE_long, false)
+    FAST_FIXED_CTOR_FROM_INT(ap_slong, _AP_SIZE_ap_slong, true)
+    FAST_FIXED_CTOR_FROM_INT(ap_ulong, _AP_SIZE_ap_slong, false)
+#undef FAST_FIXED_CTOR_FROM_INT
+
+    fast_fixed_base(double d) : V(from_double(d).V) {}
+
+    fast_fixed_base(float d) : V(from_double(d).V) {}
+
+    // Conversions
+    // -------------------------------------------------------------------------
+
+    /// Integer part, rounded towards zero like the conversion of a C floating point number
+    storage_t to_integer() const {
+        if (F <= 0)
+            return -F < BITS ? (storage_t)((ustorage_t)V << (F < 0 ? -F : 0)) : 0;
+        if (I <= 0)
+            // Like ap_fixed, the carry of the rounding overflows the one-bit integer part
+            return (S && V < 0) ? -1 : 0;
+        storage_t r = V >> (F > 0 ? F : 0);
+        if (V < 0 && ((ustorage_t)V << (F > 0 ? BITS - F : 0)) != 0)
+            r += 1;
+        return r;
+    }
+
+    char to_char() const { return (char)to_integer(); }
+    int to_int() const { return (int)to_integer(); }
+    unsigned to_uint() const { return (unsigned)to_integer(); }
+    ap_slong to_int64() const { return (ap_slong)to_integer(); }
+    ap_ulong to_uint64() const { return (ap_ulong)to_integer(); }
+
+    double to_double() const { return std::ldexp((double)V, -F); }
+    float to_float() const { return std::ldexp((float)V, -F); }
+
+    operator long double() const { return (long double)to_double(); }
+    operator double() const { return to_double(); }
+    operator float() const { return to_float(); }
+    operator bool() const { return V != 0; }
+    operator char() const { return (char)to_int(); }
+    operator signed char() const { return (signed char)to_int(); }
+    operator unsigned char() const { return (unsigned char)to_uint(); }
+    operator short() const { return (short)to_int(); }
+    operator unsigned short() const { return (unsigned short)to_uint(); }
+    operator int() const { return to_int(); }
+    operator unsigned int() const { return to_uint(); }
+    operator long() const { return (long)to_int64(); }
+    operator unsigned long() const { return (unsigned long)to_uint64(); }
+    operator ap_ulong() const { return to_uint64(); }
+    operator ap_slong() const { return to_int64(); }
+
+    template <int W2, int I2, ap_q_mode Q2, ap_o_mode O2, int N2> operator ap_fixed<W2, I2, Q2, O2, N2>() const {
+        return ap_fixed<W2, I2, Q2, O2, N2>(to_ap());
+    }
+
+    template <int W2, int I2, ap_q_mode Q2, ap_o_mode O2, int N2> operator ap_ufixed<W2, I2, Q2, O2, N2>() const {
+        return ap_ufixed<W2, I2, Q2, O2, N2>(to_ap());
+    }
+
+    template <int W2> operator ap_int<W2>() const { return ap_int<W2>(to_ap()); }
+
+    template <int W2> operator ap_uint<W2>() const { return ap_uint<W2>(to_ap()); }
+
+    int length() const { return W; }
+
+    // Arithmetic
+    // -------------------------------------------------------------------------
+
+    template <int W2, int I2, bool S2, ap_q_mode Q2, ap_o_mode O2, int N2>
+    typename RType<W2, I2, S2>::mult operator*(const fast_fixed_base<W2, I2, S2, Q2, O2, N2> &op2) const {
+        typedef typename RType<W2, I2, S2>::mult R;
+        R r;
+        r.V = (typename R::storage_t)V * (typename R::storage_t)op2.V;
+        return r;
+    }
+
+    template <int W2, int I2, bool S2, ap_q_mode Q2, ap_o_mode O2, int N2>
+    typename RType<W2, I2, S2>::div operator/(const fast_fixed_base<W2, I2, S2, Q2, O2, N2> &op2) const {
+        typedef typename RType<W2, I2, S2>::div R;
+        enum { F2 = W2 - I2, W1 = AP_MAX(W + AP_MAX(F2, 0) + (S2 && !S), W2 + (S && !S2)) };
+        typedef typename fast_fixed_storage<W1 + 1, true>::type work_t;
+        // Like ap_fixed, the quotient is computed with W1 bits and wraps around if it does not fit
+        typedef fast_fixed_base<W1, W1, S || S2> Q1;
+        R r;
+        r.V = R::wrap(Q1::wrap(((work_t)V << AP_MAX(F2, 0)) / (work_t)op2.V));
+        return r;
+    }
+
+#define FAST_FIXED_OP_BIN(Sym, Rty)                                                                                      \
+    template <int W2, int I2, bool S2, ap_q_mode Q2, ap_o_mode O2, int N2>                                               \
+    typename RType<W2, I2, S2>::Rty operator Sym(const fast_fixed_base<W2, I2, S2, Q2, O2, N2> &op2) const {            \
+        typedef typename RType<W2, I2, S2>::Rty R;                                                                     \
+        typedef typename R::storage_t T;                                                                               \
+        typedef typename R::ustorage_t U;                                                                              \
+        R r;                                                                                                           \
+        r.V = R::wrap((T)((U)(T)V << (R::F - F)) Sym(T)((U)(T)op2.V << (R::F - (W2 - I2))));                           \
+        return r;                                                                                                      \
+    }
+
+    FAST_FIXED_OP_BIN(+, plus)
+    FAST_FIXED_OP_BIN(-, minus)
+    FAST_FIXED_OP_BIN(&, logic)
+    FAST_FIXED_OP_BIN(|, logic)
+    FAST_FIXED_OP_BIN(^, logic)
+#undef FAST_FIXED_OP_BIN
+
+#define FAST_FIXED_OP_ASSIGN(Sym)                                                                                        \
+    template <int W2, int I2, bool S2, ap_q_mode Q2, ap_o_mode O2, int N2>                                               \
+    fast_fixed_base &operator Sym##=(const fast_fixed_base<W2, I2, S2, Q2, O2, N2> &op2) {                              \
+        *this = operator Sym(op2);                                                                                     \
+        return *this;                                                                                                  \
+    }
+
+    FAST_FIXED_OP_ASSIGN(*)
+    FAST_FIXED_OP_ASSIGN(/)
+    FAST_FIXED_OP_ASSIGN(+)
+    FAST_FIXED_OP_ASSIGN(-)
+    FAST_FIXED_OP_ASSIGN(&)
+    FAST_FIXED_OP_ASSIGN(|)
+    FAST_FIXED_OP_ASSIGN(^)
+#undef FAST_FIXED_OP_ASSIGN
+
+    fast_fixed_base &operator++() {
+        operator+=(fast_fixed_base<W - I + 1, 1, false>(1));
+        return *this;
+    }
+
+    fast_fixed_base &operator--() {
+        operator-=(fast_fixed_base<W - I + 1, 1, false>(1));
+        return *this;
+    }
+
+    const fast_fixed_base operator++(int) {
+        fast_fixed_base r(*this);
+        operator++();
+        return r;
+    }
+
+    const fast_fixed_base operator--(int) {
+        fast_fixed_base r(*this);
+        operator--();
+        return r;
+    }
+
+    fast_fixed_base operator+() const { return *this; }
+
+    fast_fixed_base<W + 1, I + 1, true> operator-() const {
+        fast_fixed_base<W + 1, I + 1, true> r;
+        r.V = -(typename fast_fixed_base<W + 1, I + 1, true>::storage_t)V;
+        return r;
+    }
+
+    bool operator!() const { return V == 0; }
+
+    fast_fixed_base<W, I, S> operator~() const {
+        fast_fixed_base<W, I, S> r;
+        r.V = wrap(~V);
+        return r;
+    }
+
+    // Shifts move the bits within the same type, without quantization or overflow handling
+    fast_fixed_base operator<<(unsigned int sh) const {
+        fast_fixed_base r;
+        r.V = sh >= W ? 0 : wrap((ustorage_t)V << sh);
+        return r;
+    }
+
+    fast_fixed_base operator>>(unsigned int sh) const {
+        fast_fixed_base r;
+        r.V = V >> (sh >= BITS ? BITS - 1 : sh);
+        return r;
+    }
+
+    fast_fixed_base operator<<(int sh) const { return sh < 0 ? operator>>((unsigned)-sh) : operator<<((unsigned)sh); }
+
+    fast_fixed_base operator>>(int sh) const { return sh < 0 ? operator<<((unsigned)-sh) : operator>>((unsigned)sh); }
+
+    template <int W2, bool S2> fast_fixed_base operator<<(const ap_int_base<W2, S2> &sh) const {
+        return operator<<(sh.to_int());
+    }
+
+    template <int W2, bool S2> fast_fixed_base operator>>(const ap_int_base<W2, S2> &sh) const {
+        return operator>>(sh.to_int());
+    }
+
+    fast_fixed_base &operator<<=(const int sh) { return *this = operator<<(sh); }
+    fast_fixed_base &operator<<=(const unsigned int sh) { return *this = operator<<(sh); }
+    fast_fixed_base &operator>>=(const int sh) { return *this = operator>>(sh); }
+    fast_fixed_base &operator>>=(const unsigned int sh) { return *this = operator>>(sh); }
+
+    // Comparisons
+    // -------------------------------------------------------------------------
+
+    // The operands are aligned like in ap_fixed_base, then compared like ap_private operands of widths WA and W2A
+#define FAST_FIXED_OP_CMP(Sym, Cmp)                                                                                      \
+    template <int W2, int I2, bool S2, ap_q_mode Q2, ap_o_mode O2, int N2>                                               \
+    bool operator Sym(const fast_fixed_base<W2, I2, S2, Q2, O2, N2> &op2) const {                                       \
+        enum {                                                                                                         \
+            F2 = W2 - I2,                                                                                              \
+            FM = AP_MAX(F, F2),                                                                                        \
+            WA = F >= F2 ? W : W + F2 - F + 1,                                                                         \
+            W2A = F > F2 ? W2 + F - F2 : W2                                                                            \
+        };                                                                                                             \
+        typedef fast_fixed_cmp<WA, S, W2A, S2> C;                                                                      \
+        typedef typename C::type T;                                                                                    \
+        typedef typename fast_fixed_unsigned<T>::type U;                                                               \
+        return C::Cmp((T)((U)(T)V << (FM - F)), (T)((U)(T)op2.V << (FM - F2)));                                        \
+    }                                                                                                                  \
+    bool operator Sym(double d) const { return to_double() Sym d; }
+
+    FAST_FIXED_OP_CMP(>, gt)
+    FAST_FIXED_OP_CMP(<, lt)
+    FAST_FIXED_OP_CMP(>=, ge)
+    FAST_FIXED_OP_CMP(<=, le)
+    FAST_FIXED_OP_CMP(==, eq)
+    FAST_FIXED_OP_CMP(!=, ne)
+#undef FAST_FIXED_OP_CMP
+
+    // Bit and range access
+    // -------------------------------------------------------------------------
+
+    struct bit_ref {
+        fast_fixed_base &d;
+        int index;
+
+        bit_ref(fast_fixed_base &d, int index) : d(d), index(index) {}
+
+        operator bool() const { return ((ustorage_t)d.V >> index) & 1; }
+
+        bit_ref &operator=(bool val) {
+            ustorage_t bits = (ustorage_t)d.V & ~((ustorage_t)1 << index);
+            d.V = wrap(bits | ((ustorage_t)val << index));
+            return *this;
+        }
+    };
+
+    struct range_ref {
+        fast_fixed_base &d;
+        int hi, lo;
+
+        range_ref(fast_fixed_base &d, int hi, int lo) : d(d), hi(hi), lo(lo) {}
+
+        ustorage_t mask() const { return ((ustorage_t)1 << (hi - lo) << 1) - 1; }
+
+        ap_ulong to_uint64() const { return (ap_ulong)(((ustorage_t)d.V >> lo) & mask()); }
+        unsigned to_uint() const { return (unsigned)to_uint64(); }
+        int to_int() const { return (int)to_uint64(); }
+
+        operator ap_ulong() const { return to_uint64(); }
+
+        template <int W2> operator ap_uint<W2>() const { return ap_uint<W2>(to_uint64()); }
+
+        template <int W2> operator ap_int<W2>() const { return ap_int<W2>(to_uint64()); }
+
+        range_ref &operator=(ap_ulong val) {
+            ustorage_t bits = (ustorage_t)d.V & ~(mask() << lo);
+            d.V = wrap(bits | (((ustorage_t)val & mask()) << lo));
+            return *this;
+        }
+
+        range_ref &operator=(int val) { return operator=((ap_ulong)(ap_slong)val); }
+        range_ref &operator=(unsigned val) { return operator=((ap_ulong)val); }
+
+        template <int W2, bool S2> range_ref &operator=(const ap_int_base<W2, S2> &val) {
+            return operator=((ap_ulong)val.to_uint64());
+        }
+    };
+
+    bit_ref operator[](int index) { return bit_ref(*this, index); }
+    bool operator[](int index) const { return ((ustorage_t)V >> index) & 1; }
+    bit_ref bit(int index) { return bit_ref(*this, index); }
+    bool get_bit(int index) const { return ((ustorage_t)V >> index) & 1; }
+    void set_bit(int index, bool val) { bit_ref(*this, index) = val; }
+
+    range_ref range(int hi, int lo) { return range_ref(*this, hi, lo); }
+    range_ref range() { return range_ref(*this, W - 1, 0); }
+    range_ref operator()(int hi, int lo) { return range_ref(*this, hi, lo); }
+    ap_ulong range(int hi, int lo) const { return range_ref(const_cast<fast_fixed_base &>(*this), hi, lo).to_uint64(); }
+    ap_ulong operator()(int hi, int lo) const { return range(hi, lo); }
+
+    bool is_zero() const { return V == 0; }
+    bool is_neg() const { return S && V < 0; }
+
+    std::string to_string(unsigned char radix = 2, bool sign = S) const { return to_ap().to_string(radix, sign); }
+};
+
+template <int W, int I, ap_q_mode Q = AP_TRN, ap_o_mode O = AP_WRAP, int N = 0>
+using fast_fixed = fast_fixed_base<W, I, true, Q, O, N>;
+
+template <int W, int I, ap_q_mode Q = AP_TRN, ap_o_mode O = AP_WRAP, int N = 0>
+using fast_ufixed = fast_fixed_base<W, I, false, Q, O, N>;
+
+template <int W, int I, bool S, ap_q_mode Q, ap_o_mode O, int N>
+std::ostream &operator<<(std::ostream &out, const fast_fixed_base<W, I, S, Q, O, N> &x) {
+    return out << x.to_ap();
+}
+
+template <int W, int I, bool S, ap_q_mode Q, ap_o_mode O, int N>
+std::istream &operator>>(std::istream &in, fast_fixed_base<W, I, S, Q, O, N> &x) {
+    // Same as ap_fixed, which reads a double
+    double d;
+    in >> d;
+    x = fast_fixed_base<W, I, S, Q, O, N>(d);
+    return in;
+}
+
+// Operators with C integer types, ap_int and ap_fixed, which are converted to fast_fixed_base first
+// -------------------------------------------------------------------------
+
+#define FAST_FIXED_BIN_OP_WITH(Sym, Rty, TYPE, W2, S2)                                                                   \
+    template <int W, int I, bool S, ap_q_mode Q, ap_o_mode O, int N>                                                   \
+    typename fast_fixed_base<W, I, S>::template RType<W2, W2, S2>::Rty operator Sym(                                   \
+        const fast_fixed_base<W, I, S, Q, O, N> &op, TYPE i_op) {                                                      \
+        return op.operator Sym(fast_fixed_base<W2, W2, S2>(i_op));                                                     \
+    }                                                                                                                  \
+    template <int W, int I, bool S, ap_q_mode Q, ap_o_mode O, int N>                                                   \
+    typename fast_fixed_base<W2, W2, S2>::template RType<W, I, S>::Rty operator Sym(                                   \
+        TYPE i_op, const fast_fixed_base<W, I, S, Q, O, N> &op) {                                                      \
+        return fast_fixed_base<W2, W2, S2>(i_op).operator Sym(op);                                                     \
+    }
+
+#define FAST_FIXED_REL_OP_WITH(Sym, TYPE, W2, S2)                                                                          \
+    template <int W, int I, bool S, ap_q_mode Q, ap_o_mode O, int N>                                                   \
+    bool operator Sym(const fast_fixed_base<W, I, S, Q, O, N> &op, TYPE i_op) {                                        \
+        return op Sym fast_fixed_base<W2, W2, S2>(i_op);                                                                                      \
+    }                                                                                                                  \
+    template <int W, int I, bool S, ap_q_mode Q, ap_o_mode O, int N>                                                   \
+    bool operator Sym(TYPE i_op, const fast_fixed_base<W, I, S, Q, O, N> &op) {                                        \
+        return fast_fixed_base<W2, W2, S2>(i_op) Sym op;                                                                                      \
+    }
+
+#define FAST_FIXED_ASSIGN_OP_WITH(Sym, TYPE, W2, S2)                                                                       \
+    template <int W, int I, bool S, ap_q_mode Q, ap_o_mode O, int N>                                                   \
+    fast_fixed_base<W, I, S, Q, O, N> &operator Sym##=(fast_fixed_base<W, I, S, Q, O, N> &op, TYPE i_op) {             \
+        return op.operator Sym##=(fast_fixed_base<W2, W2, S2>(i_op));                                                                         \
+    }
+
+#define FAST_FIXED_ALL_OP_WITH(TYPE, W2, S2)                                                                               \
+    FAST_FIXED_BIN_OP_WITH(+, plus, TYPE, W2, S2)                                                                              \
+    FAST_FIXED_BIN_OP_WITH(-, minus, TYPE, W2, S2)                                                                              \
+    FAST_FIXED_BIN_OP_WITH(*, mult, TYPE, W2, S2)                                                                              \
+    FAST_FIXED_BIN_OP_WITH(/, div, TYPE, W2, S2)                                                                              \
+    FAST_FIXED_BIN_OP_WITH(&, logic, TYPE, W2, S2)                                                                              \
+    FAST_FIXED_BIN_OP_WITH(|, logic, TYPE, W2, S2)                                                                              \
+    FAST_FIXED_BIN_OP_WITH(^, logic, TYPE, W2, S2)                                                                              \
+    FAST_FIXED_ASSIGN_OP_WITH(+, TYPE, W2, S2)                                                                           \
+    FAST_FIXED_ASSIGN_OP_WITH(-, TYPE, W2, S2)                                                                           \
+    FAST_FIXED_ASSIGN_OP_WITH(*, TYPE, W2, S2)                                                                           \
+    FAST_FIXED_ASSIGN_OP_WITH(/, TYPE, W2, S2)                                                                           \
+    FAST_FIXED_ASSIGN_OP_WITH(&, TYPE, W2, S2)                                                                           \
+    FAST_FIXED_ASSIGN_OP_WITH(|, TYPE, W2, S2)                                                                           \
+    FAST_FIXED_ASSIGN_OP_WITH(^, TYPE, W2, S2)                                                                           \
+    FAST_FIXED_REL_OP_WITH(>, TYPE, W2, S2)                                                                              \
+    FAST_FIXED_REL_OP_WITH(<, TYPE, W2, S2)                                                                              \
+    FAST_FIXED_REL_OP_WITH(>=, TYPE, W2, S2)                                                                             \
+    FAST_FIXED_REL_OP_WITH(<=, TYPE, W2, S2)                                                                             \
+    FAST_FIXED_REL_OP_WITH(==, TYPE, W2, S2)                                                                             \
+    FAST_FIXED_REL_OP_WITH(!=, TYPE, W2, S2)
+
+FAST_FIXED_ALL_OP_WITH(bool, 1, false)
+FAST_FIXED_ALL_OP_WITH(char, 8, CHAR_IS_SIGNED)
+FAST_FIXED_ALL_OP_WITH(signed char, 8, true)
+FAST_FIXED_ALL_OP_WITH(unsigned char, 8, false)
+FAST_FIXED_ALL_OP_WITH(short, _AP_SIZE_short, true)
+FAST_FIXED_ALL_OP_WITH(unsigned short, _AP_SIZE_short, false)
+FAST_FIXED_ALL_OP_WITH(int, _AP_SIZE_int, true)
+FAST_FIXED_ALL_OP_WITH(unsigned int, _AP_SIZE_int, false)
+FAST_FIXED_ALL_OP_WITH(long, _AP_SIZE_long, true)
+FAST_FIXED_ALL_OP_WITH(unsigned long, _AP_SIZE_long, false)
+FAST_FIXED_ALL_OP_WITH(ap_slong, _AP_SIZE_ap_slong, true)
+FAST_FIXED_ALL_OP_WITH(ap_ulong, _AP_SIZE_ap_slong, false)
+
+// ap_int and ap_fixed operands, deduced from the type of the operand
+#define FAST_FIXED_AP_TEMPLATE                                                                                           \
+    template <int W, int I, bool S, ap_q_mode Q, ap_o_mode O, int N, int W2, int I2, bool S2, ap_q_mode Q2,           \
+              ap_o_mode O2, int N2>
+
+#define FAST_FIXED_AP_OP(Sym, Rty)                                                                                       \
+    FAST_FIXED_AP_TEMPLATE                                                                                             \
+    typename fast_fixed_base<W, I, S>::template RType<W2, I2, S2>::Rty operator Sym(                                   \
+        const fast_fixed_base<W, I, S, Q, O, N> &op, const ap_fixed_base<W2, I2, S2, Q2, O2, N2> &ap_op) {             \
+        return op.operator Sym(fast_fixed_base<W2, I2, S2>(ap_op));                                                    \
+    }                                                                                                                  \
+    FAST_FIXED_AP_TEMPLATE                                                                                             \
+    typename fast_fixed_base<W2, I2, S2>::template RType<W, I, S>::Rty operator Sym(                                   \
+        const ap_fixed_base<W2, I2, S2, Q2, O2, N2> &ap_op, const fast_fixed_base<W, I, S, Q, O, N> &op) {             \
+        return fast_fixed_base<W2, I2, S2>(ap_op).operator Sym(op);                                                    \
+    }                                                                                                                  \
+    template <int W, int I, bool S, ap_q_mode Q, ap_o_mode O, int N, int W2, bool S2>                                  \
+    typename fast_fixed_base<W, I, S>::template RType<W2, W2, S2>::Rty operator Sym(                                   \
+        const fast_fixed_base<W, I, S, Q, O, N> &op, const ap_int_base<W2, S2> &ap_op) {                               \
+        return op.operator Sym(fast_fixed_base<W2, W2, S2>(ap_op));                                                    \
+    }                                                                                                                  \
+    template <int W, int I, bool S, ap_q_mode Q, ap_o_mode O, int N, int W2, bool S2>                                  \
+    typename fast_fixed_base<W2, W2, S2>::template RType<W, I, S>::Rty operator Sym(                                   \
+        const ap_int_base<W2, S2> &ap_op, const fast_fixed_base<W, I, S, Q, O, N> &op) {                               \
+        return fast_fixed_base<W2, W2, S2>(ap_op).operator Sym(op);                                                    \
+    }
+
+#define FAST_FIXED_AP_ASSIGN_OP(Sym)                                                                                     \
+    FAST_FIXED_AP_TEMPLATE                                                                                             \
+    fast_fixed_base<W, I, S, Q, O, N> &operator Sym##=(fast_fixed_base<W, I, S, Q, O, N> &op, const ap_fixed_base<W2, I2, S2, Q2, O2, N2> &ap_op) {       \
+        return op.operator Sym##=(fast_fixed_base<W2, I2, S2>(ap_op));                                                 \
+    }                                                                                                                  \
+    FAST_FIXED_AP_TEMPLATE                                                                                             \
+    ap_fixed_base<W2, I2, S2, Q2, O2, N2> &operator Sym##=(ap_fixed_base<W2, I2, S2, Q2, O2, N2> &ap_op, const fast_fixed_base<W, I, S, Q, O, N> &op) {       \
+        ap_op = (fast_fixed_base<W2, I2, S2>(ap_op) Sym op).to_ap();                                                   \
+        return ap_op;                                                                                                  \
+    }                                                                                                                  \
+    template <int W, int I, bool S, ap_q_mode Q, ap_o_mode O, int N, int W2, bool S2>                                  \
+    fast_fixed_base<W, I, S, Q, O, N> &operator Sym##=(fast_fixed_base<W, I, S, Q, O, N> &op,                          \
+                                                       const ap_int_base<W2, S2> &ap_op) {                             \
+        return op.operator Sym##=(fast_fixed_base<W2, W2, S2>(ap_op));                                                 \
+    }
+
+#define FAST_FIXED_AP_REL_OP(Sym)                                                                                        \
+    FAST_FIXED_AP_TEMPLATE                                                                                             \
+    bool operator Sym(const fast_fixed_base<W, I, S, Q, O, N> &op, const ap_fixed_base<W2, I2, S2, Q2, O2, N2> &ap_op) {    \
+        return op Sym fast_fixed_base<W2, I2, S2>(ap_op);                                                              \
+    }                                                                                                                  \
+    FAST_FIXED_AP_TEMPLATE                                                                                             \
+    bool operator Sym(const ap_fixed_base<W2, I2, S2, Q2, O2, N2> &ap_op, const fast_fixed_base<W, I, S, Q, O, N> &op) {    \
+        return fast_fixed_base<W2, I2, S2>(ap_op) Sym op;                                                              \
+    }                                                                                                                  \
+    template <int W, int I, bool S, ap_q_mode Q, ap_o_mode O, int N, int W2, bool S2>                                  \
+    bool operator Sym(const fast_fixed_base<W, I, S, Q, O, N> &op, const ap_int_base<W2, S2> &ap_op) {                 \
+        return op Sym fast_fixed_base<W2, W2, S2>(ap_op);                                                              \
+    }                                                                                                                  \
+    template <int W, int I, bool S, ap_q_mode Q, ap_o_mode O, int N, int W2, bool S2>                                  \
+    bool operator Sym(const ap_int_base<W2, S2> &ap_op, const fast_fixed_base<W, I, S, Q, O, N> &op) {                 \
+        return fast_fixed_base<W2, W2, S2>(ap_op) Sym op;                                                              \
+    }
+
+FAST_FIXED_AP_OP(+, plus)
+FAST_FIXED_AP_OP(-, minus)
+FAST_FIXED_AP_OP(*, mult)
+FAST_FIXED_AP_OP(/, div)
+FAST_FIXED_AP_OP(&, logic)
+FAST_FIXED_AP_OP(|, logic)
+FAST_FIXED_AP_OP(^, logic)
+
+FAST_FIXED_AP_ASSIGN_OP(+)
+FAST_FIXED_AP_ASSIGN_OP(-)
+FAST_FIXED_AP_ASSIGN_OP(*)
+FAST_FIXED_AP_ASSIGN_OP(/)
+
+FAST_FIXED_AP_REL_OP(>)
+FAST_FIXED_AP_REL_OP(<)
+FAST_FIXED_AP_REL_OP(>=)
+FAST_FIXED_AP_REL_OP(<=)
+FAST_FIXED_AP_REL_OP(==)
+FAST_FIXED_AP_REL_OP(!=)
+
+#undef FAST_FIXED_AP_TEMPLATE
+#undef FAST_FIXED_AP_OP
+#undef FAST_FIXED_AP_ASSIGN_OP
+#undef FAST_FIXED_AP_REL_OP
+#undef FAST_FIXED_ALL_OP_WITH
+#undef FAST_FIXED_BIN_OP_WITH
+#undef FAST_FIXED_REL_OP_WITH
+#undef FAST_FIXED_ASSIGN_OP_WITH
+
+} // namespace nnet
+
+#endif
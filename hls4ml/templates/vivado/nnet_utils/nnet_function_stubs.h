@@ -37,6 +37,10 @@ template <class data_T, class res_T, typename CONFIG_T> class DenseKernel {
     }
 };
 
+// Base of the generated shift-and-add implementations of DenseLatency
+template <class data_T, class res_T, typename CONFIG_T>
+class DenseShiftAddKernel : public DenseKernel<data_T, res_T, CONFIG_T> {};
+
 template <class data_T, class res_T, typename CONFIG_T> class Conv1DKernel {
   public:
     static void conv(data_T data[CONFIG_T::in_width * CONFIG_T::n_chan], res_T res[CONFIG_T::out_width * CONFIG_T::n_filt],
@@ -59,6 +59,11 @@ void depthwise_conv_2d_buffer_cl(
                                                                                     [CONFIG_T::n_chan];
     #pragma HLS ARRAY_PARTITION variable = line_buffer complete dim = 2
 
+    if (CONFIG_T::strategy == nnet::resource_unrolled && CONFIG_T::reuse_factor > 1) {
+        #pragma HLS allocation instances=compute_depthwise_output_buffer_1d limit=1 function
+        #pragma HLS allocation instances=compute_depthwise_output_buffer_2d limit=1 function
+    }
+
 ReadInputHeight:
     for (unsigned i_ih = 0; i_ih < CONFIG_T::in_height; i_ih++) {
     ReadInputWidth:
@@ -79,6 +79,9 @@ InitData:
     #pragma HLS INLINE recursive
     if (CONFIG_T::strategy == nnet::latency) {
         depthwise_product<typename data_T::value_type, typename res_T::value_type, CONFIG_T>(data, res, weights, biases);
+    } else if (CONFIG_T::strategy == nnet::resource_unrolled) {
+        CONFIG_T::mult_config::template kernel<typename data_T::value_type, typename res_T::value_type,
+                                               typename CONFIG_T::mult_config>::dense(data, res, weights, biases);
     } else {
         assert("Resource strategy for DepthwiseConv2D is not supported." && false);
     }
@@ -154,9 +157,9 @@ InitData:
     }
 
     #pragma HLS INLINE recursive
-    if (CONFIG_T::strategy == nnet::latency) {
-        dense_latency<typename data_T::value_type, typename res_T::value_type, typename CONFIG_T::mult_config>(
-            data, res, weights, biases);
+    if (CONFIG_T::strategy == nnet::latency || CONFIG_T::strategy == nnet::resource_unrolled) {
+        CONFIG_T::mult_config::template kernel<typename data_T::value_type, typename res_T::value_type,
+                                               typename CONFIG_T::mult_config>::dense(data, res, weights, biases);
     } else {
         dense_resource<typename data_T::value_type, typename res_T::value_type, typename CONFIG_T::mult_config>(
             data, res, weights, biases);
@@ -204,6 +207,10 @@ void compute_depthwise_output_buffer_1d(const data_T &in_elem, hls::stream<res_T
         if (CONFIG_T::strategy == nnet::latency) {
             depthwise_product<typename data_T::value_type, typename res_T::value_type, CONFIG_T>(kernel_data, res_out,
                                                                                                  weights, biases);
+        } else if (CONFIG_T::strategy == nnet::resource_unrolled) {
+            CONFIG_T::mult_config::template kernel<typename data_T::value_type, typename res_T::value_type,
+                                                   typename CONFIG_T::mult_config>::dense(kernel_data, res_out, weights,
+                                                                                          biases);
         } else {
             assert("Resource strategy for DepthwiseConv1D is not supported." && false);
         }
@@ -269,6 +276,10 @@ void compute_depthwise_output_buffer_2d(const data_T &in_elem,
         if (CONFIG_T::strategy == nnet::latency) {
             depthwise_product<typename data_T::value_type, typename res_T::value_type, CONFIG_T>(kernel_data, res_out,
                                                                                                  weights, biases);
+        } else if (CONFIG_T::strategy == nnet::resource_unrolled) {
+            CONFIG_T::mult_config::template kernel<typename data_T::value_type, typename res_T::value_type,
+                                                   typename CONFIG_T::mult_config>::dense(kernel_data, res_out, weights,
+                                                                                          biases);
         } else {
             assert("Resource strategy for DepthwiseConv2D is not supported." && false);
         }
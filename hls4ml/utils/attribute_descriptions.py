@@ -29,6 +29,29 @@ softmax_implementation = (
     'Using this implementation will save resources and clock cycles.'
 )
 softmax_skip = 'If enabled, skips the softmax node and returns the raw outputs.'
+softmax_implementation_piecewise = (
+    '"piecewise" approximates the exponential and the inverse with piecewise polynomials instead of lookup tables.'
+)
+
+activation_implementation = (
+    'Choice of implementation of the sigmoid, tanh, softplus and softsign functions. '
+    '"lut" uses a lookup table of table_size entries. '
+    '"piecewise" uses a piecewise polynomial approximation, whose few coefficients are stored in the table type '
+    'and don\'t require BRAM.'
+)
+piecewise_degree = 'The degree of the polynomials of the "piecewise" implementation (1 for piecewise-linear).'
+piecewise_max_error = (
+    'The maximum absolute error of the "piecewise" implementation. '
+    'The number of segments of the approximation is chosen to stay within it.'
+)
+
+# Dense-related attributes
+
+shift_add_max_digits = (
+    'Multiplications by the weights with at most this many nonzero digits in canonical signed digit form are '
+    'implemented with shifts and additions instead of multipliers, trading DSPs for LUTs. '
+    'Only applies to the latency strategy, 0 disables it.'
+)
 
 # Convolution-related attributes
 
@@ -42,6 +65,15 @@ conv_implementation = (
     '"LineBuffer" implementation is preferred over "Encoded" for most use cases. '
     'This attribute only applies to io_stream.'
 )
+conv_implementation_winograd = (
+    '"LineBuffer" implementation is preferred over "Encoded" for most use cases, these only apply to io_stream. '
+    '"Winograd" computes 3x3 (or 3-wide) convolutions with stride 1 in io_parallel with Winograd\'s minimal filtering '
+    'algorithm, which needs fewer multiplications per output.'
+)
+winograd_output_tile = (
+    'The number of outputs per dimension computed by each tile of the "Winograd" implementation, F(2x2, 3x3) or '
+    'F(4x4, 3x3). 4 saves more multiplications, but the transformed weights are only approximated in fixed point.'
+)
 
 # Recurrent-related attributes
 
@@ -0,0 +1,489 @@
+import http.client
+import http.server
+import io
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+_stop = object()
+
+
+def _dumps(arrays):
+    """Serialize a list of arrays, as a .npy payload if there is only one array and as a .npz payload otherwise."""
+    buffer = io.BytesIO()
+    if len(arrays) == 1:
+        np.save(buffer, arrays[0], allow_pickle=False)
+    else:
+        np.savez(buffer, *arrays)
+    return buffer.getvalue()
+
+
+def _loads(payload):
+    """Deserialize a .npy or .npz payload to a list of arrays."""
+    data = np.load(io.BytesIO(payload), allow_pickle=False)
+    if hasattr(data, 'files'):
+        return [data[f'arr_{i}'] for i in range(len(data.files))]
+    return [data]
+
+
+def _format_output(outputs, n_samples):
+    # Same conventions as ModelGraph.predict()
+    if n_samples == 1:
+        outputs = [y[0] for y in outputs]
+    if len(outputs) == 1:
+        return outputs[0]
+    return outputs
+
+
+def load_project(project_dir):
+    """Load and compile a project written by hls4ml.
+
+    The model is converted again from the configuration saved in the project (``hls4ml_config.yml``), so the files of
+    the original model referenced by the configuration must be available.
+
+    Args:
+        project_dir (str): Output directory of the project.
+
+    Returns:
+        ModelGraph: The compiled model.
+    """
+    from hls4ml.converters import convert_from_config, parse_yaml_config
+
+    config = parse_yaml_config(os.path.join(project_dir, 'hls4ml_config.yml'))
+    config['OutputDir'] = project_dir
+    model = convert_from_config(config)
+    model.compile()
+    return model
+
+
+class _Request:
+    def __init__(self, inputs, n_samples):
+        self.inputs = inputs
+        self.n_samples = n_samples
+        self.dtype = inputs[0].dtype
+        self.outputs = None
+        self.error = None
+        self.done = threading.Event()
+        self.start = time.perf_counter()
+
+
+class _ModelWorker(threading.Thread):
+    """Runs the requests of a model, merging the requests that are queued together into batches.
+
+    The compiled library of a model is only called from this thread.
+    """
+
+    def __init__(self, name, model, max_batch_size, max_delay, latency_window):
+        super().__init__(name=f'hls4ml-serve-{name}', daemon=True)
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.n_inputs = len(model.get_input_variables())
+        self.n_outputs = len(model.get_output_variables())
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)
+        self._counters = {'requests': 0, 'samples': 0, 'batches': 0, 'errors': 0, 'busy_time': 0.0}
+        self._start_time = time.perf_counter()
+
+    def _make_request(self, x):
+        xlist = [x] if self.n_inputs == 1 else list(x)
+        if len(xlist) != self.n_inputs:
+            raise Exception(f'Expected {self.n_inputs} inputs, but got {len(xlist)}')
+        xlist = [np.ascontiguousarray(xi) for xi in xlist]
+        for xi in xlist:
+            if xi.dtype not in [np.float32, np.float64]:
+                raise Exception(f'Invalid type ({xi.dtype}) of numpy array. Supported types are: float32, float64.')
+        n_samples = self.model._compute_n_samples(xlist[0] if self.n_inputs == 1 else xlist)
+        inputs = [xi.astype(xlist[0].dtype, copy=False).reshape(n_samples, -1) for xi in xlist]
+        return _Request(inputs, n_samples)
+
+    def submit(self, x):
+        try:
+            request = self._make_request(x)
+        except Exception:
+            with self._lock:
+                self._counters['requests'] += 1
+                self._counters['errors'] += 1
+            raise
+        n_samples = request.n_samples
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return _format_output(request.outputs, n_samples)
+
+    def stop(self):
+        self._queue.put(_stop)
+
+    def run(self):
+        pending = None
+        while True:
+            request = pending if pending is not None else self._queue.get()
+            pending = None
+            if request is _stop:
+                break
+
+            # Wait for more requests until the batch is full or the oldest request waited long enough
+            batch = [request]
+            n_samples = request.n_samples
+            deadline = request.start + self.max_delay
+            while n_samples < self.max_batch_size:
+                try:
+                    request = self._queue.get(timeout=max(deadline - time.perf_counter(), 0))
+                except queue.Empty:
+                    break
+                if (
+                    request is _stop
+                    or request.dtype != batch[0].dtype
+                    or n_samples + request.n_samples > self.max_batch_size
+                ):
+                    pending = request
+                    break
+                batch.append(request)
+                n_samples += request.n_samples
+
+            self._run_batch(batch, n_samples)
+
+    def _run_batch(self, batch, n_samples):
+        start = time.perf_counter()
+        try:
+            inputs = [np.concatenate([request.inputs[i] for request in batch]) for i in range(self.n_inputs)]
+            outputs = self.model.predict(inputs[0] if self.n_inputs == 1 else inputs)
+            if self.n_outputs == 1:
+                outputs = [outputs]
+            outputs = [np.reshape(y, (n_samples, -1)) for y in outputs]
+            offset = 0
+            for request in batch:
+                request.outputs = [y[offset : offset + request.n_samples] for y in outputs]
+                offset += request.n_samples
+        except Exception as e:
+            for request in batch:
+                request.error = e
+        end = time.perf_counter()
+
+        with self._lock:
+            self._counters['requests'] += len(batch)
+            self._counters['samples'] += n_samples
+            self._counters['batches'] += 1
+            self._counters['busy_time'] += end - start
+            for request in batch:
+                if request.error is not None:
+                    self._counters['errors'] += 1
+                else:
+                    self._latencies.append(end - request.start)
+        for request in batch:
+            request.done.set()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            latencies = np.array(self._latencies)
+        uptime = time.perf_counter() - self._start_time
+        stats = {
+            'requests': counters['requests'],
+            'samples': counters['samples'],
+            'batches': counters['batches'],
+            'errors': counters['errors'],
+            'mean_batch_size': counters['samples'] / counters['batches'] if counters['batches'] else 0.0,
+            'throughput': counters['samples'] / uptime if uptime > 0 else 0.0,
+            'utilization': counters['busy_time'] / uptime if uptime > 0 else 0.0,
+        }
+        if len(latencies) > 0:
+            stats['latency_ms'] = {
+                'mean': float(np.mean(latencies) * 1e3),
+                'p50': float(np.percentile(latencies, 50) * 1e3),
+                'p99': float(np.percentile(latencies, 99) * 1e3),
+                'max': float(np.max(latencies) * 1e3),
+            }
+        else:
+            stats['latency_ms'] = {'mean': 0.0, 'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+        return stats
+
+
+class _RequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.model_server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, obj, status=200):
+        self._send(status, json.dumps(obj).encode(), 'application/json')
+
+    def _send_error(self, status, message):
+        self._send_json({'error': message}, status=status)
+
+    def do_GET(self):
+        model_server = self.server.model_server
+        if self.path == '/models':
+            self._send_json(model_server.describe())
+        elif self.path == '/stats':
+            self._send_json(model_server.stats())
+        else:
+            self._send_error(404, f'Unknown path: {self.path}')
+
+    def do_POST(self):
+        model_server = self.server.model_server
+        parts = self.path.strip('/').split('/')
+        if len(parts) != 3 or parts[0] != 'models' or parts[2] != 'predict':
+            self._send_error(404, f'Unknown path: {self.path}')
+            return
+        name = parts[1]
+        payload = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if name not in model_server.workers:
+            self._send_error(404, f'Unknown model: {name}')
+            return
+
+        try:
+            inputs = _loads(payload)
+        except Exception as e:
+            self._send_error(400, f'Invalid payload: {e}')
+            return
+        try:
+            outputs = model_server.predict(name, inputs[0] if len(inputs) == 1 else inputs)
+        except Exception as e:
+            self._send_error(400, str(e))
+            return
+        self._send(200, _dumps(outputs if isinstance(outputs, list) else [outputs]), 'application/octet-stream')
+
+
+class _TCPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects a (host, port) client address
+        return request, ('local', 0)
+
+
+class ModelServer:
+    """Serves the emulation of compiled models to other processes.
+
+    Each model is run by its own worker thread. Requests that arrive while the worker is busy, or within ``max_delay``
+    seconds of each other, are merged into a single batch. Predictions can be requested in the same process with
+    `predict()` or from other processes over HTTP on a TCP port or on a Unix socket (see `ServingClient`):
+
+    * ``GET /models``: Inputs and outputs of the served models, as JSON.
+    * ``GET /stats``: Request, latency and throughput counters of each model, as JSON.
+    * ``POST /models/<name>/predict``: Predictions of a model. The body is the input in the NumPy ``.npy`` format, or
+      the inputs in the ``.npz`` format (``np.savez()``, in order) for models with several inputs. The response has the
+      same format and contains what `ModelGraph.predict()` would return.
+
+    Args:
+        models (dict or list): The models to serve, by name, or a list of models named by their project names. Models
+            that are not compiled yet are compiled.
+        max_batch_size (int, optional): Maximum number of samples in a batch. Defaults to 64.
+        max_delay (float, optional): Maximum time a request waits for other requests to be batched with, in seconds.
+            Defaults to 0.002.
+        latency_window (int, optional): Number of recent requests used for the latency statistics. Defaults to 1000.
+        verbose (bool, optional): Log the HTTP requests. Defaults to False.
+    """
+
+    def __init__(self, models, max_batch_size=64, max_delay=0.002, latency_window=1000, verbose=False):
+        if not isinstance(models, dict):
+            models = {model.config.get_project_name(): model for model in models}
+        if max_batch_size < 1:
+            raise Exception('The maximum batch size must be at least 1')
+
+        self.verbose = verbose
+        self.workers = {}
+        for name, model in models.items():
+            if model._top_function_lib is None:
+                model.compile()
+            worker = _ModelWorker(name, model, max_batch_size, max_delay, latency_window)
+            worker.start()
+            self.workers[name] = worker
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def predict(self, name, x):
+        """Run a prediction of a served model.
+
+        Args:
+            name (str): Name of the model.
+            x (np.ndarray or list): Input data, as for `ModelGraph.predict()`.
+
+        Returns:
+            np.ndarray or list: The predictions, as returned by `ModelGraph.predict()`.
+        """
+        if name not in self.workers:
+            raise Exception(f'Unknown model: {name}')
+        return self.workers[name].submit(x)
+
+    def describe(self):
+        """Inputs and outputs of the served models.
+
+        Returns:
+            dict: For each model, the names and shapes of its 'inputs' and 'outputs'.
+        """
+        description = {}
+        for name, worker in self.workers.items():
+            model = worker.model
+            description[name] = {
+                'inputs': [{'name': var.name, 'shape': list(var.shape)} for var in model.get_input_variables()],
+                'outputs': [{'name': var.name, 'shape': list(var.shape)} for var in model.get_output_variables()],
+            }
+        return description
+
+    def stats(self):
+        """Counters of the served models.
+
+        Returns:
+            dict: For each model, the number of 'requests', 'samples', 'batches' and 'errors', the 'mean_batch_size',
+            the 'throughput' (samples per second since the start), the 'utilization' (fraction of the time spent
+            running batches) and the mean, median, 99th percentile and maximum 'latency_ms' of the recent requests.
+        """
+        return {name: worker.stats() for name, worker in self.workers.items()}
+
+    @property
+    def address(self):
+        """Address the server listens on, a (host, port) tuple or the path of the Unix socket, or None."""
+        if self._server is None:
+            return None
+        return self._server.server_address
+
+    def start(self, address=('127.0.0.1', 0)):
+        """Start listening in a background thread.
+
+        Args:
+            address (tuple or str, optional): A (host, port) tuple to listen on a TCP port, or the path of a Unix
+                socket. Port 0 selects a free port, see `address`. Defaults to a free port on the local host.
+
+        Returns:
+            tuple or str: The address the server listens on.
+        """
+        if self._server is not None:
+            raise Exception('The server is already started')
+        if isinstance(address, (str, os.PathLike)):
+            address = os.fspath(address)
+            if os.path.exists(address):
+                os.remove(address)
+            self._server = _UnixServer(address, _RequestHandler)
+        else:
+            self._server = _TCPServer(tuple(address), _RequestHandler)
+        self._server.model_server = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name='hls4ml-serve', daemon=True)
+        self._thread.start()
+        return self.address
+
+    def serve_forever(self, address=('127.0.0.1', 0)):
+        """Listen until interrupted, see `start()`."""
+        self.start(address)
+        try:
+            while self._thread.is_alive():
+                self._thread.join(0.5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop listening and stop the workers."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            if isinstance(self._server, _UnixServer) and os.path.exists(self._server.server_address):
+                os.remove(self._server.server_address)
+            self._thread.join()
+            self._server = None
+            self._thread = None
+        for worker in self.workers.values():
+            if worker.is_alive():
+                worker.stop()
+                worker.join()
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+class ServingClient:
+    """Client of a `ModelServer`.
+
+    A new connection is made for each call, so the client can be shared by several threads.
+
+    Args:
+        address (tuple or str): The (host, port) tuple or the path of the Unix socket the server listens on.
+        timeout (float, optional): Timeout of the connections, in seconds. Defaults to None.
+    """
+
+    def __init__(self, address, timeout=None):
+        self.address = address
+        self.timeout = timeout
+
+    def _request(self, method, path, body=None):
+        if isinstance(self.address, (str, os.PathLike)):
+            connection = _UnixHTTPConnection(os.fspath(self.address), timeout=self.timeout)
+        else:
+            host, port = self.address[:2]
+            connection = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        try:
+            connection.request(method, path, body=body)
+            response = connection.getresponse()
+            payload = response.read()
+        finally:
+            connection.close()
+        if response.status != 200:
+            try:
+                message = json.loads(payload)['error']
+            except Exception:
+                message = payload.decode(errors='replace')
+            raise Exception(f'Request to {path} failed ({response.status}): {message}')
+        return payload
+
+    def models(self):
+        """Inputs and outputs of the served models, see `ModelServer.describe()`."""
+        return json.loads(self._request('GET', '/models'))
+
+    def stats(self):
+        """Counters of the served models, see `ModelServer.stats()`."""
+        return json.loads(self._request('GET', '/stats'))
+
+    def predict(self, name, x):
+        """Run a prediction of a served model.
+
+        Args:
+            name (str): Name of the model.
+            x (np.ndarray or list): Input data, as for `ModelGraph.predict()`.
+
+        Returns:
+            np.ndarray or list: The predictions, as returned by `ModelGraph.predict()`.
+        """
+        inputs = list(x) if isinstance(x, (list, tuple)) else [x]
+        outputs = _loads(self._request('POST', f'/models/{name}/predict', body=_dumps(inputs)))
+        return outputs[0] if len(outputs) == 1 else outputs
@@ -0,0 +1,223 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+# Stack of nested regions and the active timers, per thread, so conversions running in other threads aren't recorded
+_local = threading.local()
+
+
+class _NullCounters:
+    def __getitem__(self, key):
+        return 0
+
+    def __setitem__(self, key, value):
+        pass
+
+
+class _NullRegion:
+    _counters = _NullCounters()
+
+    def __enter__(self):
+        return self._counters
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_null_region = _NullRegion()
+
+
+class _Region:
+    __slots__ = ('category', 'name', 'counters', 'start', 'children')
+
+    def __init__(self, category, name):
+        self.category = category
+        self.name = name
+        self.counters = defaultdict(int)
+        self.start = None
+        self.children = 0.0
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self.counters
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter()
+        duration = end - self.start
+        stack = _local.stack
+        stack.pop()
+        if len(stack) > 0:
+            stack[-1].children += duration
+        event = {
+            'category': self.category,
+            'name': self.name,
+            'start': self.start,
+            'duration': duration,
+            'self': duration - self.children,
+            'thread': threading.get_ident(),
+            'counters': dict(self.counters),
+        }
+        # A timer entered more than once (e.g., the timer of a model that is nested in itself) records the event once
+        for timer in dict.fromkeys(getattr(_local, 'timers', ())):
+            timer.events.append(event)
+        return False
+
+
+def timed(category, name):
+    """Time a region of code, if a `Timer` is active.
+
+    Used as a context manager, which returns a dictionary of counters of the region (e.g., the number of matches of an
+    optimizer pass) that are recorded with the time. If no timer is active in the current thread, nothing is recorded,
+    and the cost is a single check.
+
+    Args:
+        category (str): Category of the region, e.g., 'flow', 'pass', 'writer' or 'compile'.
+        name (str): Name of the region.
+
+    Returns:
+        A context manager.
+    """
+    if not getattr(_local, 'timers', None):
+        return _null_region
+    return _Region(category, name)
+
+
+class Timer:
+    """Records the time spent in the flows, optimizer passes, writer steps, compilation and builds of the models.
+
+    The timer records while it is active, as a context manager, and only the regions of the thread that entered it.
+    Timers can also be enabled for a single model, by setting ``Timing: True`` in the ``HLSConfig`` section of the
+    configuration, in which case the timer of the model is available as ``model.timer``. Each time a region is
+    entered, an event with its start time, its duration (also excluding the nested regions, as 'self' time) and its
+    counters is recorded. For the optimizer passes, the counters are the number of nodes the pass matched ('matches')
+    and the number of transformations that changed the model ('transforms').
+
+    Example:
+        with Timer() as timer:
+            hls_model = hls4ml.converters.convert_from_keras_model(model, hls_config=config)
+            hls_model.compile()
+        timer.print_summary()
+        timer.write_chrome_trace('hls4ml_trace.json')  # Open with chrome://tracing or https://ui.perfetto.dev
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def __enter__(self):
+        timers = getattr(_local, 'timers', None)
+        if timers is None:
+            timers = _local.timers = []
+        timers.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _local.timers.remove(self)
+        return False
+
+    def reset(self):
+        """Remove the recorded events."""
+        self.events = []
+
+    def summary(self, category=None):
+        """Aggregate the recorded events by region.
+
+        Args:
+            category (str, optional): Only include the regions of this category. Defaults to None (all regions).
+
+        Returns:
+            list: A dict for each region with its 'category', 'name', number of invocations ('count'), 'total', 'self'
+            (excluding nested regions), 'mean' and 'max' time in seconds and the sum of each counter, sorted by the
+            total time.
+        """
+        regions = {}
+        for event in self.events:
+            if category is not None and event['category'] != category:
+                continue
+            key = (event['category'], event['name'])
+            region = regions.get(key)
+            if region is None:
+                region = regions[key] = {
+                    'category': event['category'],
+                    'name': event['name'],
+                    'count': 0,
+                    'total': 0.0,
+                    'self': 0.0,
+                    'max': 0.0,
+                }
+            region['count'] += 1
+            region['total'] += event['duration']
+            region['self'] += event['self']
+            region['max'] = max(region['max'], event['duration'])
+            for counter, value in event['counters'].items():
+                region[counter] = region.get(counter, 0) + value
+
+        summary = sorted(regions.values(), key=lambda region: region['total'], reverse=True)
+        for region in summary:
+            region['mean'] = region['total'] / region['count']
+        return summary
+
+    def print_summary(self, category=None, limit=None):
+        """Print a table of the time spent in each region, see `summary()`.
+
+        Args:
+            category (str, optional): Only include the regions of this category. Defaults to None (all regions).
+            limit (int, optional): Maximum number of regions to print. Defaults to None (all regions).
+        """
+        from tabulate import tabulate
+
+        summary = self.summary(category)[:limit]
+        rows = [
+            [
+                region['category'],
+                region['name'],
+                region['count'],
+                f'{region["total"]:.4f}',
+                f'{region["self"]:.4f}',
+                f'{region["mean"]:.4f}',
+                f'{region["max"]:.4f}',
+                region.get('matches', 0) if region['category'] == 'pass' else '',
+                region.get('transforms', 0) if region['category'] == 'pass' else '',
+            ]
+            for region in summary
+        ]
+        headers = ['Category', 'Name', 'Count', 'Total [s]', 'Self [s]', 'Mean [s]', 'Max [s]', 'Matches', 'Transforms']
+        print(tabulate(rows, headers=headers))
+
+    def to_chrome_trace(self):
+        """Convert the recorded events to the Chrome trace event format.
+
+        Returns:
+            dict: The trace, can be saved as JSON and opened with chrome://tracing or https://ui.perfetto.dev.
+        """
+        if len(self.events) > 0:
+            origin = min(event['start'] for event in self.events)
+        pid = os.getpid()
+        trace_events = [
+            {
+                'name': event['name'],
+                'cat': event['category'],
+                'ph': 'X',
+                'ts': (event['start'] - origin) * 1e6,
+                'dur': event['duration'] * 1e6,
+                'pid': pid,
+                'tid': event['thread'],
+                'args': event['counters'],
+            }
+            for event in self.events
+        ]
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path):
+        """Save the recorded events in the Chrome trace event format, see `to_chrome_trace()`.
+
+        Args:
+            path (str): Path of the JSON file.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
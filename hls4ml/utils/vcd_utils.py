@@ -0,0 +1,93 @@
+def _read_header(vcd_file):
+    """Read the declarations of a VCD file, up to ``$enddefinitions``.
+
+    Args:
+        vcd_file (file): The VCD file, opened in binary mode.
+
+    Returns:
+        list: Tuples of (scope path, signal name, identifier code) of the declared signals, in order of declaration.
+    """
+    signals = []
+    scope = []
+    tokens = []
+    for line in vcd_file:
+        tokens.extend(line.split())
+        # Declarations end with '$end' and may span several lines
+        while b'$end' in tokens:
+            end = tokens.index(b'$end')
+            declaration, tokens = tokens[:end], tokens[end + 1 :]
+            if len(declaration) == 0:
+                continue
+            keyword = declaration[0]
+            if keyword == b'$scope':
+                scope.append(declaration[2].decode())
+            elif keyword == b'$upscope':
+                scope.pop()
+            elif keyword == b'$var':
+                signals.append((tuple(scope), declaration[4].decode(), declaration[3]))
+            elif keyword == b'$enddefinitions':
+                return signals
+
+    raise Exception('Invalid VCD file, no $enddefinitions found')
+
+
+def read_fifo_occupancy(vcd_path, occupancy_signal='usedw', depth_signal='DEPTH'):
+    """Find the maximum occupancy of the FIFOs recorded in a VCD file.
+
+    The file is read in a single pass and only the running maximum of each FIFO is kept, so the memory use doesn't
+    depend on the length of the simulation. A FIFO is a scope with an occupancy signal, its depth is the first value of
+    the depth signal in the same scope.
+
+    Args:
+        vcd_path (str): Path to the VCD file.
+        occupancy_signal (str, optional): Name of the signals with the number of words in the FIFOs. Defaults to
+            'usedw'.
+        depth_signal (str, optional): Name of the signals with the depths of the FIFOs. Defaults to 'DEPTH'.
+
+    Returns:
+        list: A dict for each FIFO with its 'name' (the name of its scope), the 'max' occupancy and the 'depth', in
+        order of declaration.
+    """
+    with open(vcd_path, 'rb', buffering=1 << 20) as vcd_file:
+        signals = _read_header(vcd_file)
+
+        # Index of each FIFO, by the path of its scope
+        fifos = {}
+        for scope, name, _ in signals:
+            if name == occupancy_signal and scope not in fifos:
+                fifos[scope] = len(fifos)
+
+        # Running [max, depth] of each FIFO, updated by the value changes of the tracked codes. Signals may share a code.
+        values = [[None, None] for _ in fifos]
+        tracked = {}
+        for scope, name, code in signals:
+            if scope in fifos and name in (occupancy_signal, depth_signal):
+                tracked.setdefault(code, []).append((values[fifos[scope]], 0 if name == occupancy_signal else 1))
+
+        for line in vcd_file:
+            first = line[0:1]
+            if first in (b'b', b'B'):
+                value, _, code = line[1:].partition(b' ')
+                code = code.strip()
+            elif first in (b'0', b'1'):
+                value, code = first, line[1:].strip()
+            else:
+                continue  # Timestamps, keywords, real values and scalars with unknown values
+
+            targets = tracked.get(code)
+            if targets is None:
+                continue
+            try:
+                value = int(value, 2)
+            except ValueError:
+                continue  # Vectors with unknown (x) or high impedance (z) bits
+            for target, kind in targets:
+                if kind == 0:
+                    if target[0] is None or value > target[0]:
+                        target[0] = value
+                elif target[1] is None:
+                    target[1] = value
+
+    return [
+        {'name': scope[-1], 'max': max_value or 0, 'depth': depth or 0} for scope, (max_value, depth) in zip(fifos, values)
+    ]
@@ -1,5 +1,6 @@
 import glob
 import os
+import re
 import stat
 import tarfile
 from collections import OrderedDict
@@ -13,6 +14,35 @@ from hls4ml.writer.writers import Writer
 
 config_filename = 'hls4ml_config.yml'
 
+# Matches the ap_fixed/ap_ufixed types in the generated type definitions, capturing the sign, width and other arguments
+_ap_fixed_re = re.compile(r'\bap_(u?)fixed<\s*(\d+)([^<>]*)>')
+
+# Widest ap_fixed type replaced by nnet::fast_fixed in the FastCSim mode
+FAST_CSIM_MAX_WIDTH = 64
+
+
+def _fast_csim_definitions(definitions):
+    """Replace the ap_fixed types in C++ type definitions with nnet::fast_fixed.
+
+    Mixing both kinds of types in the same model is not supported, so if any of the types is wider than
+    ``FAST_CSIM_MAX_WIDTH`` bits, nothing is replaced.
+
+    Args:
+        definitions (list): C++ type definitions, as returned by ``definition_cpp()``.
+
+    Returns:
+        list: The definitions using nnet::fast_fixed, or ``None`` if a type is too wide.
+    """
+    widths = [int(match.group(2)) for definition in definitions for match in _ap_fixed_re.finditer(definition)]
+    if any(width > FAST_CSIM_MAX_WIDTH for width in widths):
+        return None
+
+    def _replace(match):
+        signed, width, args = match.groups()
+        return f'nnet::fast_{signed}fixed<{width}{args}>'
+
+    return [_ap_fixed_re.sub(_replace, definition) for definition in definitions]
+
 
 class VivadoWriter(Writer):
     def print_array_to_cpp(self, var, odir, namespace=None, write_txt_file=True):
@@ -170,26 +200,19 @@ class VivadoWriter(Writer):
                     newline += '    static bool loaded_weights = false;\n'
                     newline += '    if (!loaded_weights) {\n'
 
-                    for layer in model.get_layers():
-                        for w in layer.get_weights():
-                            if w.weight_class == 'CompressedWeightVariable':
-                                newline += (
-                                    indent
-                                    + '    nnet::load_compressed_weights_from_txt<{}, {}>({}, "{}.txt");\n'.format(
-                                        w.type.name, w.nonzeros, w.name, w.name
-                                    )
-                                )
-                            elif w.weight_class == 'ExponentWeightVariable':
-                                newline += (
-                                    indent
-                                    + '    nnet::load_exponent_weights_from_txt<{}, {}>({}, "{}.txt");\n'.format(
-                                        w.type.name, w.data_length, w.name, w.name
-                                    )
-                                )
-                            else:
-                                newline += indent + '    nnet::load_weights_from_txt<{}, {}>({}, "{}.txt");\n'.format(
-                                    w.type.name, w.data_length, w.name, w.name
-                                )
+                    for w in model.get_weight_variables():
+                        if w.weight_class == 'CompressedWeightVariable':
+                            newline += indent + '    nnet::load_compressed_weights_from_txt<{}, {}>({}, "{}.txt");\n'.format(
+                                w.type.name, w.nonzeros, w.name, w.name
+                            )
+                        elif w.weight_class == 'ExponentWeightVariable':
+                            newline += indent + '    nnet::load_exponent_weights_from_txt<{}, {}>({}, "{}.txt");\n'.format(
+                                w.type.name, w.data_length, w.name, w.name
+                            )
+                        else:
+                            newline += indent + '    nnet::load_weights_from_txt<{}, {}>({}, "{}.txt");\n'.format(
+                                w.type.name, w.data_length, w.name, w.name
+                            )
 
                     newline += '        loaded_weights = true;'
                     newline += '    }\n'
@@ -362,8 +385,24 @@ class VivadoWriter(Writer):
                         # This can happen in case of InplaceVariable types
                         if type_name not in all_precision:
                             all_precision[type_name] = type_var
-                for used_type in all_precision.values():
-                    newline += used_type.definition_cpp()
+                definitions = [used_type.definition_cpp() for used_type in all_precision.values()]
+                fast_definitions = None
+                if model.config.get_writer_config().get('FastCSim', False):
+                    fast_definitions = _fast_csim_definitions(definitions)
+                    if fast_definitions is None:
+                        print(
+                            f'WARNING: The model uses fixed-point types wider than {FAST_CSIM_MAX_WIDTH} bits, '
+                            'FastCSim is disabled.'
+                        )
+                if fast_definitions is not None:
+                    # The fast types are only used by build_lib.sh, the HLS compiler uses the ap_fixed ones
+                    newline += '#ifdef HLS4ML_FAST_CSIM\n'
+                    newline += ''.join(fast_definitions)
+                    newline += '#else\n'
+                    newline += ''.join(definitions)
+                    newline += '#endif\n'
+                else:
+                    newline += ''.join(definitions)
 
             elif '// hls-fpga-machine-learning insert namespace-start' in line:
                 newline = ''
@@ -403,10 +442,9 @@ class VivadoWriter(Writer):
 
             elif '// hls-fpga-machine-learning insert weights' in line:
                 newline = line
-                for layer in model.get_layers():
-                    for w in layer.get_weights():
-                        if w.storage.lower() != 'bram':
-                            newline += f'#include "weights/{w.name}.h"\n'
+                for w in model.get_weight_variables():
+                    if w.storage.lower() != 'bram':
+                        newline += f'#include "weights/{w.name}.h"\n'
 
             elif "// hls-fpga-machine-learning insert layer-config" in line:
                 newline = line
@@ -444,11 +482,8 @@ class VivadoWriter(Writer):
         """
         namespace = model.config.get_writer_config().get('Namespace', None)
         write_txt = model.config.get_writer_config().get('WriteWeightsTxt', True)
-        for layer in model.get_layers():
-            for weights in layer.get_weights():
-                self.print_array_to_cpp(
-                    weights, model.config.get_output_dir(), namespace=namespace, write_txt_file=write_txt
-                )
+        for weights in model.get_weight_variables():
+            self.print_array_to_cpp(weights, model.config.get_output_dir(), namespace=namespace, write_txt_file=write_txt)
 
     def __make_dat_file(self, original_path, project_path):
         """
@@ -733,10 +768,13 @@ class VivadoWriter(Writer):
         # build_lib.sh
         build_lib_src = (filedir / '../templates/vivado/build_lib.sh').resolve()
         build_lib_dst = Path(f'{model.config.get_output_dir()}/build_lib.sh').resolve()
+        fast_csim = model.config.get_writer_config().get('FastCSim', False)
         with open(build_lib_src) as src, open(build_lib_dst, 'w') as dst:
             for line in src.readlines():
                 line = line.replace('myproject', model.config.get_project_name())
                 line = line.replace('mystamp', model.config.get_config_value('Stamp'))
+                if fast_csim and line.startswith('DEFINES='):
+                    line = 'DEFINES="-D HLS4ML_FAST_CSIM"\n'
 
                 dst.write(line)
         build_lib_dst.chmod(build_lib_dst.stat().st_mode | stat.S_IEXEC)
@@ -1,4 +1,26 @@
+import functools
+import inspect
+
+from hls4ml.utils.timing import timed
+
+
+def _timed_step(step):
+    @functools.wraps(step)
+    def timed_step(self, *args, **kwargs):
+        with timed('writer', step.__qualname__):
+            return step(self, *args, **kwargs)
+
+    return timed_step
+
+
 class Writer:
+    def __init_subclass__(cls, **kwargs):
+        # Time the steps of the writers (the 'write_*' methods), see hls4ml.utils.timing
+        super().__init_subclass__(**kwargs)
+        for name, attr in list(vars(cls).items()):
+            if name.startswith('write') and inspect.isfunction(attr):
+                setattr(cls, name, _timed_step(attr))
+
     def __init__(self):
         pass
 
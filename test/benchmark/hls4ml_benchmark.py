@@ -0,0 +1,420 @@
+'''
+Performance benchmarks of the hls4ml workflow
+
+Synthetic models of increasing size (Dense MLPs, CNNs with many channels, LSTMs and deep ONNX graphs) are converted,
+written, compiled and run. The time of each stage (and of each flow applied during the conversion) and the peak memory
+allocated by Python are measured. Parsing of synthesis reports and the mask computation of DSP-aware pruning are
+benchmarked as well. Benchmarks whose frontend (TensorFlow, ONNX/QONNX) is not installed are skipped.
+
+The results are saved as JSON, together with the commit they were measured on, so that they can be compared between
+commits. Comparing two result files prints the change of each stage and exits with an error if any stage got slower
+than the given threshold.
+
+Usage:
+    python hls4ml_benchmark.py [--suites dense cnn lstm onnx report pruning] [--sizes small medium large]
+                               [--repeat 3] [--no-compile] [--output results.json]
+    python hls4ml_benchmark.py --compare baseline.json results.json [--threshold 0.1]
+'''
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+from tabulate import tabulate
+
+import hls4ml
+from hls4ml.utils.timing import Timer
+
+SUITES = ['dense', 'cnn', 'lstm', 'onnx', 'report', 'pruning']
+SIZES = ['small', 'medium', 'large']
+
+# Parameters of the synthetic models of each size
+DENSE_SIZES = {'small': (16, 32, 3), 'medium': (64, 64, 4), 'large': (128, 128, 6)}  # inputs, width, depth
+CNN_SIZES = {'small': (16, 8, 2), 'medium': (16, 16, 3), 'large': (16, 32, 3)}  # image size, channels, depth
+LSTM_SIZES = {'small': (8, 4, 8), 'medium': (16, 8, 16), 'large': (32, 8, 32)}  # sequence, features, units
+ONNX_SIZES = {'small': (16, 4), 'medium': (16, 16), 'large': (16, 64)}  # width, depth
+REPORT_SIZES = {'small': 1, 'medium': 10, 'large': 100}  # number of reports
+PRUNING_SIZES = {'small': (64, 3), 'medium': (256, 3), 'large': (512, 4)}  # width, depth
+
+N_SAMPLES = 100
+
+test_root_path = Path(__file__).parent
+
+
+def measure(fn, repeat):
+    '''
+    Measures the runtime of fn over the given number of runs, and the peak memory allocated by Python during a separate
+    (first) run. The first run also serves as a warm-up and is not included in the runtime.
+    '''
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    times = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+
+    return {'times': times, 'min': min(times), 'median': statistics.median(times), 'peak_memory_mb': peak / 2**20}
+
+
+def flow_times(timer):
+    '''
+    Time spent in each flow recorded by the timer, excluding the time spent in the flows it requires
+    '''
+    times = defaultdict(float)
+    stack = []  # End time and name of the enclosing flows
+    for event in sorted((e for e in timer.events if e['category'] == 'flow'), key=lambda e: e['start']):
+        while len(stack) > 0 and event['start'] >= stack[-1][0]:
+            stack.pop()
+        times[event['name']] += event['duration']
+        if len(stack) > 0:
+            times[stack[-1][1]] -= event['duration']
+        stack.append((event['start'] + event['duration'], event['name']))
+    return times
+
+
+def benchmark_model(convert, x, repeat, compile):
+    '''
+    Benchmarks the conversion (and each flow), writing, compilation, prediction and tracing of a model. convert(output_dir)
+    returns the converted model.
+    '''
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_dir = os.path.join(tmp_dir, 'hls4mlprj')
+
+        runs = []
+
+        def run_convert():
+            with Timer() as timer:
+                model = convert(output_dir)
+            runs.append(flow_times(timer))
+            return model
+
+        results['convert'] = measure(run_convert, repeat)
+        for flow_name in runs[-1]:
+            times = [run_flow_times[flow_name] for run_flow_times in runs[1:]]
+            results[f'flow:{flow_name}'] = {'times': times, 'min': min(times), 'median': statistics.median(times)}
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            model = convert(output_dir)
+        results['write'] = measure(model.write, repeat)
+
+        if compile:
+            # Only the build of the library, the project is written above
+            results['compile'] = measure(model._compile, repeat)
+            results['predict'] = measure(lambda: model.predict(x), repeat)
+            # Tracing rewrites and recompiles the project with the tracing enabled
+            results['trace'] = measure(lambda: model.trace(x), repeat)
+
+    return results
+
+
+def dense_benchmark(size, repeat, compile):
+    from tensorflow.keras.layers import Dense
+    from tensorflow.keras.models import Sequential
+
+    n_in, width, depth = DENSE_SIZES[size]
+    keras_model = Sequential()
+    keras_model.add(Dense(width, input_shape=(n_in,), activation='relu'))
+    for _ in range(depth - 1):
+        keras_model.add(Dense(width, activation='relu'))
+    keras_model.add(Dense(5, activation='softmax'))
+
+    config = hls4ml.utils.config_from_keras_model(keras_model, granularity='name')
+
+    def convert(output_dir):
+        return hls4ml.converters.convert_from_keras_model(
+            keras_model, hls_config=config, output_dir=output_dir, io_type='io_parallel', backend='Vivado'
+        )
+
+    x = np.random.rand(N_SAMPLES, n_in).astype(np.float32)
+    return benchmark_model(convert, x, repeat, compile)
+
+
+def cnn_benchmark(size, repeat, compile):
+    from tensorflow.keras.layers import Activation, Conv2D, Dense, Flatten, MaxPooling2D
+    from tensorflow.keras.models import Sequential
+
+    image_size, channels, depth = CNN_SIZES[size]
+    keras_model = Sequential()
+    keras_model.add(Conv2D(channels, (3, 3), padding='same', input_shape=(image_size, image_size, 3)))
+    keras_model.add(Activation('relu'))
+    for _ in range(depth - 1):
+        keras_model.add(Conv2D(channels, (3, 3), padding='same'))
+        keras_model.add(Activation('relu'))
+    keras_model.add(MaxPooling2D((2, 2)))
+    keras_model.add(Flatten())
+    keras_model.add(Dense(10, activation='softmax'))
+
+    config = hls4ml.utils.config_from_keras_model(keras_model, granularity='name')
+
+    def convert(output_dir):
+        return hls4ml.converters.convert_from_keras_model(
+            keras_model, hls_config=config, output_dir=output_dir, io_type='io_stream', backend='Vivado'
+        )
+
+    x = np.random.rand(N_SAMPLES // 10, image_size, image_size, 3).astype(np.float32)
+    return benchmark_model(convert, x, repeat, compile)
+
+
+def lstm_benchmark(size, repeat, compile):
+    from tensorflow.keras.layers import LSTM, Dense
+    from tensorflow.keras.models import Sequential
+
+    sequence, features, units = LSTM_SIZES[size]
+    keras_model = Sequential()
+    keras_model.add(LSTM(units, input_shape=(sequence, features)))
+    keras_model.add(Dense(5, activation='softmax'))
+
+    config = hls4ml.utils.config_from_keras_model(keras_model, granularity='name')
+
+    def convert(output_dir):
+        return hls4ml.converters.convert_from_keras_model(
+            keras_model, hls_config=config, output_dir=output_dir, io_type='io_parallel', backend='Vivado'
+        )
+
+    x = np.random.rand(N_SAMPLES, sequence, features).astype(np.float32)
+    return benchmark_model(convert, x, repeat, compile)
+
+
+def onnx_benchmark(size, repeat, compile):
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+    from qonnx.core.modelwrapper import ModelWrapper
+    from qonnx.util.cleanup import cleanup_model
+
+    width, depth = ONNX_SIZES[size]
+    rng = np.random.default_rng(0)
+    nodes, initializers = [], []
+    previous = 'input'
+    for i in range(depth):
+        initializers.append(numpy_helper.from_array(rng.random((width, width), dtype=np.float32) - 0.5, f'w{i}'))
+        initializers.append(numpy_helper.from_array(rng.random(width, dtype=np.float32) - 0.5, f'b{i}'))
+        nodes.append(helper.make_node('MatMul', [previous, f'w{i}'], [f'matmul{i}']))
+        nodes.append(helper.make_node('Add', [f'matmul{i}', f'b{i}'], [f'add{i}']))
+        nodes.append(helper.make_node('Relu', [f'add{i}'], [f'relu{i}']))
+        previous = f'relu{i}'
+    graph = helper.make_graph(
+        nodes,
+        'deep_mlp',
+        [helper.make_tensor_value_info('input', TensorProto.FLOAT, [1, width])],
+        [helper.make_tensor_value_info(previous, TensorProto.FLOAT, [1, width])],
+        initializer=initializers,
+    )
+    onnx_model = cleanup_model(ModelWrapper(helper.make_model(graph)))
+    onnx.checker.check_model(onnx_model.model)
+
+    config = hls4ml.utils.config_from_onnx_model(onnx_model, granularity='name')
+
+    def convert(output_dir):
+        return hls4ml.converters.convert_from_onnx_model(
+            onnx_model, hls_config=config, output_dir=output_dir, io_type='io_parallel', backend='Vivado'
+        )
+
+    x = np.random.rand(N_SAMPLES, width).astype(np.float32)
+    return benchmark_model(convert, x, repeat, compile)
+
+
+def report_benchmark(size, repeat, compile):
+    report_dir = test_root_path.parent / 'pytest' / 'test_report'
+    n_reports = REPORT_SIZES[size]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        projects = []
+        for i in range(n_reports):
+            project = os.path.join(tmp_dir, f'hls4mlprj_{i}')
+            syn_dir = os.path.join(project, 'myproject_prj', 'solution1', 'syn', 'report')
+            os.makedirs(syn_dir)
+            with open(os.path.join(project, 'project.tcl'), 'w') as f:
+                f.write('set project_name "myproject"\nset backend "vivado"\n')
+            shutil.copy(report_dir / 'vivado_hls.app', os.path.join(project, 'myproject_prj'))
+            shutil.copy(report_dir / 'myproject_csynth.rpt', syn_dir)
+            shutil.copy(report_dir / 'myproject_csynth.xml', syn_dir)
+            shutil.copy(report_dir / 'vivado_synth.rpt', project)
+            projects.append(project)
+
+        def parse():
+            for project in projects:
+                hls4ml.report.parse_vivado_report(project)
+
+        return {'parse_vivado_report': measure(parse, repeat)}
+
+
+def pruning_benchmark(size, repeat, compile):
+    from tensorflow.keras.layers import Dense
+    from tensorflow.keras.models import Sequential
+
+    from hls4ml.optimization.dsp_aware_pruning.attributes import get_attributes_from_keras_model
+    from hls4ml.optimization.dsp_aware_pruning.config import SUPPORTED_STRUCTURES
+    from hls4ml.optimization.dsp_aware_pruning.keras.masking import get_model_masks
+    from hls4ml.optimization.dsp_aware_pruning.objectives import ParameterEstimator
+
+    width, depth = PRUNING_SIZES[size]
+    keras_model = Sequential()
+    keras_model.add(Dense(width, input_shape=(width,), activation='relu', name='dense_0'))
+    for i in range(1, depth):
+        keras_model.add(Dense(width, activation='relu', name=f'dense_{i}'))
+
+    model_attributes = get_attributes_from_keras_model(keras_model)
+    for i in range(depth):
+        model_attributes[f'dense_{i}'].optimizable = True
+        model_attributes[f'dense_{i}'].optimization_attributes.pruning = True
+        model_attributes[f'dense_{i}'].optimization_attributes.structure_type = SUPPORTED_STRUCTURES.UNSTRUCTURED
+
+    def get_masks(local):
+        # The greedy solver doesn't depend on OR-Tools, see knapsack_benchmark.py for the other solvers
+        return get_model_masks(
+            keras_model, model_attributes, 0.5, ParameterEstimator, metric='l1', local=local, knapsack_solver='greedy'
+        )
+
+    return {
+        'get_model_masks_global': measure(lambda: get_masks(False), repeat),
+        'get_model_masks_local': measure(lambda: get_masks(True), repeat),
+    }
+
+
+BENCHMARKS = {
+    'dense': dense_benchmark,
+    'cnn': cnn_benchmark,
+    'lstm': lstm_benchmark,
+    'onnx': onnx_benchmark,
+    'report': report_benchmark,
+    'pruning': pruning_benchmark,
+}
+
+
+def get_metadata():
+    def git(*args):
+        try:
+            return subprocess.run(
+                ['git', *args], cwd=test_root_path, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except Exception:
+            return None
+
+    return {
+        'commit': git('rev-parse', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'hls4ml_version': hls4ml.__version__,
+        'python_version': platform.python_version(),
+        'numpy_version': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def run_benchmarks(suites, sizes, repeat, compile):
+    results = {'metadata': get_metadata(), 'benchmarks': {}}
+    results['metadata'].update({'repeat': repeat, 'compile': compile})
+    for suite in suites:
+        for size in sizes:
+            name = f'{suite}_{size}'
+            print(f'Running {name}...')
+            try:
+                stages = BENCHMARKS[suite](size, repeat, compile)
+            except ImportError as e:
+                print(f'Skipping {name}: {e}')
+                continue
+            results['benchmarks'][name] = stages
+            for stage, result in stages.items():
+                print(f'    {stage}: {result["median"]:.4f} s')
+    return results
+
+
+def compare(baseline, results, threshold):
+    '''
+    Compares the median runtime and the peak memory of each stage present in both results. Returns the rows of the
+    comparison and whether any stage got slower than the threshold (relative change).
+    '''
+    rows = []
+    regression = False
+    for name, stages in results['benchmarks'].items():
+        baseline_stages = baseline['benchmarks'].get(name, {})
+        for stage, result in stages.items():
+            if stage not in baseline_stages:
+                continue
+            base = baseline_stages[stage]
+            ratio = result['median'] / base['median'] if base['median'] > 0 else float('inf')
+            # Flows taking a negligible time are too noisy to compare
+            slower = ratio > 1 + threshold and result['median'] - base['median'] > 1e-3
+            regression = regression or slower
+            memory = ''
+            if 'peak_memory_mb' in result and 'peak_memory_mb' in base:
+                memory = f'{base["peak_memory_mb"]:.1f} -> {result["peak_memory_mb"]:.1f}'
+            rows.append(
+                [
+                    name,
+                    stage,
+                    f'{base["median"]:.4f}',
+                    f'{result["median"]:.4f}',
+                    f'{ratio:.2f}',
+                    memory,
+                    'SLOWER' if slower else ('faster' if ratio < 1 - threshold else ''),
+                ]
+            )
+    return rows, regression
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the hls4ml workflow on synthetic models')
+    parser.add_argument('--suites', nargs='+', choices=SUITES, default=SUITES, help='Benchmarks to run')
+    parser.add_argument('--sizes', nargs='+', choices=SIZES, default=SIZES, help='Sizes of the models')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of timed runs of each stage')
+    parser.add_argument(
+        '--no-compile', action='store_true', help='Skip the compilation, prediction and tracing (no C++ compiler needed)'
+    )
+    parser.add_argument('--output', default=None, help='JSON file to write the results to')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'RESULTS'), help='Compare two result files')
+    parser.add_argument(
+        '--threshold', type=float, default=0.1, help='Relative slowdown reported as a regression when comparing'
+    )
+    args = parser.parse_args()
+
+    if args.compare is not None:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            results = json.load(f)
+        print(f'Baseline: {baseline["metadata"]["commit"]}, results: {results["metadata"]["commit"]}')
+        rows, regression = compare(baseline, results, args.threshold)
+        print(
+            tabulate(rows, headers=['Benchmark', 'Stage', 'Baseline [s]', 'Time [s]', 'Ratio', 'Peak memory [MB]', 'Change'])
+        )
+        sys.exit(1 if regression else 0)
+
+    results = run_benchmarks(args.suites, args.sizes, args.repeat, not args.no_compile)
+
+    output = args.output
+    if output is None:
+        commit = results['metadata']['commit'] or 'unknown'
+        output = f'hls4ml-benchmark-{commit[:8]}.json'
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'Results written to {output}')
+
+
+if __name__ == '__main__':
+    main()
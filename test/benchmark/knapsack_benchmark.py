@@ -0,0 +1,84 @@
+'''
+Benchmark of the Knapsack solvers used in DSP-aware pruning
+
+Compares the runtime and the solution quality (relative to the best solution found) of every implementation
+on randomly generated problems of increasing size. Solvers relying on OR-Tools are skipped if it is not installed.
+
+Usage:
+    python knapsack_benchmark.py [--items 100 1000 10000] [--dims 1 2] [--seed 0]
+'''
+
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+from tabulate import tabulate
+
+from hls4ml.optimization.dsp_aware_pruning.knapsack import solve_knapsack
+
+IMPLEMENTATIONS = ['dynamic', 'greedy', 'branch_bound', 'CBC_MIP']
+
+
+def generate_problem(n_items, n_dims, rng):
+    '''
+    Generates a random Knapsack problem, similar to the ones occurring during pruning:
+    values are floats (e.g. weight magnitudes), item weights are small integers (e.g. DSPs / BRAM saved)
+    and the capacity is a fraction of the total weight of all the items
+    '''
+    values = rng.random(n_items)
+    weights = rng.integers(1, 16, size=(n_dims, n_items))
+    capacity = (weights.sum(axis=1) * rng.uniform(0.3, 0.7, size=n_dims)).astype(int)
+    return values, weights, capacity
+
+
+def run_solver(values, weights, capacity, implementation):
+    # solve_knapsack prints progress; keep the benchmark output clean
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        optimal, selected = solve_knapsack(values, weights, capacity, implementation=implementation)
+        elapsed = time.perf_counter() - start
+
+    selected = np.asarray(selected, dtype=int)
+    feasible = bool(np.all(weights[:, selected].sum(axis=1) <= capacity))
+    return float(optimal), elapsed, feasible
+
+
+def benchmark(items, dims, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for n_dims in dims:
+        for n_items in items:
+            values, weights, capacity = generate_problem(n_items, n_dims, rng)
+
+            results = {}
+            for implementation in IMPLEMENTATIONS:
+                if implementation == 'dynamic' and n_dims > 1:
+                    continue
+                try:
+                    results[implementation] = run_solver(values, weights, capacity, implementation)
+                except Exception as e:
+                    print(f'Skipping {implementation} for N={n_items}, M={n_dims}: {e}')
+
+            best = max(optimal for optimal, _, _ in results.values())
+            for implementation, (optimal, elapsed, feasible) in results.items():
+                quality = optimal / best if best > 0 else 1.0
+                rows.append([n_items, n_dims, implementation, f'{elapsed:.4f}', f'{quality:.4f}', feasible])
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Knapsack solvers used in DSP-aware pruning')
+    parser.add_argument('--items', type=int, nargs='+', default=[100, 1000, 10000], help='Number of items')
+    parser.add_argument('--dims', type=int, nargs='+', default=[1, 2], help='Number of constraints (knapsacks)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    rows = benchmark(args.items, args.dims, args.seed)
+    print(tabulate(rows, headers=['Items', 'Dims', 'Implementation', 'Time [s]', 'Quality', 'Feasible']))
+
+
+if __name__ == '__main__':
+    main()
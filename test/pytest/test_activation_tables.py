@@ -0,0 +1,138 @@
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import pytest
+from tensorflow.keras.layers import ELU, Activation, Dense
+from tensorflow.keras.models import Sequential
+
+import hls4ml
+from hls4ml.backends.vivado.passes.activation_tables import activation_tables, sliced_fixed_inputs
+from hls4ml.model.types import FixedPrecisionType, RoundingMode, SaturationMode, quantize_fixed
+
+test_root_path = Path(__file__).parent
+templates_path = test_root_path / '../../hls4ml/templates/vivado'
+
+
+def test_quantize_fixed():
+    data = np.array([-2.3, -0.375, -0.125, 0.125, 0.375, 1.9, 5.0, np.inf])
+
+    precision = FixedPrecisionType(4, 2)  # TRN, WRAP
+    np.testing.assert_array_equal(quantize_fixed(data, precision), [1.5, -0.5, -0.25, 0.0, 0.25, 1.75, 1.0, 0.0])
+
+    precision = FixedPrecisionType(4, 2, rounding_mode=RoundingMode.RND, saturation_mode=SaturationMode.SAT)
+    np.testing.assert_array_equal(quantize_fixed(data, precision), [-2.0, -0.25, 0.0, 0.25, 0.5, 1.75, 1.75, 1.75])
+
+    precision = FixedPrecisionType(4, 2, rounding_mode=RoundingMode.RND_CONV, saturation_mode=SaturationMode.SAT_SYM)
+    np.testing.assert_array_equal(quantize_fixed(data, precision), [-1.75, -0.5, 0.0, 0.0, 0.5, 1.75, 1.75, 1.75])
+
+    precision = FixedPrecisionType(4, 2, signed=False, saturation_mode=SaturationMode.SAT_ZERO)
+    np.testing.assert_array_equal(quantize_fixed(data, precision), [0.0, 0.0, 0.0, 0.0, 0.25, 1.75, 0.0, 0.0])
+
+
+def test_tables_match_cpp(tmp_path):
+    """The tables computed in Python must be identical to the ones of the C++ initialization functions"""
+    exe = tmp_path / 'init_tables'
+    subprocess.run(
+        [
+            'g++',
+            '-O1',
+            '-std=c++11',
+            f'-I{templates_path / "ap_types"}',
+            f'-I{templates_path}',
+            str(test_root_path / 'test_activation_tables/init_tables.cpp'),
+            '-o',
+            str(exe),
+        ],
+        check=True,
+    )
+    result = subprocess.run([str(exe)], stdout=subprocess.PIPE, text=True, check=True)
+    cpp_tables = [np.array(line.split(), dtype=np.float64) for line in result.stdout.splitlines()]
+
+    table_size = 1024
+    table_precision = FixedPrecisionType(18, 8)
+    softmax_precision = FixedPrecisionType(18, 8, rounding_mode=RoundingMode.RND, saturation_mode=SaturationMode.SAT)
+
+    py_tables = []
+    for activation in ['sigmoid', 'tanh', 'softplus', 'softsign', 'elu', 'selu']:
+        inputs, function = activation_tables[activation]
+        py_tables.append(quantize_fixed(function(inputs(table_size)), table_precision))
+    with np.errstate(over='ignore', divide='ignore'):
+        exp_inputs = sliced_fixed_inputs(FixedPrecisionType(16, 6), table_size)
+        py_tables.append(quantize_fixed(np.exp(exp_inputs), softmax_precision))
+        inv_inputs = sliced_fixed_inputs(softmax_precision, table_size)
+        py_tables.append(quantize_fixed(1 / inv_inputs, softmax_precision))
+
+    assert len(cpp_tables) == len(py_tables)
+    for cpp_table, py_table in zip(cpp_tables, py_tables):
+        np.testing.assert_array_equal(py_table, cpp_table)
+
+
+@pytest.mark.parametrize('backend', ['Vivado', 'Vitis'])
+@pytest.mark.parametrize('io_type', ['io_parallel', 'io_stream'])
+def test_shared_tables(backend, io_type):
+    model = Sequential()
+    model.add(Dense(8, input_shape=(8,), name='dense1'))
+    model.add(Activation('sigmoid', name='sigmoid1'))
+    model.add(Dense(8, name='dense2'))
+    model.add(Activation('sigmoid', name='sigmoid2'))
+    model.add(Dense(8, name='dense3'))
+    model.add(ELU(alpha=0.5, name='elu'))
+    model.add(Dense(8, name='dense4'))
+    model.add(Activation('softmax', name='softmax'))
+    model.compile()
+
+    config = hls4ml.utils.config_from_keras_model(model, granularity='name', backend=backend)
+    config['LayerName']['softmax']['Strategy'] = 'Stable'
+    # The softmax tables are indexed by the top bits of the input
+    config['LayerName']['dense4']['Precision']['result'] = 'fixed<16,6>'
+    odir = str(test_root_path / f'hls4mlprj_activation_tables_{backend}_{io_type}')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, output_dir=odir, backend=backend, io_type=io_type
+    )
+
+    sigmoid1 = hls_model.graph['sigmoid1']
+    sigmoid2 = hls_model.graph['sigmoid2']
+    assert sigmoid1.get_weights('table') is sigmoid2.get_weights('table')
+    assert 'table' in hls_model.graph['elu'].weights
+    assert 'exp_table' in hls_model.graph['softmax'].weights
+
+    hls_model.compile()
+
+    with open(odir + '/firmware/parameters.h') as f:
+        parameters = f.read()
+    table_name = sigmoid1.get_weights('table').name
+    assert parameters.count(f'#include "weights/{table_name}.h"') == 1
+    assert 'static bool initialized' not in parameters
+
+    data = np.random.normal(0, 2, (100, 8))
+    y_keras = model.predict(data, verbose=0)
+    y_hls = hls_model.predict(data).reshape(y_keras.shape)
+    np.testing.assert_allclose(y_hls, y_keras, atol=0.05)
+
+
+def test_tables_not_bram():
+    model = Sequential()
+    model.add(Dense(8, input_shape=(8,), name='dense1'))
+    model.add(Activation('sigmoid', name='sigmoid1'))
+    model.add(Dense(8, name='dense2'))
+    model.add(Activation('sigmoid', name='sigmoid2'))
+    model.compile()
+
+    config = hls4ml.utils.config_from_keras_model(model, granularity='name', backend='Vivado')
+    config['Model']['BramFactor'] = 16
+    odir = str(test_root_path / 'hls4mlprj_activation_tables_bram_factor')
+    hls_model = hls4ml.converters.convert_from_keras_model(model, hls_config=config, output_dir=odir, backend='Vivado')
+
+    # The dense weights become BRAM ports, the (shared) table stays a constant of the design
+    table = hls_model.graph['sigmoid1'].get_weights('table')
+    assert table is hls_model.graph['sigmoid2'].get_weights('table')
+    assert table.storage.lower() != 'bram'
+    model_brams = [var.name for var in hls_model.get_weight_variables() if var.storage.lower() == 'bram']
+    assert sorted(model_brams) == sorted(hls_model.graph[name].get_weights('weight').name for name in ['dense1', 'dense2'])
+
+    hls_model.write()
+    with open(odir + '/firmware/myproject.cpp') as f:
+        top = f.read()
+    assert top.count('#pragma HLS INTERFACE bram') == 1
+    assert table.name not in top.split('#pragma HLS INTERFACE bram')[1].splitlines()[0]
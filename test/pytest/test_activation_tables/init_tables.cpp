@@ -0,0 +1,46 @@
+// Prints the activation tables computed by the C++ initialization functions, one table per line
+#include "nnet_utils/nnet_activation.h"
+#include <iomanip>
+#include <iostream>
+
+struct config : nnet::activ_config {
+    static const unsigned table_size = 1024;
+    typedef ap_fixed<18, 8> table_t;
+    typedef ap_fixed<18, 8, AP_RND, AP_SAT> exp_table_t;
+    typedef ap_fixed<18, 8, AP_RND, AP_SAT> inv_table_t;
+};
+
+template <typename table_T> void print_table(table_T table[config::table_size]) {
+    for (unsigned i = 0; i < config::table_size; i++) {
+        std::cout << table[i].to_double() << " ";
+    }
+    std::cout << std::endl;
+}
+
+int main() {
+    std::cout << std::setprecision(17);
+
+    config::table_t table[config::table_size];
+    nnet::init_sigmoid_table<config, config::table_size>(table);
+    print_table<config::table_t>(table);
+    nnet::init_tanh_table<config, config::table_size>(table);
+    print_table<config::table_t>(table);
+    nnet::init_softplus_table<config, config::table_size>(table);
+    print_table<config::table_t>(table);
+    nnet::init_softsign_table<config, config::table_size>(table);
+    print_table<config::table_t>(table);
+    nnet::init_elu_table<config, config::table_size>(table);
+    print_table<config::table_t>(table);
+    nnet::init_selu_table<config, config::table_size>(table);
+    print_table<config::table_t>(table);
+
+    config::exp_table_t exp_table[config::table_size];
+    nnet::init_exp_table<ap_fixed<16, 6>, config>(exp_table);
+    print_table<config::exp_table_t>(exp_table);
+
+    config::inv_table_t inv_table[config::table_size];
+    nnet::init_invert_table<config::exp_table_t, config>(inv_table);
+    print_table<config::inv_table_t>(inv_table);
+
+    return 0;
+}
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from tensorflow.keras.layers import Activation, Conv2D, Dense, Flatten, MaxPooling2D
+from tensorflow.keras.models import Sequential
+
+import hls4ml
+
+test_root_path = Path(__file__).parent
+
+
+@pytest.fixture(scope='module')
+def model():
+    model = Sequential()
+    model.add(Conv2D(4, 3, input_shape=(8, 8, 3), name='conv'))
+    model.add(Activation('relu', name='relu'))
+    model.add(MaxPooling2D(name='pool'))
+    model.add(Flatten(name='flatten'))
+    model.add(Dense(10, name='dense'))
+    model.compile()
+    return model
+
+
+def _convert(model, backend, io_type, balance, target_ii=None):
+    config = hls4ml.utils.config_from_keras_model(model, granularity='name', backend=backend)
+    config['Model']['BalanceDataflow'] = balance
+    if target_ii is not None:
+        config['Model']['DataflowInterval'] = target_ii
+    odir = str(test_root_path / f'hls4mlprj_balance_dataflow_{balance}_{target_ii}_{backend}_{io_type}')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, output_dir=odir, backend=backend, io_type=io_type
+    )
+    hls_model.compile()
+    return hls_model
+
+
+@pytest.mark.parametrize('backend', ['Vivado', 'Vitis'])
+@pytest.mark.parametrize(
+    'io_type, target_ii, expected',
+    [
+        # The convolution reads 8x8 pixels, so the model can't be faster than 64 cycles.
+        # The Dense layer reads 9 pixels and writes 1, leaving 54 cycles to its multiplications.
+        ('io_stream', None, {'conv': (1, 1), 'dense': (36, 1)}),
+        ('io_stream', 200, {'conv': (3, 1), 'dense': (180, 1)}),
+        # The 6x6 output pixels of the convolution are computed in 36 / ParallelizationFactor * ReuseFactor cycles
+        ('io_parallel', None, {'conv': (1, 36), 'dense': (1, 1)}),
+        ('io_parallel', 20, {'conv': (1, 2), 'dense': (18, 1)}),
+    ],
+)
+def test_balance_dataflow(model, backend, io_type, target_ii, expected, capsys):
+    hls_model_ref = _convert(model, backend, io_type, False)
+    capsys.readouterr()
+    hls_model = _convert(model, backend, io_type, True, target_ii)
+    report = capsys.readouterr().out
+
+    assert 'Dataflow balancing' in report
+    assert 'Estimated II of the model' in report
+    for name, (rf, pf) in expected.items():
+        layer = hls_model.graph[name]
+        assert layer.get_attr('reuse_factor') == rf
+        assert hls_model.config.get_reuse_factor(layer) == rf
+        if io_type == 'io_parallel' and name == 'conv':
+            assert layer.get_attr('parallelization_factor') == pf
+            assert layer.get_attr('n_partitions') == 36 // pf
+
+    x = np.random.rand(100, 8, 8, 3)
+    np.testing.assert_array_equal(hls_model.predict(x), hls_model_ref.predict(x))
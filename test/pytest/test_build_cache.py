@@ -0,0 +1,100 @@
+import os
+import stat
+from pathlib import Path
+
+import numpy as np
+import pytest
+from tensorflow.keras.layers import Dense
+from tensorflow.keras.models import Sequential
+
+import hls4ml
+from hls4ml.backends import BuildCache
+
+test_root_path = Path(__file__).parent
+
+# Stand-in for vivado_hls, copies pregenerated reports and counts how many times it was run
+stub_vivado_hls = '''#!/bin/sh
+echo "run" >> {counter}
+mkdir -p myproject_prj/solution1/syn/report
+cp {report_dir}/vivado_hls.app myproject_prj/vivado_hls.app
+cp {report_dir}/myproject_csynth.rpt myproject_prj/solution1/syn/report/myproject_csynth.rpt
+cp {report_dir}/myproject_csynth.xml myproject_prj/solution1/syn/report/myproject_csynth.xml
+'''
+
+
+@pytest.fixture
+def tool_runs(tmp_path, monkeypatch):
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    counter = tmp_path / 'runs'
+    script = bin_dir / 'vivado_hls'
+    script.write_text(stub_vivado_hls.format(counter=counter, report_dir=test_root_path / 'test_report'))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv('PATH', str(bin_dir) + os.pathsep + os.environ['PATH'])
+
+    def count():
+        return len(counter.read_text().splitlines()) if counter.exists() else 0
+
+    return count
+
+
+def _write_model(name, seed=0):
+    model = Sequential()
+    model.add(Dense(5, input_shape=(16,), name='fc1', activation='relu'))
+    model.layers[0].set_weights([np.random.default_rng(seed).random((16, 5)), np.zeros(5)])
+
+    config = hls4ml.utils.config_from_keras_model(model, granularity='model')
+    output_dir = str(test_root_path / f'hls4mlprj_build_cache_{name}')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, output_dir=output_dir, part='xc7z020clg400-1', backend='Vivado'
+    )
+    hls_model.write()
+    return hls_model
+
+
+def test_build_cache(tool_runs, tmp_path):
+    cache = BuildCache(tmp_path / 'cache')
+
+    report = _write_model('first').build(csim=False, cache=cache)
+    assert tool_runs() == 1
+    assert report['CSynthesisReport']['BestLatency'] == '10'
+
+    # Identical project in a different directory, the report and artifacts are taken from the cache
+    hls_model = _write_model('second')
+    cached_report = hls_model.build(csim=False, cache=cache)
+    assert tool_runs() == 1
+    assert cached_report == report
+    assert hls4ml.report.parse_vivado_report(hls_model.config.get_output_dir()) == report
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Default values of the build arguments are part of the key
+    hls_model.build(csim=False, synth=True, cache=cache)
+    assert tool_runs() == 1
+
+    # Different build arguments or weights require a new build
+    hls_model.build(csim=False, cosim=True, cache=cache)
+    assert tool_runs() == 2
+    _write_model('second', seed=1).build(csim=False, cache=cache)
+    assert tool_runs() == 3
+
+
+def test_build_cache_env(tool_runs, tmp_path, monkeypatch):
+    monkeypatch.setenv('HLS4ML_BUILD_CACHE', str(tmp_path / 'cache'))
+    hls_model = _write_model('env')
+    hls_model.build(csim=False)
+    hls_model.build(csim=False)
+    assert tool_runs() == 1
+
+    hls_model.build(csim=False, cache=False)
+    assert tool_runs() == 2
+
+
+def test_build_cache_eviction(tool_runs, tmp_path):
+    cache = BuildCache(tmp_path / 'cache', max_size=1)
+    for seed in range(3):
+        _write_model('evict', seed=seed).build(csim=False, cache=cache)
+    assert tool_runs() == 3
+    # Only the last build is kept
+    assert len(os.listdir(tmp_path / 'cache')) == 1
+    _write_model('evict', seed=2).build(csim=False, cache=cache)
+    assert tool_runs() == 3
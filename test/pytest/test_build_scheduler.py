@@ -0,0 +1,96 @@
+import os
+import stat
+from pathlib import Path
+
+import pytest
+from tensorflow.keras.layers import Dense
+from tensorflow.keras.models import Sequential
+
+import hls4ml
+from hls4ml.backends import BuildScheduler, BuildStatus
+
+test_root_path = Path(__file__).parent
+
+# Stand-in for vivado_hls, copies pregenerated reports instead of running synthesis
+stub_vivado_hls = '''#!/bin/sh
+echo "stub vivado_hls $@ in $(pwd)"
+if [ -f stub_sleep ]; then sleep $(cat stub_sleep); fi
+if [ -f stub_fail ]; then exit 1; fi
+mkdir -p myproject_prj/solution1/syn/report
+cp {report_dir}/vivado_hls.app myproject_prj/vivado_hls.app
+cp {report_dir}/myproject_csynth.rpt myproject_prj/solution1/syn/report/myproject_csynth.rpt
+cp {report_dir}/myproject_csynth.xml myproject_prj/solution1/syn/report/myproject_csynth.xml
+'''
+
+
+@pytest.fixture
+def stub_tools(tmp_path, monkeypatch):
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    script = bin_dir / 'vivado_hls'
+    script.write_text(stub_vivado_hls.format(report_dir=test_root_path / 'test_report'))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv('PATH', str(bin_dir) + os.pathsep + os.environ['PATH'])
+
+
+def _write_model(name, reuse_factor=1):
+    model = Sequential()
+    model.add(Dense(5, input_shape=(16,), name='fc1', activation='relu'))
+
+    config = hls4ml.utils.config_from_keras_model(model, granularity='model', default_reuse_factor=reuse_factor)
+    output_dir = str(test_root_path / f'hls4mlprj_build_scheduler_{name}')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, output_dir=output_dir, part='xc7z020clg400-1', backend='Vivado'
+    )
+    hls_model.write()
+    for stub_file in ('stub_sleep', 'stub_fail'):
+        if os.path.exists(f'{output_dir}/{stub_file}'):
+            os.remove(f'{output_dir}/{stub_file}')
+    return hls_model
+
+
+def test_parallel_builds(stub_tools):
+    cwd = os.getcwd()
+    models = [_write_model(f'rf{rf}', reuse_factor=rf) for rf in (1, 2, 4)]
+
+    with BuildScheduler(max_workers=2) as scheduler:
+        jobs = [scheduler.submit(model, name=f'job{i}', csim=False, synth=True) for i, model in enumerate(models)]
+        finished = [job.name for job in scheduler.as_completed(timeout=60)]
+
+    assert sorted(finished) == ['job0', 'job1', 'job2']
+    assert os.getcwd() == cwd  # Builds must not change the working directory of the process
+    for job in jobs:
+        assert job.status == BuildStatus.DONE
+        assert job.returncode == 0
+        assert job.report['CSynthesisReport']['BestLatency'] == '10'
+        assert 'csim=False synth=True' in job.read_log()
+
+
+def test_failed_build(stub_tools):
+    model = _write_model('fail')
+    Path(model.config.get_output_dir(), 'stub_fail').touch()
+
+    with BuildScheduler(max_workers=1) as scheduler:
+        job = scheduler.submit(model)
+        scheduler.wait()
+
+    assert job.status == BuildStatus.FAILED
+    assert job.returncode == 1
+    with pytest.raises(Exception, match='did not finish successfully'):
+        job.result()
+
+
+def test_build_timeout_and_cancel(stub_tools):
+    slow_model = _write_model('timeout')
+    Path(slow_model.config.get_output_dir(), 'stub_sleep').write_text('30')
+    cancelled_model = _write_model('cancel')
+    Path(cancelled_model.config.get_output_dir(), 'stub_sleep').write_text('30')
+
+    with BuildScheduler(max_workers=2) as scheduler:
+        slow_job = scheduler.submit(slow_model, timeout=1)
+        cancelled_job = scheduler.submit(cancelled_model)
+        cancelled_job.cancel()
+        scheduler.wait(timeout=20)
+
+    assert slow_job.status == BuildStatus.TIMEOUT
+    assert cancelled_job.status == BuildStatus.CANCELLED
@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from tensorflow.keras.layers import Conv1D, Conv2D, DepthwiseConv2D
+from tensorflow.keras.models import Sequential
+
+import hls4ml
+
+test_root_path = Path(__file__).parent
+
+
+def _make_model(dim, padding='same', strides=1):
+    model = Sequential()
+    if dim == 1:
+        model.add(Conv1D(4, 3, strides=strides, padding=padding, input_shape=(11, 3), name='conv'))
+    else:
+        model.add(Conv2D(4, 3, strides=strides, padding=padding, input_shape=(7, 9, 3), name='conv'))
+    model.compile()
+    model.set_weights([np.random.uniform(-1, 1, w.shape) for w in model.get_weights()])
+    return model
+
+
+def _convert(model, backend, io_type, implementation, strategy, reuse_factor, output_tile, name):
+    config = hls4ml.utils.config_from_keras_model(model, granularity='name', backend=backend)
+    config['LayerName']['conv']['ConvImplementation'] = implementation
+    config['LayerName']['conv']['WinogradOutputTile'] = output_tile
+    config['LayerName']['conv']['Strategy'] = strategy
+    config['LayerName']['conv']['ReuseFactor'] = reuse_factor
+    odir = str(test_root_path / f'hls4mlprj_winograd_{name}_{implementation}_{backend}_{io_type}')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, output_dir=odir, backend=backend, io_type=io_type
+    )
+    hls_model.compile()
+    return hls_model
+
+
+@pytest.mark.parametrize('backend', ['Vivado', 'Vitis'])
+@pytest.mark.parametrize('dim', [1, 2])
+@pytest.mark.parametrize('padding', ['same', 'valid'])
+@pytest.mark.parametrize(
+    'output_tile, strategy, reuse_factor',
+    [
+        (2, 'Latency', 1),
+        (2, 'Resource', 4),
+        (4, 'Latency', 1),
+    ],
+)
+def test_conv_winograd(backend, dim, padding, output_tile, strategy, reuse_factor):
+    model = _make_model(dim, padding)
+    name = f'{dim}d_{padding}_{output_tile}_{strategy}_{reuse_factor}'
+    hls_model_direct = _convert(model, backend, 'io_parallel', 'LineBuffer', strategy, reuse_factor, output_tile, name)
+    hls_model_wino = _convert(model, backend, 'io_parallel', 'Winograd', strategy, reuse_factor, output_tile, name)
+
+    node = hls_model_wino.graph['conv']
+    assert node.get_attr('_winograd_transformation_applied')
+    tile = output_tile + 2
+    assert node.get_weights('weight').shape == [4, 3] + [tile] * dim
+
+    x = np.random.uniform(-4, 4, (100,) + model.input_shape[1:])
+    y_direct = hls_model_direct.predict(x)
+    y_wino = hls_model_wino.predict(x)
+
+    if output_tile == 2:
+        # The transformed weights and the accumulator are wide enough to be exact
+        np.testing.assert_array_equal(y_wino, y_direct)
+    else:
+        np.testing.assert_allclose(y_wino, y_direct, atol=1e-2)
+
+
+@pytest.mark.parametrize(
+    'name, io_type, layer',
+    [
+        ('stream', 'io_stream', Conv2D(4, 3, padding='same', input_shape=(7, 9, 3), name='conv')),
+        ('strided', 'io_parallel', Conv2D(4, 3, strides=2, input_shape=(7, 9, 3), name='conv')),
+        ('kernel5', 'io_parallel', Conv2D(4, 5, input_shape=(7, 9, 3), name='conv')),
+        ('depthwise', 'io_parallel', DepthwiseConv2D(3, input_shape=(7, 9, 3), name='conv')),
+    ],
+)
+def test_conv_winograd_fallback(name, io_type, layer):
+    model = Sequential()
+    model.add(layer)
+    model.compile()
+
+    config = hls4ml.utils.config_from_keras_model(model, granularity='model', backend='Vivado')
+    config['Model']['ConvImplementation'] = 'Winograd'
+    odir = str(test_root_path / f'hls4mlprj_winograd_fallback_{name}')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, output_dir=odir, backend='Vivado', io_type=io_type
+    )
+    hls_model.compile()
+
+    node = hls_model.graph['conv']
+    assert node.get_attr('implementation') == 'linebuffer'
+    assert not node.get_attr('_winograd_transformation_applied', False)
+
+    x = np.random.rand(10, *model.input_shape[1:])
+    np.testing.assert_allclose(hls_model.predict(x).reshape(10, -1), model.predict(x, verbose=0).reshape(10, -1), atol=1e-1)
@@ -2,7 +2,18 @@ from pathlib import Path
 
 import numpy as np
 import pytest
-from tensorflow.keras.layers import GRU, LSTM, Conv1D, Conv2D, Dense, Flatten
+from tensorflow.keras.layers import (
+    GRU,
+    LSTM,
+    Conv1D,
+    Conv2D,
+    Dense,
+    DepthwiseConv1D,
+    DepthwiseConv2D,
+    Flatten,
+    SeparableConv1D,
+    SeparableConv2D,
+)
 from tensorflow.keras.models import Sequential
 
 from hls4ml.converters import convert_from_keras_model
@@ -98,6 +109,53 @@ def test_resource_unrolled_streaming_conv(dim, io_type, reuse_factor):
     np.testing.assert_allclose(hls_prediction, keras_prediction, rtol=0, atol=1e-2)
 
 
+# Tests the unrolled resource kernel in the depthwise and pointwise parts of streaming depthwise-separable convolutions
+@pytest.mark.parametrize('dim', [1, 2])
+@pytest.mark.parametrize('layer_type', ['depthwise', 'separable', 'pointwise'])
+@pytest.mark.parametrize('backend', ['Vivado', 'Vitis'])
+@pytest.mark.parametrize('reuse_factor', [1, 3, 9])
+def test_resource_unrolled_streaming_depthwise_separable(dim, layer_type, backend, reuse_factor):
+    input_shape = (8,) * dim + (3,)
+    X = np.random.rand(100, *input_shape) - 0.5
+    init = {'bias_initializer': 'lecun_uniform'}
+    if layer_type == 'depthwise':
+        conv_class = DepthwiseConv1D if dim == 1 else DepthwiseConv2D
+        layer = conv_class((3,) * dim, depthwise_initializer='lecun_uniform', **init)
+    elif layer_type == 'separable':
+        conv_class = SeparableConv1D if dim == 1 else SeparableConv2D
+        layer = conv_class(
+            4, (3,) * dim, depthwise_initializer='lecun_uniform', pointwise_initializer='lecun_uniform', **init
+        )
+    else:
+        conv_class = Conv1D if dim == 1 else Conv2D
+        layer = conv_class(4, (1,) * dim, kernel_initializer='lecun_uniform', **init)
+
+    model = Sequential()
+    model.add(layer)
+    model.build((None,) + input_shape)
+    model.compile('adam', 'mse')
+    keras_prediction = model.predict(X)
+
+    config = config_from_keras_model(model, default_precision='ap_fixed<32, 16>', default_reuse_factor=reuse_factor)
+    config['Model']['Strategy'] = 'ResourceUnrolled'
+
+    prj_name = f'hls4mlprj_resource_unrolled_{layer_type}_conv{dim}d_{backend}_{reuse_factor}'
+    output_dir = str(test_root_path / prj_name)
+    hls_model = convert_from_keras_model(
+        model, hls_config=config, output_dir=output_dir, backend=backend, io_type='io_stream'
+    )
+
+    # Check if strategy was not overridden
+    expected_strategy = 'resource_unrolled' if reuse_factor > 1 else 'latency'
+    for layer in list(hls_model.get_layers())[1:]:
+        assert layer.get_attr('strategy') == expected_strategy
+
+    hls_model.compile()
+
+    hls_prediction = hls_model.predict(X).reshape(keras_prediction.shape)
+    np.testing.assert_allclose(hls_prediction, keras_prediction, rtol=0, atol=1e-2)
+
+
 @pytest.mark.parametrize('rnn_layer', [LSTM, GRU])
 @pytest.mark.parametrize('backend', ['Vitis', 'Vivado'])
 @pytest.mark.parametrize('io_type', ['io_parallel', 'io_stream'])
@@ -145,3 +203,62 @@ def test_resource_unrolled_rnn(rnn_layer, backend, io_type, static, reuse_factor
     keras_prediction = keras_model.predict(X)
     hls_prediction = hls_model.predict(X)
     np.testing.assert_allclose(hls_prediction.flatten(), keras_prediction.flatten(), rtol=0.0, atol=5e-2)
+
+
+@pytest.mark.parametrize('reuse_factor', [4, 32])
+def test_resource_unrolled_codegen_reuse(reuse_factor):
+    model = Sequential()
+    model.add(Dense(8, input_shape=(16,), kernel_initializer='lecun_uniform', name='dense'))
+    model.compile('adam', 'mse')
+    weights = model.layers[0].get_weights()[0]
+    weights[:, ::3] = 0  # Ensure some multiplications are skipped
+    model.layers[0].set_weights([weights, model.layers[0].get_weights()[1]])
+
+    config = config_from_keras_model(model, default_precision='ac_fixed<32, 16>', default_reuse_factor=reuse_factor)
+    config['Model']['Strategy'] = 'ResourceUnrolled'
+
+    codegen = []
+    for i in range(2):
+        output_dir = str(test_root_path / f'hls4mlprj_resource_unrolled_codegen_reuse_{reuse_factor}_{i}')
+        hls_model = convert_from_keras_model(model, hls_config=config, output_dir=output_dir, backend='Vivado')
+        codegen.append(str(hls_model.graph['dense'].get_attr('resource_unrolled_dense_codegen')))
+
+    # The second conversion reuses the generated code, which must be identical to the first one
+    assert codegen[0] == codegen[1]
+    assert 'product(data[' in codegen[0]
+    assert codegen[0].count('product(data[') == np.count_nonzero(weights)
+
+
+@pytest.mark.parametrize('dim', [1, 2])
+@pytest.mark.parametrize('reuse_factor', [2, 4])
+def test_resource_unrolled_depthwise_codegen(dim, reuse_factor):
+    input_shape = (8,) * dim + (4,)
+    X = np.random.rand(100, *input_shape) - 0.5
+    conv_class = DepthwiseConv1D if dim == 1 else DepthwiseConv2D
+    model = Sequential()
+    model.add(conv_class((3,) * dim, input_shape=input_shape, name='depthwise'))
+    model.compile('adam', 'mse')
+    weights, biases = model.layers[0].get_weights()
+    weights = np.random.uniform(-1, 1, weights.shape)
+    flat_weights = weights.reshape(-1)  # (kernel, channel) order, as used by the multipliers
+    flat_weights[:reuse_factor] = 0  # All the weights processed by the first multiplier
+    flat_weights[::5] = 0  # Ensure some other multiplications are skipped
+    model.layers[0].set_weights([weights, biases])
+    keras_prediction = model.predict(X)
+
+    config = config_from_keras_model(model, default_precision='ap_fixed<32, 16>', default_reuse_factor=reuse_factor)
+    config['Model']['Strategy'] = 'ResourceUnrolled'
+
+    output_dir = str(test_root_path / f'hls4mlprj_resource_unrolled_depthwise_codegen_{dim}d_{reuse_factor}')
+    hls_model = convert_from_keras_model(model, hls_config=config, output_dir=output_dir, io_type='io_stream')
+    codegen = str(hls_model.graph['depthwise'].get_attr('resource_unrolled_dense_codegen'))
+
+    # Only non-zero weights are multiplied, and the multiplier that only sees zeros is not allocated, so no more
+    # multipliers are used than with the Resource strategy
+    assert codegen.count('product(data[') == np.count_nonzero(weights)
+    n_mult_resource = weights.size // reuse_factor
+    assert f'instances=mul limit={n_mult_resource - 1}\n' in codegen
+
+    hls_model.compile()
+    hls_prediction = hls_model.predict(X).reshape(keras_prediction.shape)
+    np.testing.assert_allclose(hls_prediction, keras_prediction, rtol=0, atol=1e-2)
@@ -0,0 +1,137 @@
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import pytest
+from tensorflow.keras.layers import (
+    Activation,
+    BatchNormalization,
+    Conv2D,
+    Dense,
+    Flatten,
+    LeakyReLU,
+    MaxPooling2D,
+)
+from tensorflow.keras.models import Sequential
+
+import hls4ml
+
+test_root_path = Path(__file__).parent
+templates_path = test_root_path / '../../hls4ml/templates/vivado'
+
+
+def test_fast_fixed_differential(tmp_path):
+    """Randomized comparison of all the operations of nnet::fast_fixed against ap_fixed"""
+    exe = tmp_path / 'fast_fixed_diff'
+    subprocess.run(
+        [
+            'g++',
+            '-O1',
+            '-std=c++11',
+            f'-I{templates_path / "ap_types"}',
+            f'-I{templates_path}',
+            str(test_root_path / 'test_fast_csim/fast_fixed_diff.cpp'),
+            '-o',
+            str(exe),
+        ],
+        check=True,
+    )
+    for seed in range(3):
+        result = subprocess.run([str(exe), '2000', str(seed)], stdout=subprocess.PIPE, text=True)
+        assert result.returncode == 0, result.stdout
+
+
+@pytest.fixture(scope='module')
+def dense_model():
+    model = Sequential()
+    model.add(Dense(32, input_shape=(16,), name='dense1'))
+    model.add(Activation('relu', name='relu1'))
+    model.add(Dense(16, name='dense2'))
+    model.add(LeakyReLU(alpha=0.3, name='leaky_relu'))
+    model.add(Dense(16, name='dense3'))
+    model.add(Activation('tanh', name='tanh'))
+    model.add(Dense(5, name='dense4'))
+    model.add(Activation('softmax', name='softmax'))
+    model.compile()
+    return model
+
+
+@pytest.fixture(scope='module')
+def conv_model():
+    model = Sequential()
+    model.add(Conv2D(4, (3, 3), input_shape=(10, 10, 3), name='conv1'))
+    model.add(BatchNormalization(name='bn1'))
+    model.add(Activation('sigmoid', name='sigmoid'))
+    model.add(MaxPooling2D((2, 2), name='pool1'))
+    model.add(Flatten(name='flatten'))
+    model.add(Dense(4, name='dense1'))
+    model.add(Activation('softmax', name='softmax'))
+    model.compile()
+    model.layers[1].set_weights([np.random.rand(4) + 0.5, np.random.rand(4), np.random.rand(4), np.random.rand(4) + 0.5])
+    return model
+
+
+def _predict(keras_model, name, backend, io_type, strategy, fast_csim, data):
+    config = hls4ml.utils.config_from_keras_model(keras_model, granularity='name', backend=backend)
+    config['Model']['Strategy'] = strategy
+    for layer in config['LayerName'].values():
+        layer['ReuseFactor'] = 4 if strategy == 'Resource' else 1
+    if 'softmax' in config['LayerName']:
+        config['LayerName']['softmax']['Strategy'] = 'Stable'
+    odir = str(test_root_path / f'hls4mlprj_fast_csim_{name}_{backend}_{io_type}_{strategy}_{fast_csim}')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        keras_model, hls_config=config, output_dir=odir, backend=backend, io_type=io_type, fast_csim=fast_csim
+    )
+    hls_model.compile()
+    return hls_model.predict(data)
+
+
+@pytest.mark.parametrize('backend', ['Vivado', 'Vitis'])
+@pytest.mark.parametrize('io_type', ['io_parallel', 'io_stream'])
+@pytest.mark.parametrize('strategy', ['Latency', 'Resource'])
+def test_fast_csim_dense(dense_model, backend, io_type, strategy):
+    data = np.random.normal(0, 4, (200, 16))
+    y_ref = _predict(dense_model, 'dense', backend, io_type, strategy, False, data)
+    y_fast = _predict(dense_model, 'dense', backend, io_type, strategy, True, data)
+    np.testing.assert_array_equal(y_fast, y_ref)
+
+
+@pytest.mark.parametrize('backend', ['Vivado', 'Vitis'])
+@pytest.mark.parametrize('io_type', ['io_parallel', 'io_stream'])
+def test_fast_csim_conv(conv_model, backend, io_type):
+    data = np.random.normal(0, 4, (50, 10, 10, 3))
+    y_ref = _predict(conv_model, 'conv', backend, io_type, 'Latency', False, data)
+    y_fast = _predict(conv_model, 'conv', backend, io_type, 'Latency', True, data)
+    np.testing.assert_array_equal(y_fast, y_ref)
+
+
+def test_fast_csim_defines(dense_model):
+    config = hls4ml.utils.config_from_keras_model(dense_model, granularity='name', backend='Vivado')
+    odir = str(test_root_path / 'hls4mlprj_fast_csim_defines')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        dense_model, hls_config=config, output_dir=odir, backend='Vivado', fast_csim=True
+    )
+    hls_model.write()
+
+    with open(odir + '/firmware/defines.h') as f:
+        defines = f.read()
+    fast_defines, ap_defines = defines.split('#ifdef HLS4ML_FAST_CSIM')[-1].split('#else')
+    assert 'typedef nnet::fast_fixed<16,6> input_t;' in fast_defines
+    assert 'ap_fixed' not in fast_defines
+    assert 'typedef ap_fixed<16,6> input_t;' in ap_defines
+    assert 'fast_fixed' not in ap_defines
+
+    with open(odir + '/build_lib.sh') as f:
+        assert 'DEFINES="-D HLS4ML_FAST_CSIM"' in f.read()
+
+    # Types wider than 64 bits can't be mixed with the fast ones, so the model falls back to ap_fixed
+    config['LayerName']['dense1']['Precision']['accum'] = 'fixed<72,36>'
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        dense_model, hls_config=config, output_dir=odir, backend='Vivado', fast_csim=True
+    )
+    hls_model.write()
+
+    with open(odir + '/firmware/defines.h') as f:
+        defines = f.read()
+    assert 'typedef ap_fixed<72,36> dense1_accum_t;' in defines
+    assert 'fast_fixed<' not in defines
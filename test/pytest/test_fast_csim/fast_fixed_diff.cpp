@@ -0,0 +1,302 @@
+// Randomized differential test of nnet::fast_fixed against ap_fixed.
+//
+// Every operation is performed on random operands with both types and the results are compared bit by bit. The
+// program prints the failing cases and returns the number of failures (capped at 255).
+
+#include "ap_fixed.h"
+#include "nnet_utils/nnet_fast_fixed.h"
+
+#include <cmath>
+#include <cstdio>
+#include <cstdlib>
+#include <random>
+
+static std::mt19937_64 rng;
+static long n_checks = 0;
+static long n_failures = 0;
+
+template <class A, class F> void check(const char *what, const A &a, const F &f) {
+    static_assert(A::width == F::width && A::iwidth == F::iwidth, "Result types differ");
+    n_checks++;
+    // Compare the raw bits, to_string() of ap_fixed warns on every call for types with negative fractional bits
+    ap_uint<A::width> a_bits = a.range(A::width - 1, 0);
+    ap_uint<F::width> f_bits = f.to_ap().range(F::width - 1, 0);
+    if (a_bits != f_bits) {
+        if (n_failures++ < 20) {
+            std::printf("FAIL %s <%d,%d>: ap_fixed=%s fast_fixed=%s\n", what, A::width, A::iwidth,
+                        a_bits.to_string(16).c_str(), f_bits.to_string(16).c_str());
+        }
+    }
+}
+
+template <class T> void check_value(const char *what, T a, T f) {
+    n_checks++;
+    if (a != f) {
+        if (n_failures++ < 20) {
+            std::printf("FAIL %s: ap_fixed=%lld fast_fixed=%lld\n", what, (long long)a, (long long)f);
+        }
+    }
+}
+
+// A random ap_fixed value, with the corner cases (zero, min, max) overrepresented
+template <class A> A random_ap() {
+    A a;
+    uint64_t bits = rng();
+    switch (rng() % 8) {
+    case 0:
+        bits = 0;
+        break;
+    case 1:
+        bits = 1ULL << (A::width - 1);
+        break;
+    case 2:
+        bits = ~(1ULL << (A::width - 1));
+        break;
+    case 3:
+        bits = ~0ULL;
+        break;
+    default:
+        break;
+    }
+    if (A::width < 64)
+        bits &= (1ULL << A::width) - 1;
+    a.range(A::width - 1, 0) = (ap_ulong)bits;
+    return a;
+}
+
+double random_double() {
+    std::uniform_real_distribution<double> mantissa(-1.0, 1.0);
+    return std::ldexp(mantissa(rng), (int)(rng() % 48) - 24);
+}
+
+// Conversion from a source type to a destination type, e.g. the accumulator to the output of a layer
+template <class AS, class FS, class AD, class FD> void test_convert(const char *name, int n) {
+    for (int i = 0; i < n; i++) {
+        AS a = random_ap<AS>();
+        FS f(a);
+        check(name, AD(a), FD(f));
+        AD ad;
+        FD fd;
+        ad = a;
+        fd = f;
+        check(name, ad, fd);
+
+        double d = random_double();
+        check(name, AD(d), FD(d));
+        check(name, AD((float)d), FD((float)d));
+        int x = (int)(rng() % 4096) - 2048;
+        check(name, AD(x), FD(x));
+        // Subnormal
+        d = std::ldexp(random_double(), -1040);
+        check(name, AD(d), FD(d));
+    }
+}
+
+template <class A, class F> void test_unary(const char *name, int n) {
+    for (int i = 0; i < n; i++) {
+        A a = random_ap<A>();
+        F f(a);
+        check(name, a, f);
+        check(name, -a, -f);
+        check(name, ~a, ~f);
+        check_value(name, a.to_double(), f.to_double());
+        check_value(name, a.to_float(), f.to_float());
+        if (A::iwidth >= 0) {
+            // The integer conversion of ap_fixed reads out of range bits for a negative number of integer bits
+            check_value(name, a.to_int(), f.to_int());
+            check_value(name, (long long)a.to_int64(), (long long)f.to_int64());
+        }
+        check_value(name, (bool)a, (bool)f);
+        int sh = (int)(rng() % (A::width + 2));
+        check(name, A(a << sh), F(f << sh));
+        check(name, A(a >> sh), F(f >> sh));
+        int hi = (int)(rng() % A::width), lo = (int)(rng() % (hi + 1));
+        check_value(name, (ap_ulong)a.range(hi, lo).to_uint64(), (ap_ulong)f.range(hi, lo));
+        check_value(name, (bool)a[hi], (bool)f[hi]);
+    }
+}
+
+// Only for types with at least one integer bit, like ap_fixed
+template <class A, class F> void test_increment(const char *name, int n) {
+    for (int i = 0; i < n; i++) {
+        A a = random_ap<A>();
+        F f(a);
+        a++;
+        f++;
+        check(name, a, f);
+        --a;
+        --f;
+        --a;
+        --f;
+        check(name, a, f);
+    }
+}
+
+template <class A1, class F1, class A2, class F2> void test_binary(const char *name, int n) {
+    for (int i = 0; i < n; i++) {
+        A1 a1 = random_ap<A1>();
+        A2 a2 = random_ap<A2>();
+        F1 f1(a1);
+        F2 f2(a2);
+        check(name, a1 + a2, f1 + f2);
+        check(name, a1 - a2, f1 - f2);
+        check(name, a1 * a2, f1 * f2);
+        if (a2 != 0)
+            check(name, a1 / a2, f1 / f2);
+        check(name, a1 & a2, f1 & f2);
+        check(name, a1 | a2, f1 | f2);
+        check(name, a1 ^ a2, f1 ^ f2);
+        check_value(name, a1 < a2, f1 < f2);
+        check_value(name, a1 <= a2, f1 <= f2);
+        check_value(name, a1 > a2, f1 > f2);
+        check_value(name, a1 >= a2, f1 >= f2);
+        check_value(name, a1 == a2, f1 == f2);
+        check_value(name, a1 != a2, f1 != f2);
+
+        // Mixed operands, as found in nnet_utils when the weights are not converted
+        check(name, a1 * a2, f1 * a2);
+        check(name, a1 + a2, a1 + f2);
+        int x = (int)(rng() % 256) - 128;
+        check(name, a1 * x, f1 * x);
+        check(name, a1 + x, f1 + x);
+        check_value(name, a1 > x, f1 > x);
+
+        A1 acc_a = a1;
+        F1 acc_f = f1;
+        acc_a += a1 * a2;
+        acc_f += f1 * f2;
+        check(name, acc_a, acc_f);
+        acc_a -= a2;
+        acc_f -= f2;
+        check(name, acc_a, acc_f);
+        acc_a *= a2;
+        acc_f *= f2;
+        check(name, acc_a, acc_f);
+    }
+}
+
+#define CONVERT(AS, AD)                                                                                                  \
+    test_convert<AS, nnet::fast_##AS, AD, nnet::fast_##AD>(#AS " -> " #AD, n)
+#define UNARY(A) test_unary<A, nnet::fast_##A>(#A, n)
+#define INCREMENT(A) test_increment<A, nnet::fast_##A>(#A, n)
+#define BINARY(A1, A2) test_binary<A1, nnet::fast_##A1, A2, nnet::fast_##A2>(#A1 " op " #A2, n)
+
+// The ap_fixed type t<ID> is replaced by nnet::fast_t<ID>
+#define DEFINE_TYPES(ID, NAME, ...)                                                                                      \
+    typedef ap_##NAME<__VA_ARGS__> t##ID;                                                                              \
+    namespace nnet {                                                                                                   \
+    typedef fast_##NAME<__VA_ARGS__> fast_t##ID;                                                                       \
+    }
+
+DEFINE_TYPES(1, fixed, 16, 6)
+DEFINE_TYPES(2, fixed, 8, 3)
+DEFINE_TYPES(3, ufixed, 10, 4)
+DEFINE_TYPES(4, fixed, 18, 8, AP_RND, AP_SAT)
+DEFINE_TYPES(5, fixed, 12, 2, AP_RND_CONV, AP_SAT_SYM)
+DEFINE_TYPES(6, ufixed, 8, 0, AP_RND, AP_SAT)
+DEFINE_TYPES(7, fixed, 6, 9, AP_RND_ZERO, AP_SAT_ZERO)
+DEFINE_TYPES(8, fixed, 7, -2, AP_RND_MIN_INF, AP_SAT)
+DEFINE_TYPES(9, fixed, 10, 5, AP_RND_INF, AP_WRAP, 2)
+DEFINE_TYPES(10, ufixed, 9, 5, AP_TRN_ZERO, AP_WRAP, 1)
+DEFINE_TYPES(11, fixed, 32, 16)
+DEFINE_TYPES(12, fixed, 48, 20, AP_RND_CONV, AP_SAT)
+DEFINE_TYPES(13, fixed, 64, 24)
+DEFINE_TYPES(14, ufixed, 64, 32, AP_RND, AP_SAT)
+DEFINE_TYPES(15, fixed, 1, 1)
+DEFINE_TYPES(16, ufixed, 1, 0)
+DEFINE_TYPES(17, fixed, 24, 12, AP_TRN, AP_SAT)
+DEFINE_TYPES(18, fixed, 5, 5, AP_RND, AP_WRAP, 3)
+
+int main(int argc, char **argv) {
+    int n = argc > 1 ? std::atoi(argv[1]) : 2000;
+    rng.seed(argc > 2 ? std::atoll(argv[2]) : 12345);
+
+    UNARY(t1);
+    UNARY(t2);
+    UNARY(t3);
+    UNARY(t4);
+    UNARY(t5);
+    UNARY(t6);
+    UNARY(t7);
+    UNARY(t8);
+    UNARY(t9);
+    UNARY(t10);
+    UNARY(t11);
+    UNARY(t12);
+    UNARY(t13);
+    UNARY(t14);
+    UNARY(t15);
+    UNARY(t16);
+    UNARY(t17);
+    UNARY(t18);
+
+    INCREMENT(t1);
+    INCREMENT(t3);
+    INCREMENT(t4);
+    INCREMENT(t5);
+    INCREMENT(t9);
+    INCREMENT(t13);
+    INCREMENT(t14);
+
+    BINARY(t1, t1);
+    BINARY(t1, t2);
+    BINARY(t2, t3);
+    BINARY(t3, t6);
+    BINARY(t4, t5);
+    BINARY(t5, t8);
+    BINARY(t7, t9);
+    BINARY(t10, t3);
+    BINARY(t11, t12);
+    BINARY(t13, t2);
+    BINARY(t14, t3);
+    BINARY(t12, t14);
+    BINARY(t14, t11);
+    BINARY(t15, t16);
+    BINARY(t17, t1);
+    BINARY(t18, t7);
+
+    // Every pair of types, as the quantization and overflow modes are applied on conversion
+    CONVERT(t1, t2);
+    CONVERT(t1, t3);
+    CONVERT(t1, t4);
+    CONVERT(t1, t5);
+    CONVERT(t1, t6);
+    CONVERT(t1, t7);
+    CONVERT(t1, t8);
+    CONVERT(t1, t9);
+    CONVERT(t1, t10);
+    CONVERT(t1, t17);
+    CONVERT(t1, t18);
+    CONVERT(t2, t1);
+    CONVERT(t3, t2);
+    CONVERT(t3, t5);
+    CONVERT(t3, t9);
+    CONVERT(t4, t6);
+    CONVERT(t5, t10);
+    CONVERT(t8, t4);
+    CONVERT(t9, t3);
+    CONVERT(t11, t1);
+    CONVERT(t11, t4);
+    CONVERT(t11, t5);
+    CONVERT(t11, t6);
+    CONVERT(t11, t7);
+    CONVERT(t11, t8);
+    CONVERT(t11, t9);
+    CONVERT(t11, t10);
+    CONVERT(t12, t11);
+    CONVERT(t13, t1);
+    CONVERT(t13, t4);
+    CONVERT(t13, t12);
+    CONVERT(t13, t14);
+    CONVERT(t14, t13);
+    CONVERT(t14, t5);
+    CONVERT(t1, t13);
+    CONVERT(t2, t14);
+    CONVERT(t1, t15);
+    CONVERT(t1, t16);
+    CONVERT(t16, t15);
+    CONVERT(t18, t9);
+
+    std::printf("%ld checks, %ld failures\n", n_checks, n_failures);
+    return n_failures > 255 ? 255 : (int)n_failures;
+}
@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from tensorflow.keras.layers import Activation, Conv2D
+from tensorflow.keras.models import Sequential
+
+import hls4ml
+from hls4ml.model.optimizer import get_optimizer
+
+test_root_path = Path(__file__).parent
+
+
+@pytest.fixture(scope='module')
+def data():
+    return np.random.rand(10, 12, 12, 3)
+
+
+@pytest.fixture(scope='module')
+def model():
+    model = Sequential()
+    model.add(Conv2D(4, (3, 3), input_shape=(12, 12, 3), name='conv1'))
+    model.add(Activation('relu', name='relu1'))
+    model.add(Conv2D(4, (3, 3), name='conv2'))
+    model.add(Activation('relu', name='relu2'))
+    model.compile()
+    return model
+
+
+def _convert(model, name, reuse_factor=1, flows=None):
+    config = hls4ml.utils.config_from_keras_model(model, granularity='name', backend='Vivado')
+    config['LayerName']['conv2']['ReuseFactor'] = reuse_factor
+    if flows is not None:
+        config['Flows'] = flows
+    output_dir = str(test_root_path / f'hls4mlprj_fifo_depth_csim_{name}')
+    return hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, output_dir=output_dir, io_type='io_stream', backend='Vivado'
+    )
+
+
+def test_profile_streams(data, model):
+    hls_model = _convert(model, 'profile')
+    hls_model.compile()
+    stream_profile = hls_model.profile_streams(data)
+
+    # Each stream is written and read once per pixel of each sample, in the order of the layers
+    for var in hls_model.output_vars.values():
+        writes, reads = stream_profile[var.name]
+        n_pixels = np.prod(var.shape[:-1])
+        assert len(writes) == len(reads) == len(data) * n_pixels
+        assert np.all(np.diff(writes) > 0) and np.all(np.diff(reads) > 0)
+        assert np.all(reads > writes)
+
+
+@pytest.mark.parametrize('reuse_factor', [1, 36])
+def test_csim_fifo_depth_optimization(data, model, reuse_factor):
+    hls_model_ref = _convert(model, f'ref_rf{reuse_factor}', reuse_factor=reuse_factor)
+    hls_model_ref.compile()
+    y_ref = hls_model_ref.predict(data)
+
+    get_optimizer('vivado:csim_fifo_depth_optimization').configure(data=data, margin=0.0)
+    hls_model = _convert(
+        model, f'rf{reuse_factor}', reuse_factor=reuse_factor, flows=['vivado:csim_fifo_depth_optimization']
+    )
+
+    with open(hls_model.config.get_output_dir() + '/max_depth.json') as f:
+        maxs = {x['name']: x for x in json.load(f)}
+    variables = {var.name: var for var in hls_model.output_vars.values()}
+    assert hls_model.get_input_variables()[0].name not in maxs
+    for name, x in maxs.items():
+        depth = variables[name].pragma[1]
+        assert x['max'] <= x['depth']
+        assert depth == min(x['max'] + 1, x['depth'])
+
+    # Only the input of the slow layer needs to hold (almost) the whole tensor
+    conv2_input = hls_model.graph['conv2'].get_input_variable().name
+    for name, x in maxs.items():
+        if name == conv2_input and reuse_factor > 1:
+            assert x['max'] > x['depth'] // 2
+        else:
+            assert x['max'] < x['depth'] // 2
+
+    hls_model.compile()
+    np.testing.assert_allclose(hls_model.predict(data), y_ref)
@@ -0,0 +1,65 @@
+import pytest
+
+from hls4ml.utils.vcd_utils import read_fifo_occupancy
+
+# Declarations as written by xsim for the FIFOs logged by the FIFO depth optimization
+vcd_header = '''$date
+  Mon Jan  1 00:00:00 2024
+$end
+$version
+  2020.1
+$end
+$timescale
+  1ps
+$end
+$scope module apatb_myproject_top $end
+$scope module AESL_inst_myproject $end
+$scope module layer2_out_V_data_0_V_U $end
+$var wire 17 ! usedw [16:0] $end
+$var parameter 32 " DEPTH [31:0] $end
+$upscope $end
+$scope module layer4_out_V_data_0_V_U $end
+$var wire 17 # usedw [16:0] $end
+$var parameter 32 $ DEPTH
+  [31:0] $end
+$upscope $end
+$upscope $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+b0 !
+b11000011010100000 "
+bx #
+b11000011010100000 $
+$end
+'''
+
+
+def _write_vcd(path, n_cycles):
+    with open(path, 'w') as f:
+        f.write(vcd_header)
+        for t in range(1, n_cycles + 1):
+            f.write(f'#{t * 5000}\n')
+            f.write(f'b{t % 7:b} !\n')
+            f.write(f'b{(t * 3) % 11:b} #\n')
+
+
+def test_read_fifo_occupancy(tmp_path):
+    vcd_path = tmp_path / 'fifo_opt.vcd'
+    _write_vcd(vcd_path, 1000)
+
+    assert read_fifo_occupancy(vcd_path) == [
+        {'name': 'layer2_out_V_data_0_V_U', 'max': 6, 'depth': 100_000},
+        {'name': 'layer4_out_V_data_0_V_U', 'max': 10, 'depth': 100_000},
+    ]
+
+
+def test_read_fifo_occupancy_no_fifos(tmp_path):
+    vcd_path = tmp_path / 'fifo_opt.vcd'
+    vcd_path.write_text('$timescale 1ps $end\n$enddefinitions $end\n#0\n')
+    assert read_fifo_occupancy(vcd_path) == []
+
+    vcd_path.write_text('$timescale 1ps $end\n')
+    with pytest.raises(Exception, match='enddefinitions'):
+        read_fifo_occupancy(vcd_path)
@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 
 import numpy as np
@@ -5,6 +6,7 @@ import pytest
 import tensorflow as tf
 
 import hls4ml
+from hls4ml.converters import parse_yaml_config
 
 test_root_path = Path(__file__).parent
 
@@ -224,3 +226,96 @@ def test_multiple_outputs(batch):
     for y_i, y_hls_i in zip(y, y_hls):
         y_hls_i = y_hls_i.reshape(y_i.shape)
         np.testing.assert_allclose(y_i, y_hls_i, rtol=0)
+
+
+def test_predict_async():
+    odir = str(test_root_path / 'hls4mlprj_graph_predict_async')
+    model = base_model(odir)
+    model.compile()
+    X = np.random.rand(10, 100, 1)
+    y_expected = model.predict(X[0])
+
+    np.testing.assert_allclose(model.predict_async(X[0]).result(), y_expected, rtol=0)
+
+    async def run():
+        return await asyncio.gather(*(model.apredict(x) for x in X))
+
+    for x, y in zip(X, asyncio.run(run())):
+        np.testing.assert_allclose(y, model.predict(x), rtol=0)
+
+    # The batches are consumed in order
+    consumed = []
+    assert model.predict_pipeline(iter(X), callback=lambda x, y: consumed.append((x, y)), max_in_flight=3) is None
+    assert len(consumed) == len(X)
+    for x, (x_consumed, y) in zip(X, consumed):
+        np.testing.assert_array_equal(x_consumed, x)
+        np.testing.assert_allclose(y, model.predict(x), rtol=0)
+    assert len(model.predict_pipeline(X)) == len(X)
+
+    # Recompiling waits for the running predictions
+    future = model.predict_async(X[0])
+    model.compile()
+    np.testing.assert_allclose(future.result(), y_expected, rtol=0)
+    np.testing.assert_allclose(model.predict_async(X[0]).result(), y_expected, rtol=0)
+
+
+def test_variant(tmp_path):
+    layers = [
+        {'class_name': 'Input', 'name': 'layer0_input', 'input_shape': [4]},
+        {'class_name': 'Dense', 'name': 'layer0', 'n_in': 4, 'n_out': 8, 'weight_data': np.random.rand(4, 8)},
+        {'class_name': 'Dense', 'name': 'layer1', 'n_in': 8, 'n_out': 2, 'weight_data': np.random.rand(8, 2)},
+    ]
+    config = {'HLSConfig': {'Model': {'Precision': 'ap_fixed<32,16>', 'ReuseFactor': 1}}}
+    config['OutputDir'] = str(test_root_path / 'hls4mlprj_graph_variant')
+    config['ProjectName'] = 'myprj'
+    config['IOType'] = 'io_parallel'
+    config['Backend'] = 'Vivado'
+    model = hls4ml.model.ModelGraph(config, layers)
+    X = np.random.rand(10, 4)
+
+    # Variants with the configuration overrides, and the equivalent HLSConfig of a new conversion
+    variants = [
+        ({'ProjectName': 'myprj_copy'}, config['HLSConfig']),
+        (
+            {'HLSConfig': {'LayerName': {'layer1': {'ReuseFactor': 4, 'Strategy': 'Resource'}}}},
+            {**config['HLSConfig'], 'LayerName': {'layer1': {'ReuseFactor': 4, 'Strategy': 'Resource'}}},
+        ),
+        (
+            {'HLSConfig': {'Model': {'Precision': 'ap_fixed<8,4>'}}},
+            {'Model': {'Precision': 'ap_fixed<8,4>', 'ReuseFactor': 1}},
+        ),
+    ]
+    for i, (config_overrides, hls_config) in enumerate(variants):
+        config_overrides['OutputDir'] = str(test_root_path / f'hls4mlprj_graph_variant_{i}')
+        variant = model.variant(config_overrides)
+
+        # A new conversion with the same configuration gives the same model
+        ref_config = {**config, **config_overrides, 'HLSConfig': hls_config}
+        ref_config['OutputDir'] += '_ref'
+        reference = hls4ml.model.ModelGraph(ref_config, layers)
+        for layer, ref_layer in zip(variant.get_layers(), reference.get_layers()):
+            assert layer.get_attr('reuse_factor') == ref_layer.get_attr('reuse_factor')
+            assert layer.get_attr('strategy') == ref_layer.get_attr('strategy')
+            assert layer.get_output_variable().type.precision == ref_layer.get_output_variable().type.precision
+
+        variant.compile()
+        reference.compile()
+        np.testing.assert_array_equal(variant.predict(X), reference.predict(X))
+
+    # The variant does not modify the model, and shares its weights
+    assert model.graph['layer1'].get_attr('reuse_factor') == 1
+    assert model.config.get_output_dir() == str(test_root_path / 'hls4mlprj_graph_variant')
+    variant = model.variant({'OutputDir': str(test_root_path / 'hls4mlprj_graph_variant_copy')})
+    weights = variant.graph['layer0'].weights['weight'].data
+    assert np.shares_memory(weights, model.graph['layer0'].weights['weight'].data)
+    assert not weights.flags.writeable
+
+    # Variants without an OutputDir are written next to the one of the model, which is a new directory here
+    base = model.variant({'OutputDir': str(tmp_path / 'hls4mlprj_graph_variant')})
+    output_dirs = base.write_variants([{'HLSConfig': {'Model': {'ReuseFactor': rf}}} for rf in [2, 4]], processes=2)
+    for i, (rf, output_dir) in enumerate(zip([2, 4], output_dirs)):
+        assert output_dir == str(tmp_path / f'hls4mlprj_graph_variant_{i}')
+        assert Path(output_dir, 'firmware', 'myprj.cpp').exists()
+        written_config = parse_yaml_config(str(Path(output_dir, 'hls4ml_config.yml')))
+        assert written_config['OutputDir'] == output_dir
+        assert written_config['HLSConfig']['Model']['ReuseFactor'] == rf
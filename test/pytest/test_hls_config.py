@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import numpy as np
+
+import hls4ml
+
+test_root_path = Path(__file__).parent
+
+
+def dense_model(output_dir):
+    layers = [{'class_name': 'Input', 'name': 'layer0_input', 'input_shape': [8]}]
+    for i in range(3):
+        inputs = [layers[-1]['name']]
+        weights = np.random.rand(8, 8)
+        layers.append(
+            {'class_name': 'Dense', 'name': f'fc{i}', 'n_in': 8, 'n_out': 8, 'weight_data': weights, 'bias_data': None}
+        )
+        layers[-1]['inputs'] = inputs
+    config = {
+        'HLSConfig': {
+            'Model': {'Precision': 'ap_fixed<16,6>', 'ReuseFactor': 1, 'Strategy': 'Latency'},
+            'LayerType': {'Dense': {'Precision': {'weight': 'ap_fixed<8,3>'}, 'ReuseFactor': 2}},
+            'LayerName': {'fc1': {'Precision': {'result': 'ap_fixed<18,8>'}, 'ReuseFactor': 4, 'Strategy': 'Resource'}},
+        }
+    }
+    config['OutputDir'] = output_dir
+    config['ProjectName'] = 'myprj'
+    config['IOType'] = 'io_parallel'
+    config['Backend'] = 'Vivado'
+    return hls4ml.model.ModelGraph(config, layers)
+
+
+def test_layer_config():
+    model = dense_model(str(test_root_path / 'hls4mlprj_hls_config'))
+    config = model.config
+    fc0, fc1 = model.graph['fc0'], model.graph['fc1']
+
+    assert config.get_reuse_factor(fc0) == 2
+    assert config.get_reuse_factor(fc1) == 4
+    assert config.get_strategy(fc0) == 'latency'
+    assert config.is_resource_strategy(fc1)
+    assert config.get_layer_config_value(fc0, 'ReuseFactor') == 2
+    assert config.get_layer_config_value(fc1, 'Strategy') == 'Resource'
+    assert config.get_layer_config(fc1)['Precision'] == {'result': 'ap_fixed<18,8>'}
+
+    precision, type_name = config.get_precision(fc0, 'weight')
+    assert (str(precision), type_name) == ('fixed<8,3,TRN,WRAP,0>', 'Dense_weight_t')
+    precision, type_name = config.get_precision(fc1, 'result')
+    assert (str(precision), type_name) == ('fixed<18,8,TRN,WRAP,0>', 'fc1_result_t')
+    precision, type_name = config.get_precision(fc0, 'result')
+    assert (str(precision), type_name) == ('fixed<16,6,TRN,WRAP,0>', 'model_default_t')
+
+    # Each call returns a separate precision, which can be modified by passes
+    precision.width = 20
+    assert config.get_precision(fc0, 'result')[0].width == 16
+    assert config.get_precision(fc2 := model.graph['fc2'], 'result')[0].width == 16
+
+    # Updated layer configs are taken into account
+    layer_config = {'Precision': 'ap_fixed<10,2>', 'ReuseFactor': 8}
+    config.set_name_config('fc2', layer_config)
+    config.parse_name_config('fc2', layer_config)
+    assert config.get_reuse_factor(fc2) == 8
+    assert config.get_layer_config_value(fc2, 'ReuseFactor') == 8
+    assert str(config.get_precision(fc2, 'weight')[0]) == 'fixed<10,2,TRN,WRAP,0>'
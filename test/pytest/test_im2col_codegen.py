@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from hls4ml.backends import get_backend
+
+
+def _reference_conv2d_im2col(H, W, C, kernel, stride, pad, dilation):
+    kernel_h, kernel_w = kernel
+    stride_h, stride_w = stride
+    pad_t, pad_b, pad_l, pad_r = pad
+    dilation_h, dilation_w = dilation
+
+    out_h = (H + pad_t + pad_b - (dilation_h * (kernel_h - 1) + 1)) // stride_h + 1
+    out_w = (W + pad_l + pad_r - (dilation_w * (kernel_w - 1) + 1)) // stride_w + 1
+
+    im_matrix = np.zeros((out_h * out_w, kernel_h * kernel_w * C), dtype=int)
+    for i_oh in range(out_h):
+        for i_ow in range(out_w):
+            index = 0
+            for i_kh in range(kernel_h):
+                input_row = -pad_t + i_kh * dilation_h + i_oh * stride_h
+                for i_kw in range(kernel_w):
+                    input_col = -pad_l + i_kw * dilation_w + i_ow * stride_w
+                    for i_c in range(C):
+                        if 0 <= input_row < H and 0 <= input_col < W:
+                            im_matrix[i_oh * out_w + i_ow, index] = input_row * W * C + input_col * C + i_c + 1
+                        index += 1
+
+    return im_matrix
+
+
+@pytest.mark.parametrize('backend', ['Vivado', 'Vitis', 'Catapult'])
+@pytest.mark.parametrize(
+    'shape, kernel, stride, pad, dilation',
+    [
+        ((8, 8, 3), (3, 3), (1, 1), (1, 1, 1, 1), (1, 1)),
+        ((9, 7, 2), (3, 2), (2, 1), (1, 0, 2, 1), (1, 2)),
+        ((6, 6, 4), (1, 1), (1, 1), (0, 0, 0, 0), (1, 1)),
+    ],
+)
+def test_conv2d_im2col(backend, shape, kernel, stride, pad, dilation):
+    backend = get_backend(backend)
+    im_matrix = backend._compute_conv2d_im2col(shape, kernel, stride, pad, dilation)
+    np.testing.assert_array_equal(im_matrix, _reference_conv2d_im2col(*shape, kernel, stride, pad, dilation))
+
+
+@pytest.mark.parametrize('pad', [(0, 0), (1, 1), (2, 0)])
+@pytest.mark.parametrize('dilation', [1, 2])
+def test_conv1d_im2col(pad, dilation):
+    backend = get_backend('Vivado')
+    W, C, kernel, stride = 11, 3, 3, 2
+    im_matrix = backend._compute_conv1d_im2col((W, C), kernel, stride, pad, dilation)
+    # A 1D convolution is a 2D convolution with unit height
+    expected = _reference_conv2d_im2col(1, W, C, (1, kernel), (1, stride), (0, 0, *pad), (1, dilation))
+    np.testing.assert_array_equal(im_matrix, expected)
+
+
+def test_line_buffer_fn():
+    backend = get_backend('Vivado')
+    code = backend.generate_conv2d_line_buffer_fn(3, 2, 4, 4, 1, kernel=(3, 3), stride=(1, 1), pad=(1, 1, 1, 1))
+
+    assert 'class fill_buffer_3 : public FillConv2DBuffer<data_T, CONFIG_T>' in code
+    assert code.count('if (partition == ') == 2
+    # Top-left pixel is padded on the first row/column, its center element is the first input
+    assert 'buffer[0][0] =          0;' in code
+    assert 'buffer[0][4] =    data[0];' in code
+
+    # Layers with identical parameters only differ in the name of the generated class
+    other_code = backend.generate_conv2d_line_buffer_fn(7, 2, 4, 4, 1, kernel=(3, 3), stride=(1, 1), pad=(1, 1, 1, 1))
+    assert other_code == code.replace('fill_buffer_3', 'fill_buffer_7')
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import pytest
+from tensorflow.keras.layers import Dense, ReLU
+from tensorflow.keras.models import Sequential
+
+import hls4ml
+from hls4ml.optimization import optimize_reuse_factors
+
+test_root_path = Path(__file__).parent
+
+
+def _convert_model(io_type='io_parallel'):
+    model = Sequential()
+    model.add(Dense(32, input_shape=(16,), name='dense1'))
+    model.add(ReLU(name='relu1'))
+    model.add(Dense(32, name='dense2'))
+    model.add(ReLU(name='relu2'))
+    model.add(Dense(256, name='dense3'))
+
+    config = hls4ml.utils.config_from_keras_model(model, granularity='name', default_precision='ap_fixed<16, 6>')
+    return hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, io_type=io_type, output_dir=str(test_root_path / 'hls4mlprj_dse'), backend='Vivado'
+    )
+
+
+@pytest.mark.parametrize('dsp_budget', [4000, 600, 50])
+def test_dsp_budget(dsp_budget):
+    hls_model = _convert_model()
+    backend = hls_model.config.backend
+    selected = optimize_reuse_factors(hls_model, dsp_budget)
+
+    assert list(selected.keys()) == ['dense1', 'dense2', 'dense3']
+    assert sum(option['DSP'] for option in selected.values()) <= dsp_budget
+    for name, option in selected.items():
+        layer = hls_model.graph[name]
+        assert option['ReuseFactor'] in backend.get_valid_reuse_factors(*backend.get_layer_mult_size(layer))
+        # Selection is written back to the config
+        assert hls_model.config.config['HLSConfig']['LayerName'][name]['ReuseFactor'] == option['ReuseFactor']
+        assert hls_model.config.get_reuse_factor(layer) == option['ReuseFactor']
+
+    # Large layers can't use the latency strategy
+    assert selected['dense3']['Strategy'] == 'Resource'
+
+
+def test_smaller_budget_is_slower():
+    latencies = []
+    for dsp_budget in [4000, 600, 50]:
+        selected = optimize_reuse_factors(_convert_model(), dsp_budget, update_config=False)
+        latencies.append(sum(option['Latency'] for option in selected.values()))
+    assert latencies == sorted(latencies)
+    assert latencies[0] < latencies[-1]
+
+
+def test_targets():
+    hls_model = _convert_model()
+    selected = optimize_reuse_factors(hls_model, 4000, interval_target=8)
+    assert all(option['Interval'] <= 8 for option in selected.values())
+
+    fastest = optimize_reuse_factors(hls_model, 4000, update_config=False)
+    relaxed = optimize_reuse_factors(hls_model, 4000, latency_target=100, update_config=False)
+    assert sum(option['DSP'] for option in relaxed.values()) < sum(option['DSP'] for option in fastest.values())
+
+    with pytest.raises(Exception, match='does not fit'):
+        optimize_reuse_factors(hls_model, 1)
@@ -7,7 +7,7 @@ from tensorflow.keras.models import Sequential
 from hls4ml.optimization.dsp_aware_pruning.attributes import get_attributes_from_keras_model
 from hls4ml.optimization.dsp_aware_pruning.config import SUPPORTED_STRUCTURES
 from hls4ml.optimization.dsp_aware_pruning.keras.masking import get_model_masks
-from hls4ml.optimization.dsp_aware_pruning.objectives import ParameterEstimator
+from hls4ml.optimization.dsp_aware_pruning.objectives import ObjectiveEstimator, ParameterEstimator
 
 '''
 In all the tests, an artifical network with one Dense/Conv2D layer and pre-determined weights is created
@@ -449,3 +449,53 @@ def test_consecutive_pattern_masking(local_masking, dense):
     assert not np.any(offsets['dense'])
     assert not np.any(masks['dense'][zeros[:, 0], zeros[:, 1]])
     assert (weight_shape[0] * weight_shape[1]) == (zeros.shape[0] + nonzeros.shape[0])
+
+
+# An objective where removing a neuron, either by pruning or weight sharing, saves its weights
+class NeuronEstimator(ObjectiveEstimator):
+    @classmethod
+    def is_layer_optimizable(self, layer_attributes):
+        return True, layer_attributes.optimization_attributes
+
+    @classmethod
+    def layer_resources(self, layer_attributes):
+        return [np.prod(layer_attributes.weight_shape)]
+
+    @classmethod
+    def layer_savings(self, layer_attributes):
+        return [layer_attributes.weight_shape[0]]
+
+
+# Create two Dense layers, where the 1st and 2nd neuron of the second layer are (almost) constant
+# These neurons should be weight shared and their offsets should be equal to their means
+@pytest.mark.parametrize('local_masking', local_masking)
+def test_structured_weight_sharing(local_masking):
+    model = Sequential()
+    model.add(Dense(6, input_shape=(8,), name='dense1'))
+    model.add(Dense(4, name='dense2'))
+
+    weights = model.layers[0].get_weights()
+    weights[0] = np.random.normal(size=(8, 6))
+    model.layers[0].set_weights(weights)
+
+    weights = model.layers[1].get_weights()
+    weights[0] = np.stack([np.full(6, 3.0), np.full(6, 5.0), 100 * np.arange(6), -100 * np.arange(6)], axis=1)
+    weights[0][0, :2] += 1e-3
+    model.layers[1].set_weights(weights)
+
+    model_attributes = get_attributes_from_keras_model(model)
+    for layer, pruning, weight_sharing in [('dense1', True, False), ('dense2', False, True)]:
+        model_attributes[layer].optimizable = True
+        model_attributes[layer].optimization_attributes.pruning = pruning
+        model_attributes[layer].optimization_attributes.weight_sharing = weight_sharing
+        model_attributes[layer].optimization_attributes.structure_type = SUPPORTED_STRUCTURES.STRUCTURED
+
+    # 50% sparsity - remove 36 out of 72 weights, i.e. three neurons of dense1 and two neurons of dense2
+    masks, offsets = get_model_masks(model, model_attributes, 0.5, NeuronEstimator, metric='l1', local=local_masking)
+
+    np.testing.assert_array_equal(masks['dense2'][:, :2], 0)
+    np.testing.assert_array_equal(masks['dense2'][:, 2:], 1)
+    np.testing.assert_allclose(offsets['dense2'][:, :2], np.mean(weights[0][:, :2], axis=0, keepdims=True) * np.ones((6, 1)))
+    assert not np.any(offsets['dense2'][:, 2:])
+    assert np.count_nonzero(masks['dense1'][0]) == 3
+    assert not np.any(offsets['dense1'])
@@ -0,0 +1,78 @@
+import gc
+import weakref
+
+import numpy as np
+import pytest
+import tensorflow as tf
+from tensorflow.keras.layers import Dense
+from tensorflow.keras.models import Sequential
+
+from hls4ml.optimization.dsp_aware_pruning.keras.utils import get_model_gradients, get_model_hessians
+
+
+def _get_model_and_data():
+    model = Sequential()
+    model.add(Dense(8, input_shape=(4,), activation='tanh', name='dense_1'))
+    model.add(Dense(2, name='dense_2'))
+
+    X = np.random.rand(100, 4).astype(np.float32)
+    y = np.random.rand(100, 2).astype(np.float32)
+    return model, X, y
+
+
+@pytest.mark.parametrize('batch_size', [7, 32, 100])
+def test_batched_gradients(batch_size):
+    model, X, y = _get_model_and_data()
+    loss_fn = tf.keras.losses.MeanSquaredError()
+
+    # Reference: gradient of the loss over all samples at once
+    with tf.GradientTape() as tape:
+        loss_value = loss_fn(y, model(X, training=True))
+    expected = tape.gradient(loss_value, [model.layers[0].kernel, model.layers[1].kernel])
+
+    gradients = get_model_gradients(model, loss_fn, X, y, batch_size=batch_size)
+    np.testing.assert_allclose(gradients['dense_1'], expected[0], rtol=1e-4, atol=1e-6)
+    np.testing.assert_allclose(gradients['dense_2'], expected[1], rtol=1e-4, atol=1e-6)
+
+    # Batched tf.data.Dataset input
+    dataset = tf.data.Dataset.from_tensor_slices((X, y)).batch(batch_size)
+    gradients = get_model_gradients(model, loss_fn, dataset)
+    np.testing.assert_allclose(gradients['dense_1'], expected[0], rtol=1e-4, atol=1e-6)
+
+
+def test_hutchinson_hessians():
+    model, X, y = _get_model_and_data()
+    loss_fn = tf.keras.losses.MeanSquaredError()
+
+    # The last layer is linear, with a mean squared error the Hessian is constant and can be computed exactly
+    # For an output neuron j, d^2L / dw_ij^2 = 2 / (N * n_out) * sum_n h_ni^2, where h are the outputs of the first layer
+    hidden = model.layers[0](X).numpy()
+    expected = np.repeat(2.0 / (X.shape[0] * 2) * np.sum(np.square(hidden), axis=0)[:, np.newaxis], 2, axis=1)
+
+    hessians = get_model_hessians(model, loss_fn, X, y, batch_size=10, num_samples=64, seed=42)
+    assert hessians['dense_1'].shape == (4, 8)
+    assert hessians['dense_2'].shape == (8, 2)
+    np.testing.assert_allclose(hessians['dense_2'], expected, rtol=0.2)
+
+    # Same seed, same estimate
+    hessians_repeated = get_model_hessians(model, loss_fn, X, y, batch_size=10, num_samples=64, seed=42)
+    np.testing.assert_allclose(hessians['dense_1'], hessians_repeated['dense_1'])
+
+
+def test_traced_steps_released():
+    model, X, y = _get_model_and_data()
+    loss_fn = tf.keras.losses.MeanSquaredError()
+
+    get_model_gradients(model, loss_fn, X, y, batch_size=32)
+    traced_steps = model._hls4ml_traced_steps
+    assert len(traced_steps) == 1
+
+    # Traced steps are reused between calls
+    get_model_gradients(model, loss_fn, X, y, batch_size=32)
+    assert model._hls4ml_traced_steps is traced_steps and len(traced_steps) == 1
+
+    # Deleting the model releases it, together with its traced steps
+    model_ref = weakref.ref(model)
+    del model, traced_steps
+    gc.collect()
+    assert model_ref() is None
@@ -50,3 +50,35 @@ def test_knapsack_all_elements_fit():
     optimal, selected = solve_knapsack(values, weights, capacity)
     assert optimal == 33
     assert selected == list(range(0, values.shape[0]))
+
+
+def test_knapsack_dp_optimal():
+    # Compare dynamic programming against exhaustive search on small problems with non-integer values
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        values = rng.random(10)
+        weights = rng.integers(1, 10, size=(1, 10))
+        capacity = np.array([weights.sum() // 2])
+
+        best = 0
+        for mask in range(1 << 10):
+            selection = [i for i in range(10) if mask & (1 << i)]
+            if weights[0, selection].sum() <= capacity[0]:
+                best = max(best, values[selection].sum())
+
+        optimal, selected = solve_knapsack(values, weights, capacity, implementation='dynamic')
+        assert np.isclose(optimal, best)
+        assert np.isclose(values[selected].sum(), optimal)
+        assert weights[0, selected].sum() <= capacity[0]
+
+
+def test_multidimensional_knapsack_greedy_feasible():
+    rng = np.random.default_rng(0)
+    values = rng.random(1000)
+    weights = rng.integers(1, 16, size=(3, 1000))
+    capacity = weights.sum(axis=1) // 3
+
+    optimal, selected = solve_knapsack(values, weights, capacity, implementation='greedy')
+    assert len(selected) == len(set(selected))
+    assert np.all(weights[:, selected].sum(axis=1) <= capacity)
+    assert np.isclose(values[selected].sum(), optimal)
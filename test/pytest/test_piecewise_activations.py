@@ -0,0 +1,120 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from tensorflow.keras.layers import Activation
+from tensorflow.keras.models import Sequential
+
+import hls4ml
+from hls4ml.backends.fpga.passes.piecewise_activations import fit_piecewise, piecewise_functions, piecewise_value
+from hls4ml.model.types import FixedPrecisionType, RoundingMode, SaturationMode, quantize_fixed
+
+test_root_path = Path(__file__).parent
+
+
+@pytest.mark.parametrize('activation', ['sigmoid', 'tanh', 'softplus', 'softsign'])
+@pytest.mark.parametrize('degree', [1, 2])
+@pytest.mark.parametrize('max_error', [1e-2, 1e-3])
+def test_fit_piecewise(activation, degree, max_error):
+    precision = FixedPrecisionType(18, 8)
+    x_min, x_max, function = piecewise_functions[activation]
+    breakpoints, coefs = fit_piecewise(function, x_min, x_max, precision, degree, max_error)
+
+    assert breakpoints[0] == x_min and breakpoints[-1] == x_max
+    assert np.all(np.diff(breakpoints) > 0)
+    assert coefs.shape == (len(breakpoints) - 1, degree + 1)
+    np.testing.assert_array_equal(quantize_fixed(coefs, precision), coefs)
+
+    # All the representable inputs of the range are within the error
+    x = np.arange(x_min * 2**precision.fractional, x_max * 2**precision.fractional + 1) / 2**precision.fractional
+    assert np.max(np.abs(piecewise_value(x, breakpoints, coefs, precision) - function(x))) <= max_error
+
+
+def test_fit_piecewise_degree():
+    precision = FixedPrecisionType(18, 8)
+    x_min, x_max, function = piecewise_functions['sigmoid']
+    n_linear = len(fit_piecewise(function, x_min, x_max, precision, 1, 1e-3)[1])
+    n_quadratic = len(fit_piecewise(function, x_min, x_max, precision, 2, 1e-3)[1])
+    assert n_quadratic < n_linear
+
+
+def _convert(keras_model, backend, io_type, degree, name):
+    config = hls4ml.utils.config_from_keras_model(keras_model, granularity='name', backend=backend)
+    for layer_config in config['LayerName'].values():
+        layer_config['Implementation'] = 'piecewise'
+        layer_config['PiecewiseDegree'] = degree
+    odir = str(test_root_path / f'hls4mlprj_piecewise_{name}_{backend}_{io_type}_{degree}')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        keras_model, hls_config=config, output_dir=odir, backend=backend, io_type=io_type
+    )
+    hls_model.compile()
+    return hls_model
+
+
+def _fixed_inputs(precision, low, high, shape):
+    # Inputs that are exactly representable in the input type, so the emulation sees the same values as the C++
+    return quantize_fixed(np.random.uniform(low, high, shape), precision)
+
+
+@pytest.mark.parametrize('backend', ['Vivado', 'Vitis', 'Quartus'])
+@pytest.mark.parametrize('io_type', ['io_parallel', 'io_stream'])
+@pytest.mark.parametrize('degree', [1, 2])
+@pytest.mark.parametrize('activation', ['sigmoid', 'tanh'])
+def test_piecewise_activation(backend, io_type, degree, activation):
+    model = Sequential()
+    model.add(Activation(activation, input_shape=(16,), name='activation'))
+    model.compile()
+
+    hls_model = _convert(model, backend, io_type, degree, activation)
+    node = hls_model.graph['activation']
+    assert 'table' not in node.weights
+
+    input_precision = hls_model.get_input_variables()[0].type.precision
+    x = _fixed_inputs(input_precision, -10, 10, (1000, 16))
+    y_hls = hls_model.predict(x)
+
+    y_emu = piecewise_value(
+        x, node.get_weights('breakpoints').data, node.get_weights('coefs').data, node.get_attr('table_t').precision
+    )
+    y_emu = quantize_fixed(y_emu, node.get_output_variable().type.precision)
+    np.testing.assert_array_equal(y_hls, y_emu)
+
+    y_keras = model.predict(x, verbose=0)
+    np.testing.assert_allclose(y_hls, y_keras, atol=node.get_attr('piecewise_max_error') + 2e-3)
+
+
+@pytest.mark.parametrize('backend', ['Vivado', 'Vitis', 'Quartus'])
+@pytest.mark.parametrize('io_type', ['io_parallel', 'io_stream'])
+@pytest.mark.parametrize('degree', [1, 2])
+def test_piecewise_softmax(backend, io_type, degree):
+    model = Sequential()
+    model.add(Activation('softmax', input_shape=(8,), name='softmax'))
+    model.compile()
+
+    hls_model = _convert(model, backend, io_type, degree, 'softmax')
+    node = hls_model.graph['softmax']
+    assert 'exp_table' not in node.weights
+
+    input_precision = hls_model.get_input_variables()[0].type.precision
+    x = _fixed_inputs(input_precision, -4, 4, (1000, 8))
+    y_hls = hls_model.predict(x)
+
+    diff_precision = FixedPrecisionType(
+        input_precision.width,
+        input_precision.integer,
+        rounding_mode=RoundingMode.RND,
+        saturation_mode=SaturationMode.SAT,
+    )
+    exp_precision = node.get_attr('exp_table_t').precision
+    inv_precision = node.get_attr('inv_table_t').precision
+    diff = quantize_fixed(x - x.max(axis=1, keepdims=True), diff_precision)
+    exp = piecewise_value(diff, node.get_weights('exp_breakpoints').data, node.get_weights('exp_coefs').data, exp_precision)
+    exp_sum = quantize_fixed(exp.sum(axis=1, keepdims=True), exp_precision)
+    inv = piecewise_value(
+        exp_sum, node.get_weights('inv_breakpoints').data, node.get_weights('inv_coefs').data, inv_precision
+    )
+    y_emu = quantize_fixed(exp * inv, node.get_output_variable().type.precision)
+    np.testing.assert_array_equal(y_hls, y_emu)
+
+    y_keras = model.predict(x, verbose=0)
+    np.testing.assert_allclose(y_hls, y_keras, atol=1e-2)
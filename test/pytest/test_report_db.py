@@ -0,0 +1,92 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from tensorflow.keras.layers import Dense
+from tensorflow.keras.models import Sequential
+
+import hls4ml
+
+test_root_path = Path(__file__).parent
+
+# (reuse factor, latency, DSP, LUT) of the fake synthesis results
+sweep = [(1, 10, 80, 3000), (2, 12, 40, 2500), (4, 16, 20, 2600), (8, 24, 10, 2000), (16, 24, 12, 2200)]
+
+
+def _write_project(base_dir, reuse_factor, latency, dsp, lut):
+    model = Sequential()
+    model.add(Dense(5, input_shape=(16,), name='fc1', activation='relu'))
+
+    config = hls4ml.utils.config_from_keras_model(model, granularity='name', default_reuse_factor=reuse_factor)
+    output_dir = str(base_dir / f'rf{reuse_factor}')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, output_dir=output_dir, part='xc7z020clg400-1', backend='Vivado'
+    )
+    hls_model.write()
+
+    # Fake synthesis results, from the pregenerated report
+    test_report_dir = test_root_path / 'test_report'
+    report_dir = f'{output_dir}/myproject_prj/solution1/syn/report'
+    os.makedirs(report_dir, exist_ok=True)
+    shutil.copy(test_report_dir / 'vivado_hls.app', f'{output_dir}/myproject_prj/vivado_hls.app')
+    xml = (test_report_dir / 'myproject_csynth.xml').read_text()
+    xml = xml.replace('<Worst-caseLatency>10<', f'<Worst-caseLatency>{latency}<', 1)
+    xml = xml.replace('<DSP48E>73<', f'<DSP48E>{dsp}<', 1)
+    xml = xml.replace('<LUT>2532<', f'<LUT>{lut}<', 1)
+    Path(report_dir, 'myproject_csynth.xml').write_text(xml)
+
+
+@pytest.fixture(scope='module')
+def sweep_dir():
+    base_dir = test_root_path / 'hls4mlprj_report_db'
+    if base_dir.exists():
+        shutil.rmtree(base_dir)
+    for rf, latency, dsp, lut in sweep:
+        _write_project(base_dir, rf, latency, dsp, lut)
+    os.makedirs(base_dir / 'not_a_project')
+    return base_dir
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_ingest(sweep_dir, max_workers):
+    with hls4ml.report.ReportDatabase() as db:
+        assert db.ingest(sweep_dir, max_workers=max_workers) == len(sweep)
+        assert db.ingest(sweep_dir, update=False) == 0
+
+        builds = db.query('SELECT output_dir, backend, io_type, reuse_factor FROM builds ORDER BY reuse_factor')
+        assert [b['reuse_factor'] for b in builds] == [rf for rf, *_ in sweep]
+        assert all(b['backend'] == 'Vivado' and b['io_type'] == 'io_parallel' for b in builds)
+
+        settings = db.query(
+            "SELECT b.reuse_factor, s.value FROM builds b JOIN layer_settings s ON s.build_id = b.id "
+            "WHERE s.layer = 'fc1' AND s.setting = 'ReuseFactor'"
+        )
+        assert all(int(s['value']) == s['reuse_factor'] for s in settings)
+
+        metrics = db.get_metrics(['WorstLatency', 'BestLatency', 'DSP', 'AvailableDSP'])
+        assert sorted((m['reuse_factor'], m['WorstLatency'], m['DSP']) for m in metrics) == [
+            (rf, latency, dsp) for rf, latency, dsp, _ in sweep
+        ]
+        assert all(m['BestLatency'] == 10 and m['AvailableDSP'] == 220 for m in metrics)
+
+        # Reading the projects again replaces them
+        assert db.ingest(sweep_dir, max_workers=max_workers) == len(sweep)
+        assert db.query('SELECT COUNT(*) AS n FROM metrics WHERE metric = "DSP"')[0]['n'] == len(sweep)
+
+
+def test_pareto_front(sweep_dir):
+    with hls4ml.report.ReportDatabase() as db:
+        db.ingest(sweep_dir, max_workers=1)
+
+        front = db.pareto_front(latency='WorstLatency', resources=('DSP',))
+        assert [b['reuse_factor'] for b in front] == [1, 2, 4, 8]
+
+        # RF=4 uses more LUTs than RF=2, RF=16 is dominated by RF=8
+        front = db.pareto_front(latency='WorstLatency', resources=('DSP', 'LUT'))
+        assert [b['reuse_factor'] for b in front] == [1, 2, 4, 8]
+        front = db.pareto_front(latency='WorstLatency', resources=('LUT',))
+        assert [b['reuse_factor'] for b in front] == [1, 2, 8]
+
+        front = db.pareto_front(resources=('DSP',), where='b.reuse_factor > ?', params=(2,))
+        assert [b['reuse_factor'] for b in front] == [4, 8]
@@ -0,0 +1,98 @@
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+from tensorflow.keras.layers import Activation, Dense, SimpleRNN
+from tensorflow.keras.models import Sequential
+
+import hls4ml
+
+test_root_path = Path(__file__).parent
+
+
+def _convert_model(name, io_type='io_parallel', reuse_factor=1, strategy='Latency'):
+    model = Sequential()
+    model.add(Dense(32, input_shape=(16,), name='fc1'))
+    model.add(Activation('relu', name='relu1'))
+    model.add(Dense(5, name='fc2'))
+    model.add(Activation('sigmoid', name='sigmoid'))
+
+    config = hls4ml.utils.config_from_keras_model(
+        model, granularity='model', default_reuse_factor=reuse_factor, backend='Vivado'
+    )
+    config['Model']['Strategy'] = strategy
+    output_dir = str(test_root_path / f'hls4mlprj_resource_estimate_{name}')
+    return hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, output_dir=output_dir, io_type=io_type, part='xc7z020clg400-1', backend='Vivado'
+    )
+
+
+@pytest.mark.parametrize('io_type', ['io_parallel', 'io_stream'])
+def test_estimate(io_type):
+    hls_model = _convert_model(f'{io_type}_rf1', io_type=io_type)
+    report = hls4ml.report.estimate(hls_model)
+
+    c_synth_report = report['CSynthesisReport']
+    for key in ['BestLatency', 'WorstLatency', 'IntervalMin', 'IntervalMax', 'BRAM_18K', 'DSP', 'FF', 'LUT', 'URAM']:
+        assert key in c_synth_report
+        assert c_synth_report[key] >= 0
+    assert list(report['LayerReport'].keys()) == ['fc1', 'relu1', 'fc2', 'sigmoid']
+    for resource in ['DSP', 'LUT', 'FF']:
+        assert c_synth_report[resource] == sum(layer[resource] for layer in report['LayerReport'].values())
+
+    # 16x32 + 32x5 multiplications with <16,6> inputs and weights, each using one DSP
+    assert c_synth_report['DSP'] == 16 * 32 + 32 * 5
+    assert report['LayerReport']['relu1']['DSP'] == 0
+
+
+def test_estimate_reuse_factor():
+    report_rf1 = hls4ml.report.estimate(_convert_model('resource_rf1', reuse_factor=1, strategy='Resource'))
+    report_rf16 = hls4ml.report.estimate(_convert_model('resource_rf16', reuse_factor=16, strategy='Resource'))
+
+    assert report_rf16['CSynthesisReport']['DSP'] < report_rf1['CSynthesisReport']['DSP']
+    assert report_rf16['CSynthesisReport']['IntervalMin'] > report_rf1['CSynthesisReport']['IntervalMin']
+    assert report_rf16['CSynthesisReport']['BestLatency'] > report_rf1['CSynthesisReport']['BestLatency']
+
+
+def test_estimate_unsupported_mult_layer():
+    model = Sequential()
+    model.add(SimpleRNN(8, input_shape=(4, 6), name='rnn'))
+
+    config = hls4ml.utils.config_from_keras_model(model, granularity='model', backend='Vivado')
+    output_dir = str(test_root_path / 'hls4mlprj_resource_estimate_rnn')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, output_dir=output_dir, part='xc7z020clg400-1', backend='Vivado'
+    )
+
+    with pytest.warns(UserWarning, match='rnn'):
+        report = hls4ml.report.estimate(hls_model)
+    assert report['LayerReport']['rnn']['DSP'] == 0
+
+
+def test_calibrate_estimate():
+    test_report_dir = test_root_path / 'test_report'
+    hls_model = _convert_model('calibrate')
+    hls_model.write()
+    hls4ml.report.write_estimate_features(hls_model)
+
+    # copy pregenerated reports
+    output_dir = hls_model.config.get_output_dir()
+    os.makedirs(f'{output_dir}/myproject_prj/solution1/syn/report', exist_ok=True)
+    shutil.copy(test_report_dir / 'vivado_hls.app', f'{output_dir}/myproject_prj/vivado_hls.app')
+    shutil.copy(
+        test_report_dir / 'myproject_csynth.xml', f'{output_dir}/myproject_prj/solution1/syn/report/myproject_csynth.xml'
+    )
+    synth_report = hls4ml.report.parse_vivado_report(output_dir)['CSynthesisReport']
+
+    coefficients = hls4ml.report.calibrate_estimate(output_dir, regularization=1e-6)
+    calibrated = hls4ml.report.estimate(hls_model, coefficients=coefficients)['CSynthesisReport']
+    for key in ['DSP', 'LUT', 'FF', 'BestLatency']:
+        np.testing.assert_allclose(calibrated[key], int(synth_report[key]), rtol=0.05, atol=1)
+
+    # Same result when calibrating from the model directly
+    coefficients_from_model = hls4ml.report.calibrate_estimate(
+        [(hls_model, {'CSynthesisReport': synth_report})], regularization=1e-6
+    )
+    assert coefficients_from_model == coefficients
@@ -0,0 +1,88 @@
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+from tensorflow.keras.layers import Dense, Input
+from tensorflow.keras.models import Model
+
+import hls4ml
+from hls4ml.utils.serving import ModelServer, ServingClient, load_project
+
+test_root_path = Path(__file__).parent
+
+
+@pytest.fixture(scope='module')
+def models():
+    inp = Input(shape=(8,), name='x')
+    out = Dense(4, activation='relu', name='dense')(inp)
+    single = Model(inputs=inp, outputs=out)
+
+    inp1 = Input(shape=(8,), name='x1')
+    inp2 = Input(shape=(8,), name='x2')
+    out1 = Dense(4, name='dense1')(inp1)
+    out2 = Dense(2, name='dense2')(inp2)
+    multi = Model(inputs=[inp1, inp2], outputs=[out1, out2])
+
+    hls_models = {}
+    for name, model in [('single', single), ('multi', multi)]:
+        config = hls4ml.utils.config_from_keras_model(model, granularity='model')
+        hls_model = hls4ml.converters.convert_from_keras_model(
+            model, hls_config=config, output_dir=str(test_root_path / f'hls4mlprj_serving_{name}'), backend='Vivado'
+        )
+        hls_model.compile()
+        hls_models[name] = hls_model
+    return hls_models
+
+
+@pytest.mark.parametrize('transport', ['tcp', 'unix'])
+def test_serving(models, transport, tmp_path):
+    x = np.random.rand(100, 8).astype(np.float32)
+    y_ref = models['single'].predict(x)
+    x_multi = [np.random.rand(10, 8).astype(np.float32), np.random.rand(10, 8).astype(np.float32)]
+    y_multi_ref = models['multi'].predict(x_multi)
+
+    address = str(tmp_path / 'hls4ml.sock') if transport == 'unix' else ('127.0.0.1', 0)
+    with ModelServer(models, max_batch_size=32, max_delay=0.05) as server:
+        client = ServingClient(server.start(address), timeout=60)
+        assert client.models()['multi']['inputs'][1]['shape'] == [8]
+
+        # Concurrent requests of one sample are merged into batches
+        results = [None] * len(x)
+
+        def run(i):
+            results[i] = client.predict('single', x[i])
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(x))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        np.testing.assert_allclose(np.stack(results), y_ref)
+
+        y_multi = client.predict('multi', x_multi)
+        for y, y_ref_i in zip(y_multi, y_multi_ref):
+            np.testing.assert_allclose(y, y_ref_i)
+
+        with pytest.raises(Exception, match='Unknown model'):
+            client.predict('missing', x)
+        with pytest.raises(Exception, match='mismatch'):
+            client.predict('single', x[:, :5])
+
+        stats = client.stats()
+        assert stats['single']['requests'] == len(x) + 1
+        assert stats['single']['samples'] == len(x)
+        assert stats['single']['errors'] == 1
+        assert stats['single']['batches'] < len(x)
+        assert stats['single']['latency_ms']['max'] > 0
+        assert stats['multi']['samples'] == 10
+
+    if transport == 'unix':
+        assert not Path(address).exists()
+
+
+def test_load_project(models):
+    model = load_project(models['single'].config.get_output_dir())
+    x = np.random.rand(10, 8).astype(np.float32)
+    with ModelServer([model]) as server:
+        np.testing.assert_allclose(server.predict('myproject', x), models['single'].predict(x))
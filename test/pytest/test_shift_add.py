@@ -0,0 +1,88 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from tensorflow.keras.layers import Activation, Conv1D, Conv2D, Dense
+from tensorflow.keras.models import Sequential
+
+import hls4ml
+from hls4ml.backends.vivado.passes.shift_add_codegen import csd_digits, share_subexpressions
+
+test_root_path = Path(__file__).parent
+
+
+def _make_model(kind):
+    model = Sequential()
+    if kind == 'dense':
+        model.add(Dense(8, input_shape=(6,), name='first'))
+        model.add(Activation('relu', name='relu'))
+        model.add(Dense(5, name='layer'))
+    elif kind == 'conv1d':
+        model.add(Conv1D(4, 3, input_shape=(10, 3), name='layer'))
+    else:
+        model.add(Conv2D(4, 3, input_shape=(6, 7, 3), name='layer'))
+    model.compile()
+    # Weights on the grid of ap_fixed<8,3>, with a few 0s and 0.375s
+    weights = [np.round(np.random.uniform(-2, 2, w.shape) * 16) / 16 for w in model.get_weights()]
+    weights[-2].flat[:3] = [0, 0.375, -0.375]
+    model.set_weights(weights)
+    return model
+
+
+def _convert(model, backend, io_type, max_digits, name):
+    config = hls4ml.utils.config_from_keras_model(
+        model, granularity='name', backend=backend, default_precision='ap_fixed<16,6>'
+    )
+    config['LayerName']['layer']['ShiftAddMaxDigits'] = max_digits
+    config['LayerName']['layer']['Precision']['weight'] = 'ap_fixed<8,3>'
+    odir = str(test_root_path / f'hls4mlprj_shift_add_{name}_{max_digits}_{backend}_{io_type}')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, output_dir=odir, backend=backend, io_type=io_type
+    )
+    hls_model.compile()
+    return hls_model
+
+
+@pytest.mark.parametrize('value', [1, -1, 3, 6, 7, -7, 23, 85, -128, 255, 1000])
+def test_csd_digits(value):
+    digits = csd_digits(value)
+    assert sum(sign * 2**pos for pos, sign in digits) == value
+    positions = [pos for pos, _ in digits]
+    assert all(hi - lo > 1 for lo, hi in zip(positions, positions[1:]))
+
+
+def test_share_subexpressions():
+    constants = [csd_digits(v) for v in [5, 10, 21, -20, 7]]
+    subexpressions, terms = share_subexpressions(constants)
+
+    # x + (x << 2) is shared by 5, 10, 21 and -20
+    assert subexpressions[0] == (2, 1)
+    for value, const_terms in zip([5, 10, 21, -20, 7], terms):
+        sub_values = [1 + sign * 2**distance for distance, sign in subexpressions]
+        total = sum(sign * 2**pos * (1 if sub is None else sub_values[sub]) for pos, sign, sub in const_terms)
+        assert total == value
+
+
+@pytest.mark.parametrize('backend', ['Vivado', 'Vitis'])
+@pytest.mark.parametrize('io_type', ['io_parallel', 'io_stream'])
+@pytest.mark.parametrize('kind', ['dense', 'conv1d', 'conv2d'])
+def test_shift_add(backend, io_type, kind):
+    model = _make_model(kind)
+    hls_model_mult = _convert(model, backend, io_type, 0, kind)
+    hls_model_shift_add = _convert(model, backend, io_type, 2, kind)
+
+    node = hls_model_shift_add.graph['layer']
+    assert node.get_attr('_shift_add_applied')
+    assert not hls_model_mult.graph['layer'].get_attr('_shift_add_applied', False)
+
+    # Only the weights with more than 2 nonzero digits are still multiplied
+    code = str(node.get_attr('shift_add_codegen'))
+    weights = np.round(node.get_weights('weight').data * 16).astype(int)
+    n_mult = sum(len(csd_digits(int(w))) > 2 for w in weights.flatten() if w != 0)
+    assert code.count('::product(') == n_mult
+    assert node.get_attr('shift_add_n_products') == n_mult
+
+    x = np.random.uniform(-4, 4, (100,) + model.input_shape[1:])
+    y_mult = hls_model_mult.predict(x)
+    y_shift_add = hls_model_shift_add.predict(x)
+    np.testing.assert_array_equal(y_shift_add, y_mult)
@@ -0,0 +1,95 @@
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+
+import hls4ml
+from hls4ml.utils.timing import Timer, timed
+
+test_root_path = Path(__file__).parent
+
+
+def dense_model(output_dir, timing=False):
+    layers = [{'class_name': 'Input', 'name': 'layer0_input', 'input_shape': [8]}]
+    for i in range(3):
+        inputs = [layers[-1]['name']]
+        weights = np.random.rand(8, 8)
+        layers.append(
+            {'class_name': 'Dense', 'name': f'fc{i}', 'n_in': 8, 'n_out': 8, 'weight_data': weights, 'bias_data': None}
+        )
+        layers[-1]['inputs'] = inputs
+    config = {'HLSConfig': {'Model': {'Precision': 'ap_fixed<16,6>', 'ReuseFactor': 1}}}
+    if timing:
+        config['HLSConfig']['Timing'] = True
+    config['OutputDir'] = output_dir
+    config['ProjectName'] = 'myprj'
+    config['IOType'] = 'io_parallel'
+    config['Backend'] = 'Vivado'
+    return hls4ml.model.ModelGraph(config, layers)
+
+
+def test_timer(tmp_path):
+    output_dir = str(test_root_path / 'hls4mlprj_timing')
+    with timed('flow', 'ignored'):
+        pass
+
+    with Timer() as timer:
+        model = dense_model(output_dir)
+        model.compile()
+
+        with timed('custom', 'outer') as counters:
+            counters['items'] += 2
+            with timed('custom', 'inner'):
+                pass
+
+    summary = {(region['category'], region['name']): region for region in timer.summary()}
+    assert ('flow', 'ignored') not in summary
+    assert summary[('flow', 'vivado:ip')]['count'] == 1
+    assert summary[('flow', 'vivado:write')]['count'] == 1
+    assert summary[('pass', 'vivado:write_hls')]['transforms'] == 1
+    assert summary[('writer', 'VivadoWriter.write_weights')]['count'] == 1
+    assert summary[('compile', 'myprj')]['count'] == 1
+    # Each layer is matched once
+    assert summary[('pass', 'vivado:transform_types')]['matches'] == len(model.get_layers())
+
+    outer = summary[('custom', 'outer')]
+    inner = summary[('custom', 'inner')]
+    assert outer['items'] == 2
+    assert outer['self'] == outer['total'] - inner['total']
+
+    trace_file = tmp_path / 'trace.json'
+    timer.write_chrome_trace(trace_file)
+    with open(trace_file) as f:
+        trace = json.load(f)
+    assert len(trace['traceEvents']) == len(timer.events)
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in trace['traceEvents'])
+
+    # Nothing is recorded after the timer exits
+    n_events = len(timer.events)
+    model.write()
+    assert len(timer.events) == n_events
+
+
+def test_timing_config():
+    model = dense_model(str(test_root_path / 'hls4mlprj_timing_config'), timing=True)
+    model.compile()
+    categories = {region['category'] for region in model.timer.summary()}
+    assert {'flow', 'pass', 'writer', 'compile'} <= categories
+
+    assert dense_model(str(test_root_path / 'hls4mlprj_timing_config'), timing=False).timer is None
+
+
+def test_timer_threads():
+    def convert_in_thread():
+        with timed('flow', 'other_thread'):
+            pass
+
+    with Timer() as timer:
+        with timed('flow', 'main_thread'):
+            thread = threading.Thread(target=convert_in_thread)
+            thread.start()
+            thread.join()
+
+    # Regions entered in other threads are not recorded
+    assert [event['name'] for event in timer.events] == ['main_thread']